@@ -12,6 +12,8 @@ from pathlib import Path
 from threading import Lock
 from typing import Dict, List, Optional
 
+from src.core.portfolio_greeks import get_portfolio_greeks_aggregator
+
 app = Flask(__name__)
 CORS(app)
 
@@ -31,7 +33,7 @@ class DashboardDataProvider:
         self.greeks_data = {}  # symbol -> greeks snapshot
         self.active_trades = []
         self.closed_trades = []
-        self.portfolio_greeks = {'delta': 0, 'gamma': 0, 'theta': 0, 'vega': 0}
+        self.portfolio_greeks = get_portfolio_greeks_aggregator()  # live book Greeks
         self.daily_pnl = 0
         self.daily_trades = 0
         self.account_risk_used = 0
@@ -56,7 +58,6 @@ class DashboardDataProvider:
         """Set current active trades"""
         with self.lock:
             self.active_trades = trades
-            self._compute_portfolio_greeks()
     
     def set_closed_trades(self, trades: List):
         """Set closed trades for session"""
@@ -74,20 +75,9 @@ class DashboardDataProvider:
         with self.lock:
             self.account_risk_used = risk_used
     
-    def _compute_portfolio_greeks(self):
-        """Compute aggregated portfolio Greeks"""
-        portfolio = {'delta': 0, 'gamma': 0, 'theta': 0, 'vega': 0}
-        
-        for trade in self.active_trades:
-            portfolio['delta'] += getattr(trade, 'entry_delta', 0) * trade.quantity
-            portfolio['gamma'] += getattr(trade, 'entry_gamma', 0) * trade.quantity
-            portfolio['theta'] += getattr(trade, 'entry_theta', 0) * trade.quantity
-            portfolio['vega'] += getattr(trade, 'entry_iv', 0) * trade.quantity
-        
-        self.portfolio_greeks = portfolio
-    
     def get_dashboard_data(self) -> Dict:
         """Get complete dashboard snapshot"""
+        greeks = self.portfolio_greeks.get_totals()
         with self.lock:
             return {
                 'timestamp': datetime.now().isoformat(),
@@ -114,10 +104,11 @@ class DashboardDataProvider:
                     ]
                 },
                 'portfolio': {
-                    'delta': round(self.portfolio_greeks['delta'], 2),
-                    'gamma': round(self.portfolio_greeks['gamma'], 4),
-                    'theta': round(self.portfolio_greeks['theta'], 2),
-                    'vega': round(self.portfolio_greeks['vega'], 2),
+                    'delta': round(greeks['net_delta'], 2),
+                    'gamma': round(greeks['net_gamma'], 4),
+                    'theta': round(greeks['net_theta'], 2),
+                    'vega': round(greeks['net_vega'], 2),
+                    'greeks_version': greeks['version'],
                     'daily_pnl': round(self.daily_pnl, 2),
                     'daily_trades': self.daily_trades,
                     'risk_used_percent': round(self.account_risk_used * 100, 1)
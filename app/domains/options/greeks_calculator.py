@@ -3,8 +3,8 @@ PHASE 3 — Greeks Calculation Engine
 Broker Greeks + Black-Scholes fallback for IV-based calculation
 
 Components:
-    • GreeksCalculator - Black-Scholes implementation
-    • IvEstimator - Implied Volatility from market data
+    • GreeksCalculator - Black-Scholes implementation (scalar + vectorized batch)
+    • IvEstimator - Implied Volatility solver (vectorized safeguarded Newton)
     • BrokerGreeksValidator - Normalize broker data
     • GreeksCalculationEngine - Main orchestrator
 """
@@ -12,10 +12,15 @@ Components:
 import math
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, List, Tuple
 from dataclasses import dataclass
 
 from .greeks_models import GreeksSnapshot, OptionType, GreeksHealthStatus
+from src.engines.greeks.greeks_calculator import (
+    GreeksCalculationEngine as _BatchGreeksEngine,
+    GreeksCalculator as _BatchGreeksCalculator,
+    IvEstimator as _IvEstimator,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -194,68 +199,16 @@ class GreeksCalculator:
             "vega": float(vega)
         }
 
+    # Vectorized whole-chain Greeks (structured GREEKS_DTYPE array), shared implementation
+    calculate_batch = staticmethod(_BatchGreeksCalculator.calculate_batch)
+
 
 # ============================================================================
 # Implied Volatility Estimation
 # ============================================================================
 
-class IvEstimator:
-    """
-    Estimate Implied Volatility from option price and market parameters
-    
-    Used when broker doesn't provide IV
-    Takes: LTP, spot, strike, time_to_expiry
-    Returns: IV estimate
-    """
-    
-    @staticmethod
-    def estimate_from_price(
-        option_ltp: float,
-        spot: float,
-        strike: float,
-        time_to_expiry: float,
-        option_type: OptionType,
-        rate: float = RISK_FREE_RATE
-    ) -> float:
-        """
-        Estimate IV using simple heuristic
-        (Full Newton-Raphson iteration would be better but overkill for scalping)
-        
-        Simple approach: Try different IVs and find closest match
-        """
-        if time_to_expiry <= 0:
-            return DEFAULT_IV
-        
-        # Newton-Raphson iteration for IV
-        iv = DEFAULT_IV
-        for _ in range(10):  # Max 10 iterations
-            try:
-                if option_type == OptionType.CALL:
-                    greeks = GreeksCalculator.calculate_call_greeks(
-                        spot, strike, time_to_expiry, iv, rate
-                    )
-                else:
-                    greeks = GreeksCalculator.calculate_put_greeks(
-                        spot, strike, time_to_expiry, iv, rate
-                    )
-                
-                # Approximate option price (simplified)
-                # This is a heuristic, not exact BS pricing
-                vega = greeks["vega"]
-                if vega == 0:
-                    break
-                
-                # Adjust IV towards actual price
-                # (Full implementation would use actual BS price calculation)
-                price_diff = option_ltp * 0.01  # Assume ~1% accuracy from heuristic
-                iv_adjustment = price_diff / max(vega, 0.01)
-                iv = max(MIN_IV, min(MAX_IV, iv + iv_adjustment))
-                
-            except Exception as e:
-                logger.warning(f"IV estimation error: {e}, using default")
-                return DEFAULT_IV
-        
-        return max(MIN_IV, min(MAX_IV, iv))
+# Vectorized safeguarded-Newton solver shared with src.engines.greeks (see IvEstimator there)
+IvEstimator = _IvEstimator
 
 
 # ============================================================================
@@ -364,6 +317,9 @@ class GreeksCalculationEngine:
         self.calculation_count = 0
         self.fallback_count = 0
         self.error_count = 0
+
+        # Whole-chain path (IV warm starts, convergence stats, Greeks cache)
+        self.batch_engine = _BatchGreeksEngine(risk_free_rate)
         
         logger.info(f"Greeks Engine initialized (Risk-free rate: {risk_free_rate*100:.2f}%)")
     
@@ -480,13 +436,44 @@ class GreeksCalculationEngine:
             
             return snapshot, f"error_fallback: {str(e)}"
     
+    def calculate_greeks_batch(
+        self,
+        strikes: List[float],
+        option_types: List[OptionType],
+        spot: float,
+        days_to_expiry: float,
+        ltps: List[float],
+        broker_greeks: Optional[Dict[Tuple[float, OptionType], Dict[str, float]]] = None,
+        broker_ivs: Optional[Dict[Tuple[float, OptionType], float]] = None,
+        underlying: Optional[str] = None,
+        expiry: Optional[str] = None,
+    ) -> List[Tuple[GreeksSnapshot, str]]:
+        """
+        Calculate Greeks for a whole chain
+
+        Delegates to the shared batch pricer
+        (src.engines.greeks.greeks_calculator.GreeksCalculationEngine):
+        same priority as calculate_greeks per row, one vectorized IV solve
+        and one BS pass. Broker maps are keyed by (strike, option_type).
+
+        Returns:
+            [(GreeksSnapshot, status_message)] in input order
+        """
+        return self.batch_engine.calculate_greeks_batch(
+            strikes, option_types, spot, days_to_expiry, ltps, broker_greeks, broker_ivs, underlying, expiry
+        )
+
     def get_metrics(self) -> Dict:
-        """Return calculation metrics"""
+        """Return calculation metrics (scalar and batch paths combined)"""
+        batch = self.batch_engine.get_metrics()
+        calculated = self.calculation_count + batch["total_calculated"]
+        errors = self.error_count + batch["errors"]
         return {
-            "total_calculated": self.calculation_count,
-            "fallback_to_bs": self.fallback_count,
-            "errors": self.error_count,
-            "success_rate": (
-                (self.calculation_count - self.error_count) / max(self.calculation_count, 1) * 100
-            )
+            "total_calculated": calculated,
+            "fallback_to_bs": self.fallback_count + batch["fallback_to_bs"],
+            "errors": errors,
+            "success_rate": (calculated - errors) / max(calculated, 1) * 100,
+            "iv_solves": batch["iv_solves"],
+            "avg_iv_iterations": batch["avg_iv_iterations"],
+            "iv_unconverged": batch["iv_unconverged"],
         }
@@ -81,6 +81,22 @@ ANGELONE_API_TIMEOUT = get_env_int("ANGELONE_API_TIMEOUT", 30)
 ANGELONE_MAX_RETRIES = get_env_int("ANGELONE_MAX_RETRIES", 3)
 ANGELONE_RETRY_DELAY = get_env_int("ANGELONE_RETRY_DELAY", 2)
 
+# REST polling fallback: batched getQuote (max 50 tokens/request) within a per-minute request budget
+ANGELONE_POLL_BATCHED = get_env_bool("ANGELONE_POLL_BATCHED", True)
+ANGELONE_POLL_INTERVAL = get_env_float("ANGELONE_POLL_INTERVAL", 2.0)
+ANGELONE_POLL_QUOTE_MODE = os.getenv("ANGELONE_POLL_QUOTE_MODE", "FULL")
+ANGELONE_QUOTE_BATCH_SIZE = get_env_int("ANGELONE_QUOTE_BATCH_SIZE", 50)
+ANGELONE_QUOTE_RATE_LIMIT = get_env_int("ANGELONE_QUOTE_RATE_LIMIT", 500)
+
+# Shared keep-alive HTTP pool for all AngelOne REST calls
+HTTP_POOL_CONNECTIONS = get_env_int("HTTP_POOL_CONNECTIONS", 4)  # host pools kept alive
+HTTP_POOL_MAXSIZE = get_env_int("HTTP_POOL_MAXSIZE", 10)  # connections per host
+HTTP_TIMEOUT = get_env_float("HTTP_TIMEOUT", 10.0)
+
+# Instrument master CSV and its memory-mapped index (rebuilt once per day)
+INSTRUMENT_MASTER_PATH = os.getenv("INSTRUMENT_MASTER_PATH", "data/instruments.csv")
+INSTRUMENT_INDEX_DIR = os.getenv("INSTRUMENT_INDEX_DIR", "data/instrument_index")
+
 # ============================================================================
 # TRADING MODE
 # ============================================================================
@@ -98,6 +114,11 @@ if ENVIRONMENT == "development" and not PAPER_TRADING:
 TRADING_ENABLED = get_env_bool("TRADING_ENABLED", False)
 LIVE_TRADING_CONFIRMATION = get_env_bool("LIVE_TRADING_CONFIRMATION", True)
 
+# Multi-leg order gateway (concurrent leg submission)
+ORDER_GATEWAY_ENABLED = get_env_bool("ORDER_GATEWAY_ENABLED", True)
+ORDER_GATEWAY_WORKERS = get_env_int("ORDER_GATEWAY_WORKERS", 4)
+ORDER_PARTIAL_FAILURE_POLICY = os.getenv("ORDER_PARTIAL_FAILURE_POLICY", "flatten")  # flatten | cancel | none
+
 # ============================================================================
 # SECURITY SETTINGS
 # ============================================================================
@@ -149,6 +170,20 @@ GREEKS_CALCULATION_INTERVAL = get_env_int("GREEKS_CALCULATION_INTERVAL", 10)
 OI_REFRESH_INTERVAL = get_env_int("OI_REFRESH_INTERVAL", 30)
 DATA_FRESHNESS_TOLERANCE = get_env_int("DATA_FRESHNESS_TOLERANCE", 5)
 
+# Strategy loop wakes on ticks instead of polling every second
+TICK_DRIVEN_LOOP = get_env_bool("TICK_DRIVEN_LOOP", True)
+TICK_LOOP_MAX_IDLE = get_env_float("TICK_LOOP_MAX_IDLE", 5.0)
+
+# Binary tick recording (ticks/ticks_YYYYMMDD_HHMMSS.tkb)
+TICK_RECORDING_ENABLED = get_env_bool("TICK_RECORDING_ENABLED", True)
+TICK_RECORDING_DIR = os.getenv("TICK_RECORDING_DIR", "ticks")
+TICK_RECORDING_BLOCK_SIZE = get_env_int("TICK_RECORDING_BLOCK_SIZE", 4096)
+
+# Tick consumers: conflate (latest tick per symbol wins) | fifo (bounded queue) | inline
+TICK_CONSUMER_MODE = os.getenv("TICK_CONSUMER_MODE", "conflate").lower()
+TICK_CONSUMER_MAX_PENDING = get_env_int("TICK_CONSUMER_MAX_PENDING", 1000)
+TICK_HISTORY_SIZE = get_env_int("TICK_HISTORY_SIZE", 1000)
+
 # ============================================================================
 # STRATEGY PARAMETERS
 # ============================================================================
@@ -284,6 +319,42 @@ ADAPTIVE_MIN_TRADES = get_env_int("ADAPTIVE_MIN_TRADES", 10)
 USE_REAL_GREEKS_DATA = get_env_bool("USE_REAL_GREEKS_DATA", True)
 GREEKS_BACKGROUND_REFRESH = get_env_bool("GREEKS_BACKGROUND_REFRESH", True)
 GREEKS_REFRESH_INTERVAL = get_env_int("GREEKS_REFRESH_INTERVAL", 5)
+GREEKS_REFRESH_WORKERS = get_env_int("GREEKS_REFRESH_WORKERS", 4)
+GREEKS_API_RATE_LIMIT = get_env_int("GREEKS_API_RATE_LIMIT", 10)  # Greeks API calls per second
+
+# "hybrid": local Greeks from streamed LTP/spot, broker Greeks only to recalibrate; "broker": API only
+GREEKS_SOURCE = os.getenv("GREEKS_SOURCE", "hybrid")
+GREEKS_BROKER_RECALIBRATE_INTERVAL = get_env_int("GREEKS_BROKER_RECALIBRATE_INTERVAL", 60)
+GREEKS_LOCAL_MAX_TICK_AGE = get_env_int("GREEKS_LOCAL_MAX_TICK_AGE", 5)
+GREEKS_DRIFT_DELTA_THRESHOLD = get_env_float("GREEKS_DRIFT_DELTA_THRESHOLD", 0.05)
+GREEKS_DRIFT_IV_THRESHOLD = get_env_float("GREEKS_DRIFT_IV_THRESHOLD", 2.0)  # vol points
+SMILE_MAX_QUOTE_AGE = get_env_int("SMILE_MAX_QUOTE_AGE", 300)  # seconds before a smile point is dropped
+
+# GreeksEngine recomputes a strike only when an input moves past its epsilon
+GREEKS_INCREMENTAL_ENABLED = get_env_bool("GREEKS_INCREMENTAL_ENABLED", True)
+GREEKS_INCREMENTAL_MONEYNESS_EPSILON = get_env_float("GREEKS_INCREMENTAL_MONEYNESS_EPSILON", 0.0001)
+GREEKS_INCREMENTAL_TTE_EPSILON = get_env_float("GREEKS_INCREMENTAL_TTE_EPSILON", 0.001)  # days
+GREEKS_INCREMENTAL_LTP_EPSILON = get_env_float("GREEKS_INCREMENTAL_LTP_EPSILON", 0.05)
+GREEKS_INCREMENTAL_IV_EPSILON = get_env_float("GREEKS_INCREMENTAL_IV_EPSILON", 0.0005)
+
+# Black-Scholes memo: inputs rounded to these ticks, cleared on large spot / IV moves
+GREEKS_CACHE_ENABLED = get_env_bool("GREEKS_CACHE_ENABLED", True)
+GREEKS_CACHE_SIZE = get_env_int("GREEKS_CACHE_SIZE", 4096)
+GREEKS_CACHE_SPOT_TICK = get_env_float("GREEKS_CACHE_SPOT_TICK", 0.5)
+GREEKS_CACHE_STRIKE_TICK = get_env_float("GREEKS_CACHE_STRIKE_TICK", 0.05)
+GREEKS_CACHE_TTE_MINUTES = get_env_float("GREEKS_CACHE_TTE_MINUTES", 1.0)
+GREEKS_CACHE_IV_TICK = get_env_float("GREEKS_CACHE_IV_TICK", 0.0005)
+GREEKS_CACHE_SPOT_MOVE_PCT = get_env_float("GREEKS_CACHE_SPOT_MOVE_PCT", 1.0)
+GREEKS_CACHE_IV_MOVE = get_env_float("GREEKS_CACHE_IV_MOVE", 0.03)
+
+# Multi-leg scenario grid: spot ± %, IV ± vol points, time slices to expiry; shocks as "spot%:ivpts"
+SCENARIO_SPOT_RANGE_PCT = get_env_float("SCENARIO_SPOT_RANGE_PCT", 5.0)
+SCENARIO_SPOT_STEPS = get_env_int("SCENARIO_SPOT_STEPS", 100)
+SCENARIO_IV_SHIFT_RANGE = get_env_float("SCENARIO_IV_SHIFT_RANGE", 10.0)
+SCENARIO_IV_STEPS = get_env_int("SCENARIO_IV_STEPS", 20)
+SCENARIO_TIME_STEPS = get_env_int("SCENARIO_TIME_STEPS", 5)
+SCENARIO_SHOCKS = get_env_list("SCENARIO_SHOCKS", ["-5:10", "-3:5", "3:-3", "5:5"])
+SCENARIO_MAX_SHOCK_LOSS = get_env_float("SCENARIO_MAX_SHOCK_LOSS", 0.0)  # 0 = use MAX_DAILY_LOSS
 
 SMART_EXIT_ENABLED = get_env_bool("SMART_EXIT_ENABLED", True)
 TRAILING_STOP_ENABLED = get_env_bool("TRAILING_STOP_ENABLED", True)
@@ -495,9 +566,14 @@ __all__ = [
     # Broker
     "ANGELONE_API_KEY", "ANGELONE_CLIENT_CODE", "ANGELONE_PASSWORD", "ANGELONE_TOTP_SECRET",
     "ANGELONE_API_TIMEOUT", "ANGELONE_MAX_RETRIES", "ANGELONE_RETRY_DELAY",
+    "ANGELONE_POLL_BATCHED", "ANGELONE_POLL_INTERVAL", "ANGELONE_POLL_QUOTE_MODE",
+    "ANGELONE_QUOTE_BATCH_SIZE", "ANGELONE_QUOTE_RATE_LIMIT",
+    "HTTP_POOL_CONNECTIONS", "HTTP_POOL_MAXSIZE", "HTTP_TIMEOUT",
+    "INSTRUMENT_MASTER_PATH", "INSTRUMENT_INDEX_DIR",
     
     # Trading
     "PAPER_TRADING", "PAPER_INITIAL_CAPITAL", "PAPER_SLIPPAGE_PCT",
+    "ORDER_GATEWAY_ENABLED", "ORDER_GATEWAY_WORKERS", "ORDER_PARTIAL_FAILURE_POLICY",
     
     # Risk
     "RISK_PER_TRADE", "MAX_DAILY_LOSS", "MAX_DAILY_PROFIT", "MAX_DAILY_TRADES",
@@ -510,6 +586,9 @@ __all__ = [
     "WEBSOCKET_RECONNECT_DELAY", "WEBSOCKET_PING_INTERVAL", "WEBSOCKET_TICK_TIMEOUT",
     "WEBSOCKET_NO_DATA_FALLBACK", "MARKET_DATA_REFRESH", "GREEKS_CALCULATION_INTERVAL",
     "OI_REFRESH_INTERVAL", "DATA_FRESHNESS_TOLERANCE",
+    "TICK_DRIVEN_LOOP", "TICK_LOOP_MAX_IDLE",
+    "TICK_RECORDING_ENABLED", "TICK_RECORDING_DIR", "TICK_RECORDING_BLOCK_SIZE",
+    "TICK_CONSUMER_MODE", "TICK_CONSUMER_MAX_PENDING", "TICK_HISTORY_SIZE",
     
     # Strategy
     "PRIMARY_UNDERLYING", "ALLOWED_UNDERLYING", "UNDERLYING_EXCHANGE",
@@ -549,6 +628,15 @@ __all__ = [
     "ML_ENABLED", "ML_MODEL_PATH", "ML_RETRAIN_INTERVAL",
     "ADAPTIVE_LEARNING_ENABLED", "ADAPTIVE_MIN_TRADES",
     "USE_REAL_GREEKS_DATA", "GREEKS_BACKGROUND_REFRESH", "GREEKS_REFRESH_INTERVAL",
+    "GREEKS_REFRESH_WORKERS", "GREEKS_API_RATE_LIMIT",
+    "GREEKS_SOURCE", "GREEKS_BROKER_RECALIBRATE_INTERVAL", "GREEKS_LOCAL_MAX_TICK_AGE",
+    "GREEKS_DRIFT_DELTA_THRESHOLD", "GREEKS_DRIFT_IV_THRESHOLD", "SMILE_MAX_QUOTE_AGE",
+    "GREEKS_INCREMENTAL_ENABLED", "GREEKS_INCREMENTAL_MONEYNESS_EPSILON", "GREEKS_INCREMENTAL_TTE_EPSILON",
+    "GREEKS_INCREMENTAL_LTP_EPSILON", "GREEKS_INCREMENTAL_IV_EPSILON",
+    "GREEKS_CACHE_ENABLED", "GREEKS_CACHE_SIZE", "GREEKS_CACHE_SPOT_TICK", "GREEKS_CACHE_STRIKE_TICK",
+    "GREEKS_CACHE_TTE_MINUTES", "GREEKS_CACHE_IV_TICK", "GREEKS_CACHE_SPOT_MOVE_PCT", "GREEKS_CACHE_IV_MOVE",
+    "SCENARIO_SPOT_RANGE_PCT", "SCENARIO_SPOT_STEPS", "SCENARIO_IV_SHIFT_RANGE", "SCENARIO_IV_STEPS",
+    "SCENARIO_TIME_STEPS", "SCENARIO_SHOCKS", "SCENARIO_MAX_SHOCK_LOSS",
     "SMART_EXIT_ENABLED", "TRAILING_STOP_ENABLED", "PROFIT_LADDER_ENABLED",
     
     # Performance
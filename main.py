@@ -36,6 +36,7 @@ from src.core.position_sizing import PositionSizing
 from src.core.order_manager import OrderManager, OrderAction, OrderType, ProductType
 from src.core.trade_manager import TradeManager
 from src.core.expiry_manager import ExpiryManager
+from src.core.performance_monitor import LatencyMetrics
 from src.utils.options_helper import OptionsHelper
 from src.integration_hub import get_integration_hub
 
@@ -84,8 +85,9 @@ class AngelXStrategy:
         self.strike_selection = StrikeSelectionEngine()
         self.entry_engine = EntryEngine(self.bias_engine, self.trap_detection)
         self.position_sizing = PositionSizing()
-        self.order_manager = OrderManager()
-        self.trade_manager = TradeManager()
+        self.latency_metrics = LatencyMetrics()
+        self.order_manager = OrderManager(latency_metrics=self.latency_metrics)
+        self.trade_manager = TradeManager(latency_metrics=self.latency_metrics)
         self.trade_journal = TradeJournal()
         self.options_helper = OptionsHelper()
         self.multi_strike_engine = MultiStrikePortfolioEngine(self.options_helper)
@@ -93,6 +95,7 @@ class AngelXStrategy:
         
         # Greeks data manager for real-time Greeks and OI
         self.greeks_manager = GreeksDataManager()
+        self.greeks_manager.attach_price_feed(self.data_feed)  # local Greeks in hybrid mode
         logger.info("Greeks data manager initialized")
         
         # Adaptive Controller (Phase 10) - Self-correcting, Market-aware brain
@@ -109,6 +112,13 @@ class AngelXStrategy:
         self.state_lock = Lock()
         self.last_tick_time = None
         
+        # Event-driven loop: wake on ticks of the underlying / tracked options
+        self.tick_driven = getattr(config, 'TICK_DRIVEN_LOOP', True)
+        self.tick_loop_max_idle = getattr(config, 'TICK_LOOP_MAX_IDLE', 5.0)
+        self.tracked_option_symbols = set()
+        self._seen_tick_versions = {}
+        self._trigger_tick_time = None
+        
         # Daily limits
         self.daily_start_time = datetime.now()
         self.daily_pnl = 0.0
@@ -244,6 +254,9 @@ class AngelXStrategy:
         # Expiry refresh tracking (time-based, following OpenAlgo best practices)
         last_expiry_refresh = 0
         EXPIRY_REFRESH_INTERVAL = 300  # 5 minutes
+        market_changed = True
+        
+        logger.info(f"Loop mode: {'tick-driven' if self.tick_driven else 'polling'}")
         
         try:
             while self.running:
@@ -267,6 +280,19 @@ class AngelXStrategy:
                         logger.info(f"✅ Expiry refreshed: {expiry_stats}")
                         last_expiry_refresh = current_time
                     
+                    # Tick-driven mode: re-evaluate only when a watched symbol ticked,
+                    # otherwise wake just in time for the next housekeeping timer
+                    if self.tick_driven and not market_changed:
+                        next_refresh = EXPIRY_REFRESH_INTERVAL - (current_time - last_expiry_refresh)
+                        market_changed = self._wait_for_market_update(
+                            max(0.0, min(self.tick_loop_max_idle, next_refresh))
+                        )
+                        if not market_changed:
+                            # No ticks within TICK_LOOP_MAX_IDLE: time-based exits still apply
+                            self._run_time_exits()
+                        continue
+                    market_changed = False
+                    
                     # Get expiry rules (lightweight, can be called every iteration)
                     expiry_rules = self.expiry_manager.apply_expiry_rules()
                     
@@ -276,7 +302,7 @@ class AngelXStrategy:
                     # 🔴 CHECK DATA FRESHNESS
                     if not ltp_data:
                         logger.warning("❌ NO DATA from broker - waiting for connection")
-                        time.sleep(2)
+                        self._idle(2)
                         continue
                     
                     ltp = ltp_data.get('price', 0)
@@ -288,12 +314,13 @@ class AngelXStrategy:
                         if age_sec > 5:  # config.DATA_FRESHNESS_TOLERANCE
                             logger.error(f"❌ STALE DATA: Last tick {age_sec:.1f}s old - HALTING trades")
                             logger.error(f"   WebSocket may be disconnected. Waiting for fresh data...")
-                            time.sleep(3)
+                            self._run_time_exits()
+                            self._idle(3)
                             continue
                     
                     if not ltp or ltp <= 0:
                         logger.warning("Invalid LTP received, waiting...")
-                        time.sleep(1)
+                        self._idle(1)
                         continue
                     
                     # Update market state
@@ -311,7 +338,7 @@ class AngelXStrategy:
                         
                         if not current_exp:
                             logger.warning("No current expiry - cannot fetch Greeks")
-                            time.sleep(1)
+                            self._idle(1)
                             continue
                         
                         # Build option symbol
@@ -320,6 +347,7 @@ class AngelXStrategy:
                             atm_strike,
                             current_option_type
                         )
+                        self.tracked_option_symbols = {option_symbol}
                         
                         # Get real Greeks from API
                         greeks_data = self.greeks_manager.get_greeks(
@@ -336,7 +364,7 @@ class AngelXStrategy:
                         # Validate we have real data before proceeding
                         if not greeks_data:
                             logger.warning(f"❌ Failed to get real Greeks for {option_symbol} - SKIPPING entry")
-                            time.sleep(2)
+                            self._idle(2)
                             continue
                         
                         # Extract real values
@@ -395,6 +423,7 @@ class AngelXStrategy:
                             selected_strike=atm_strike,            # ✅ REAL ATM
                             current_spread_percent=current_spread_percent  # ✅ REAL
                         )
+                        self._record_decision_latency()
                         
                         if entry_context and entry_context.signal != EntrySignal.NO_SIGNAL:
                             # Validate entry quality
@@ -499,6 +528,9 @@ class AngelXStrategy:
                                     
                                     current_exp_for_entry = self.expiry_manager.get_current_expiry()
                                     expiry_date_str = current_exp_for_entry.expiry_date if current_exp_for_entry else None
+                                    entry_symbol = self.expiry_manager.build_order_symbol(
+                                        entry_context.strike, entry_context.option_type
+                                    ) if current_exp_for_entry else None
                                     
                                     # Enter trade
                                     trade = self.trade_manager.enter_trade(
@@ -514,7 +546,8 @@ class AngelXStrategy:
                                         entry_iv=entry_context.entry_iv,
                                         sl_price=position.hard_sl_price,
                                         target_price=position.target_price,
-                                        entry_reason_tags=entry_tags
+                                        entry_reason_tags=entry_tags,
+                                        symbol=entry_symbol
                                     )
 
                                     # Multi-strike planning (ATM + hedges) if enabled
@@ -597,18 +630,20 @@ class AngelXStrategy:
                                     logger.info(f"   Symbol: {order_symbol}, Qty: {int(position.quantity)}, Price: ₹{entry_context.entry_price:.2f}")
                     else:
                         # Update active trades with REAL Greeks data
+                        trade_symbols = set()
                         for trade in active_trades:
                             # Build option symbol from trade
                             current_exp = self.expiry_manager.get_current_expiry()
                             if not current_exp:
                                 logger.warning("No current expiry for Greeks fetch")
-                                time.sleep(1)
+                                self._idle(1)
                                 continue
                             
                             option_symbol = self.expiry_manager.build_order_symbol(
                                 trade.strike, 
                                 trade.option_type
                             )
+                            trade_symbols.add(option_symbol)
                             
                             # Get real-time Greeks if enabled
                             if getattr(config, 'USE_REAL_GREEKS_DATA', True):
@@ -672,6 +707,7 @@ class AngelXStrategy:
                                 prev_price=prev_price,
                                 expiry_rules=expiry_rules
                             )
+                            self._record_decision_latency()
                             
                             if exit_reason:
                                 # Exit order execution (paper/live aware)
@@ -721,38 +757,12 @@ class AngelXStrategy:
                                     logger.info(f"Stopped tracking Greeks for {option_symbol}")
                                 
                                 # Log to journal with real timestamps and greeks snapshot
-                                self.trade_journal.log_trade(
-                                    underlying=trade.underlying,
-                                    strike=trade.strike,
-                                    option_type=trade.option_type,
-                                    expiry_date=trade.expiry_date or "unknown",
-                                    entry_price=trade.entry_price,
-                                    exit_price=trade.exit_price,
-                                    qty=trade.quantity,
-                                    entry_delta=trade.entry_delta,
-                                    entry_gamma=trade.entry_gamma,
-                                    entry_theta=trade.entry_theta,
-                                    entry_vega=0,
-                                    entry_iv=trade.entry_iv,
-                                    exit_delta=trade.exit_delta,
-                                    exit_gamma=trade.exit_gamma,
-                                    exit_theta=trade.exit_theta,
-                                    exit_vega=0,
-                                    exit_iv=trade.exit_iv,
-                                    entry_spread=0.5,
-                                    exit_spread=0.5,
-                                    entry_reason_tags=trade.entry_reason_tags,
-                                    exit_reason_tags=trade.exit_reason_tags or [exit_reason],
-                                    original_sl_price=trade.sl_price,
-                                    original_sl_percent=7.0,
-                                    original_target_price=trade.target_price,
-                                    original_target_percent=7.0,
-                                    entry_time=trade.entry_time,
-                                    exit_time=trade.exit_time
-                                )
+                                self._journal_trade(trade, exit_reason)
                                 
                                 self.daily_pnl += trade.pnl
                                 self.daily_trades += 1
+                        
+                        self.tracked_option_symbols = trade_symbols
                     
                     # Sync dashboard/analytics once per loop
                     if getattr(config, 'DASHBOARD_ENABLED', True):
@@ -761,7 +771,7 @@ class AngelXStrategy:
                         except Exception as dash_exc:
                             logger.error(f"Dashboard sync failed: {dash_exc}")
 
-                    time.sleep(1)
+                    self._idle(1)
                 
                 except Exception as e:
                     logger.error(f"Error in main loop: {e}")
@@ -772,6 +782,91 @@ class AngelXStrategy:
         finally:
             self.stop()
     
+    def _idle(self, seconds: float):
+        """Pause between polling iterations (tick-driven mode waits at the loop gate instead)"""
+        if not self.tick_driven:
+            time.sleep(seconds)
+    
+    def _wait_for_market_update(self, timeout: float) -> bool:
+        """Block until the underlying or a tracked option symbol ticks
+        
+        Returns:
+            True if a watched symbol changed, False if the timeout expired
+        """
+        watched = [config.PRIMARY_UNDERLYING, *self.tracked_option_symbols]
+        changed = self.data_feed.wait_for_ticks(watched, self._seen_tick_versions, timeout=timeout)
+        if not changed:
+            return False
+        received = [self.data_feed.get_tick_received_at(s) for s in changed]
+        self._trigger_tick_time = min(t for t in received if t) if any(received) else None
+        return True
+    
+    def _journal_trade(self, trade, exit_reason):
+        """Log a closed trade to the journal with its entry / exit Greeks snapshot"""
+        self.trade_journal.log_trade(
+            underlying=trade.underlying,
+            strike=trade.strike,
+            option_type=trade.option_type,
+            expiry_date=trade.expiry_date or "unknown",
+            entry_price=trade.entry_price,
+            exit_price=trade.exit_price,
+            qty=trade.quantity,
+            entry_delta=trade.entry_delta,
+            entry_gamma=trade.entry_gamma,
+            entry_theta=trade.entry_theta,
+            entry_vega=0,
+            entry_iv=trade.entry_iv,
+            exit_delta=trade.exit_delta,
+            exit_gamma=trade.exit_gamma,
+            exit_theta=trade.exit_theta,
+            exit_vega=0,
+            exit_iv=trade.exit_iv,
+            entry_spread=0.5,
+            exit_spread=0.5,
+            entry_reason_tags=trade.entry_reason_tags,
+            exit_reason_tags=trade.exit_reason_tags or [exit_reason],
+            original_sl_price=trade.sl_price,
+            original_sl_percent=7.0,
+            original_target_price=trade.target_price,
+            original_target_percent=7.0,
+            entry_time=trade.entry_time,
+            exit_time=trade.exit_time
+        )
+    
+    def _run_time_exits(self):
+        """Apply time-based exits without fresh ticks (stale feed / idle tick-driven wait)
+        
+        Uses the last known price; Greeks-based triggers wait for the next full evaluation.
+        """
+        active_trades = self.trade_manager.get_active_trades()
+        if not active_trades:
+            return
+        expiry_rules = self.expiry_manager.apply_expiry_rules()
+        for trade in list(active_trades):
+            exit_reason = self.trade_manager.check_time_exit(trade, expiry_rules)
+            if not exit_reason:
+                continue
+            logger.warning(f"⏱ Time-based exit without fresh data: {exit_reason}")
+            option_symbol = self.expiry_manager.build_order_symbol(trade.strike, trade.option_type)
+            try:
+                exit_order = self.trade_manager.execute_exit_order(trade, option_symbol, trade.current_price)
+                if exit_order and isinstance(exit_order, dict) and exit_order.get('status') not in (None, 'success'):
+                    logger.warning(f"⚠️ Exit order response indicates failure: {exit_order}")
+            except Exception as exit_exc:
+                logger.error(f"Exit order execution failed: {exit_exc}")
+            self.trade_manager.exit_trade(trade, exit_reason)
+            if getattr(config, 'USE_REAL_GREEKS_DATA', True):
+                self.greeks_manager.untrack_symbol(option_symbol)
+            self._journal_trade(trade, exit_reason)
+            self.daily_pnl += trade.pnl
+            self.daily_trades += 1
+    
+    def _record_decision_latency(self):
+        """Record time from the tick that triggered this evaluation to the decision"""
+        tick_time = self._trigger_tick_time or self.data_feed.get_tick_received_at(config.PRIMARY_UNDERLYING)
+        if tick_time:
+            self.latency_metrics.add_tick_to_decision((time.time() - tick_time) * 1000)
+    
     def _check_daily_limits(self) -> bool:
         """Check if daily limits are exceeded"""
         # Check max daily loss
@@ -812,6 +907,8 @@ class AngelXStrategy:
         # Disconnect and cleanup
         self.bias_engine.stop()
         self.data_feed.disconnect()
+        self.data_feed.stop_recording()
+        self.data_feed.stop_consumers()
         
         # Stop Greeks manager and print stats
         if hasattr(self, 'greeks_manager'):
@@ -823,6 +920,19 @@ class AngelXStrategy:
             logger.info(f"  Active Symbols: {stats['active_symbols']}")
             logger.info(f"  Cached Symbols: {stats['cached_symbols']}")
         
+        # Tick-to-decision latency
+        if hasattr(self, 'latency_metrics'):
+            latency_stats = self.latency_metrics.get_stats()
+            t2d = latency_stats['tick_to_decision']
+            logger.info(
+                f"Tick→Decision Latency: avg {t2d['avg']:.1f}ms, p95 {t2d['p95']:.1f}ms, max {t2d['max']:.1f}ms"
+            )
+            if self.latency_metrics.leg_skew_times:
+                skew = latency_stats['leg_skew']
+                logger.info(
+                    f"Multi-leg Ack Skew: avg {skew['avg']:.1f}ms, p95 {skew['p95']:.1f}ms, max {skew['max']:.1f}ms"
+                )
+        
         # Stop network monitoring
         if hasattr(self, 'network_monitor'):
             logger.info("Network Health Summary:")
@@ -10,6 +10,8 @@ import numpy as np
 import logging
 from datetime import datetime
 
+from src.integrations.data_feeds.tick_recorder import FILE_SUFFIX, tick_file_to_dataframe
+
 logger = logging.getLogger(__name__)
 
 
@@ -61,6 +63,26 @@ class TickDataLoader:
         logger.info(f"Loaded ticks: {filename} | Rows: {len(df)} | Date: {df.index[0] if len(df) > 0 else 'N/A'}")
         return df
 
+    def load_ticks_binary(self, filename: str, symbol: Optional[str] = None) -> pd.DataFrame:
+        """Load tick data recorded by TickRecorder (ticks_YYYYMMDD_HHMMSS.tkb format)"""
+        filepath = self.data_dir / filename
+
+        if not filepath.exists():
+            logger.error(f"File not found: {filepath}")
+            return pd.DataFrame()
+
+        try:
+            df = tick_file_to_dataframe(filepath)
+        except Exception as e:
+            logger.error(f"Error loading binary ticks: {e}")
+            return pd.DataFrame()
+
+        if symbol is not None:
+            df = df[df["symbol"] == symbol]
+
+        logger.info(f"Loaded ticks: {filename} | Rows: {len(df)} | Date: {df.index[0] if len(df) > 0 else 'N/A'}")
+        return df
+
     def convert_ticks_to_ohlcv(self, df: pd.DataFrame, period: str = "1min") -> pd.DataFrame:
         """Convert tick data to OHLCV candles"""
         if df.empty:
@@ -86,14 +108,15 @@ class TickDataLoader:
             return pd.DataFrame()
 
     def find_latest_tick_file(self) -> Optional[str]:
-        """Find latest ticks_YYYYMMDD.csv file"""
+        """Find latest tick file (binary ticks_YYYYMMDD_HHMMSS.tkb preferred over legacy CSV)"""
         ticks_dir = Path("ticks")
         if not ticks_dir.exists():
             return None
 
-        tick_files = sorted(ticks_dir.glob("ticks_*.csv"), reverse=True)
-        if tick_files:
-            return tick_files[0].name
+        for pattern in (f"ticks_*{FILE_SUFFIX}", "ticks_*.csv"):
+            tick_files = sorted(ticks_dir.glob(pattern), reverse=True)
+            if tick_files:
+                return tick_files[0].name
         return None
 
     def load_latest_ticks(self) -> pd.DataFrame:
@@ -103,16 +126,19 @@ class TickDataLoader:
             logger.warning("No tick files found in ticks/")
             return pd.DataFrame()
 
-        df = self.load_ticks_csv(f"../ticks/{latest}")
-        return df
+        if latest.endswith(FILE_SUFFIX):
+            return self.load_ticks_binary(f"../ticks/{latest}")
+        return self.load_ticks_csv(f"../ticks/{latest}")
 
     def find_all_tick_files(self) -> List[str]:
-        """Find all tick CSV files"""
+        """Find all tick files (binary and legacy CSV)"""
         ticks_dir = Path("ticks")
         if not ticks_dir.exists():
             return []
 
-        return sorted([f.name for f in ticks_dir.glob("ticks_*.csv")])
+        return sorted(
+            [f.name for f in ticks_dir.glob(f"ticks_*{FILE_SUFFIX}")] + [f.name for f in ticks_dir.glob("ticks_*.csv")]
+        )
 
     @staticmethod
     def create_synthetic_ticks(
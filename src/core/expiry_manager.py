@@ -15,6 +15,7 @@ except ImportError:
 from config import config
 from src.utils.logger import StrategyLogger
 from src.core.order_manager import OrderManager
+from src.integrations.angelone.instrument_index import get_instrument_index
 
 logger = StrategyLogger.get_logger(__name__)
 
@@ -92,8 +93,8 @@ class ExpiryManager:
         """
         if not self.client:
             logger.error("OpenAlgo client not initialized")
-            # Return default weekly expiries (Thursday and next Thursday)
-            return self._get_default_expiries()
+            # Listed expiries from instrument master, else default weekly expiries
+            return self._get_fallback_expiries(underlying)
 
         try:
             # Try to get option chain from OpenAlgo
@@ -105,11 +106,11 @@ class ExpiryManager:
             else:
                 logger.warning(f"OpenAlgo API does not support option chain fetching")
                 # Return default expiries
-                return self._get_default_expiries()
+                return self._get_fallback_expiries(underlying)
 
             if not response:
                 logger.warning(f"No option chain data for {underlying}, using defaults")
-                return self._get_default_expiries()
+                return self._get_fallback_expiries(underlying)
 
             # Extract unique expiry dates from response
             expiry_dates = set()
@@ -120,7 +121,7 @@ class ExpiryManager:
 
             if not expiry_dates:
                 logger.warning(f"No expiry dates found in option chain, using defaults")
-                return self._get_default_expiries()
+                return self._get_fallback_expiries(underlying)
 
             # Convert to ExpiryInfo objects
             today = datetime.now().date()
@@ -175,11 +176,59 @@ class ExpiryManager:
         except AttributeError as e:
             logger.warning(f"OpenAlgo API method not available: {e}")
             # Return default expiries when API method not available
-            return self._get_default_expiries()
+            return self._get_fallback_expiries(underlying)
         except Exception as e:
             logger.error(f"Error fetching expiries: {e}")
             # Return default expiries on error
-            return self._get_default_expiries()
+            return self._get_fallback_expiries(underlying)
+
+    def _get_fallback_expiries(self, underlying: str) -> List[ExpiryInfo]:
+        """Listed expiries from the instrument index, else computed defaults"""
+        expiries = self._get_index_expiries(underlying)
+        return expiries if expiries else self._get_default_expiries()
+
+    def _get_index_expiries(self, underlying: str) -> List[ExpiryInfo]:
+        """
+        Read listed option expiries from the shared instrument index
+
+        Returns:
+            ExpiryInfo list (nearest first), empty if no index is available
+        """
+        index = get_instrument_index()
+        if index is None:
+            return []
+
+        today = datetime.now().date()
+        expiry_list = []
+        for exp_date in index.expiries(underlying):
+            days_to_exp = (exp_date - today).days
+            if days_to_exp < 0:
+                continue
+            if days_to_exp <= 7:
+                exp_type = ExpiryType.WEEKLY
+            elif days_to_exp <= 30:
+                exp_type = ExpiryType.MONTHLY
+            else:
+                exp_type = ExpiryType.QUARTERLY
+            expiry_list.append(
+                ExpiryInfo(
+                    expiry_date=exp_date.strftime("%d%b%y").upper(),
+                    expiry_type=exp_type,
+                    days_to_expiry=days_to_exp,
+                )
+            )
+
+        if expiry_list:
+            self.available_expiries = expiry_list
+            logger.info(f"Loaded {len(expiry_list)} listed expiries for {underlying} from instrument index")
+        return expiry_list
+
+    def get_listed_strikes(self, underlying: str = None) -> List[float]:
+        """Strikes listed for the current expiry (instrument index)"""
+        index = get_instrument_index()
+        if index is None or not self.current_expiry:
+            return []
+        return index.strikes(underlying or self.selected_underlying, self.current_expiry.expiry_date).tolist()
 
     def _get_default_expiries(self) -> List[ExpiryInfo]:
         """
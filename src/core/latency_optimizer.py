@@ -30,9 +30,16 @@ class DifferentialProcessor:
     Dramatically reduces processing overhead
     """
 
-    def __init__(self):
+    def __init__(self, tolerances: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            tolerances: Optional {field: epsilon}; numeric fields listed here
+                only count as changed once they drift more than epsilon from
+                the value last reported as changed
+        """
         self.last_snapshot: Dict = {}
         self.last_update_time: float = 0
+        self.tolerances: Dict[str, float] = tolerances or {}
 
     def get_changes(self, new_snapshot: Dict) -> Dict:
         """
@@ -40,29 +47,46 @@ class DifferentialProcessor:
         Returns: {strike: changed_fields}
         """
         changes = {}
+        baseline = {}
 
         for strike, data in new_snapshot.items():
             if strike not in self.last_snapshot:
                 # New strike - all data is change
                 changes[strike] = data
+                baseline[strike] = data
             else:
                 # Check what changed
                 old_data = self.last_snapshot[strike]
                 changed_fields = {}
 
                 for key, value in data.items():
-                    if key not in old_data or old_data[key] != value:
+                    if key not in old_data or self._field_changed(key, old_data[key], value):
                         changed_fields[key] = value
 
                 if changed_fields:
                     changes[strike] = changed_fields
+                    baseline[strike] = data
+                else:
+                    # Keep the old reference so sub-epsilon drift accumulates
+                    baseline[strike] = old_data
 
         # Update last snapshot
-        self.last_snapshot = new_snapshot.copy()
+        self.last_snapshot = baseline
         self.last_update_time = time.time()
 
         return changes
 
+    def _field_changed(self, key, old_value, new_value) -> bool:
+        epsilon = self.tolerances.get(key)
+        if epsilon is None or old_value is None or new_value is None:
+            return old_value != new_value
+        return abs(new_value - old_value) > epsilon
+
+    def reset(self):
+        """Forget the baseline so the next snapshot is reported in full"""
+        self.last_snapshot = {}
+        self.last_update_time = 0
+
     def is_stale(self, max_age_seconds: int = 5) -> bool:
         """Check if cached data is too old"""
         if not self.last_update_time:
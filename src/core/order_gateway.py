@@ -0,0 +1,301 @@
+"""
+ANGEL-X Order Gateway
+Concurrent submission of multi-leg baskets (straddles, strangles, hedges)
+
+All legs of a basket are released together on a worker pool so the last
+leg is not delayed by the round trips (and retry sleeps) of the earlier
+ones. Acknowledgements are collected as a group, a single partial-failure
+policy is applied, and the spread between the first and last leg ack is
+recorded as the basket's leg skew.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from threading import Event
+from typing import Callable, Dict, List, Optional
+
+from config import config
+from src.utils.logger import StrategyLogger
+
+logger = StrategyLogger.get_logger(__name__)
+
+POLICY_FLATTEN = "flatten"  # offset acknowledged legs with opposite market orders
+POLICY_CANCEL = "cancel"  # cancel acknowledged legs (pending limit orders)
+POLICY_NONE = "none"  # keep acknowledged legs, report only
+PARTIAL_FAILURE_POLICIES = (POLICY_FLATTEN, POLICY_CANCEL, POLICY_NONE)
+
+
+def _opposite(action: str) -> str:
+    return "SELL" if str(action).upper() == "BUY" else "BUY"
+
+
+@dataclass
+class LegResult:
+    """Outcome of one basket leg"""
+
+    leg: dict
+    response: Optional[dict] = None
+    ack_time: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        resp = self.response
+        return bool(resp) and resp.get("status") == "success" and bool(resp.get("orderid"))
+
+    @property
+    def orderid(self) -> Optional[str]:
+        return self.response.get("orderid") if self.response else None
+
+
+@dataclass
+class BasketResult:
+    """Grouped acknowledgements for a basket"""
+
+    legs: List[LegResult] = field(default_factory=list)
+    skew_ms: float = 0.0
+    policy_applied: Optional[str] = None
+    unwound: List[LegResult] = field(default_factory=list)
+
+    @property
+    def all_ok(self) -> bool:
+        return bool(self.legs) and all(leg.ok for leg in self.legs)
+
+    def to_response(self) -> dict:
+        """Multi-order style response: status, first orderid and per-leg results"""
+        return {
+            "status": "success" if self.all_ok else "error",
+            "orderid": next((leg.orderid for leg in self.legs if leg.ok), None),
+            "results": [
+                {
+                    "status": "success" if leg.ok else "error",
+                    "orderid": leg.orderid,
+                    "leg": leg.leg,
+                    "message": leg.error or (leg.response or {}).get("message"),
+                }
+                for leg in self.legs
+            ],
+            "leg_skew_ms": self.skew_ms,
+            "partial_failure_policy": self.policy_applied,
+        }
+
+
+class OrderGateway:
+    """
+    Submits basket legs concurrently through an OrderManager
+
+    Usage:
+        gateway = OrderGateway(order_manager)
+        resp = gateway.place_option_legs(strategy, "NIFTY", legs, expiry_date)
+    """
+
+    def __init__(
+        self,
+        order_manager,
+        max_workers: Optional[int] = None,
+        partial_failure_policy: Optional[str] = None,
+        latency_metrics=None,
+    ):
+        """
+        Initialize order gateway
+
+        Args:
+            order_manager: OrderManager used for per-leg placement and cancels
+            max_workers: Worker threads (legs beyond this queue)
+            partial_failure_policy: flatten | cancel | none
+            latency_metrics: Optional LatencyMetrics receiving leg skew samples
+        """
+        self.order_manager = order_manager
+        self.max_workers = max_workers or getattr(config, "ORDER_GATEWAY_WORKERS", 4)
+        policy = partial_failure_policy or getattr(config, "ORDER_PARTIAL_FAILURE_POLICY", POLICY_FLATTEN)
+        self.policy = policy.lower()
+        if self.policy not in PARTIAL_FAILURE_POLICIES:
+            logger.warning(
+                f"Unknown partial failure policy '{self.policy}', using '{POLICY_FLATTEN}'"
+            )
+            self.policy = POLICY_FLATTEN
+        self.latency_metrics = latency_metrics
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="OrderGateway"
+        )
+
+        # Stats
+        self.baskets = 0
+        self.partial_failures = 0
+        self.last_skew_ms = 0.0
+
+    # ------------------------------------------------------------------
+    # Basket entry points
+    # ------------------------------------------------------------------
+
+    def place_option_legs(
+        self, strategy: str, underlying: str, legs: List[dict], expiry_date: Optional[str] = None
+    ) -> dict:
+        """Place offset-based option legs (optionsorder per leg) concurrently"""
+
+        def submit(leg: dict) -> Optional[dict]:
+            return self.order_manager.place_option_order(
+                strategy=strategy,
+                underlying=underlying,
+                expiry_date=leg.get("expiry_date", expiry_date),
+                offset=leg["offset"],
+                option_type=leg["option_type"],
+                action=leg["action"],
+                quantity=leg["quantity"],
+                pricetype=leg.get("pricetype"),
+                product=leg.get("product"),
+                splitsize=leg.get("splitsize", 0),
+            )
+
+        return self.execute(legs, submit).to_response()
+
+    def place_orders(self, orders: List[dict]) -> dict:
+        """Place a basket of symbol orders (place_order per order) concurrently"""
+        return self.execute(orders, self._place_symbol_order).to_response()
+
+    def _place_symbol_order(self, order: dict) -> Optional[dict]:
+        from src.core.order_manager import OrderAction, OrderType, ProductType
+
+        return self.order_manager.place_order(
+            exchange=order.get("exchange", "NSE"),
+            symbol=order["symbol"],
+            action=OrderAction(order["action"].upper()),
+            order_type=OrderType(order.get("pricetype", "MARKET").upper()),
+            price=float(order.get("price", 0) or 0),
+            quantity=int(order["quantity"]),
+            product=ProductType(order.get("product", "MIS").upper()),
+        )
+
+    # ------------------------------------------------------------------
+    # Core
+    # ------------------------------------------------------------------
+
+    def execute(self, legs: List[dict], submit: Callable[[dict], Optional[dict]]) -> BasketResult:
+        """
+        Submit all legs concurrently, collect acks, apply partial-failure policy
+
+        Args:
+            legs: Leg dicts (must contain 'action' and 'quantity' for flattening)
+            submit: Places one leg and returns the broker response
+
+        Returns:
+            BasketResult with per-leg outcomes and ack skew
+        """
+        result = BasketResult()
+        if not legs:
+            return result
+
+        self.baskets += 1
+        result.legs = self._submit_all(legs, submit)
+
+        acked = [leg for leg in result.legs if leg.ok]
+        if len(acked) > 1:
+            times = [leg.ack_time for leg in acked]
+            result.skew_ms = (max(times) - min(times)) * 1000
+            self.last_skew_ms = result.skew_ms
+            if self.latency_metrics is not None:
+                self.latency_metrics.add_leg_skew(result.skew_ms)
+
+        if acked and len(acked) < len(result.legs):
+            self.partial_failures += 1
+            result.policy_applied = self.policy
+            failed = [leg.leg for leg in result.legs if not leg.ok]
+            logger.error(
+                f"Basket partially failed: {len(acked)}/{len(result.legs)} legs acknowledged; "
+                f"applying '{self.policy}' policy"
+            )
+            logger.log_order(
+                {"type": "BASKET_PARTIAL_FAILURE", "policy": self.policy, "failed_legs": failed}
+            )
+            result.unwound = self._apply_policy(acked)
+
+        logger.log_order(
+            {
+                "type": "BASKET_COMPLETE",
+                "legs": len(result.legs),
+                "acknowledged": len(acked),
+                "leg_skew_ms": round(result.skew_ms, 2),
+            }
+        )
+        return result
+
+    def _submit_all(self, legs: List[dict], submit: Callable) -> List[LegResult]:
+        # Hold legs until the whole basket is queued so workers that are already
+        # free do not start ahead of the rest; legs beyond max_workers queue behind
+        start = Event()
+
+        def run(leg: dict) -> LegResult:
+            start.wait()
+            outcome = LegResult(leg=leg)
+            try:
+                outcome.response = submit(leg)
+            except Exception as e:
+                outcome.error = str(e)
+                logger.error(f"Leg submission error {leg}: {e}")
+            outcome.ack_time = time.perf_counter()
+            return outcome
+
+        try:
+            futures = [self._executor.submit(run, leg) for leg in legs]
+        finally:
+            start.set()
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def _unwind_order(leg: LegResult) -> Optional[dict]:
+        """Opposite market order for the instrument the broker actually filled"""
+        resp = leg.response or {}
+        symbol = resp.get("tradingsymbol") or resp.get("symbol") or leg.leg.get("symbol")
+        if not symbol:
+            return None
+        default_exchange = "NFO" if "offset" in leg.leg else "NSE"
+        return {
+            "exchange": resp.get("exchange") or leg.leg.get("exchange", default_exchange),
+            "symbol": symbol,
+            "token": resp.get("symboltoken") or resp.get("token") or leg.leg.get("token"),
+            "action": _opposite(leg.leg.get("action", "BUY")),
+            "quantity": resp.get("quantity") or leg.leg["quantity"],
+            "pricetype": "MARKET",
+            "product": resp.get("product") or leg.leg.get("product") or "MIS",
+        }
+
+    def _apply_policy(self, acked: List[LegResult]) -> List[LegResult]:
+        if self.policy == POLICY_NONE:
+            return []
+
+        if self.policy == POLICY_CANCEL:
+            for leg in acked:
+                if not self.order_manager.cancel_order(leg.orderid):
+                    logger.error(f"Failed to cancel leg {leg.orderid}")
+            return []
+
+        # Flatten: offset every acknowledged leg concurrently. Option legs are
+        # unwound by the tradingsymbol in their ack; re-sending the ATM/OTM offset
+        # would resolve against the current spot and could hit a different strike.
+        reverse = []
+        for leg in acked:
+            order = self._unwind_order(leg)
+            if order is None:
+                logger.error(f"⚠️ No tradingsymbol in ack for leg {leg.leg} - manual intervention required")
+                continue
+            reverse.append(order)
+        unwound = self._submit_all(reverse, self._place_symbol_order) if reverse else []
+        for leg in unwound:
+            if not leg.ok:
+                logger.error(f"⚠️ Failed to flatten leg {leg.leg} - manual intervention required")
+        return unwound
+
+    def get_stats(self) -> Dict:
+        """Get gateway statistics"""
+        return {
+            "baskets": self.baskets,
+            "partial_failures": self.partial_failures,
+            "last_leg_skew_ms": self.last_skew_ms,
+            "policy": self.policy,
+        }
+
+    def shutdown(self):
+        """Stop worker pool"""
+        self._executor.shutdown(wait=False)
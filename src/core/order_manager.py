@@ -52,8 +52,13 @@ class OrderManager:
     With retry logic and timeout handling for local network resilience
     """
 
-    def __init__(self):
-        """Initialize order manager"""
+    def __init__(self, latency_metrics=None):
+        """
+        Initialize order manager
+
+        Args:
+            latency_metrics: Optional LatencyMetrics passed to the order gateway (leg skew)
+        """
         data_src = getattr(config, "DATA_SOURCE", "openalgo")
         self.risk_manager = RiskManager()
         if data_src == "angelone":
@@ -76,6 +81,20 @@ class OrderManager:
 
         self.active_orders = {}
         self.order_counter = 0
+        self.latency_metrics = latency_metrics
+        self._gateway = None
+
+    @property
+    def gateway(self):
+        """Concurrent multi-leg order gateway (created on first use)"""
+        if self._gateway is None:
+            from src.core.order_gateway import OrderGateway
+
+            self._gateway = OrderGateway(self, latency_metrics=self.latency_metrics)
+        return self._gateway
+
+    def _use_gateway(self) -> bool:
+        return bool(getattr(config, "ORDER_GATEWAY_ENABLED", True))
 
     def _fetch_quote(self, exchange: str, symbol: str):
         """Fetch quote using available AngelOne SmartAPI client if possible."""
@@ -413,7 +432,11 @@ class OrderManager:
             }
             logger.log_order({"type": "OPTIONSORDER_INTENT", **payload})
             if config.PAPER_TRADING:
-                sim = self._simulate_response(payload)
+                # Carry the resolved tradingsymbol like a live optionsorder ack does
+                resolved = self.resolve_option_symbol(underlying, expiry_date, offset, option_type) or {}
+                sim = self._simulate_response(
+                    {**payload, "symbol": resolved.get("symbol"), "exchange": resolved.get("exchange", "NFO")}
+                )
                 self.active_orders[sim["orderid"]] = sim
                 logger.info(f"📄 PAPER OPTIONS ORDER: {payload}")
                 return sim
@@ -466,6 +489,15 @@ class OrderManager:
             if not self.client:
                 logger.error("Client not initialized")
                 return None
+            if self._use_gateway():
+                resp = self.gateway.place_option_legs(strategy, underlying, legs, expiry_date)
+                if resp["status"] == "success":
+                    logger.info(f"Options multi-order placed: {resp}")
+                    logger.log_order({"type": "MULTIORDER_PLACED", "response": resp})
+                    return resp
+                logger.error(f"Options multi-order failed: {resp}")
+                logger.log_order({"type": "MULTIORDER_REJECTED", "response": resp})
+                return None
             if hasattr(self.client, "optionsmultiorder"):
                 resp = self._api_call_with_retry(self.client.optionsmultiorder, **payload)
             elif hasattr(self.client, "place_order"):
@@ -499,6 +531,13 @@ class OrderManager:
             if not self.client:
                 logger.error("Client not initialized")
                 return None
+            if self._use_gateway():
+                resp = self.gateway.place_orders(orders)
+                if resp["status"] == "success":
+                    logger.info(f"Basket order placed: {resp}")
+                    return resp
+                logger.error(f"Basket order failed: {resp}")
+                return None
             if hasattr(self.client, "basketorder"):
                 resp = self._api_call_with_retry(self.client.basketorder, orders=orders)
             elif hasattr(self.client, "place_order"):
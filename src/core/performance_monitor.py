@@ -20,6 +20,8 @@ class LatencyMetrics:
     signal_generation_times: deque = field(default_factory=lambda: deque(maxlen=100))
     order_execution_times: deque = field(default_factory=lambda: deque(maxlen=100))
     total_latencies: deque = field(default_factory=lambda: deque(maxlen=100))
+    tick_to_decision_times: deque = field(default_factory=lambda: deque(maxlen=100))
+    leg_skew_times: deque = field(default_factory=lambda: deque(maxlen=100))
 
     def add_data_fetch(self, latency_ms: float):
         self.data_fetch_times.append(latency_ms)
@@ -33,6 +35,12 @@ class LatencyMetrics:
     def add_total(self, latency_ms: float):
         self.total_latencies.append(latency_ms)
 
+    def add_tick_to_decision(self, latency_ms: float):
+        self.tick_to_decision_times.append(latency_ms)
+
+    def add_leg_skew(self, latency_ms: float):
+        self.leg_skew_times.append(latency_ms)
+
     def get_stats(self) -> Dict:
         """Calculate latency statistics"""
 
@@ -52,6 +60,8 @@ class LatencyMetrics:
             "signal_generation": calc_stats(self.signal_generation_times),
             "order_execution": calc_stats(self.order_execution_times),
             "total_latency": calc_stats(self.total_latencies),
+            "tick_to_decision": calc_stats(self.tick_to_decision_times),
+            "leg_skew": calc_stats(self.leg_skew_times),
         }
 
 
@@ -220,6 +230,10 @@ class PerformanceMonitor:
             self.latency.add_order_exec(latency_ms)
         elif operation == "total":
             self.latency.add_total(latency_ms)
+        elif operation == "tick_to_decision":
+            self.latency.add_tick_to_decision(latency_ms)
+        elif operation == "leg_skew":
+            self.latency.add_leg_skew(latency_ms)
 
         return latency_ms
 
@@ -0,0 +1,321 @@
+"""
+Portfolio Greeks Aggregator
+Single live source of net Greeks per underlying and per strategy
+
+Risk limits, hedging triggers, multi-leg strategies and the dashboard all
+need the book's net exposure. Each position keeps its per-unit Greeks and a
+signed quantity; running totals are held for the whole book, per underlying
+and per strategy, so a Greeks tick or a quantity change on one leg costs
+O(1): the old contribution is subtracted and the new one added.
+
+    • Live Greeks arrive per symbol (GreeksDataManager publishes here)
+    • Every change bumps a version stamp so readers can skip unchanged state
+    • Running sums are rebuilt exactly every FULL_REBUILD_EVERY changes
+"""
+
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+from src.utils.logger import StrategyLogger
+
+logger = StrategyLogger.get_logger(__name__)
+
+GREEKS = ("delta", "gamma", "theta", "vega")
+TOTAL_FIELDS = ("net_delta", "net_gamma", "net_theta", "net_vega", "gross_delta")
+DEFAULT_STRATEGY = "directional"
+FULL_REBUILD_EVERY = 4096  # incremental changes between exact rebuilds of the sums
+
+
+@dataclass
+class PortfolioPosition:
+    """One option position (or strategy leg) held in the book"""
+
+    key: str
+    symbol: str
+    underlying: str
+    strategy: str
+    quantity: float  # signed: negative for short legs
+    delta: float = 0.0
+    gamma: float = 0.0
+    theta: float = 0.0
+    vega: float = 0.0
+    updated_at: float = 0.0
+
+    def exposure(self) -> Tuple[float, float, float, float, float]:
+        """Position Greeks in TOTAL_FIELDS order"""
+        q = self.quantity
+        return (self.delta * q, self.gamma * q, self.theta * q, self.vega * q, abs(self.delta * q))
+
+
+def _greeks_values(greeks) -> Dict[str, float]:
+    """Greeks present on a dict or snapshot-like object (missing / None skipped)"""
+    if greeks is None:
+        return {}
+    if isinstance(greeks, Mapping):
+        values = {name: greeks.get(name) for name in GREEKS}
+    else:
+        values = {name: getattr(greeks, name, None) for name in GREEKS}
+    return {name: float(value) for name, value in values.items() if value is not None}
+
+
+class PortfolioGreeksAggregator:
+    """
+    Incrementally maintained net Greeks of the live book
+
+    Usage:
+        book = get_portfolio_greeks_aggregator()
+        book.upsert_position("T1", "NIFTY30DEC2523000CE", "NIFTY", 75, greeks={"delta": 0.5})
+        book.update_greeks("NIFTY30DEC2523000CE", snapshot)   # live tick, O(positions on symbol)
+        book.update_position("T1", quantity=50)               # O(1)
+        book.get_totals(underlying="NIFTY")                   # {"net_delta": ..., "version": ...}
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._positions: Dict[str, PortfolioPosition] = {}
+        self._by_symbol: Dict[str, Set[str]] = {}
+
+        # Running sums: TOTAL_FIELDS followed by the position count
+        self._book: List[float] = [0.0] * (len(TOTAL_FIELDS) + 1)
+        self._underlyings: Dict[str, List[float]] = {}
+        self._strategies: Dict[str, List[float]] = {}
+
+        self.version = 0
+        self.updated_at: Optional[float] = None
+        self.changes = 0
+        self.rebuilds = 0
+
+    # -------- Positions --------
+
+    def upsert_position(
+        self,
+        key: str,
+        symbol: str,
+        underlying: str,
+        quantity: float,
+        strategy: str = DEFAULT_STRATEGY,
+        greeks=None,
+    ) -> PortfolioPosition:
+        """
+        Add a position or replace its identity / size
+
+        Args:
+            key: Unique position id (trade id, strategy leg id)
+            symbol: Option symbol whose live Greeks apply to this position
+            underlying: Underlying symbol
+            quantity: Signed quantity (negative for short)
+            strategy: Strategy the position belongs to
+            greeks: Optional per-unit Greeks (dict or snapshot); kept if omitted
+
+        Returns:
+            The stored position
+        """
+        with self._lock:
+            position = self._positions.get(key)
+            if position is None:
+                position = PortfolioPosition(key, symbol, underlying, strategy, float(quantity))
+            else:
+                self._apply(position, -1.0)
+                self._unindex(position)
+                position.symbol, position.underlying, position.strategy = symbol, underlying, strategy
+                position.quantity = float(quantity)
+            self._set_greeks(position, greeks)
+            self._positions[key] = position
+            self._by_symbol.setdefault(symbol, set()).add(key)
+            self._apply(position, 1.0)
+            self._changed()
+            return position
+
+    def update_position(self, key: str, quantity: Optional[float] = None, greeks=None) -> bool:
+        """
+        Change one position's quantity and / or per-unit Greeks in O(1)
+
+        Returns:
+            False if the position is unknown
+        """
+        with self._lock:
+            position = self._positions.get(key)
+            if position is None:
+                return False
+            self._apply(position, -1.0)
+            if quantity is not None:
+                position.quantity = float(quantity)
+            self._set_greeks(position, greeks)
+            self._apply(position, 1.0)
+            self._changed()
+            return True
+
+    def update_quantity(self, key: str, quantity: float) -> bool:
+        """Resize one position (signed quantity)"""
+        return self.update_position(key, quantity=quantity)
+
+    def update_greeks(self, symbol: str, greeks) -> int:
+        """
+        Apply live per-unit Greeks to every position on a symbol
+
+        Returns:
+            Number of positions updated
+        """
+        return self.apply_greeks({symbol: greeks})
+
+    def apply_greeks(self, snapshots: Mapping[str, object]) -> int:
+        """Apply a batch of {symbol: greeks}; symbols not held are ignored"""
+        updated = 0
+        with self._lock:
+            for symbol, greeks in snapshots.items():
+                values = _greeks_values(greeks)
+                if not values:
+                    continue
+                for key in self._by_symbol.get(symbol, ()):
+                    position = self._positions[key]
+                    self._apply(position, -1.0)
+                    self._set_greeks(position, values)
+                    self._apply(position, 1.0)
+                    updated += 1
+            if updated:
+                self._changed()
+        return updated
+
+    def remove_position(self, key: str) -> bool:
+        """Drop a closed position"""
+        with self._lock:
+            position = self._positions.pop(key, None)
+            if position is None:
+                return False
+            self._apply(position, -1.0)
+            self._unindex(position)
+            self._changed()
+            return True
+
+    def remove_strategy(self, strategy: str) -> int:
+        """Drop every position of a strategy (e.g. on strategy exit)"""
+        with self._lock:
+            keys = [key for key, position in self._positions.items() if position.strategy == strategy]
+            for key in keys:
+                position = self._positions.pop(key)
+                self._apply(position, -1.0)
+                self._unindex(position)
+            if keys:
+                self._changed()
+            return len(keys)
+
+    def get_position(self, key: str) -> Optional[PortfolioPosition]:
+        with self._lock:
+            return self._positions.get(key)
+
+    def clear(self):
+        """Drop all positions"""
+        with self._lock:
+            self._positions.clear()
+            self._by_symbol.clear()
+            self._rebuild()
+            self._changed()
+
+    # -------- Running sums --------
+
+    def _set_greeks(self, position: PortfolioPosition, greeks):
+        for name, value in _greeks_values(greeks).items():
+            setattr(position, name, value)
+        position.updated_at = time.time()
+
+    def _apply(self, position: PortfolioPosition, sign: float):
+        """Add (sign=1) or subtract (sign=-1) a position's contribution"""
+        exposure = position.exposure()
+        groups = (
+            (self._book, None, None),
+            (self._underlyings.setdefault(position.underlying, [0.0] * 6), self._underlyings, position.underlying),
+            (self._strategies.setdefault(position.strategy, [0.0] * 6), self._strategies, position.strategy),
+        )
+        for totals, registry, name in groups:
+            for i, value in enumerate(exposure):
+                totals[i] += sign * value
+            totals[-1] += sign
+            if registry is not None and totals[-1] <= 0:
+                del registry[name]  # empty group: drop it (and any residue)
+
+    def _unindex(self, position: PortfolioPosition):
+        keys = self._by_symbol.get(position.symbol)
+        if keys is not None:
+            keys.discard(position.key)
+            if not keys:
+                del self._by_symbol[position.symbol]
+
+    def _changed(self):
+        self.version += 1
+        self.changes += 1
+        self.updated_at = time.time()
+        if self.changes % FULL_REBUILD_EVERY == 0:
+            self._rebuild()
+
+    def _rebuild(self):
+        """Recompute every sum from the positions"""
+        self._book = [0.0] * (len(TOTAL_FIELDS) + 1)
+        self._underlyings, self._strategies = {}, {}
+        for position in self._positions.values():
+            self._apply(position, 1.0)
+        self.rebuilds += 1
+
+    # -------- Readers --------
+
+    @staticmethod
+    def _as_dict(totals: Optional[List[float]]) -> Dict:
+        totals = totals or [0.0] * (len(TOTAL_FIELDS) + 1)
+        result = dict(zip(TOTAL_FIELDS, totals))
+        result["positions"] = int(round(totals[-1]))
+        return result
+
+    def get_totals(self, underlying: Optional[str] = None, strategy: Optional[str] = None) -> Dict:
+        """
+        Net Greeks for the whole book, one underlying or one strategy
+
+        Returns:
+            {net_delta, net_gamma, net_theta, net_vega, gross_delta, positions, version}
+        """
+        with self._lock:
+            if strategy is not None:
+                totals = self._strategies.get(strategy)
+            elif underlying is not None:
+                totals = self._underlyings.get(underlying)
+            else:
+                totals = self._book
+            result = self._as_dict(totals)
+            result["version"] = self.version
+            return result
+
+    def snapshot(self) -> Dict:
+        """Consistent view of every total under one version stamp"""
+        with self._lock:
+            return {
+                "version": self.version,
+                "updated_at": self.updated_at,
+                "portfolio": self._as_dict(self._book),
+                "underlyings": {name: self._as_dict(t) for name, t in self._underlyings.items()},
+                "strategies": {name: self._as_dict(t) for name, t in self._strategies.items()},
+            }
+
+    def get_stats(self) -> Dict:
+        """Get aggregator statistics"""
+        with self._lock:
+            return {
+                "version": self.version,
+                "positions": len(self._positions),
+                "symbols": len(self._by_symbol),
+                "underlyings": len(self._underlyings),
+                "strategies": len(self._strategies),
+                "changes": self.changes,
+                "rebuilds": self.rebuilds,
+            }
+
+
+# Global aggregator shared by risk, strategies, Greeks feed and dashboard
+_aggregator: Optional[PortfolioGreeksAggregator] = None
+
+
+def get_portfolio_greeks_aggregator() -> PortfolioGreeksAggregator:
+    """Get or create the shared portfolio Greeks aggregator"""
+    global _aggregator
+    if _aggregator is None:
+        _aggregator = PortfolioGreeksAggregator()
+    return _aggregator
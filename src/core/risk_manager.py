@@ -9,6 +9,8 @@ from datetime import datetime, time
 from threading import Lock
 from typing import Dict, Optional, List
 from config import config
+from src.core.portfolio_greeks import get_portfolio_greeks_aggregator
+from src.engines.portfolio.scenario_engine import get_scenario_engine
 from src.utils.logger import StrategyLogger
 
 logger = StrategyLogger.get_logger(__name__)
@@ -86,6 +88,13 @@ class RiskManager:
         self.current_net_vega = 0.0
         self.current_gross_delta = 0.0
 
+        # Live book Greeks (shared with strategies, Greeks feed and dashboard)
+        self.portfolio_greeks = get_portfolio_greeks_aggregator()
+        self.greeks_version = -1  # aggregator version last pulled
+
+        # Multi-leg trades: worst loss under configured spot / IV shocks
+        self.max_shock_loss = getattr(config, "SCENARIO_MAX_SHOCK_LOSS", 0.0) or self.max_daily_loss
+
         logger.info("RiskManager initialized")
         logger.info(
             f"Limits: Max Loss={self.max_daily_loss}, Max Profit={self.max_daily_profit}, Max Trades={self.max_trades_per_day}"
@@ -97,6 +106,8 @@ class RiskManager:
         """
         Update current portfolio Greeks exposure
 
+        Manual override; the next change in the shared aggregator replaces it.
+
         Args:
             net_delta: Net delta across all positions
             net_gamma: Net gamma
@@ -116,6 +127,22 @@ class RiskManager:
             if hedge_needed:
                 logger.warning(f"HEDGING REQUIRED: {hedge_needed}")
 
+    def _sync_portfolio_greeks(self):
+        """Pull book totals from the aggregator if its version moved (call under risk_lock)"""
+        totals = self.portfolio_greeks.get_totals()
+        if totals["version"] == self.greeks_version:
+            return
+        self.greeks_version = totals["version"]
+        self.current_net_delta = totals["net_delta"]
+        self.current_net_gamma = totals["net_gamma"]
+        self.current_net_theta = totals["net_theta"]
+        self.current_net_vega = totals["net_vega"]
+        self.current_gross_delta = totals["gross_delta"]
+
+        hedge_needed = self._check_hedging_triggers()
+        if hedge_needed:
+            logger.warning(f"HEDGING REQUIRED: {hedge_needed}")
+
     def _check_hedging_triggers(self) -> Optional[str]:
         """
         Check if portfolio needs hedging
@@ -148,7 +175,8 @@ class RiskManager:
         Check if new trade is allowed based on all risk criteria + Greeks limits
 
         Args:
-            trade_info: Dict with trade details (size, risk, symbol, etc.)
+            trade_info: Dict with trade details (size, risk, symbol, etc.); multi-leg
+                trades add legs, spot and time_to_expiry (years) for the shock check
             position_delta: Delta of new position
             position_gamma: Gamma of new position
             position_theta: Theta of new position
@@ -180,7 +208,16 @@ class RiskManager:
             if position_size > self.max_position_size:
                 return False, f"Position size exceeds limit: {position_size} > {self.max_position_size}"
 
+            # Check loss under spot / IV shocks (multi-leg)
+            if trade_info.get("legs"):
+                allowed, reason = self.check_scenario_risk(
+                    trade_info["legs"], trade_info.get("spot"), trade_info.get("time_to_expiry"), trade_info.get("iv")
+                )
+                if not allowed:
+                    return False, reason
+
             # Check Greeks limits if provided
+            self._sync_portfolio_greeks()
             if position_delta is not None:
                 new_net_delta = self.current_net_delta + position_delta
                 if abs(new_net_delta) > self.greeks_limits.max_net_delta:
@@ -229,9 +266,25 @@ class RiskManager:
             # All checks passed
             return True, "Trade allowed"
 
+    def check_scenario_risk(self, legs, spot: Optional[float], time_to_expiry: Optional[float], iv=None) -> tuple:
+        """
+        Worst instant loss of a set of legs under the configured shocks
+
+        Returns:
+            tuple: (bool, str) - (allowed, reason)
+        """
+        if spot is None or time_to_expiry is None:
+            return False, "Scenario check needs spot and time_to_expiry"
+        shock = get_scenario_engine().shock_losses(legs, spot, time_to_expiry, iv)
+        loss = -shock["worst_loss"]
+        if loss > self.max_shock_loss:
+            return False, f"Shock {shock['worst_shock']} loss {loss:.2f} exceeds limit {self.max_shock_loss:.2f}"
+        return True, "Scenario risk OK"
+
     def get_portfolio_greeks(self) -> Dict:
         """Get current portfolio Greeks exposure"""
         with self.risk_lock:
+            self._sync_portfolio_greeks()
             return {
                 "net_delta": self.current_net_delta,
                 "net_gamma": self.current_net_gamma,
@@ -241,6 +294,7 @@ class RiskManager:
                 "delta_utilization": abs(self.current_net_delta) / self.greeks_limits.max_net_delta * 100,
                 "gamma_utilization": abs(self.current_net_gamma) / self.greeks_limits.max_net_gamma * 100,
                 "needs_hedge": self._check_hedging_triggers() is not None,
+                "version": self.greeks_version,
             }
 
     def record_trade(self, trade_result):
@@ -12,6 +12,7 @@ from typing import Optional, List
 from config import config
 from src.utils.logger import StrategyLogger
 from src.core.order_manager import OrderManager, OrderAction, OrderType, ProductType
+from src.core.portfolio_greeks import get_portfolio_greeks_aggregator
 from src.utils.slippage_calculator import SlippageCalculator
 
 logger = StrategyLogger.get_logger(__name__)
@@ -56,6 +57,7 @@ class Trade:
     brokerage_cost: float = 0.0  # Total brokerage + taxes
     net_pnl: float = 0.0  # P&L after costs
     net_pnl_percent: float = 0.0  # P&L % after costs
+    symbol: Optional[str] = None  # option symbol (live Greeks key)
 
 
 class TradeManager:
@@ -73,13 +75,20 @@ class TradeManager:
     6. OI-Price mismatch: OI↑ but price flat → exit
     """
 
-    def __init__(self):
-        """Initialize trade manager"""
+    def __init__(self, latency_metrics=None):
+        """
+        Initialize trade manager
+
+        Args:
+            latency_metrics: Optional LatencyMetrics for multi-leg order leg skew
+        """
         self.active_trades: List[Trade] = []
         self.closed_trades: List[Trade] = []
         self.trade_counter = 0
         # Local order manager for multi-leg operations
-        self._order_manager = OrderManager()
+        self._order_manager = OrderManager(latency_metrics=latency_metrics)
+        # Live net Greeks of open trades
+        self.portfolio_greeks = get_portfolio_greeks_aggregator()
 
         logger.info("TradeManager (ANGEL-X) initialized")
 
@@ -99,10 +108,14 @@ class TradeManager:
         target_price: float,
         entry_reason_tags: Optional[List[str]] = None,
         rule_violations: Optional[List[str]] = None,
+        symbol: Optional[str] = None,
     ) -> Trade:
         """
         Enter a new trade
 
+        Args:
+            symbol: Option symbol; live Greeks published for it update the trade's exposure
+
         Returns:
             Trade object for tracking
         """
@@ -138,9 +151,17 @@ class TradeManager:
             rule_violations=rule_violations or [],
             pnl=0.0,
             pnl_percent=0.0,
+            symbol=symbol,
         )
 
         self.active_trades.append(trade)
+        self.portfolio_greeks.upsert_position(
+            trade_id,
+            symbol or f"{underlying}{strike}{option_type}",
+            underlying,
+            quantity,
+            greeks={"delta": entry_delta, "gamma": entry_gamma, "theta": entry_theta},
+        )
         logger.info(f"Trade opened: {trade_id} | {option_type} {strike} @ ₹{entry_price:.2f} | SL: ₹{sl_price:.2f}")
 
         return trade
@@ -250,6 +271,11 @@ class TradeManager:
             trade.net_pnl = pnl_detail["net_pnl"]
             trade.net_pnl_percent = pnl_detail["net_pnl_percent"]
 
+        # Live Greeks into the portfolio totals (vega arrives from the Greeks feed)
+        self.portfolio_greeks.update_position(
+            trade.trade_id, greeks={"delta": current_delta, "gamma": current_gamma, "theta": current_theta}
+        )
+
         # Update time in trade
         trade.time_in_trade_sec = int((datetime.now() - trade.entry_time).total_seconds())
 
@@ -269,6 +295,29 @@ class TradeManager:
 
         return exit_reason
 
+    def check_time_exit(self, trade: Trade, expiry_rules: Optional[dict] = None) -> Optional[str]:
+        """
+        Time-based exit check that needs no fresh market data
+
+        Called when no tick arrived (stale feed / idle tick-driven loop) so
+        the max time in trade still forces an exit at the last known price.
+
+        Returns:
+            Exit reason if trade should be exited, None otherwise
+        """
+        trade.time_in_trade_sec = int((datetime.now() - trade.entry_time).total_seconds())
+        return self._time_exit_reason(trade, expiry_rules)
+
+    def _time_exit_reason(self, trade, expiry_rules: Optional[dict]) -> Optional[str]:
+        """Expiry-day max time in trade: exit immediately (even if loss)"""
+        if not expiry_rules:
+            return None
+        if trade.time_in_trade_sec > expiry_rules.get("max_time_in_trade", 300):
+            if trade.pnl > 0:
+                return "expiry_time_based_profit_exit"
+            return "expiry_time_forced_exit_loss"
+        return None
+
     def _check_exit_triggers(
         self,
         trade,
@@ -285,16 +334,12 @@ class TradeManager:
         """Check all exit trigger rules"""
 
         # EXPIRY-DAY TIME-BASED EXIT (highest priority)
+        time_exit = self._time_exit_reason(trade, expiry_rules)
+        if time_exit:
+            return time_exit
+
         if expiry_rules:
             min_time = expiry_rules.get("min_time_in_trade", 20)
-            max_time = expiry_rules.get("max_time_in_trade", 300)
-
-            # If time exceeded max, exit immediately (even if loss)
-            if trade.time_in_trade_sec > max_time:
-                if trade.pnl > 0:
-                    return "expiry_time_based_profit_exit"
-                else:
-                    return "expiry_time_forced_exit_loss"
 
             # If min time passed and profit is hit, exit
             if trade.time_in_trade_sec > min_time and trade.pnl > 0:
@@ -373,6 +418,7 @@ class TradeManager:
         if trade in self.active_trades:
             self.active_trades.remove(trade)
         self.closed_trades.append(trade)
+        self.portfolio_greeks.remove_position(trade.trade_id)
 
         duration = (trade.exit_time - trade.entry_time).total_seconds()
 
@@ -44,11 +44,20 @@ class DashboardDataProvider:
         self.daily_trades: int = 0
         self.current_ltp: float = 27850.0
         self.greeks_data = {}
-        self.portfolio_greeks = {"delta": 0, "gamma": 0, "theta": 0, "vega": 0, "iv": 0}
+        self._portfolio_greeks = None  # live book Greeks, bound on first use
         self.account_risk_used = 0.45
         self.account_margin = 1000000
         self.margin_used = 450000
 
+    @property
+    def portfolio_greeks(self):
+        """Shared book Greeks aggregator (imported on first use: src.core needs the trading config)"""
+        if self._portfolio_greeks is None:
+            from src.core.portfolio_greeks import get_portfolio_greeks_aggregator
+
+            self._portfolio_greeks = get_portfolio_greeks_aggregator()
+        return self._portfolio_greeks
+
     def update_ltp(self, symbol: str, price: float):
         """Update LTP for a symbol"""
         with self.lock:
@@ -83,6 +92,8 @@ class DashboardDataProvider:
 
     def get_dashboard_data(self) -> Dict:
         """Get complete dashboard snapshot"""
+        greeks = self.portfolio_greeks.snapshot()
+        book = greeks["portfolio"]
         with self.lock:
             return {
                 "timestamp": datetime.now().isoformat(),
@@ -105,10 +116,15 @@ class DashboardDataProvider:
                     ],
                 },
                 "portfolio": {
-                    "delta": round(self.portfolio_greeks.get("delta", 0), 2),
-                    "gamma": round(self.portfolio_greeks.get("gamma", 0), 4),
-                    "theta": round(self.portfolio_greeks.get("theta", 0), 2),
-                    "vega": round(self.portfolio_greeks.get("vega", 0), 2),
+                    "delta": round(book["net_delta"], 2),
+                    "gamma": round(book["net_gamma"], 4),
+                    "theta": round(book["net_theta"], 2),
+                    "vega": round(book["net_vega"], 2),
+                    "greeks_version": greeks["version"],
+                    "by_underlying": {
+                        name: {"delta": round(t["net_delta"], 2), "gamma": round(t["net_gamma"], 4)}
+                        for name, t in greeks["underlyings"].items()
+                    },
                     "daily_pnl": round(self.daily_pnl, 2),
                     "daily_trades": self.daily_trades,
                     "risk_used_percent": round(self.account_risk_used * 100, 1),
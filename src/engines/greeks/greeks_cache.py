@@ -0,0 +1,249 @@
+"""
+PHASE 3 — Greeks Cache
+Bounded memo of Black-Scholes results keyed on quantized inputs
+
+Entry checks, exit checks, the dashboard and strike scans all ask for the
+same Greeks within the same second. Inputs are snapped to tick sizes
+(spot, strike, time-to-expiry, IV) and the snapped values are what get
+priced, so a hit and a miss for the same bucket return identical numbers.
+
+    • LRU eviction once max_size entries are held
+    • Exact repeats of a recent request skip per-option keying entirely
+    • Hit / miss / eviction / invalidation counters
+    • Per (underlying, expiry) bucket: the bucket's entries are dropped when
+      spot or the request's mean IV moves past a threshold from the reference
+      captured after that bucket's last invalidation
+"""
+
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+from config import config
+from .greeks_calculator import GREEKS_DTYPE, RISK_FREE_RATE, GreeksCalculator, call_mask
+
+logger = logging.getLogger(__name__)
+
+MINUTES_PER_YEAR = 365.0 * 24 * 60
+REQUEST_MEMO_SIZE = 64  # recent whole requests answered without re-keying
+
+
+class GreeksCache:
+    """
+    LRU cache in front of GreeksCalculator.calculate_batch
+
+    Usage:
+        cache = get_greeks_cache()
+        greeks = cache.get_batch(spot, strikes, tte, ivs, "CE", bucket=("NIFTY", "30DEC25"))
+        cache.get_stats()
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        spot_tick: Optional[float] = None,
+        strike_tick: Optional[float] = None,
+        tte_tick: Optional[float] = None,
+        iv_tick: Optional[float] = None,
+        spot_move_pct: Optional[float] = None,
+        iv_move: Optional[float] = None,
+    ):
+        """
+        Initialize cache
+
+        Args:
+            max_size: Max cached (option, inputs) entries
+            spot_tick: Spot rounding (price units)
+            strike_tick: Strike rounding (price units)
+            tte_tick: Time-to-expiry rounding (years; default one minute)
+            iv_tick: IV rounding (decimal vol)
+            spot_move_pct: Spot move (%) from a bucket's reference that clears the bucket
+            iv_move: Mean IV move (decimal vol) from a bucket's reference that clears the bucket
+        """
+        self.max_size = max_size or getattr(config, "GREEKS_CACHE_SIZE", 4096)
+        self.spot_tick = spot_tick or getattr(config, "GREEKS_CACHE_SPOT_TICK", 0.5)
+        self.strike_tick = strike_tick or getattr(config, "GREEKS_CACHE_STRIKE_TICK", 0.05)
+        self.tte_tick = tte_tick or getattr(config, "GREEKS_CACHE_TTE_MINUTES", 1.0) / MINUTES_PER_YEAR
+        self.iv_tick = iv_tick or getattr(config, "GREEKS_CACHE_IV_TICK", 0.0005)
+        self.spot_move_pct = spot_move_pct or getattr(config, "GREEKS_CACHE_SPOT_MOVE_PCT", 1.0)
+        self.iv_move = iv_move or getattr(config, "GREEKS_CACHE_IV_MOVE", 0.03)
+
+        self._entries: "OrderedDict[Tuple, Tuple[float, ...]]" = OrderedDict()
+        self._requests: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()  # whole-request memo
+        self._lock = Lock()
+        self._refs: Dict[Hashable, Tuple[float, float]] = {}  # bucket -> (spot, mean IV) reference
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_batch(
+        self,
+        spot,
+        strikes,
+        time_to_expiry,
+        volatility,
+        option_types,
+        rate: float = RISK_FREE_RATE,
+        bucket: Hashable = None,
+    ) -> np.ndarray:
+        """
+        Cached equivalent of GreeksCalculator.calculate_batch
+
+        Args:
+            bucket: (underlying, expiry) the request prices; a regime move only
+                invalidates entries of the same bucket
+
+        Returns:
+            Structured array (GREEKS_DTYPE) for the snapped inputs
+        """
+        inputs = (
+            np.asarray(spot, dtype=float),
+            np.asarray(strikes, dtype=float),
+            np.asarray(time_to_expiry, dtype=float),
+            np.asarray(volatility, dtype=float),
+            call_mask(option_types),
+        )
+
+        # Fast path: exact repeat of a recent request (e.g. the same chain rescanned)
+        signature = (bucket, rate) + tuple((a.shape, a.tobytes()) for a in inputs)
+        with self._lock:
+            result = self._requests.get(signature)
+            if result is not None:
+                self._requests.move_to_end(signature)
+                self.hits += result.size
+                return result.copy()
+
+        spot, strikes, t, vol, is_call = np.broadcast_arrays(*inputs)
+        shape = strikes.shape
+        if not strikes.size:
+            return np.zeros(shape, dtype=GREEKS_DTYPE)
+        spot_q = np.rint(spot.ravel() / self.spot_tick).astype(np.int64)
+        strike_q = np.rint(strikes.ravel() / self.strike_tick).astype(np.int64)
+        t_q = np.rint(t.ravel() / self.tte_tick).astype(np.int64)
+        vol_q = np.rint(vol.ravel() / self.iv_tick).astype(np.int64)
+        calls = is_call.ravel()
+        keys = list(zip(spot_q.tolist(), strike_q.tolist(), t_q.tolist(), vol_q.tolist(), calls.tolist()))
+        rate_key = round(rate, 6)
+
+        rows = [None] * len(keys)
+        missing = []
+        with self._lock:
+            self._check_regime(bucket, float(spot_q[0]) * self.spot_tick, float(vol_q.mean()) * self.iv_tick)
+            entries = self._entries
+            for i, key in enumerate(keys):
+                value = entries.get((bucket, key, rate_key))
+                if value is None:
+                    missing.append(i)
+                else:
+                    entries.move_to_end((bucket, key, rate_key))
+                    rows[i] = value
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            idx = np.asarray(missing)
+            computed = GreeksCalculator.calculate_batch(
+                spot_q[idx] * self.spot_tick,
+                strike_q[idx] * self.strike_tick,
+                t_q[idx] * self.tte_tick,
+                vol_q[idx] * self.iv_tick,
+                calls[idx],
+                rate,
+            ).tolist()
+            with self._lock:
+                for i, value in zip(missing, computed):
+                    rows[i] = value
+                    self._entries[(bucket, keys[i], rate_key)] = value
+                overflow = len(self._entries) - self.max_size
+                for _ in range(max(0, overflow)):
+                    self._entries.popitem(last=False)
+                self.evictions += max(0, overflow)
+
+        result = np.array(rows, dtype=GREEKS_DTYPE).reshape(shape)
+        with self._lock:
+            self._requests[signature] = result.copy()
+            if len(self._requests) > REQUEST_MEMO_SIZE:
+                self._requests.popitem(last=False)
+        return result
+
+    def get(
+        self,
+        spot: float,
+        strike: float,
+        time_to_expiry: float,
+        volatility: float,
+        option_type,
+        rate: float = RISK_FREE_RATE,
+        bucket: Hashable = None,
+    ) -> Dict[str, float]:
+        """Cached single-option Greeks in the calculate_call/put_greeks dict shape"""
+        row = self.get_batch(spot, [strike], time_to_expiry, volatility, [option_type], rate, bucket)[0]
+        return {
+            "delta": float(row["delta"]),
+            "gamma": float(row["gamma"]),
+            "theta": float(row["theta"]),
+            "vega": float(row["vega"]),
+        }
+
+    def _check_regime(self, bucket: Hashable, spot: float, mean_iv: float):
+        """Drop the bucket's entries once its spot / IV has moved past the thresholds (call under _lock)"""
+        ref = self._refs.get(bucket)
+        if ref is None:
+            self._refs[bucket] = (spot, mean_iv)
+            return
+        ref_spot, ref_iv = ref
+        spot_moved = abs(spot - ref_spot) / ref_spot * 100 > self.spot_move_pct
+        iv_moved = abs(mean_iv - ref_iv) > self.iv_move
+        if spot_moved or iv_moved:
+            logger.debug(
+                f"Greeks cache invalidated for {bucket} (spot {ref_spot:.2f}→{spot:.2f}, "
+                f"IV {ref_iv:.4f}→{mean_iv:.4f})"
+            )
+            for key in [key for key in self._entries if key[0] == bucket]:
+                del self._entries[key]
+            for signature in [sig for sig in self._requests if sig[0] == bucket]:
+                del self._requests[signature]
+            self.invalidations += 1
+            self._refs[bucket] = (spot, mean_iv)
+
+    def clear(self):
+        """Drop all entries and regime references"""
+        with self._lock:
+            self._entries.clear()
+            self._requests.clear()
+            self._refs.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups * 100 if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "buckets": len(self._refs),
+        }
+
+
+# Global cache shared by the Greeks engine and strike selection
+_cache: Optional[GreeksCache] = None
+
+
+def get_greeks_cache() -> GreeksCache:
+    """Get or create the shared Greeks cache"""
+    global _cache
+    if _cache is None:
+        _cache = GreeksCache()
+    return _cache
@@ -3,18 +3,21 @@ PHASE 3 — Greeks Calculation Engine
 Broker Greeks + Black-Scholes fallback for IV-based calculation
 
 Components:
-    • GreeksCalculator - Black-Scholes implementation
-    • IvEstimator - Implied Volatility from market data
+    • GreeksCalculator - Black-Scholes implementation (scalar + vectorized batch)
+    • IvEstimator - Implied Volatility solver (vectorized safeguarded Newton)
     • BrokerGreeksValidator - Normalize broker data
     • GreeksCalculationEngine - Main orchestrator
 """
 
 import math
 import logging
+import time
 from datetime import datetime
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, List, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
 from .greeks_models import GreeksSnapshot, OptionType, GreeksHealthStatus
 
 logger = logging.getLogger(__name__)
@@ -33,12 +36,63 @@ MIN_IV = 0.05  # 5% minimum
 MAX_IV = 2.0  # 200% maximum
 DEFAULT_IV = 0.25  # 25% default if cannot estimate
 
+# IV solver tolerances
+IV_PRICE_TOLERANCE = 1e-4  # |model - market| in price units
+IV_VOL_TOLERANCE = 1e-6  # bracket width in vol units
+IV_MAX_ITERATIONS = 50
+
 # Greeks validation bounds
 DELTA_MIN, DELTA_MAX = 0.0, 1.0
 GAMMA_MIN, GAMMA_MAX = 0.0, 0.2  # Very high Gamma is suspicious
 THETA_MIN, THETA_MAX = -10.0, 0.0  # Theta should be negative (decay)
 VEGA_MIN, VEGA_MAX = -100.0, 100.0
 
+# Batch result layout (one row per option)
+GREEKS_DTYPE = np.dtype(
+    [("delta", "f8"), ("gamma", "f8"), ("theta", "f8"), ("vega", "f8"), ("price", "f8")]
+)
+
+_CALL_TYPES = frozenset({"CE", "CALL", "C"})
+
+# erfc(z) ~ t * exp(-z^2 + P(t)), t = 1 / (1 + z/2); P coefficients, constant first
+_ERFC_COEFFS = (
+    -1.26551223,
+    1.00002368,
+    0.37409196,
+    0.09678418,
+    -0.18628806,
+    0.27886807,
+    -1.13520398,
+    1.48851587,
+    -0.82215223,
+    0.17087277,
+)
+
+
+def _normal_cdf_array(x: np.ndarray) -> np.ndarray:
+    """
+    Vectorized standard normal CDF without SciPy
+
+    Chebyshev erfc approximation (Numerical Recipes ``erfcc``), fractional
+    error < 1.2e-7 everywhere.
+    """
+    z = np.abs(x) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = np.full_like(t, _ERFC_COEFFS[-1])
+    for coeff in _ERFC_COEFFS[-2::-1]:
+        poly = poly * t + coeff
+    tail = 0.5 * t * np.exp(poly - z * z)  # P(Z > |x|)
+    return np.where(x >= 0, 1.0 - tail, tail)
+
+
+def call_mask(option_types) -> np.ndarray:
+    """Boolean call mask from bools, "CE"/"PE" strings or OptionType values"""
+    types = np.asarray(option_types)
+    if types.dtype == bool:
+        return types
+    flat = [str(getattr(t, "value", t)).upper() in _CALL_TYPES for t in types.ravel()]
+    return np.array(flat, dtype=bool).reshape(types.shape)
+
 
 # ============================================================================
 # Black-Scholes Greeks Calculation
@@ -164,21 +218,225 @@ class GreeksCalculator:
 
         return {"delta": float(delta), "gamma": float(gamma), "theta": float(theta), "vega": float(vega)}
 
+    @staticmethod
+    def calculate_batch(
+        spot,
+        strikes,
+        time_to_expiry,
+        volatility,
+        option_types,
+        rate: float = RISK_FREE_RATE,
+    ) -> np.ndarray:
+        """
+        Vectorized Black-Scholes Greeks and price for a whole chain
+
+        Every argument broadcasts against ``strikes``, so a chain can mix
+        expiries, vols and CE/PE rows in one call.
+
+        Args:
+            spot: Spot price(s)
+            strikes: Strike prices
+            time_to_expiry: Years to expiry (days / 365)
+            volatility: Implied volatilities (decimal)
+            option_types: Bool call mask or "CE"/"PE"/OptionType values
+            rate: Risk-free rate
+
+        Returns:
+            Structured array (GREEKS_DTYPE): delta, gamma, theta (per day),
+            vega (per 1% IV) and price, same conventions as the scalar path
+        """
+        spot, strikes, t, vol, is_call = np.broadcast_arrays(
+            np.asarray(spot, dtype=float),
+            np.asarray(strikes, dtype=float),
+            np.asarray(time_to_expiry, dtype=float),
+            np.asarray(volatility, dtype=float),
+            call_mask(option_types),
+        )
+        out = np.zeros(strikes.shape, dtype=GREEKS_DTYPE)
+
+        # Expired (or zero-vol) rows: intrinsic value only
+        live = (t > 0) & (vol > 0)
+        itm_call = spot > strikes
+        out["delta"] = np.where(is_call, itm_call, np.where(itm_call, 0.0, -1.0))
+        out["price"] = np.where(is_call, np.maximum(spot - strikes, 0.0), np.maximum(strikes - spot, 0.0))
+        if not live.any():
+            return out
+
+        s, k, tt, v, c = spot[live], strikes[live], t[live], vol[live], is_call[live]
+        sqrt_t = np.sqrt(tt)
+        vol_sqrt_t = v * sqrt_t
+        d1 = (np.log(s / k) + (rate + 0.5 * v * v) * tt) / vol_sqrt_t
+        d2 = d1 - vol_sqrt_t
+
+        nd1 = np.exp(-0.5 * d1 * d1) / math.sqrt(2 * math.pi)
+        Nd1 = _normal_cdf_array(d1)
+        Nd2 = _normal_cdf_array(d2)
+        discounted_k = k * np.exp(-rate * tt)
+
+        out["delta"][live] = np.where(c, Nd1, Nd1 - 1.0)
+        out["gamma"][live] = nd1 / (s * vol_sqrt_t)
+        decay = -s * nd1 * v / (2 * sqrt_t)
+        carry = np.where(c, -rate * discounted_k * Nd2, rate * discounted_k * (1.0 - Nd2))
+        out["theta"][live] = (decay + carry) / DAYS_PER_YEAR
+        out["vega"][live] = s * nd1 * sqrt_t / 100.0
+        call_price = s * Nd1 - discounted_k * Nd2
+        # Put via parity: P = C - S + K e^(-rT)
+        out["price"][live] = np.where(c, call_price, call_price - s + discounted_k)
+        return out
+
 
 # ============================================================================
 # Implied Volatility Estimation
 # ============================================================================
 
 
+@dataclass
+class IvSolution:
+    """Vectorized IV solve result (one entry per option)"""
+
+    iv: np.ndarray
+    iterations: np.ndarray  # Newton/bisection steps taken per option
+    converged: np.ndarray  # |model - market| <= IV_PRICE_TOLERANCE (or bracket collapsed)
+
+
+def _bs_price_vega(spot, strike, t, vol, is_call, rate):
+    """Black-Scholes price and raw vega (d price / d vol) for live rows"""
+    sqrt_t = np.sqrt(t)
+    vol_sqrt_t = vol * sqrt_t
+    d1 = (np.log(spot / strike) + (rate + 0.5 * vol * vol) * t) / vol_sqrt_t
+    d2 = d1 - vol_sqrt_t
+    discounted_k = strike * np.exp(-rate * t)
+    call = spot * _normal_cdf_array(d1) - discounted_k * _normal_cdf_array(d2)
+    price = np.where(is_call, call, call - spot + discounted_k)
+    vega = spot * np.exp(-0.5 * d1 * d1) / math.sqrt(2 * math.pi) * sqrt_t
+    return price, vega
+
+
+def _corrado_miller_guess(price, spot, strike, t, is_call, rate):
+    """Closed-form IV approximation used as the cold-start guess (DEFAULT_IV where undefined)"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discounted_k = strike * np.exp(-rate * t)
+        call = np.where(is_call, price, price + spot - discounted_k)  # put-call parity
+        half_moneyness = 0.5 * (spot - discounted_k)
+        excess = call - half_moneyness
+        radicand = np.maximum(excess * excess - (spot - discounted_k) ** 2 / math.pi, 0.0)
+        guess = math.sqrt(2 * math.pi) / np.sqrt(t) / (spot + discounted_k) * (excess + np.sqrt(radicand))
+    return np.where(np.isfinite(guess) & (guess > MIN_IV) & (guess < MAX_IV), guess, DEFAULT_IV)
+
+
 class IvEstimator:
     """
-    Estimate Implied Volatility from option price and market parameters
+    Implied Volatility solver
 
     Used when broker doesn't provide IV
     Takes: LTP, spot, strike, time_to_expiry
-    Returns: IV estimate
+    Returns: IV that reprices the option to its LTP
+
+    Safeguarded Newton: each row keeps a [lo, hi] bracket that always holds
+    the root (BS price is increasing in vol); a Newton step that leaves the
+    bracket or meets a vanishing vega is replaced by bisection. Whole chains
+    are solved together and can be warm-started from the previous snapshot.
+
+    Tolerance: |model price - LTP| <= IV_PRICE_TOLERANCE (0.0001 in price
+    units), or the bracket narrower than IV_VOL_TOLERANCE. Prices no vol in
+    [MIN_IV, MAX_IV] can reach (e.g. below intrinsic) come back at the nearer
+    bound with converged False.
     """
 
+    @staticmethod
+    def solve_batch(
+        prices,
+        spot,
+        strikes,
+        time_to_expiry,
+        option_types,
+        rate: float = RISK_FREE_RATE,
+        initial_iv=None,
+        max_iterations: int = IV_MAX_ITERATIONS,
+    ) -> IvSolution:
+        """
+        Solve implied volatility for a whole chain
+
+        Args:
+            prices: Option market prices (LTP)
+            spot, strikes, time_to_expiry, option_types: As GreeksCalculator.calculate_batch
+            rate: Risk-free rate
+            initial_iv: Warm-start guesses (e.g. previous snapshot's IV); NaN rows
+                fall back to a Corrado-Miller closed-form guess
+            max_iterations: Iteration cap per option
+
+        Returns:
+            IvSolution; rows without a usable price or expiry get DEFAULT_IV, rows priced
+            outside the [MIN_IV, MAX_IV] range get that bound, neither converged
+        """
+        prices, spot, strikes, t, is_call = np.broadcast_arrays(
+            np.asarray(prices, dtype=float),
+            np.asarray(spot, dtype=float),
+            np.asarray(strikes, dtype=float),
+            np.asarray(time_to_expiry, dtype=float),
+            call_mask(option_types),
+        )
+        shape = prices.shape
+        prices, spot, strikes, t, is_call = (a.ravel() for a in (prices, spot, strikes, t, is_call))
+
+        iv = _corrado_miller_guess(prices, spot, strikes, t, is_call, rate)
+        if initial_iv is not None:
+            guess = np.broadcast_to(np.asarray(initial_iv, dtype=float), shape).ravel()
+            usable = np.isfinite(guess) & (guess > MIN_IV) & (guess < MAX_IV)
+            iv = np.where(usable, guess, iv)
+        iterations = np.zeros(prices.size, dtype=np.int32)
+        converged = np.zeros(prices.size, dtype=bool)
+
+        solvable = (prices > 0) & (t > 0) & (spot > 0) & (strikes > 0)
+        iv[~solvable] = DEFAULT_IV
+
+        # Working set: unresolved rows only, compacted as they converge
+        rows = np.flatnonzero(solvable)
+        target, s, k, tt, c = prices[rows], spot[rows], strikes[rows], t[rows], is_call[rows]
+        sigma = iv[rows]
+        lo = np.full(rows.size, MIN_IV)
+        hi = np.full(rows.size, MAX_IV)
+
+        # Prices outside [price(MIN_IV), price(MAX_IV)] have no root in the bracket
+        floor, _ = _bs_price_vega(s, k, tt, lo, c, rate)
+        cap, _ = _bs_price_vega(s, k, tt, hi, c, rate)
+        below = target < floor - IV_PRICE_TOLERANCE
+        outside = below | (target > cap + IV_PRICE_TOLERANCE)
+        if outside.any():
+            iv[rows[outside]] = np.where(below[outside], MIN_IV, MAX_IV)
+            keep = ~outside
+            rows, target, s, k, tt, c = rows[keep], target[keep], s[keep], k[keep], tt[keep], c[keep]
+            sigma, lo, hi = sigma[keep], lo[keep], hi[keep]
+
+        for _ in range(max_iterations):
+            if not rows.size:
+                break
+            model, vega = _bs_price_vega(s, k, tt, sigma, c, rate)
+            diff = model - target
+
+            done = (np.abs(diff) <= IV_PRICE_TOLERANCE) | (hi - lo <= IV_VOL_TOLERANCE)
+            if done.any():
+                iv[rows[done]] = sigma[done]
+                converged[rows[done]] = True
+                keep = ~done
+                rows, target, s, k, tt, c = rows[keep], target[keep], s[keep], k[keep], tt[keep], c[keep]
+                sigma, lo, hi, diff, vega = sigma[keep], lo[keep], hi[keep], diff[keep], vega[keep]
+                if not rows.size:
+                    break
+            iterations[rows] += 1
+
+            # Shrink bracket around the root, then Newton with bisection fallback
+            above = diff > 0
+            hi = np.where(above, sigma, hi)
+            lo = np.where(above, lo, sigma)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                step = sigma - diff / vega
+            sigma = np.where((vega > 1e-12) & (step > lo) & (step < hi), step, 0.5 * (lo + hi))
+
+        iv[rows] = sigma  # hit max_iterations
+        iv = np.clip(iv, MIN_IV, MAX_IV).reshape(shape)
+        return IvSolution(iv=iv, iterations=iterations.reshape(shape), converged=converged.reshape(shape))
+
     @staticmethod
     def estimate_from_price(
         option_ltp: float,
@@ -188,42 +446,14 @@ class IvEstimator:
         option_type: OptionType,
         rate: float = RISK_FREE_RATE,
     ) -> float:
-        """
-        Estimate IV using simple heuristic
-        (Full Newton-Raphson iteration would be better but overkill for scalping)
-
-        Simple approach: Try different IVs and find closest match
-        """
-        if time_to_expiry <= 0:
+        """Implied volatility for a single option (DEFAULT_IV if it cannot be solved)"""
+        try:
+            solution = IvEstimator.solve_batch(option_ltp, spot, strike, time_to_expiry, option_type, rate)
+            return float(solution.iv)
+        except Exception as e:
+            logger.warning(f"IV estimation error: {e}, using default")
             return DEFAULT_IV
 
-        # Newton-Raphson iteration for IV
-        iv = DEFAULT_IV
-        for _ in range(10):  # Max 10 iterations
-            try:
-                if option_type == OptionType.CALL:
-                    greeks = GreeksCalculator.calculate_call_greeks(spot, strike, time_to_expiry, iv, rate)
-                else:
-                    greeks = GreeksCalculator.calculate_put_greeks(spot, strike, time_to_expiry, iv, rate)
-
-                # Approximate option price (simplified)
-                # This is a heuristic, not exact BS pricing
-                vega = greeks["vega"]
-                if vega == 0:
-                    break
-
-                # Adjust IV towards actual price
-                # (Full implementation would use actual BS price calculation)
-                price_diff = option_ltp * 0.01  # Assume ~1% accuracy from heuristic
-                iv_adjustment = price_diff / max(vega, 0.01)
-                iv = max(MIN_IV, min(MAX_IV, iv + iv_adjustment))
-
-            except Exception as e:
-                logger.warning(f"IV estimation error: {e}, using default")
-                return DEFAULT_IV
-
-        return max(MIN_IV, min(MAX_IV, iv))
-
 
 # ============================================================================
 # Broker Greeks Validator & Normalizer
@@ -320,9 +550,22 @@ class GreeksCalculationEngine:
         5. Health check results
     """
 
-    def __init__(self, risk_free_rate: float = RISK_FREE_RATE):
-        """Initialize Greeks engine"""
+    def __init__(self, risk_free_rate: float = RISK_FREE_RATE, cache=None):
+        """
+        Initialize Greeks engine
+
+        Args:
+            risk_free_rate: Risk-free rate
+            cache: GreeksCache for model Greeks (default: shared cache unless
+                GREEKS_CACHE_ENABLED is off)
+        """
+        from config import config
+        from .greeks_cache import get_greeks_cache
+
         self.risk_free_rate = risk_free_rate
+        if cache is None and getattr(config, "GREEKS_CACHE_ENABLED", True):
+            cache = get_greeks_cache()
+        self.cache = cache
         self.calculator = GreeksCalculator()
         self.iv_estimator = IvEstimator()
         self.validator = BrokerGreeksValidator()
@@ -332,6 +575,13 @@ class GreeksCalculationEngine:
         self.fallback_count = 0
         self.error_count = 0
 
+        # IV solver warm start + convergence stats
+        self.last_iv: Dict[Tuple[Optional[str], Optional[str]], Dict[Tuple[float, OptionType], float]] = {}
+        self.last_iv_expires: Dict[Tuple[Optional[str], Optional[str]], float] = {}  # epoch seconds
+        self.iv_solve_count = 0
+        self.iv_iteration_count = 0
+        self.iv_unconverged_count = 0
+
         logger.info(f"Greeks Engine initialized (Risk-free rate: {risk_free_rate*100:.2f}%)")
 
     def calculate_greeks(
@@ -343,6 +593,8 @@ class GreeksCalculationEngine:
         ltp: float,
         broker_greeks: Optional[Dict[str, float]] = None,
         broker_iv: Optional[float] = None,
+        underlying: Optional[str] = None,
+        expiry: Optional[str] = None,
     ) -> Tuple[GreeksSnapshot, str]:
         """
         Calculate Greeks for single strike
@@ -353,6 +605,8 @@ class GreeksCalculationEngine:
             3. Estimate IV from LTP
             4. Use default IV
 
+        underlying / expiry pick the cache bucket the strike is priced in.
+
         Returns:
             (GreeksSnapshot, status_message)
         """
@@ -398,7 +652,11 @@ class GreeksCalculationEngine:
                 iv_source = "estimated"
 
             # Calculate Greeks using BS
-            if option_type == OptionType.CALL:
+            if self.cache is not None:
+                greeks_dict = self.cache.get(
+                    spot, strike, time_to_expiry, iv, option_type, self.risk_free_rate, (underlying, expiry)
+                )
+            elif option_type == OptionType.CALL:
                 greeks_dict = self.calculator.calculate_call_greeks(
                     spot, strike, time_to_expiry, iv, self.risk_free_rate
                 )
@@ -447,6 +705,124 @@ class GreeksCalculationEngine:
 
             return snapshot, f"error_fallback: {str(e)}"
 
+    def calculate_greeks_batch(
+        self,
+        strikes: List[float],
+        option_types: List[OptionType],
+        spot: float,
+        days_to_expiry: float,
+        ltps: List[float],
+        broker_greeks: Optional[Dict[Tuple[float, OptionType], Dict[str, float]]] = None,
+        broker_ivs: Optional[Dict[Tuple[float, OptionType], float]] = None,
+        underlying: Optional[str] = None,
+        expiry: Optional[str] = None,
+    ) -> List[Tuple[GreeksSnapshot, str]]:
+        """
+        Calculate Greeks for a whole chain
+
+        Same priority as calculate_greeks per row, but missing IVs are solved
+        in one IvEstimator.solve_batch call (warm-started from the last converged
+        IV of the same underlying / expiry / strike / type) and every row that needs the BS model is priced in one
+        GreeksCalculator.calculate_batch pass. Broker maps are keyed by
+        (strike, option_type); underlying / expiry pick the cache bucket.
+
+        Returns:
+            [(GreeksSnapshot, status_message)] in input order
+        """
+        broker_greeks = broker_greeks or {}
+        broker_ivs = broker_ivs or {}
+        time_to_expiry = max(days_to_expiry / 365.0, 0.001)
+        results: List[Optional[Tuple[GreeksSnapshot, str]]] = [None] * len(strikes)
+
+        model_rows, ivs, iv_sources, solve_rows = [], [], [], []
+        for i, (strike, option_type, ltp) in enumerate(zip(strikes, option_types, ltps)):
+            key = (strike, option_type)
+            broker_greek = broker_greeks.get(key)
+            broker_iv = broker_ivs.get(key)
+            if broker_greek and "delta" in broker_greek:
+                # Broker rows keep the scalar path (validation + its own fallback)
+                results[i] = self.calculate_greeks(
+                    strike, option_type, spot, days_to_expiry, ltp, broker_greek, broker_iv, underlying, expiry
+                )
+                continue
+
+            if broker_iv is None or not (MIN_IV <= broker_iv <= MAX_IV):
+                solve_rows.append(len(model_rows))
+                broker_iv, iv_source = np.nan, "estimated"
+            else:
+                iv_source = "broker"
+            model_rows.append(i)
+            ivs.append(broker_iv)
+            iv_sources.append(iv_source)
+
+        if solve_rows:
+            # One vectorized IV solve, warm-started from the previous snapshot
+            rows = [model_rows[r] for r in solve_rows]
+            keys = [(strikes[i], option_types[i]) for i in rows]
+            warm = self._warm_start_ivs(underlying, expiry, days_to_expiry)
+            solution = self.iv_estimator.solve_batch(
+                [ltps[i] for i in rows],
+                spot,
+                [strikes[i] for i in rows],
+                time_to_expiry,
+                [option_types[i] for i in rows],
+                self.risk_free_rate,
+                initial_iv=[warm.get(key, np.nan) for key in keys],
+            )
+            for r, key, iv, converged in zip(solve_rows, keys, solution.iv.tolist(), solution.converged.tolist()):
+                ivs[r] = iv
+                if converged:
+                    warm[key] = iv
+            self.iv_solve_count += len(rows)
+            self.iv_iteration_count += int(solution.iterations.sum())
+            self.iv_unconverged_count += int((~solution.converged).sum())
+
+        if model_rows:
+            batch_args = (
+                spot,
+                [strikes[i] for i in model_rows],
+                time_to_expiry,
+                ivs,
+                [option_types[i] for i in model_rows],
+                self.risk_free_rate,
+            )
+            if self.cache is not None:
+                greeks = self.cache.get_batch(*batch_args, bucket=(underlying, expiry))
+            else:
+                greeks = self.calculator.calculate_batch(*batch_args)
+            now = datetime.now()
+            for row, i in enumerate(model_rows):
+                snapshot = GreeksSnapshot(
+                    strike=strikes[i],
+                    option_type=option_types[i],
+                    delta=float(greeks["delta"][row]),
+                    gamma=float(greeks["gamma"][row]),
+                    theta=float(greeks["theta"][row]),
+                    vega=float(greeks["vega"][row]),
+                    implied_volatility=ivs[row],
+                    iv_source=iv_sources[row],
+                    last_price=ltps[i],
+                    timestamp=now,
+                )
+                results[i] = (snapshot, f"calculated_bs_{iv_sources[row]}")
+            self.calculation_count += len(model_rows)
+            self.fallback_count += len(model_rows)
+
+        return results
+
+    def _warm_start_ivs(
+        self, underlying: Optional[str], expiry: Optional[str], days_to_expiry: float
+    ) -> Dict[Tuple[float, OptionType], float]:
+        """Last solved IVs for (underlying, expiry); drops expiries that have passed"""
+        now = time.time()
+        for bucket in [b for b, expires in self.last_iv_expires.items() if expires <= now]:
+            del self.last_iv_expires[bucket]
+            self.last_iv.pop(bucket, None)
+
+        bucket = (underlying, expiry)
+        self.last_iv_expires[bucket] = now + max(days_to_expiry, 1.0) * 86400  # at least through expiry day
+        return self.last_iv.setdefault(bucket, {})
+
     def get_metrics(self) -> Dict:
         """Return calculation metrics"""
         return {
@@ -454,4 +830,7 @@ class GreeksCalculationEngine:
             "fallback_to_bs": self.fallback_count,
             "errors": self.error_count,
             "success_rate": ((self.calculation_count - self.error_count) / max(self.calculation_count, 1) * 100),
+            "iv_solves": self.iv_solve_count,
+            "avg_iv_iterations": self.iv_iteration_count / max(self.iv_solve_count, 1),
+            "iv_unconverged": self.iv_unconverged_count,
         }
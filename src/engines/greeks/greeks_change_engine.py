@@ -10,7 +10,7 @@ Components:
 
 import logging
 from datetime import datetime
-from typing import Dict, Optional, List, Tuple
+from typing import Dict, Iterable, Optional, List, Tuple
 from dataclasses import dataclass, field
 
 from .greeks_models import GreeksSnapshot, GreeksDelta, AtmIntelligence, OptionType, ZoneType
@@ -269,6 +269,11 @@ class MomentumAnalyzer:
 
     def __init__(self):
         """Initialize analyzer"""
+        # Incremental state: strike -> (delta direction, gamma direction) in {-1, 0, 1}
+        self._contributions: Dict[float, Tuple[int, int]] = {}
+        self._delta_counts = {1: 0, -1: 0}
+        self._gamma_counts = {1: 0, -1: 0}
+
         logger.info("Momentum Analyzer initialized")
 
     def analyze_momentum(self, greeks_dict: Dict[float, GreeksSnapshot], atm_strike: float) -> Dict:
@@ -335,3 +340,73 @@ class MomentumAnalyzer:
         )
 
         return momentum_data
+
+    def update_momentum(
+        self, greeks_dict: Dict[float, GreeksSnapshot], changed_strikes: Iterable[float]
+    ) -> Dict:
+        """
+        Incremental equivalent of analyze_momentum
+
+        Only strikes whose Greeks were recomputed this update contribute
+        movement; strikes that moved last update but not this one drop back
+        to neutral. Running counts are adjusted per strike, so the cost is
+        proportional to the number of strikes that moved rather than the
+        chain size.
+
+        Returns:
+            Same shape as analyze_momentum
+        """
+        changed = set(changed_strikes)
+        for strike in changed | set(self._contributions):
+            greek = greeks_dict.get(strike) if strike in changed else None
+            self._set_contribution(strike, greek)
+
+        momentum_data = {"direction": "NEUTRAL", "strength": 0.5, "acceleration_score": 0.5, "signals": []}
+        chain_size = max(len(greeks_dict), 1)
+        bullish, bearish = self._delta_counts[1], self._delta_counts[-1]
+
+        if bullish > bearish:
+            momentum_data["direction"] = "BULLISH"
+            momentum_data["strength"] = min(bullish / chain_size, 1.0)
+            momentum_data["signals"].append("DELTA_ACCUMULATION_BULLISH")
+        elif bearish > bullish:
+            momentum_data["direction"] = "BEARISH"
+            momentum_data["strength"] = min(bearish / chain_size, 1.0)
+            momentum_data["signals"].append("DELTA_ACCUMULATION_BEARISH")
+
+        if self._gamma_counts[1] > self._gamma_counts[-1]:
+            momentum_data["acceleration_score"] += 0.2
+            momentum_data["signals"].append("GAMMA_EXPANDING")
+
+        momentum_data["acceleration_score"] = min(momentum_data["acceleration_score"], 1.0)
+        return momentum_data
+
+    def _set_contribution(self, strike: float, greek: Optional[GreeksSnapshot]):
+        """Replace one strike's contribution to the running counts"""
+        old_delta, old_gamma = self._contributions.pop(strike, (0, 0))
+        if old_delta:
+            self._delta_counts[old_delta] -= 1
+        if old_gamma:
+            self._gamma_counts[old_gamma] -= 1
+
+        delta_dir = gamma_dir = 0
+        if greek is not None:
+            delta_change = greek.delta_change
+            if delta_change:
+                delta_dir = 1 if delta_change > 0 else -1
+            gamma_expansion = greek.gamma_expansion
+            if gamma_expansion is not None and abs(gamma_expansion) > 0.001:
+                gamma_dir = 1 if gamma_expansion > 0 else -1
+
+        if delta_dir:
+            self._delta_counts[delta_dir] += 1
+        if gamma_dir:
+            self._gamma_counts[gamma_dir] += 1
+        if delta_dir or gamma_dir:
+            self._contributions[strike] = (delta_dir, gamma_dir)
+
+    def reset(self):
+        """Clear incremental state"""
+        self._contributions.clear()
+        self._delta_counts = {1: 0, -1: 0}
+        self._gamma_counts = {1: 0, -1: 0}
@@ -2,21 +2,62 @@
 Greeks & OI Data Manager
 Handles real-time Greeks and OI data fetching with rate limiting and caching
 Designed to minimize API calls while maintaining data freshness
+
+Hybrid mode (GREEKS_SOURCE=hybrid) computes Greeks locally from the streamed
+option LTP and underlying spot on every request, and only pulls broker
+Greeks every GREEKS_BROKER_RECALIBRATE_INTERVAL seconds per symbol to
+recalibrate the local IV and check drift against the broker values.
 """
 
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from threading import Lock, Thread
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List, Tuple
+from typing import Dict, Iterable, Optional, List, Tuple
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import defaultdict, deque
 
 from config import config
+from src.core.portfolio_greeks import get_portfolio_greeks_aggregator
 from src.utils.logger import StrategyLogger
 from src.utils.options_helper import OptionsHelper
+from .greeks_calculator import RISK_FREE_RATE, GreeksCalculator, IvEstimator
+from .greeks_health import GreeksHealthMonitor, get_greeks_health_monitor
+from .volatility_smile import get_smile_engine
 
 logger = StrategyLogger.get_logger(__name__)
 
+# NIFTY23000CE30DEC25 (ExpiryManager) or NIFTY30DEC2523000CE (AngelOne)
+_OPTION_SYMBOL_PATTERNS = (
+    re.compile(r"^(?P<underlying>[A-Z]+?)(?P<strike>\d+(?:\.\d+)?)(?P<type>CE|PE)(?P<expiry>\d{2}[A-Z]{3}\d{2})$"),
+    re.compile(r"^(?P<underlying>[A-Z]+?)(?P<expiry>\d{2}[A-Z]{3}\d{2})(?P<strike>\d+(?:\.\d+)?)(?P<type>CE|PE)$"),
+)
+
+
+def parse_option_symbol(symbol: str) -> Optional[Tuple[str, float, str, datetime]]:
+    """
+    Parse an option symbol into (underlying, strike, "CE"/"PE", expiry datetime)
+
+    Expiry is the session close (TRADING_SESSION_END) on the expiry date.
+    Returns None if the symbol is not a recognised option symbol.
+    """
+    for pattern in _OPTION_SYMBOL_PATTERNS:
+        match = pattern.match(symbol)
+        if match:
+            break
+    else:
+        return None
+
+    try:
+        expiry = datetime.strptime(match.group("expiry").title(), "%d%b%y")
+        close = getattr(config, "TRADING_SESSION_END", "15:30")
+        hour, minute = (int(part) for part in close.split(":"))
+    except ValueError:
+        return None
+    expiry = expiry.replace(hour=hour, minute=minute)
+    return match.group("underlying"), float(match.group("strike")), match.group("type"), expiry
+
 
 @dataclass
 class GreeksSnapshot:
@@ -68,10 +109,20 @@ class GreeksDataManager:
     3. Batch fetching - get option chain once, extract multiple strikes
     4. Rate limiting - respect API limits
     5. Fallback - use last known values if API fails
+    6. Concurrent refresh - due symbols fetched on a bounded pool and
+       published together once the cycle completes
     """
 
-    def __init__(self):
-        """Initialize Greeks data manager"""
+    API_RATE_WINDOW = 1.0  # seconds covered by GREEKS_API_RATE_LIMIT
+
+    def __init__(self, health_monitor: Optional[GreeksHealthMonitor] = None):
+        """
+        Initialize Greeks data manager
+
+        Args:
+            health_monitor: Monitor that receives drift flags (default: the one shared
+                with GreeksEngine, so its health checks report MODEL_DRIFT)
+        """
         self.options_helper = OptionsHelper()
 
         # State management
@@ -88,19 +139,55 @@ class GreeksDataManager:
         self.last_api_call = defaultdict(float)
         self.api_call_count = defaultdict(int)
         self.min_call_interval = getattr(config, "GREEKS_API_MIN_INTERVAL", 1)
+        self.api_rate_limit = getattr(config, "GREEKS_API_RATE_LIMIT", 10)
+        self._api_requests = deque()  # request times in the current rate window
+        self._budget_lock = Lock()
 
         # Background refresh
         self.refresh_thread = None
         self.refresh_running = False
         self.refresh_interval = getattr(config, "GREEKS_REFRESH_INTERVAL", 5)
+        self.refresh_workers = max(1, getattr(config, "GREEKS_REFRESH_WORKERS", 4))
+        self._refresh_pool: Optional[ThreadPoolExecutor] = None
+
+        # Hybrid mode: local Greeks from streamed prices, broker only to recalibrate
+        self.greeks_source = getattr(config, "GREEKS_SOURCE", "hybrid")
+        self.recalibrate_interval = getattr(config, "GREEKS_BROKER_RECALIBRATE_INTERVAL", 60)
+        self.max_tick_age = getattr(config, "GREEKS_LOCAL_MAX_TICK_AGE", 5)
+        self.price_feed = None
+        self.health_monitor = health_monitor or get_greeks_health_monitor()
+        self.iv_offsets: Dict[str, float] = {}  # symbol -> broker IV - local IV (vol points)
+        self.last_local_iv: Dict[str, float] = {}  # symbol -> solved IV (decimal), warm start
+        self._streamed_symbols = set()
+
+        # Every published snapshot also moves the live portfolio totals
+        self.portfolio_greeks = get_portfolio_greeks_aggregator()
 
         # Performance tracking
         self.api_calls_total = 0
         self.cache_hits = 0
         self.cache_misses = 0
+        self.refresh_cycles = 0
+        self.refresh_overruns = 0  # cycles that took longer than refresh_interval
+        self.last_cycle_ms = 0.0
+        self.max_cycle_ms = 0.0
+        self.total_cycle_ms = 0.0
+        self.local_computations = 0
+        self.broker_recalibrations = 0
 
         logger.info("GreeksDataManager initialized")
 
+    def attach_price_feed(self, price_feed):
+        """
+        Use a streaming feed for local Greeks (hybrid mode)
+
+        Args:
+            price_feed: DataFeed-like object with get_ltp_with_timestamp(symbol),
+                optionally get_quote(symbol) and subscribe_ltp(instruments)
+        """
+        self.price_feed = price_feed
+        logger.info(f"Greeks price feed attached (source: {self.greeks_source})")
+
     def start_background_refresh(self):
         """Start background thread for periodic data refresh"""
         if self.refresh_running:
@@ -117,28 +204,113 @@ class GreeksDataManager:
         self.refresh_running = False
         if self.refresh_thread:
             self.refresh_thread.join(timeout=5)
+        if self._refresh_pool:
+            self._refresh_pool.shutdown(wait=False)
+            self._refresh_pool = None
         logger.info("Stopped background Greeks refresh")
 
     def _refresh_loop(self):
         """Background loop for periodic data refresh"""
         while self.refresh_running:
             try:
-                # Refresh all active symbols
-                with self.data_lock:
-                    active_symbols_copy = self.active_symbols.copy()
-
-                for symbol in active_symbols_copy:
-                    try:
-                        self._fetch_greeks_for_symbol(symbol, force=False)
-                    except Exception as e:
-                        logger.error(f"Error refreshing Greeks for {symbol}: {e}")
+                started = time.perf_counter()
+                self.refresh_cycle()
 
-                time.sleep(self.refresh_interval)
+                # Keep the cadence fixed: only sleep what is left of the interval
+                elapsed = time.perf_counter() - started
+                time.sleep(max(0.0, self.refresh_interval - elapsed))
 
             except Exception as e:
                 logger.error(f"Error in refresh loop: {e}")
                 time.sleep(5)
 
+    def refresh_cycle(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, GreeksSnapshot]:
+        """
+        Refresh Greeks for all due symbols in one cycle
+
+        Symbols are fetched concurrently on a bounded worker pool under the
+        shared API rate budget. Nothing is published until every fetch has
+        finished, then all snapshots are swapped in under a single lock so
+        readers never see a half-refreshed set.
+
+        Args:
+            symbols: Symbols to refresh (defaults to the active set)
+
+        Returns:
+            Dict of symbol -> snapshot published this cycle
+        """
+        started = time.perf_counter()
+        if symbols is None:
+            with self.data_lock:
+                symbols = self.active_symbols.copy()
+
+        now = time.time()
+        interval = self._broker_interval()
+        due, local = [], []
+        for symbol in symbols:
+            since = now - self.last_api_call.get(symbol, 0)
+            if self._use_local(symbol) and since < interval:
+                local.append(symbol)
+            elif since >= self.min_call_interval:
+                due.append(symbol)
+
+        snapshots: Dict[str, GreeksSnapshot] = {}
+        for symbol in local:
+            snapshot = self._compute_local_greeks(symbol)
+            if snapshot is not None:
+                snapshots[symbol] = snapshot
+            elif (now - self.last_api_call.get(symbol, 0)) >= self.min_call_interval:
+                due.append(symbol)
+
+        if due:
+            if self._refresh_pool is None:
+                self._refresh_pool = ThreadPoolExecutor(
+                    max_workers=self.refresh_workers, thread_name_prefix="greeks-refresh"
+                )
+            for symbol, snapshot in zip(due, self._refresh_pool.map(self._refresh_one, due)):
+                if snapshot is not None:
+                    snapshots[symbol] = snapshot
+        if snapshots:
+            self._publish(snapshots)
+
+        self._record_cycle((time.perf_counter() - started) * 1000)
+        return snapshots
+
+    def _refresh_one(self, symbol: str) -> Optional[GreeksSnapshot]:
+        """Worker task: fetch one symbol without publishing"""
+        try:
+            return self._request_greeks(symbol)
+        except Exception as e:
+            logger.error(f"Error refreshing Greeks for {symbol}: {e}")
+            return None
+
+    def _record_cycle(self, cycle_ms: float):
+        """Update refresh cycle duration metrics"""
+        self.refresh_cycles += 1
+        self.last_cycle_ms = cycle_ms
+        self.total_cycle_ms += cycle_ms
+        self.max_cycle_ms = max(self.max_cycle_ms, cycle_ms)
+        if cycle_ms > self.refresh_interval * 1000:
+            self.refresh_overruns += 1
+            logger.warning(
+                f"Greeks refresh cycle took {cycle_ms:.0f}ms (interval {self.refresh_interval}s)"
+            )
+
+    def _acquire_api_budget(self):
+        """Block until the shared API rate window has room for one more call"""
+        while True:
+            with self._budget_lock:
+                now = time.time()
+                window_start = now - self.API_RATE_WINDOW
+                while self._api_requests and self._api_requests[0] <= window_start:
+                    self._api_requests.popleft()
+                if len(self._api_requests) < self.api_rate_limit:
+                    self._api_requests.append(now)
+                    self.api_calls_total += 1
+                    return
+                wait = self._api_requests[0] + self.API_RATE_WINDOW - now
+            time.sleep(max(wait, 0.001))
+
     def track_symbol(self, symbol: str):
         """Add symbol to active tracking list"""
         with self.data_lock:
@@ -174,6 +346,16 @@ class GreeksDataManager:
         Returns:
             GreeksSnapshot or None if fetch fails
         """
+        # Hybrid mode: compute from the latest ticks unless a broker check is due
+        if self._use_local(symbol):
+            if self._broker_check_due(symbol):
+                force_refresh = True  # recalibrate against the broker
+            else:
+                snapshot = self._compute_local_greeks(symbol, exchange, underlying_symbol, underlying_exchange)
+                if snapshot is not None:
+                    self._publish({symbol: snapshot})
+                    return snapshot
+
         # Check cache first
         if not force_refresh:
             with self.data_lock:
@@ -207,46 +389,209 @@ class GreeksDataManager:
                 return self.greeks_cache.get(symbol)
 
         try:
-            # Call API
-            self.last_api_call[symbol] = now
-            self.api_calls_total += 1
-            self.api_call_count[symbol] += 1
+            snapshot = self._request_greeks(symbol, exchange, underlying_symbol, underlying_exchange)
+        except Exception as e:
+            logger.error(f"Error fetching Greeks for {symbol}: {e}")
+            snapshot = None
 
-            response = self.options_helper.get_option_greeks(
-                symbol=symbol,
-                exchange=exchange,
-                underlying_symbol=underlying_symbol or config.PRIMARY_UNDERLYING,
-                underlying_exchange=underlying_exchange or config.UNDERLYING_EXCHANGE,
-            )
+        if snapshot is None:
+            # Return last known value if available
+            with self.data_lock:
+                return self.greeks_cache.get(symbol)
 
-            if not response or response.get("status") != "success":
-                logger.warning(f"Failed to fetch Greeks for {symbol}")
-                # Return cached value if available
-                with self.data_lock:
-                    return self.greeks_cache.get(symbol)
+        self._publish({symbol: snapshot})
+        return snapshot
 
-            # Extract data - response format from AngelOne SmartAPI
-            data = response.get("data", {})
+    def _request_greeks(
+        self,
+        symbol: str,
+        exchange: str = "NFO",
+        underlying_symbol: Optional[str] = None,
+        underlying_exchange: Optional[str] = None,
+    ) -> Optional[GreeksSnapshot]:
+        """Call the Greeks API under the shared rate budget (does not publish)"""
+        self.last_api_call[symbol] = time.time()
+        self._acquire_api_budget()
+        self.api_call_count[symbol] += 1
+
+        response = self.options_helper.get_option_greeks(
+            symbol=symbol,
+            exchange=exchange,
+            underlying_symbol=underlying_symbol or config.PRIMARY_UNDERLYING,
+            underlying_exchange=underlying_exchange or config.UNDERLYING_EXCHANGE,
+        )
+
+        if not response or response.get("status") != "success":
+            logger.warning(f"Failed to fetch Greeks for {symbol}")
+            return None
 
-            # Create snapshot from AngelOne response
-            snapshot = GreeksSnapshot(
-                symbol=symbol,
-                timestamp=datetime.now(),
-                delta=data.get("delta", 0.0),
-                gamma=data.get("gamma", 0.0),
-                theta=data.get("theta", 0.0),
-                vega=data.get("vega", 0.0),
-                iv=data.get("iv", 0.0),
-                ltp=data.get("ltp", 0.0),
-                bid=data.get("bid", 0.0),
-                ask=data.get("ask", 0.0),
-                volume=data.get("volume", 0),
-                oi=data.get("oi", 0),
-                oi_change=data.get("oi_change", 0.0),
+        # Extract data - response format from AngelOne SmartAPI
+        data = response.get("data", {})
+
+        # Create snapshot from AngelOne response
+        snapshot = GreeksSnapshot(
+            symbol=symbol,
+            timestamp=datetime.now(),
+            delta=data.get("delta", 0.0),
+            gamma=data.get("gamma", 0.0),
+            theta=data.get("theta", 0.0),
+            vega=data.get("vega", 0.0),
+            iv=data.get("iv", 0.0),
+            ltp=data.get("ltp", 0.0),
+            bid=data.get("bid", 0.0),
+            ask=data.get("ask", 0.0),
+            volume=data.get("volume", 0),
+            oi=data.get("oi", 0),
+            oi_change=data.get("oi_change", 0.0),
+        )
+
+        logger.debug(
+            f"Fetched Greeks for {symbol}: Delta={snapshot.delta:.4f}, Gamma={snapshot.gamma:.4f}, IV={snapshot.iv:.2f}"
+        )
+
+        if self.greeks_source == "hybrid":
+            self._recalibrate(symbol, snapshot, exchange, underlying_symbol, underlying_exchange)
+
+        return snapshot
+
+    # -------- Hybrid mode: local Greeks --------
+
+    def _use_local(self, symbol: str) -> bool:
+        """Local Greeks are served in hybrid mode unless the symbol is flagged for drift"""
+        return (
+            self.greeks_source == "hybrid"
+            and self.price_feed is not None
+            and not self.health_monitor.is_drifting(symbol)
+        )
+
+    def _broker_interval(self) -> float:
+        """Minimum seconds between broker Greeks calls for one symbol"""
+        if self.greeks_source == "hybrid" and self.price_feed is not None:
+            return max(self.recalibrate_interval, self.min_call_interval)
+        return self.min_call_interval
+
+    def _broker_check_due(self, symbol: str) -> bool:
+        return (time.time() - self.last_api_call.get(symbol, 0)) >= self._broker_interval()
+
+    def _streamed_price(self, symbol: str, exchange: str) -> Optional[float]:
+        """Latest streamed LTP if fresh; subscribes the symbol on first use"""
+        tick = self.price_feed.get_ltp_with_timestamp(symbol)
+        if not tick:
+            if symbol not in self._streamed_symbols and hasattr(self.price_feed, "subscribe_ltp"):
+                self._streamed_symbols.add(symbol)
+                try:
+                    self.price_feed.subscribe_ltp([{"exchange": exchange, "symbol": symbol}])
+                except Exception as e:
+                    logger.warning(f"Could not subscribe {symbol} for local Greeks: {e}")
+            return None
+
+        timestamp = tick.get("timestamp")
+        if timestamp and (datetime.now() - timestamp).total_seconds() > self.max_tick_age:
+            return None
+        price = tick.get("price") or 0.0
+        return price if price > 0 else None
+
+    def _compute_local_greeks(
+        self,
+        symbol: str,
+        exchange: str = "NFO",
+        underlying_symbol: Optional[str] = None,
+        underlying_exchange: Optional[str] = None,
+        iv_offset: Optional[float] = None,
+    ) -> Optional[GreeksSnapshot]:
+        """
+        Greeks from the streamed option LTP and underlying spot
+
+        IV is solved from the LTP (warm-started from the last solve), shifted by
+        the broker calibration offset, and priced with the real time to expiry.
+        Returns None when the symbol can't be parsed or prices are missing/stale.
+        """
+        parsed = parse_option_symbol(symbol)
+        if parsed is None or self.price_feed is None:
+            return None
+        underlying, strike, option_type, expiry = parsed
+
+        ltp = self._streamed_price(symbol, exchange)
+        spot = self._streamed_price(
+            underlying_symbol or underlying,
+            underlying_exchange or config.UNDERLYING_EXCHANGE,
+        )
+        time_to_expiry = (expiry - datetime.now()).total_seconds() / (365.0 * 24 * 3600)
+        if ltp is None or spot is None or time_to_expiry <= 0:
+            return None
+
+        solution = IvEstimator.solve_batch(
+            [ltp],
+            spot,
+            [strike],
+            time_to_expiry,
+            [option_type],
+            RISK_FREE_RATE,
+            initial_iv=[self.last_local_iv.get(symbol, float("nan"))],
+        )
+        market_iv = float(solution.iv[0])
+        if bool(solution.converged[0]):
+            self.last_local_iv[symbol] = market_iv
+            # Every solved strike also refines the expiry's smile
+            get_smile_engine().get_smile(underlying, expiry.strftime("%d%b%y").upper()).update(
+                [strike], [market_iv], spot=spot, time_to_expiry=time_to_expiry
             )
 
-            # Update cache and rolling state
-            with self.data_lock:
+        offset = self.iv_offsets.get(symbol, 0.0) if iv_offset is None else iv_offset
+        iv = max(market_iv * 100 + offset, 0.01)
+        greeks = GreeksCalculator.calculate_batch(spot, strike, time_to_expiry, iv / 100, option_type)
+
+        quote = self.price_feed.get_quote(symbol) if hasattr(self.price_feed, "get_quote") else None
+        with self.data_lock:
+            last = self.greeks_cache.get(symbol)
+
+        self.local_computations += 1
+        return GreeksSnapshot(
+            symbol=symbol,
+            timestamp=datetime.now(),
+            delta=float(greeks["delta"]),
+            gamma=float(greeks["gamma"]),
+            theta=float(greeks["theta"]),
+            vega=float(greeks["vega"]),
+            iv=iv,
+            ltp=ltp,
+            bid=(quote or {}).get("bid") or (last.bid if last else 0.0),
+            ask=(quote or {}).get("ask") or (last.ask if last else 0.0),
+            volume=last.volume if last else 0,
+            oi=last.oi if last else 0,
+            oi_change=last.oi_change if last else 0.0,
+        )
+
+    def _recalibrate(
+        self,
+        symbol: str,
+        broker: GreeksSnapshot,
+        exchange: str = "NFO",
+        underlying_symbol: Optional[str] = None,
+        underlying_exchange: Optional[str] = None,
+    ):
+        """Check local vs broker drift, then re-anchor the local IV to the broker's"""
+        if self.price_feed is None:
+            return
+        local = self._compute_local_greeks(symbol, exchange, underlying_symbol, underlying_exchange)
+        if local is None:
+            return
+
+        self.broker_recalibrations += 1
+        parsed = parse_option_symbol(symbol)
+        self.health_monitor.check_drift(
+            symbol,
+            {"delta": local.delta, "iv": local.iv},
+            {"delta": broker.delta, "iv": broker.iv},
+            underlying=parsed[0] if parsed else None,
+        )
+        if broker.iv > 0:
+            self.iv_offsets[symbol] = self.iv_offsets.get(symbol, 0.0) + (broker.iv - local.iv)
+
+    def _publish(self, snapshots: Dict[str, GreeksSnapshot]):
+        """Swap snapshots into the cache and rolling state in one step"""
+        with self.data_lock:
+            for symbol, snapshot in snapshots.items():
                 # Move current to prev
                 if symbol in self.current_greeks:
                     self.prev_greeks[symbol] = self.current_greeks[symbol]
@@ -254,18 +599,7 @@ class GreeksDataManager:
                 # Update current
                 self.current_greeks[symbol] = snapshot
                 self.greeks_cache[symbol] = snapshot
-
-            logger.debug(
-                f"Fetched Greeks for {symbol}: Delta={snapshot.delta:.4f}, Gamma={snapshot.gamma:.4f}, IV={snapshot.iv:.2f}"
-            )
-
-            return snapshot
-
-        except Exception as e:
-            logger.error(f"Error fetching Greeks for {symbol}: {e}")
-            # Return last known value if available
-            with self.data_lock:
-                return self.greeks_cache.get(symbol)
+        self.portfolio_greeks.apply_greeks(snapshots)
 
     def get_option_chain_data(
         self,
@@ -369,6 +703,15 @@ class GreeksDataManager:
             "cache_hit_rate": hit_rate,
             "active_symbols": len(self.active_symbols),
             "cached_symbols": len(self.greeks_cache),
+            "refresh_cycles": self.refresh_cycles,
+            "last_cycle_ms": self.last_cycle_ms,
+            "avg_cycle_ms": self.total_cycle_ms / self.refresh_cycles if self.refresh_cycles else 0.0,
+            "max_cycle_ms": self.max_cycle_ms,
+            "refresh_overruns": self.refresh_overruns,
+            "greeks_source": self.greeks_source,
+            "local_computations": self.local_computations,
+            "broker_recalibrations": self.broker_recalibrations,
+            "drifting_symbols": sorted(self.health_monitor.drifting_symbols),
         }
 
     def clear_stale_cache(self):
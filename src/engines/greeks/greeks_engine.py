@@ -6,14 +6,18 @@ Components:
     • GreeksEngine - Main orchestrator
     • Integration with Phase 2B OptionChainDataEngine
     • Clean interface for strategy layer
+    • Incremental updates - only strikes whose inputs moved are recomputed
 """
 
 import logging
 import threading
 import time
+from dataclasses import replace
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Callable, List
 
+from config import config
+from src.core.latency_optimizer import DifferentialProcessor
 from .greeks_models import (
     GreeksSnapshot,
     OptionType,
@@ -21,16 +25,36 @@ from .greeks_models import (
     GreeksHealthStatus,
     VolatilityState,
     AtmIntelligence,
+    ZoneType,
 )
 from .greeks_calculator import GreeksCalculationEngine
 from .greeks_change_engine import GreeksChangeTracker, ZoneDetector, MomentumAnalyzer
 from .greeks_oi_sync import GreeksOiSyncValidator
-from .greeks_health import GreeksHealthMonitor
-from .option_chain_data_models import StrikeData
+from .greeks_health import GreeksHealthMonitor, get_greeks_health_monitor
+from .volatility_smile import get_smile_engine
+from src.utils.option_chain_data_models import OptionType as ChainOptionType, StrikeData
 
 logger = logging.getLogger(__name__)
 
 
+def _settled(greek: GreeksSnapshot) -> GreeksSnapshot:
+    """Carried-over snapshot with zero velocity (its inputs held still this cycle)"""
+    if greek.delta_previous is None or (
+        greek.delta_previous == greek.delta
+        and greek.gamma_previous == greek.gamma
+        and greek.theta_previous == greek.theta
+        and greek.vega_previous == greek.vega
+    ):
+        return greek
+    return replace(
+        greek,
+        delta_previous=greek.delta,
+        gamma_previous=greek.gamma,
+        theta_previous=greek.theta,
+        vega_previous=greek.vega,
+    )
+
+
 class GreeksEngine:
     """
     Main Greeks orchestrator
@@ -42,15 +66,35 @@ class GreeksEngine:
     Exposes clean interface: get_direction_bias(), get_acceleration(), get_theta_pressure()
     """
 
-    def __init__(self, risk_free_rate: float = 0.06):
-        """Initialize Greeks engine"""
+    def __init__(self, risk_free_rate: float = 0.06, health_monitor: Optional[GreeksHealthMonitor] = None):
+        """
+        Initialize Greeks engine
+
+        Args:
+            risk_free_rate: Risk-free rate
+            health_monitor: Health monitor (default: shared with GreeksDataManager, whose
+                broker drift checks surface here as MODEL_DRIFT)
+        """
         # Component initialization
         self.calculator = GreeksCalculationEngine(risk_free_rate=risk_free_rate)
         self.change_tracker = GreeksChangeTracker()
         self.zone_detector = ZoneDetector()
         self.momentum_analyzer = MomentumAnalyzer()
         self.oi_sync_validator = GreeksOiSyncValidator()
-        self.health_monitor = GreeksHealthMonitor()
+        self.health_monitor = health_monitor or get_greeks_health_monitor()
+
+        # Per-strike Greeks inputs; a strike is recomputed only when one moves past its epsilon
+        self.incremental_enabled = getattr(config, "GREEKS_INCREMENTAL_ENABLED", True)
+        self.input_tracker = DifferentialProcessor(
+            tolerances={
+                "moneyness": getattr(config, "GREEKS_INCREMENTAL_MONEYNESS_EPSILON", 0.0001),
+                "days_to_expiry": getattr(config, "GREEKS_INCREMENTAL_TTE_EPSILON", 0.001),
+                "ltp": getattr(config, "GREEKS_INCREMENTAL_LTP_EPSILON", 0.05),
+                "iv": getattr(config, "GREEKS_INCREMENTAL_IV_EPSILON", 0.0005),
+            }
+        )
+        self.strike_zones: Dict[float, ZoneType] = {}  # strike -> zone classification
+        self.momentum: Optional[Dict] = None
 
         # State tracking
         self.current_greeks: Dict[float, GreeksSnapshot] = {}  # strike -> Greeks
@@ -65,6 +109,7 @@ class GreeksEngine:
         self.underlying: Optional[str] = None
         self.atm_strike: Optional[float] = None
         self.days_to_expiry: float = 0.0
+        self.expiry: Optional[str] = None  # Expiry label; enables the volatility smile feed
 
         # Threading
         self.background_update_thread: Optional[threading.Thread] = None
@@ -78,14 +123,27 @@ class GreeksEngine:
         self.signal_count = 0
         self.fake_moves_blocked = 0
         self.theta_exits_triggered = 0
+        self.update_count = 0
+        self.strikes_recomputed = 0
+        self.strikes_skipped = 0
+        self.last_strikes_recomputed = 0
+        self.last_strikes_skipped = 0
 
         logger.info("Greeks Engine initialized")
 
-    def set_universe(self, underlying: str, atm_strike: float, days_to_expiry: float):
-        """Set trading universe (ATM reference, time to expiry)"""
+    def set_universe(
+        self, underlying: str, atm_strike: float, days_to_expiry: float, expiry: Optional[str] = None
+    ):
+        """Set trading universe (ATM reference, time to expiry, optional expiry label)"""
+        if underlying != self.underlying:
+            # New chain: drop per-strike state so everything is recomputed
+            self.input_tracker.reset()
+            self.momentum_analyzer.reset()
+            self.strike_zones.clear()
         self.underlying = underlying
         self.atm_strike = atm_strike
         self.days_to_expiry = days_to_expiry
+        self.expiry = expiry
         logger.info(f"Greeks universe set: {underlying} ATM={atm_strike}, " f"expiry in {days_to_expiry:.1f} days")
 
     def update_from_option_chain(
@@ -113,59 +171,156 @@ class GreeksEngine:
         self.previous_greeks = dict(self.current_greeks)
         self.previous_oi_data = dict(self.current_oi_data)
 
-        # Clear current
-        self.current_greeks = {}
+        # -------- Find strikes whose Greeks inputs moved --------
+        changed = self._changed_strikes(option_chain_snapshot, broker_greeks, broker_iv)
+
+        # Unchanged strikes keep their last Greeks, with no velocity since nothing moved
+        self.current_greeks = {
+            strike: _settled(greek)
+            for strike, greek in self.previous_greeks.items()
+            if strike in option_chain_snapshot and strike not in changed
+        }
         self.current_oi_data = {}
 
-        # -------- Calculate Greeks for each strike --------
-        for strike, chain_data in option_chain_snapshot.items():
+        # -------- Calculate Greeks for the changed strikes in one batch --------
+        strikes, option_types, ltps = [], [], []
+        batch_broker_greeks, batch_broker_ivs = {}, {}
+        for strike in changed:
+            chain_data = option_chain_snapshot[strike]
+            option_type = OptionType.CALL if chain_data.get("type") == "CE" else OptionType.PUT
+            strikes.append(strike)
+            option_types.append(option_type)
+            ltps.append(chain_data.get("ltp", 0.0))
+            if broker_greeks and strike in broker_greeks:
+                batch_broker_greeks[(strike, option_type)] = broker_greeks[strike]
+            if broker_iv and strike in broker_iv:
+                batch_broker_ivs[(strike, option_type)] = broker_iv[strike]
+
+        results = []
+        if strikes:
             try:
-                # Determine option type
-                option_type = OptionType.CALL if chain_data.get("type") == "CE" else OptionType.PUT
-
-                # Get broker data if available
-                broker_greek = broker_greeks.get(strike) if broker_greeks else None
-                broker_iv_val = broker_iv.get(strike) if broker_iv else None
-
-                # Calculate Greeks
-                greek_snapshot, status = self.calculator.calculate_greeks(
-                    strike=strike,
-                    option_type=option_type,
+                results = self.calculator.calculate_greeks_batch(
+                    strikes=strikes,
+                    option_types=option_types,
                     spot=self.atm_strike,
                     days_to_expiry=self.days_to_expiry,
-                    ltp=chain_data.get("ltp", 0.0),
-                    broker_greeks=broker_greek,
-                    broker_iv=broker_iv_val,
+                    ltps=ltps,
+                    broker_greeks=batch_broker_greeks,
+                    broker_ivs=batch_broker_ivs,
+                    underlying=self.underlying,
+                    expiry=self.expiry,
                 )
+            except Exception as e:
+                logger.error(f"Error calculating chain Greeks: {e}")
 
-                # Store Greek
+        for (greek_snapshot, status), strike in zip(results, strikes):
+            try:
+                # Store Greek (tracker fills in the previous values for velocity)
+                self.change_tracker.update(strike, greek_snapshot)
                 self.current_greeks[strike] = greek_snapshot
-
-                # Store OI data for sync validation
-                oi_data = StrikeData(
-                    strike=strike,
-                    option_type=option_type,
-                    ltp=chain_data.get("ltp", 0.0),
-                    bid=chain_data.get("bid", 0.0),
-                    ask=chain_data.get("ask", 0.0),
-                    open_interest=chain_data.get("oi", 0),
-                    volume=chain_data.get("volume", 0),
-                    timestamp=datetime.now(),
-                )
-                self.current_oi_data[strike] = oi_data
-
             except Exception as e:
                 logger.error(f"Error updating Greeks for strike {strike}: {e}")
                 continue
 
+        # -------- Feed recomputed IVs into the expiry's smile --------
+        if self.expiry and strikes:
+            self._update_smile(strikes)
+
+        # -------- OI data for sync validation (every strike) --------
+        now = datetime.now()
+        for strike, chain_data in option_chain_snapshot.items():
+            greek = self.current_greeks.get(strike)
+            if greek is None:
+                continue
+            self.current_oi_data[strike] = StrikeData(
+                strike=strike,
+                option_type=ChainOptionType(greek.option_type.value),
+                ltp=chain_data.get("ltp", 0.0),
+                bid=chain_data.get("bid", 0.0),
+                ask=chain_data.get("ask", 0.0),
+                oi=chain_data.get("oi", 0),
+                volume=chain_data.get("volume", 0),
+                timestamp=now,
+            )
+
+        skipped = len(option_chain_snapshot) - len(changed)
+        self.update_count += 1
+        self.strikes_recomputed += len(changed)
+        self.strikes_skipped += skipped
+        self.last_strikes_recomputed = len(changed)
+        self.last_strikes_skipped = skipped
+
         # -------- Post-update analysis --------
-        self._analyze_greeks()
+        self._analyze_greeks(changed)
         self._generate_strategy_signal()
 
-    def _analyze_greeks(self):
-        """Analyze Greeks and generate intelligence"""
+    def _update_smile(self, strikes: List[float]):
+        """Add freshly computed IVs (vega-weighted) to the smile for this expiry"""
+        greeks = [self.current_greeks[s] for s in strikes if s in self.current_greeks]
+        if not greeks:
+            return
+        try:
+            get_smile_engine().get_smile(self.underlying, self.expiry).update(
+                [g.strike for g in greeks],
+                [g.implied_volatility for g in greeks],
+                [max(g.vega, 0.0) for g in greeks],
+                spot=self.atm_strike,
+                time_to_expiry=max(self.days_to_expiry / 365.0, 0.001),
+            )
+        except Exception as e:
+            logger.error(f"Error updating volatility smile: {e}")
+
+    def _changed_strikes(
+        self, option_chain_snapshot: Dict, broker_greeks: Optional[Dict], broker_iv: Optional[Dict]
+    ) -> List[float]:
+        """Strikes whose spot-relative inputs, LTP, IV or broker Greeks moved past epsilon"""
+        inputs = {}
+        for strike, chain_data in option_chain_snapshot.items():
+            broker_greek = broker_greeks.get(strike) if broker_greeks else None
+            inputs[strike] = {
+                "type": chain_data.get("type"),
+                "moneyness": strike / self.atm_strike,
+                "days_to_expiry": self.days_to_expiry,
+                "ltp": chain_data.get("ltp", 0.0),
+                "iv": broker_iv.get(strike) if broker_iv else None,
+                "broker_greeks": tuple(sorted(broker_greek.items())) if broker_greek else None,
+            }
+        changes = self.input_tracker.get_changes(inputs)
+
+        if not self.incremental_enabled:
+            return list(option_chain_snapshot)
+        # Strikes that failed last time are retried even if their inputs held still
+        return [
+            strike
+            for strike in option_chain_snapshot
+            if strike in changes or strike not in self.previous_greeks
+        ]
+
+    def _analyze_greeks(self, changed_strikes: Optional[List[float]] = None):
+        """
+        Analyze Greeks and generate intelligence
+
+        Zone classification is refreshed only for changed strikes and the ATM
+        zone scan only runs when something moved; momentum counts are always
+        updated so strikes that stopped moving fall back to neutral.
+        """
+        if changed_strikes is None:
+            changed_strikes = list(self.current_greeks)
+
+        removed = set(self.strike_zones) - set(self.current_greeks)
+        for strike in removed:
+            del self.strike_zones[strike]
+        for strike in changed_strikes:
+            greek = self.current_greeks.get(strike)
+            if greek is not None:
+                self.strike_zones[strike] = self.zone_detector.get_zone_type(strike, greek)
+
+        self.momentum = self.momentum_analyzer.update_momentum(self.current_greeks, changed_strikes)
+
         if not self.current_greeks:
             return
+        if self.atm_intelligence is not None and not changed_strikes and not removed:
+            return
 
         # Zone analysis
         self.atm_intelligence = self.zone_detector.analyze_atm_zone(self.atm_strike, self.current_greeks)
@@ -357,6 +512,16 @@ class GreeksEngine:
             "oi_sync_metrics": self.oi_sync_validator.get_metrics(),
             "health_summary": self.health_monitor.get_health_summary(),
             "current_data_count": len(self.current_greeks),
+            "incremental": {
+                "updates": self.update_count,
+                "strikes_recomputed": self.strikes_recomputed,
+                "strikes_skipped": self.strikes_skipped,
+                "last_strikes_recomputed": self.last_strikes_recomputed,
+                "last_strikes_skipped": self.last_strikes_skipped,
+                "avg_skipped_per_update": (
+                    self.strikes_skipped / self.update_count if self.update_count else 0.0
+                ),
+            },
         }
 
     def get_detailed_status(self) -> Dict:
@@ -369,6 +534,8 @@ class GreeksEngine:
             },
             "greeks_count": len(self.current_greeks),
             "atm_intelligence": self.atm_intelligence,
+            "strike_zones": dict(self.strike_zones),
+            "momentum": self.momentum,
             "current_signal": self.current_signal,
             "health_status": self.health_monitor.get_health_summary(),
             "metrics": self.get_metrics(),
@@ -9,6 +9,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List, Tuple
 
+from config import config
 from .greeks_models import GreeksSnapshot, GreeksHealthReport, GreeksHealthStatus, OptionType, VolatilityState
 
 logger = logging.getLogger(__name__)
@@ -28,15 +29,24 @@ class GreeksHealthMonitor:
         frozen_greek_threshold: float = 0.0001,  # No movement = frozen
         iv_spike_threshold: float = 0.20,  # IV change >20% = spike
         min_greeks_for_health: int = 8,  # Need ≥8 strikes for healthy
+        drift_delta_threshold: float = 0.05,  # |local Δ - broker Δ| above this = drift
+        drift_iv_threshold: float = 2.0,  # |local IV - broker IV| (vol points) above this = drift
     ):
         """Initialize health monitor"""
         self.stale_threshold = stale_threshold_sec
         self.frozen_greek_threshold = frozen_greek_threshold
         self.iv_spike_threshold = iv_spike_threshold
         self.min_greeks_for_health = min_greeks_for_health
+        self.drift_delta_threshold = drift_delta_threshold
+        self.drift_iv_threshold = drift_iv_threshold
 
         # Tracking
         self.last_iv_level: Dict[str, float] = {}  # Track IV per underlying
+        self.drift: Dict[str, Tuple[float, float]] = {}  # symbol -> last (delta drift, IV drift)
+        self.drifting_symbols = set()  # Symbols whose local Greeks disagree with the broker
+        self.drift_underlying: Dict[str, Optional[str]] = {}  # symbol -> underlying it was checked under
+        self.drift_checks = 0
+        self.drift_alerts = 0
         self.health_history: List[GreeksHealthReport] = []
         self.max_history = 100
 
@@ -131,11 +141,17 @@ class GreeksHealthMonitor:
         if report.snapshot_count < self.min_greeks_for_health:
             issues.append("INSUFFICIENT_DATA")
 
+        report.model_drift_count = sum(
+            1 for symbol in self.drifting_symbols if self.drift_underlying.get(symbol) in (None, underlying)
+        )
+        if report.model_drift_count:
+            issues.append("MODEL_DRIFT")
+
         # Determine status
         if not issues:
             report.status = GreeksHealthStatus.HEALTHY
             report.can_trade = True
-        elif len(issues) == 1 and issues[0] in ["FROZEN_GREEKS", "CALCULATION_ERRORS"]:
+        elif len(issues) == 1 and issues[0] in ["FROZEN_GREEKS", "CALCULATION_ERRORS", "MODEL_DRIFT"]:
             report.status = GreeksHealthStatus.DEGRADED
             report.can_trade = True
         elif "STALE_DATA" in issues:
@@ -195,6 +211,44 @@ class GreeksHealthMonitor:
 
         return True, None
 
+    def check_drift(
+        self, symbol: str, local: Dict[str, float], broker: Dict[str, float], underlying: Optional[str] = None
+    ) -> bool:
+        """
+        Compare locally computed Greeks against broker Greeks for one symbol
+
+        Args:
+            symbol: Option symbol
+            local: {"delta": d, "iv": iv%} from the local model
+            broker: {"delta": d, "iv": iv%} from the broker API
+            underlying: Underlying whose health checks report the drift (all when None)
+
+        Returns:
+            True if drift is within thresholds (the symbol's flag is cleared)
+        """
+        delta_drift = abs(local["delta"] - broker["delta"])
+        iv_drift = abs(local["iv"] - broker["iv"]) if broker.get("iv") else 0.0
+        self.drift[symbol] = (delta_drift, iv_drift)
+        self.drift_underlying[symbol] = underlying
+        self.drift_checks += 1
+
+        if delta_drift > self.drift_delta_threshold or iv_drift > self.drift_iv_threshold:
+            if symbol not in self.drifting_symbols:
+                self.drift_alerts += 1
+                logger.warning(
+                    f"Greeks drift for {symbol}: Δ drift={delta_drift:.4f}, IV drift={iv_drift:.2f} "
+                    f"(thresholds {self.drift_delta_threshold}, {self.drift_iv_threshold})"
+                )
+            self.drifting_symbols.add(symbol)
+            return False
+
+        self.drifting_symbols.discard(symbol)
+        return True
+
+    def is_drifting(self, symbol: str) -> bool:
+        """True if the last broker check flagged drift for this symbol"""
+        return symbol in self.drifting_symbols
+
     def detect_iv_state(self, current_greeks: Dict[float, GreeksSnapshot]) -> VolatilityState:
         """
         Detect current IV state (surging, crushing, stable)
@@ -222,8 +276,13 @@ class GreeksHealthMonitor:
 
     def get_health_summary(self) -> Dict:
         """Get summary of health history"""
+        drift = {
+            "drift_checks": self.drift_checks,
+            "drift_alerts": self.drift_alerts,
+            "drifting_symbols": sorted(self.drifting_symbols),
+        }
         if not self.health_history:
-            return {"status": "NO_DATA"}
+            return {"status": "NO_DATA", **drift}
 
         latest = self.health_history[-1]
 
@@ -244,4 +303,20 @@ class GreeksHealthMonitor:
             "frozen_count": latest.frozen_greeks,
             "status_distribution_10": status_counts,
             "last_check": latest.timestamp,
+            **drift,
         }
+
+
+# Global monitor shared by the Greeks engine and the Greeks data manager
+_monitor: Optional[GreeksHealthMonitor] = None
+
+
+def get_greeks_health_monitor() -> GreeksHealthMonitor:
+    """Get or create the shared Greeks health monitor"""
+    global _monitor
+    if _monitor is None:
+        _monitor = GreeksHealthMonitor(
+            drift_delta_threshold=getattr(config, "GREEKS_DRIFT_DELTA_THRESHOLD", 0.05),
+            drift_iv_threshold=getattr(config, "GREEKS_DRIFT_IV_THRESHOLD", 2.0),
+        )
+    return _monitor
@@ -291,6 +291,7 @@ class GreeksHealthReport:
     frozen_greeks: int = 0  # Strikes with no Greek movement
     iv_spike: Optional[float] = None  # IV jumped % (or None if normal)
     calculation_errors: int = 0  # How many failed BS calculations
+    model_drift_count: int = 0  # Symbols whose local Greeks drifted from broker Greeks
 
     # Recommendation
     can_trade: bool = True  # Should strategy trade with this data?
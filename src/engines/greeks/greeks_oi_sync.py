@@ -7,17 +7,80 @@ Rules:
     • Delta ↑ + OI ↓ = Fake move (DANGER)
     • Gamma ↑ + OI ↑ = Acceleration potential (BULLISH)
     • Theta ↑ aggressively = Trap zone (AVOID)
+    • LTP ↑ + OI ↓ = Short covering / unwinding (price-OI divergence)
+    • IV and LTP moving opposite ways = IV divergence
+
+The chain check runs every rule for every strike and side in one vectorized
+pass over column arrays and returns a compact SYNC_DTYPE result array.
 """
 
 import logging
+import time
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
 
+from src.utils.option_chain_data_models import StrikeData
 from .greeks_models import GreeksSnapshot, OptionType, GreeksOiSyncResult
-from .option_chain_data_models import StrikeData
 
 logger = logging.getLogger(__name__)
 
+DIRECTION_THRESHOLD = 0.001  # 0.1% change counts as a move
+GAMMA_EXPANSION_THRESHOLD = 0.001
+THETA_SPIKE_THRESHOLD = -0.05
+
+# Recommendation codes in SYNC_DTYPE["recommendation"]
+RECOMMENDATIONS = ("NEUTRAL", "PROCEED", "CAUTION", "AVOID")
+NEUTRAL, PROCEED, CAUTION, AVOID = range(len(RECOMMENDATIONS))
+
+# Bits in SYNC_DTYPE["flags"]
+SMART_MONEY = 1  # Delta ↑ + OI ↑
+FAKE_MOVE = 2  # Delta ↑ + OI ↓
+REVERSAL = 4  # Delta ↓ + OI ↑
+ACCELERATION = 8  # Gamma expansion + OI ↑
+THETA_TRAP = 16  # Theta spike
+PRICE_OI_DIVERGENCE = 32  # LTP ↑ + OI ↓
+IV_DIVERGENCE = 64  # IV and LTP moving opposite ways
+DELTA_OI_ALIGNED = 128  # Delta and OI not contradicting
+NO_HISTORY = 256  # No previous row to compare against
+
+# One row per strike and side; directions are -1 (DOWN), 0 (FLAT), 1 (UP)
+SYNC_DTYPE = np.dtype(
+    [
+        ("strike", "f8"),
+        ("is_call", "?"),
+        ("delta_dir", "i1"),
+        ("oi_dir", "i1"),
+        ("ltp_dir", "i1"),
+        ("iv_dir", "i1"),
+        ("flags", "u2"),
+        ("quality", "f4"),
+        ("recommendation", "i1"),
+    ]
+)
+
+CHAIN_FIELDS = ("delta", "gamma", "iv", "oi", "ltp")
+
+
+def _has(data, name: str) -> bool:
+    names = getattr(getattr(data, "dtype", None), "names", None)
+    return name in names if names is not None else name in data
+
+
+def _column(data, name: str, n: int, default: float = np.nan) -> np.ndarray:
+    """Float column from a mapping of arrays or a structured array (default if absent)"""
+    if data is None or not _has(data, name):
+        return np.full(n, default)
+    return np.broadcast_to(np.asarray(data[name], dtype=float), (n,))
+
+
+def _directions(current: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    """Vectorized _get_direction_change: 1 UP, -1 DOWN, 0 FLAT (or no previous)"""
+    with np.errstate(invalid="ignore"):
+        pct = (current - previous) / np.maximum(np.abs(previous), 0.01)
+        return np.where(pct > DIRECTION_THRESHOLD, 1, np.where(pct < -DIRECTION_THRESHOLD, -1, 0)).astype(np.int8)
+
 
 class GreeksOiSyncValidator:
     """
@@ -132,6 +195,131 @@ class GreeksOiSyncValidator:
 
         return result
 
+    def validate_chain_arrays(self, current, previous=None) -> Dict:
+        """
+        Validate a whole chain (any number of strikes, sides and expiries) in one pass
+
+        Args:
+            current: Mapping of column arrays or a structured array with
+                delta, gamma, iv, oi, ltp per row; optional strike, is_call,
+                theta, gamma_expansion, theta_spike
+            previous: Same columns for the previous snapshot, row-aligned with
+                current. NaN (or a missing column / None) means no history.
+                Rows whose current OI is NaN are skipped but still count in
+                the chain size used for the recommendation.
+
+        Returns:
+            Same summary as validate_chain_sync; "details" is the SYNC_DTYPE array
+        """
+        started = time.perf_counter()
+        n = len(np.atleast_1d(current["delta"]))
+        cur = {name: _column(current, name, n) for name in CHAIN_FIELDS}
+        prev = {name: _column(previous, name, n) for name in CHAIN_FIELDS}
+
+        valid = ~np.isnan(cur["oi"])
+        history = valid & ~np.isnan(prev["delta"]) & ~np.isnan(prev["oi"])
+
+        delta_dir = np.where(history, _directions(cur["delta"], prev["delta"]), 0)
+        oi_dir = np.where(history, _directions(cur["oi"], prev["oi"]), 0)
+        ltp_dir = _directions(cur["ltp"], prev["ltp"])
+        iv_dir = _directions(cur["iv"], prev["iv"])
+
+        # Own-snapshot velocities win; otherwise derive them from the previous row
+        if _has(current, "gamma_expansion"):
+            gamma_expansion = _column(current, "gamma_expansion", n)
+        else:
+            gamma_expansion = cur["gamma"] - prev["gamma"]
+        if _has(current, "theta_spike"):
+            theta_spike = _column(current, "theta_spike", n)
+        else:
+            theta_spike = _column(current, "theta", n) - _column(previous, "theta", n)
+        gamma_expanded = np.nan_to_num(gamma_expansion) > GAMMA_EXPANSION_THRESHOLD
+        theta_spiked = history & (np.nan_to_num(theta_spike) < THETA_SPIKE_THRESHOLD)
+
+        up, down = delta_dir == 1, delta_dir == -1
+        smart = up & (oi_dir == 1)
+        fake = up & (oi_dir == -1)
+        reversal = down & (oi_dir == 1)
+        acceleration = history & gamma_expanded & (oi_dir == 1)
+        aligned = (up & (oi_dir != -1)) | (down & (oi_dir != 1))
+        price_oi = history & (ltp_dir == 1) & (oi_dir == -1)
+        iv_div = history & (ltp_dir * iv_dir == -1)
+
+        # Same rule order as validate_strike_sync
+        recommendation = np.select([smart, fake, reversal], [PROCEED, AVOID, CAUTION], NEUTRAL)
+        recommendation = np.where(acceleration, PROCEED, recommendation)
+        recommendation = np.where(theta_spiked & (recommendation != AVOID), CAUTION, recommendation)
+        quality = np.select([smart, fake], [0.9, 0.1], np.where(aligned, 0.6, 0.3))
+        quality = np.where(history, quality, 0.5)
+
+        flags = (
+            smart * SMART_MONEY
+            | fake * FAKE_MOVE
+            | reversal * REVERSAL
+            | acceleration * ACCELERATION
+            | theta_spiked * THETA_TRAP
+            | price_oi * PRICE_OI_DIVERGENCE
+            | iv_div * IV_DIVERGENCE
+            | (history & aligned) * DELTA_OI_ALIGNED
+            | ~history * NO_HISTORY
+        )
+
+        details = np.empty(int(valid.sum()), dtype=SYNC_DTYPE)
+        details["strike"] = _column(current, "strike", n)[valid]
+        details["is_call"] = _column(current, "is_call", n, 1.0)[valid] != 0
+        details["delta_dir"] = delta_dir[valid]
+        details["oi_dir"] = oi_dir[valid]
+        details["ltp_dir"] = ltp_dir[valid]
+        details["iv_dir"] = iv_dir[valid]
+        details["flags"] = flags[valid]
+        details["quality"] = quality[valid]
+        details["recommendation"] = recommendation[valid]
+
+        fake_count = int(fake[valid].sum())
+        smart_money_count = int(smart[valid].sum())
+        theta_danger_count = int(theta_spiked[valid].sum())
+        self.total_validations += len(details)
+        self.fake_moves_detected += fake_count
+        self.smart_money_signals += smart_money_count
+        self.theta_exits += theta_danger_count
+
+        # Aggregate recommendation
+        overall_quality = float(details["quality"].astype(float).mean()) if len(details) else 0.5
+
+        if fake_count > n * 0.3:  # >30% strikes are fake
+            chain_recommendation = "AVOID"
+        elif smart_money_count > n * 0.4:  # >40% are smart money
+            chain_recommendation = "PROCEED"
+        elif theta_danger_count > n * 0.2:  # >20% danger zones
+            chain_recommendation = "CAUTION"
+        else:
+            chain_recommendation = "NEUTRAL"
+
+        result_dict = {
+            "overall_alignment": overall_quality,
+            "fake_move_count": fake_count,
+            "smart_money_count": smart_money_count,
+            "theta_danger_count": theta_danger_count,
+            "reversal_count": int(reversal[valid].sum()),
+            "acceleration_count": int(acceleration[valid].sum()),
+            "price_oi_divergence_count": int(price_oi[valid].sum()),
+            "iv_divergence_count": int(iv_div[valid].sum()),
+            "recommendation": chain_recommendation,
+            "details": details,
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+            "timestamp": datetime.now(),
+        }
+
+        if fake_count:
+            logger.warning(f"FAKE MOVE DETECTED at {fake_count} strike(s): Delta ↑ but OI ↓")
+        logger.info(
+            f"Chain sync validation: quality={overall_quality:.2f}, "
+            f"fake={fake_count}, smart={smart_money_count}, "
+            f"theta_danger={theta_danger_count}, rec={chain_recommendation}"
+        )
+
+        return result_dict
+
     def validate_chain_sync(
         self,
         current_greeks: Dict[float, GreeksSnapshot],
@@ -143,6 +331,9 @@ class GreeksOiSyncValidator:
         Validate entire chain Greeks + OI alignment
         Aggregate view of fake moves, smart money, etc.
 
+        Builds column arrays from the snapshots and runs validate_chain_arrays,
+        so per-strike results match validate_strike_sync.
+
         Returns:
             {
                 "overall_alignment": 0-1,
@@ -150,64 +341,51 @@ class GreeksOiSyncValidator:
                 "smart_money_count": int,
                 "theta_danger_count": int,
                 "recommendation": "PROCEED" | "CAUTION" | "AVOID" | "NEUTRAL",
-                "details": [list of result objects]
+                "details": SYNC_DTYPE array (one row per strike with OI data),
+                ...divergence counts
             }
         """
-        fake_count = 0
-        smart_money_count = 0
-        theta_danger_count = 0
-        quality_scores = []
-        details = []
+        current, previous = self.chain_arrays(current_greeks, previous_greeks, current_oi_data, previous_oi_data)
+        return self.validate_chain_arrays(current, previous)
 
-        for strike, current_greek in current_greeks.items():
+    @staticmethod
+    def chain_arrays(
+        current_greeks: Dict[float, GreeksSnapshot],
+        previous_greeks: Dict[float, GreeksSnapshot],
+        current_oi_data: Dict[float, StrikeData],
+        previous_oi_data: Dict[float, StrikeData],
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """Row-aligned (current, previous) column arrays from strike-keyed snapshots"""
+        nan = float("nan")
+        current = {name: [] for name in CHAIN_FIELDS + ("strike", "is_call", "gamma_expansion", "theta_spike")}
+        previous = {name: [] for name in CHAIN_FIELDS}
+
+        for strike, greek in current_greeks.items():
+            oi_data = current_oi_data.get(strike)
             previous_greek = previous_greeks.get(strike)
-            current_oi = current_oi_data.get(strike)
             previous_oi = previous_oi_data.get(strike)
 
-            if current_oi is None:
-                continue
-
-            result = self.validate_strike_sync(current_greek, previous_greek, current_oi, previous_oi)
-            details.append(result)
-            quality_scores.append(result.quality_score)
-
-            if result.fake_move_detected:
-                fake_count += 1
-            if result.smart_money_signal:
-                smart_money_count += 1
-            if result.theta_exit_signal:
-                theta_danger_count += 1
-
-        # Aggregate recommendation
-        overall_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0.5
-
-        if fake_count > len(current_greeks) * 0.3:  # >30% strikes are fake
-            recommendation = "AVOID"
-        elif smart_money_count > len(current_greeks) * 0.4:  # >40% are smart money
-            recommendation = "PROCEED"
-        elif theta_danger_count > len(current_greeks) * 0.2:  # >20% danger zones
-            recommendation = "CAUTION"
-        else:
-            recommendation = "NEUTRAL"
-
-        result_dict = {
-            "overall_alignment": overall_quality,
-            "fake_move_count": fake_count,
-            "smart_money_count": smart_money_count,
-            "theta_danger_count": theta_danger_count,
-            "recommendation": recommendation,
-            "details": details,
-            "timestamp": datetime.now(),
-        }
-
-        logger.info(
-            f"Chain sync validation: quality={overall_quality:.2f}, "
-            f"fake={fake_count}, smart={smart_money_count}, "
-            f"theta_danger={theta_danger_count}, rec={recommendation}"
+            current["strike"].append(strike)
+            current["is_call"].append(greek.option_type == OptionType.CALL)
+            current["delta"].append(greek.delta)
+            current["gamma"].append(greek.gamma)
+            current["iv"].append(greek.implied_volatility)
+            current["oi"].append(oi_data.oi if oi_data is not None else nan)
+            current["ltp"].append(oi_data.ltp if oi_data is not None else greek.last_price)
+            current["gamma_expansion"].append(greek.gamma_expansion or 0.0)
+            current["theta_spike"].append(greek.theta_spike or 0.0)
+
+            previous["delta"].append(previous_greek.delta if previous_greek is not None else nan)
+            previous["gamma"].append(previous_greek.gamma if previous_greek is not None else nan)
+            previous["iv"].append(previous_greek.implied_volatility if previous_greek is not None else nan)
+            previous["oi"].append(previous_oi.oi if previous_oi is not None else nan)
+            previous["ltp"].append(previous_oi.ltp if previous_oi is not None else nan)
+
+        return (
+            {name: np.asarray(values, dtype=float) for name, values in current.items()},
+            {name: np.asarray(values, dtype=float) for name, values in previous.items()},
         )
 
-        return result_dict
-
     @staticmethod
     def _get_direction_change(current: float, previous: float) -> Optional[str]:
         """Determine if value moved UP, DOWN, or stayed FLAT"""
@@ -0,0 +1,351 @@
+"""
+PHASE 3 — Volatility Smile
+Per-underlying, per-expiry IV curve fitted to the strikes we observe
+
+Strike selection and ladder scans need IV (and so Greeks) for strikes that
+are not subscribed. Each smile fits a quadratic in log-moneyness
+
+    iv(k) = a + b·k + c·k²,   k = ln(K / F_ref)
+
+by weighted least squares. F_ref is the forward when the smile was first
+anchored; a quadratic in ln(K / F_ref) is the same family as one in
+ln(K / F), so moving spot only shifts the coefficients.
+
+    • Normal-equation sums are updated per quote (old row out, new row in),
+      so a new quote costs O(1) and the 3×3 solve runs lazily on the next query
+    • Fewer than three strikes degrade to a line / flat level
+    • Outside the observed range the curve continues along its edge tangent
+    • Quotes older than max_age are dropped; fit age is reported in stats
+"""
+
+import logging
+import math
+import time
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from config import config
+from .greeks_calculator import MAX_IV, MIN_IV, RISK_FREE_RATE, GreeksCalculator, IvEstimator
+
+logger = logging.getLogger(__name__)
+
+FULL_REBUILD_EVERY = 512  # incremental updates between exact rebuilds of the sums
+
+
+class VolatilitySmile:
+    """
+    IV smile for one underlying and expiry
+
+    Usage:
+        smile = get_smile_engine().get_smile("NIFTY", "30DEC25")
+        smile.update_from_prices(ltps, spot, strikes, tte, types)
+        smile.iv([22800, 23400])
+        smile.greeks([22800, 23400], "CE")      # GREEKS_DTYPE array, no network call
+    """
+
+    def __init__(self, underlying: str, expiry: str, max_age: Optional[float] = None):
+        """
+        Initialize smile
+
+        Args:
+            underlying: Underlying symbol
+            expiry: Expiry label (e.g. 30DEC25)
+            max_age: Seconds after which an observed strike is dropped
+        """
+        self.underlying = underlying
+        self.expiry = expiry
+        self.max_age = max_age or getattr(config, "SMILE_MAX_QUOTE_AGE", 300)
+
+        # Observations: strike -> (x = ln(K / F_ref), iv, weight, observed_at)
+        self._points: Dict[float, Tuple[float, float, float, float]] = {}
+        self._xtwx = np.zeros((3, 3))
+        self._xtwy = np.zeros(3)
+        self._lock = Lock()
+        self._ref_log_forward: Optional[float] = None
+
+        # Cached fit
+        self._coeffs: Optional[np.ndarray] = None
+        self._x_range: Tuple[float, float] = (0.0, 0.0)
+        self._dirty = False
+        self.fitted_at: Optional[float] = None
+
+        # Last market state (defaults for greeks())
+        self.spot: Optional[float] = None
+        self.time_to_expiry: Optional[float] = None
+        self._tte_at: float = 0.0
+        self.rate = RISK_FREE_RATE
+
+        # Stats
+        self.quote_updates = 0
+        self.refits = 0
+        self.rebuilds = 0
+
+    # -------- Observations --------
+
+    def update(
+        self,
+        strikes,
+        ivs,
+        weights=None,
+        spot: Optional[float] = None,
+        time_to_expiry: Optional[float] = None,
+    ) -> int:
+        """
+        Add or replace observed IVs (decimal) for some strikes
+
+        Args:
+            strikes: Strike(s)
+            ivs: IV(s) as decimals; rows outside [MIN_IV, MAX_IV] are ignored
+            weights: Optional per-row weights (e.g. vega)
+            spot: Current spot (anchors log-moneyness on first use)
+            time_to_expiry: Current time to expiry in years
+
+        Returns:
+            Number of rows accepted
+        """
+        strikes = np.atleast_1d(np.asarray(strikes, dtype=float))
+        ivs = np.broadcast_to(np.asarray(ivs, dtype=float), strikes.shape)
+        weights = np.broadcast_to(np.asarray(1.0 if weights is None else weights, dtype=float), strikes.shape)
+        now = time.time()
+
+        with self._lock:
+            if spot is not None:
+                self._set_market(spot, time_to_expiry, now)
+            if self._ref_log_forward is None:
+                if self.spot is None:
+                    return 0
+                self._ref_log_forward = self._log_forward(self.spot)
+
+            accepted = 0
+            for strike, iv, weight in zip(strikes.tolist(), ivs.tolist(), weights.tolist()):
+                if not (MIN_IV <= iv <= MAX_IV) or not weight > 0 or strike <= 0:
+                    continue
+                self._remove(strike)
+                x = math.log(strike) - self._ref_log_forward
+                self._add(x, iv, weight)
+                self._points[strike] = (x, iv, weight, now)
+                accepted += 1
+
+            self._prune(now)
+            self.quote_updates += accepted
+            if accepted:
+                self._dirty = True
+            if self.quote_updates and self.quote_updates % FULL_REBUILD_EVERY < accepted:
+                self._rebuild()
+            return accepted
+
+    def update_from_prices(
+        self,
+        prices,
+        spot: float,
+        strikes,
+        time_to_expiry: float,
+        option_types,
+        rate: float = RISK_FREE_RATE,
+    ) -> int:
+        """Solve IVs from option prices (one vectorized solve) and add them, vega-weighted"""
+        solution = IvEstimator.solve_batch(prices, spot, strikes, time_to_expiry, option_types, rate)
+        vegas = GreeksCalculator.calculate_batch(
+            spot, strikes, time_to_expiry, solution.iv, option_types, rate
+        )["vega"]
+        ivs = np.where(solution.converged, solution.iv, np.nan)
+        self.rate = rate
+        return self.update(strikes, ivs, vegas, spot=spot, time_to_expiry=time_to_expiry)
+
+    def _set_market(self, spot: float, time_to_expiry: Optional[float], now: float):
+        self.spot = spot
+        if time_to_expiry is not None:
+            self.time_to_expiry = time_to_expiry
+            self._tte_at = now
+
+    def _log_forward(self, spot: float) -> float:
+        tte = self.time_to_expiry or 0.0
+        return math.log(spot) + self.rate * tte
+
+    def _add(self, x: float, iv: float, weight: float, sign: float = 1.0):
+        row = np.array([1.0, x, x * x])
+        self._xtwx += sign * weight * np.outer(row, row)
+        self._xtwy += sign * weight * iv * row
+
+    def _remove(self, strike: float):
+        point = self._points.pop(strike, None)
+        if point is not None:
+            x, iv, weight, _ = point
+            self._add(x, iv, weight, sign=-1.0)
+
+    def _prune(self, now: float):
+        stale = [strike for strike, point in self._points.items() if now - point[3] > self.max_age]
+        for strike in stale:
+            self._remove(strike)
+        if stale:
+            self._dirty = True
+
+    def _rebuild(self):
+        """Recompute the sums exactly (clears floating-point residue from removals)"""
+        self._xtwx = np.zeros((3, 3))
+        self._xtwy = np.zeros(3)
+        for x, iv, weight, _ in self._points.values():
+            self._add(x, iv, weight)
+        self.rebuilds += 1
+
+    # -------- Fit --------
+
+    def _fit(self) -> Optional[np.ndarray]:
+        """Cached coefficients (a, b, c), refit only when quotes changed"""
+        with self._lock:
+            if not self._dirty:
+                return self._coeffs
+            self._prune(time.time())
+            n = len(self._points)
+            coeffs = np.zeros(3)
+            if n:
+                degree = min(n, 3)  # 1 point: flat, 2 points: line
+                try:
+                    coeffs[:degree] = np.linalg.solve(self._xtwx[:degree, :degree], self._xtwy[:degree])
+                except np.linalg.LinAlgError:
+                    coeffs[0] = self._xtwy[0] / self._xtwx[0, 0]
+                xs = [point[0] for point in self._points.values()]
+                self._x_range = (min(xs), max(xs))
+                self._coeffs = coeffs
+            else:
+                self._coeffs = None
+            self._dirty = False
+            self.fitted_at = time.time()
+            self.refits += 1
+            return self._coeffs
+
+    def is_fitted(self) -> bool:
+        return self._fit() is not None
+
+    def iv(self, strikes) -> np.ndarray:
+        """
+        Smile IV (decimal) for any strike(s)
+
+        Returns:
+            Array shaped like strikes; NaN if the smile has no observations
+        """
+        strikes = np.asarray(strikes, dtype=float)
+        coeffs = self._fit()
+        if coeffs is None:
+            return np.full(strikes.shape, np.nan)
+        a, b, c = coeffs
+        x = np.log(strikes) - self._ref_log_forward
+
+        # Tangent continuation beyond the observed strikes keeps the wings monotone
+        lo, hi = self._x_range
+        edge = np.clip(x, lo, hi)
+        iv = a + b * edge + c * edge * edge + (b + 2 * c * edge) * (x - edge)
+        return np.clip(iv, MIN_IV, MAX_IV)
+
+    def current_time_to_expiry(self) -> Optional[float]:
+        """Last reported time to expiry, aged by the wall clock since"""
+        if self.time_to_expiry is None:
+            return None
+        elapsed = (time.time() - self._tte_at) / (365.0 * 24 * 3600)
+        return max(self.time_to_expiry - elapsed, 0.0)
+
+    def greeks(
+        self,
+        strikes,
+        option_types,
+        spot: Optional[float] = None,
+        time_to_expiry: Optional[float] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Greeks (GREEKS_DTYPE, includes model price) priced at the smile IV
+
+        Spot / time to expiry default to the last values seen by update().
+        Returns None if the smile is not fitted or no market state is known.
+        """
+        spot = spot or self.spot
+        tte = time_to_expiry if time_to_expiry is not None else self.current_time_to_expiry()
+        ivs = self.iv(strikes)
+        if spot is None or tte is None or np.isnan(ivs).any():
+            return None
+        return GreeksCalculator.calculate_batch(spot, strikes, tte, ivs, option_types, self.rate)
+
+    # -------- Stats --------
+
+    @property
+    def fit_age(self) -> Optional[float]:
+        """Seconds since the last refit (None if never fitted)"""
+        return None if self.fitted_at is None else time.time() - self.fitted_at
+
+    def quote_age(self) -> Optional[float]:
+        """Seconds since the newest observed quote"""
+        with self._lock:
+            if not self._points:
+                return None
+            return time.time() - max(point[3] for point in self._points.values())
+
+    def get_stats(self) -> Dict:
+        """Get fit statistics"""
+        coeffs = self._fit()
+        rmse = None
+        if coeffs is not None:
+            with self._lock:
+                points = list(self._points.values())
+            xs = np.array([p[0] for p in points])
+            residuals = np.array([p[1] for p in points]) - (coeffs[0] + coeffs[1] * xs + coeffs[2] * xs * xs)
+            rmse = float(np.sqrt(np.mean(residuals**2)))
+        return {
+            "underlying": self.underlying,
+            "expiry": self.expiry,
+            "points": len(self._points),
+            "coefficients": None if coeffs is None else [float(v) for v in coeffs],
+            "rmse": rmse,
+            "fit_age_s": self.fit_age,
+            "quote_age_s": self.quote_age(),
+            "quote_updates": self.quote_updates,
+            "refits": self.refits,
+            "rebuilds": self.rebuilds,
+        }
+
+
+class SmileEngine:
+    """Registry of smiles keyed by (underlying, expiry)"""
+
+    def __init__(self):
+        self._smiles: Dict[Tuple[str, str], VolatilitySmile] = {}
+        self._lock = Lock()
+
+    def get_smile(self, underlying: str, expiry: str) -> VolatilitySmile:
+        """Get or create the smile for an underlying / expiry"""
+        key = (underlying, expiry)
+        with self._lock:
+            smile = self._smiles.get(key)
+            if smile is None:
+                smile = self._smiles[key] = VolatilitySmile(underlying, expiry)
+            return smile
+
+    def find(self, underlying: str, expiry: Optional[str] = None) -> Optional[VolatilitySmile]:
+        """
+        Existing smile for an underlying; without an expiry, the fitted smile
+        with the most recent quotes
+        """
+        with self._lock:
+            if expiry is not None:
+                return self._smiles.get((underlying, expiry))
+            smiles = [s for (u, _), s in self._smiles.items() if u == underlying and s.quote_updates]
+        ages = [(s.quote_age(), s) for s in smiles]
+        ages = [(age, s) for age, s in ages if age is not None]
+        return min(ages, key=lambda item: item[0])[1] if ages else None
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            smiles = list(self._smiles.values())
+        return {f"{s.underlying}:{s.expiry}": s.get_stats() for s in smiles}
+
+
+# Global smile registry
+_engine: Optional[SmileEngine] = None
+
+
+def get_smile_engine() -> SmileEngine:
+    """Get or create the shared smile engine"""
+    global _engine
+    if _engine is None:
+        _engine = SmileEngine()
+    return _engine
@@ -5,9 +5,12 @@ Foundation for Feature #3 in the 38-point roadmap.
 """
 
 from dataclasses import dataclass
+from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 from config import config
 from src.utils.logger import StrategyLogger
+from src.engines.greeks.greeks_data_manager import GreeksSnapshot
+from src.engines.greeks.volatility_smile import get_smile_engine
 
 logger = StrategyLogger.get_logger(__name__)
 
@@ -113,6 +116,7 @@ class MultiStrikePortfolioEngine:
         """
         candidates = []
         strike_interval = 50  # NIFTY 50-point intervals
+        smile = get_smile_engine().find(underlying, expiry_date)
 
         # Scan strikes: ATM, OTM (-1, -2, -3), ITM (+1, +2, +3)
         for offset in range(-self.strike_range, self.strike_range + 1):
@@ -127,6 +131,9 @@ class MultiStrikePortfolioEngine:
                     symbol=symbol, exchange="NFO", underlying_symbol=underlying, underlying_exchange="NSE"
                 )
 
+                if not greeks:
+                    # Unsubscribed strike: price it off the fitted smile (no network call)
+                    greeks = self._smile_greeks(smile, symbol, strike, option_type)
                 if not greeks:
                     logger.debug(f"No Greeks data for {symbol}")
                     continue
@@ -185,6 +192,30 @@ class MultiStrikePortfolioEngine:
 
         return candidates
 
+    def _smile_greeks(self, smile, symbol: str, strike: int, option_type: str) -> Optional[GreeksSnapshot]:
+        """Greeks for one strike from the volatility smile (None if no fit is available)"""
+        if smile is None:
+            return None
+        row = smile.greeks([strike], option_type)
+        if row is None:
+            return None
+        row = row[0]
+        return GreeksSnapshot(
+            symbol=symbol,
+            timestamp=datetime.now(),
+            delta=float(row["delta"]),
+            gamma=float(row["gamma"]),
+            theta=float(row["theta"]),
+            vega=float(row["vega"]),
+            iv=float(smile.iv(strike)) * 100,
+            ltp=float(row["price"]),
+            bid=0.0,
+            ask=0.0,
+            volume=0,
+            oi=0,
+            oi_change=0.0,
+        )
+
     def _score_iv(self, iv: float) -> float:
         """
         Score IV (prefer moderate levels, penalize extremes)
@@ -0,0 +1,332 @@
+"""
+Scenario Grid Engine
+Multi-leg P&L and risk over a spot × IV × time grid in one Black-Scholes pass
+
+Every leg is priced on every grid node in a single vectorized
+GreeksCalculator.calculate_batch call (shape spot × IV shift × time × leg),
+then summed with signed quantities into a P&L surface.
+
+    • P&L surfaces for adjustment / dashboard views
+    • Numerical breakevens (sign changes along the spot axis, interpolated)
+    • Worst-case loss under configured (spot %, IV points) shocks
+    • Expiry payoff profile (max profit / loss, unbounded wings detected)
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config import config
+from src.engines.greeks.greeks_calculator import (
+    DAYS_PER_YEAR,
+    DEFAULT_IV,
+    MIN_IV,
+    RISK_FREE_RATE,
+    GreeksCalculator,
+    call_mask,
+)
+from src.utils.logger import StrategyLogger
+
+logger = StrategyLogger.get_logger(__name__)
+
+EXPIRY_PROFILE_SPAN = 0.5  # expiry payoff evaluated from zero to 50% above the highest strike
+
+
+@dataclass
+class ScenarioLegs:
+    """Leg arrays in the shape the grid pricer needs"""
+
+    strikes: np.ndarray
+    is_call: np.ndarray
+    quantity: np.ndarray  # signed: negative for short legs
+    entry_price: np.ndarray
+    iv: np.ndarray  # decimal
+    time_to_expiry: np.ndarray  # years
+
+    @classmethod
+    def from_legs(cls, legs: Iterable, time_to_expiry=0.0, iv=None) -> "ScenarioLegs":
+        """
+        Read OptionLeg / LegPlan-like objects
+
+        Sign comes from ``direction`` (LegDirection) or ``action`` ("BUY"/"SELL"),
+        size from ``quantity`` or ``weight``. Leg IVs are in percent (the Greeks
+        feed convention); ``iv`` (decimal, scalar or per leg) overrides them.
+        """
+        legs = list(legs)
+        sides = [getattr(getattr(leg, "direction", None), "value", getattr(leg, "action", "BUY")) for leg in legs]
+        sizes = [getattr(leg, "quantity", getattr(leg, "weight", 1.0)) for leg in legs]
+        if iv is None:
+            leg_iv = np.array([getattr(leg, "iv", 0.0) or 0.0 for leg in legs], dtype=float) / 100.0
+            iv = np.where(leg_iv > 0, leg_iv, DEFAULT_IV)
+        n = len(legs)
+        return cls(
+            strikes=np.array([leg.strike for leg in legs], dtype=float),
+            is_call=call_mask([leg.option_type for leg in legs]) if n else np.zeros(0, dtype=bool),
+            quantity=np.array([-s if str(side).upper() == "SELL" else s for side, s in zip(sides, sizes)], dtype=float),
+            entry_price=np.array([getattr(leg, "entry_price", 0.0) or 0.0 for leg in legs], dtype=float),
+            iv=np.broadcast_to(np.asarray(iv, dtype=float), (n,)).copy(),
+            time_to_expiry=np.broadcast_to(np.asarray(time_to_expiry, dtype=float), (n,)).copy(),
+        )
+
+
+@dataclass
+class ScenarioResult:
+    """P&L surface over spot × IV shift × days forward"""
+
+    spots: np.ndarray  # (S,)
+    iv_shifts: np.ndarray  # (V,) vol points added to every leg's IV
+    days_forward: np.ndarray  # (T,)
+    pnl: np.ndarray  # (S, V, T)
+    elapsed_ms: float = 0.0
+
+    def _index(self, iv_shift: float, days: Optional[float]) -> Tuple[int, int]:
+        v = int(np.abs(self.iv_shifts - iv_shift).argmin())
+        t = len(self.days_forward) - 1 if days is None else int(np.abs(self.days_forward - days).argmin())
+        return v, t
+
+    def pnl_curve(self, iv_shift: float = 0.0, days: Optional[float] = None) -> np.ndarray:
+        """P&L along the spot axis for the nearest IV shift / time slice (default: last slice)"""
+        v, t = self._index(iv_shift, days)
+        return self.pnl[:, v, t]
+
+    def breakevens(self, iv_shift: float = 0.0, days: Optional[float] = None) -> List[float]:
+        """Spots where P&L crosses zero, linearly interpolated between grid nodes"""
+        return _zero_crossings(self.spots, self.pnl_curve(iv_shift, days))
+
+    def worst_case(self) -> Dict:
+        """Largest loss anywhere on the grid and where it occurs"""
+        s, v, t = np.unravel_index(int(self.pnl.argmin()), self.pnl.shape)
+        return {
+            "pnl": float(self.pnl[s, v, t]),
+            "spot": float(self.spots[s]),
+            "iv_shift": float(self.iv_shifts[v]),
+            "days_forward": float(self.days_forward[t]),
+        }
+
+    def best_case(self) -> float:
+        return float(self.pnl.max())
+
+
+def _zero_crossings(spots: np.ndarray, pnl: np.ndarray) -> List[float]:
+    sign = np.sign(pnl)
+    # Exact zeros count only at the edge of a flat-zero run
+    nonzero = sign != 0
+    edge = np.zeros_like(nonzero)
+    edge[1:] |= nonzero[:-1]
+    edge[:-1] |= nonzero[1:]
+    points = [float(x) for x in spots[~nonzero & edge]]
+    idx = np.nonzero(sign[:-1] * sign[1:] < 0)[0]
+    x0, x1, y0, y1 = spots[idx], spots[idx + 1], pnl[idx], pnl[idx + 1]
+    points.extend((x0 - y0 * (x1 - x0) / (y1 - y0)).tolist())
+    return sorted(points)
+
+
+class ScenarioEngine:
+    """
+    Vectorized multi-leg scenario pricer
+
+    Usage:
+        engine = get_scenario_engine()
+        result = engine.evaluate(strategy.legs, spot=23000, time_to_expiry=5 / 365)
+        result.breakevens(); result.worst_case()
+        engine.shock_losses(strategy.legs, 23000, 5 / 365)["worst_loss"]
+    """
+
+    def __init__(
+        self,
+        spot_range_pct: Optional[float] = None,
+        spot_steps: Optional[int] = None,
+        iv_shift_range: Optional[float] = None,
+        iv_steps: Optional[int] = None,
+        time_steps: Optional[int] = None,
+        shocks: Optional[List[Tuple[float, float]]] = None,
+        rate: float = RISK_FREE_RATE,
+    ):
+        """
+        Initialize engine
+
+        Args:
+            spot_range_pct: Spot grid covers ± this % around spot
+            spot_steps: Spot grid points
+            iv_shift_range: IV grid covers ± this many vol points
+            iv_steps: IV grid points
+            time_steps: Time slices from now to the nearest leg expiry
+            shocks: (spot move %, IV move in vol points) pairs for worst-case loss
+            rate: Risk-free rate
+        """
+        self.spot_range_pct = spot_range_pct or getattr(config, "SCENARIO_SPOT_RANGE_PCT", 5.0)
+        self.spot_steps = spot_steps or getattr(config, "SCENARIO_SPOT_STEPS", 100)
+        self.iv_shift_range = iv_shift_range or getattr(config, "SCENARIO_IV_SHIFT_RANGE", 10.0)
+        self.iv_steps = iv_steps or getattr(config, "SCENARIO_IV_STEPS", 20)
+        self.time_steps = time_steps or getattr(config, "SCENARIO_TIME_STEPS", 5)
+        self.shocks = shocks if shocks is not None else self._parse_shocks(
+            getattr(config, "SCENARIO_SHOCKS", ["-5:10", "-3:5", "3:-3", "5:5"])
+        )
+        self.rate = rate
+
+        # Stats
+        self.evaluations = 0
+        self.nodes_priced = 0
+        self.total_ms = 0.0
+
+    @staticmethod
+    def _parse_shocks(entries) -> List[Tuple[float, float]]:
+        """Parse "spot%:ivpts" strings (or pairs) into [(spot %, vol points)]"""
+        shocks = []
+        for entry in entries or []:
+            try:
+                spot_move, iv_move = entry.split(":") if isinstance(entry, str) else entry
+                shocks.append((float(spot_move), float(iv_move)))
+            except (TypeError, ValueError):
+                logger.warning(f"Ignoring malformed scenario shock: {entry!r}")
+        return shocks
+
+    # -------- Pricing --------
+
+    def _value(self, legs: ScenarioLegs, spots, iv_shifts, days_forward) -> np.ndarray:
+        """Position value sum(qty × price) on the spot × IV × time grid, one batch call"""
+        spots = np.asarray(spots, dtype=float)[:, None, None, None]
+        vols = np.maximum(legs.iv + np.asarray(iv_shifts, dtype=float)[:, None] / 100.0, MIN_IV)[None, :, None, :]
+        tte = np.maximum(legs.time_to_expiry - np.asarray(days_forward, dtype=float)[:, None] / DAYS_PER_YEAR, 0.0)
+        prices = GreeksCalculator.calculate_batch(
+            spots, legs.strikes, tte[None, None, :, :], vols, legs.is_call, self.rate
+        )["price"]
+        return prices @ legs.quantity
+
+    def _cost_basis(self, legs: ScenarioLegs, spot: float) -> float:
+        """Entry cost; legs without an entry price are marked at today's model price"""
+        entry = legs.entry_price
+        if (entry <= 0).any():
+            model = GreeksCalculator.calculate_batch(
+                spot, legs.strikes, legs.time_to_expiry, legs.iv, legs.is_call, self.rate
+            )["price"]
+            entry = np.where(entry > 0, entry, model)
+        return float(entry @ legs.quantity)
+
+    def evaluate(
+        self,
+        legs,
+        spot: float,
+        time_to_expiry=0.0,
+        iv=None,
+        spots=None,
+        iv_shifts=None,
+        days_forward=None,
+    ) -> ScenarioResult:
+        """
+        P&L surface for a set of legs
+
+        Args:
+            legs: OptionLeg / LegPlan objects or ScenarioLegs
+            spot: Current spot
+            time_to_expiry: Years to expiry (scalar or per leg)
+            iv: Optional IV override (decimal, scalar or per leg)
+            spots / iv_shifts / days_forward: Explicit grid axes (defaults from config)
+
+        Returns:
+            ScenarioResult with pnl shaped (spots, iv_shifts, days_forward)
+        """
+        started = time.perf_counter()
+        legs = legs if isinstance(legs, ScenarioLegs) else ScenarioLegs.from_legs(legs, time_to_expiry, iv)
+        if spots is None:
+            spots = spot * (1 + np.linspace(-self.spot_range_pct, self.spot_range_pct, self.spot_steps) / 100.0)
+        if iv_shifts is None:
+            iv_shifts = np.linspace(-self.iv_shift_range, self.iv_shift_range, self.iv_steps)
+        if days_forward is None:
+            horizon = float(legs.time_to_expiry.min()) * DAYS_PER_YEAR if legs.strikes.size else 0.0
+            days_forward = np.linspace(0.0, horizon, self.time_steps)
+        spots, iv_shifts, days_forward = (
+            np.atleast_1d(np.asarray(axis, dtype=float)) for axis in (spots, iv_shifts, days_forward)
+        )
+
+        if legs.strikes.size:
+            pnl = self._value(legs, spots, iv_shifts, days_forward) - self._cost_basis(legs, spot)
+        else:
+            pnl = np.zeros((spots.size, iv_shifts.size, days_forward.size))
+
+        elapsed = (time.perf_counter() - started) * 1000
+        self.evaluations += 1
+        self.nodes_priced += pnl.size * legs.strikes.size
+        self.total_ms += elapsed
+        return ScenarioResult(spots, iv_shifts, days_forward, pnl, elapsed)
+
+    # -------- Risk views --------
+
+    def shock_losses(self, legs, spot: float, time_to_expiry=0.0, iv=None, shocks=None) -> Dict:
+        """
+        Instant P&L under each (spot %, IV points) shock
+
+        Returns:
+            {worst_loss (≤ 0), worst_shock, by_shock: [(spot %, iv pts, pnl)]}
+        """
+        shocks = self.shocks if shocks is None else shocks
+        legs = legs if isinstance(legs, ScenarioLegs) else ScenarioLegs.from_legs(legs, time_to_expiry, iv)
+        if not shocks or not legs.strikes.size:
+            return {"worst_loss": 0.0, "worst_shock": None, "by_shock": []}
+
+        moves = np.array(shocks, dtype=float)
+        spots = spot * (1 + moves[:, 0] / 100.0)
+        # Diagonal of a (shock × shock) grid: price each shock's own spot / IV pair in one pass
+        tte = legs.time_to_expiry[None, :]
+        vols = np.maximum(legs.iv[None, :] + moves[:, 1:2] / 100.0, MIN_IV)
+        prices = GreeksCalculator.calculate_batch(spots[:, None], legs.strikes, tte, vols, legs.is_call, self.rate)
+        pnl = prices["price"] @ legs.quantity - self._cost_basis(legs, spot)
+
+        worst = int(pnl.argmin())
+        return {
+            "worst_loss": min(float(pnl[worst]), 0.0),
+            "worst_shock": tuple(shocks[worst]),
+            "by_shock": [(float(m[0]), float(m[1]), float(p)) for m, p in zip(moves, pnl)],
+        }
+
+    def expiry_profile(self, legs) -> Dict:
+        """
+        Payoff at (common) expiry: numerical breakevens, max profit and max loss
+
+        The payoff is piecewise linear with kinks at the strikes, so the grid
+        includes every strike. Puts are bounded at zero spot; above the highest
+        strike the slope is the net call quantity, so any net calls make that wing unbounded.
+        """
+        legs = legs if isinstance(legs, ScenarioLegs) else ScenarioLegs.from_legs(legs)
+        if not legs.strikes.size:
+            return {"breakevens": [], "max_profit": 0.0, "max_loss": 0.0}
+
+        hi = legs.strikes.max() * (1 + EXPIRY_PROFILE_SPAN)
+        spots = np.unique(np.concatenate([np.linspace(0.0, hi, self.spot_steps), legs.strikes]))
+        intrinsic = np.where(
+            legs.is_call, np.maximum(spots[:, None] - legs.strikes, 0.0), np.maximum(legs.strikes - spots[:, None], 0.0)
+        )
+        pnl = intrinsic @ legs.quantity - float(legs.entry_price @ legs.quantity)
+
+        upper_slope = float(legs.quantity[legs.is_call].sum())
+        max_profit = float("inf") if upper_slope > 0 else float(pnl.max())
+        max_loss = float("inf") if upper_slope < 0 else float(-pnl.min())
+        return {
+            "breakevens": _zero_crossings(spots, pnl),
+            "max_profit": max_profit,
+            "max_loss": max(max_loss, 0.0),
+        }
+
+    def get_stats(self) -> Dict:
+        """Get engine statistics"""
+        return {
+            "evaluations": self.evaluations,
+            "nodes_priced": self.nodes_priced,
+            "avg_ms": self.total_ms / self.evaluations if self.evaluations else 0.0,
+            "grid": (self.spot_steps, self.iv_steps, self.time_steps),
+            "shocks": list(self.shocks),
+        }
+
+
+# Global engine shared by strategies and the pre-trade risk check
+_engine: Optional[ScenarioEngine] = None
+
+
+def get_scenario_engine() -> ScenarioEngine:
+    """Get or create the shared scenario engine"""
+    global _engine
+    if _engine is None:
+        _engine = ScenarioEngine()
+    return _engine
@@ -10,6 +10,8 @@ from datetime import datetime
 
 from src.utils.logger import StrategyLogger
 from src.engines.greeks.greeks_calculator import GreeksCalculator
+from src.engines.greeks.greeks_cache import get_greeks_cache
+from src.engines.greeks.volatility_smile import VolatilitySmile, get_smile_engine
 from config import config
 
 logger = StrategyLogger.get_logger(__name__)
@@ -75,6 +77,9 @@ class AutoStrikeSelector:
         max_delta: float = 0.75,
         min_gamma: float = 0.0005,
         prefer_atm: bool = True,
+        smile: Optional[VolatilitySmile] = None,
+        underlying: Optional[str] = None,
+        expiry: Optional[str] = None,
     ) -> Optional[StrikeGreeks]:
         """
         Select optimal strike based on Greeks and IV
@@ -89,6 +94,11 @@ class AutoStrikeSelector:
             max_delta: Maximum acceptable delta (default 0.75)
             min_gamma: Minimum acceptable gamma (default 0.0005)
             prefer_atm: Prefer ATM strikes over OTM/ITM (default True)
+            smile: Fitted VolatilitySmile for this expiry; replaces the moneyness
+                IV / LTP heuristics when fitted. Looked up in the shared smile
+                engine when not given
+            underlying: Underlying whose smile is looked up (default PRIMARY_UNDERLYING)
+            expiry: Expiry of the smile to look up (default: most recently quoted)
 
         Returns:
             StrikeGreeks object with best strike or None
@@ -97,6 +107,11 @@ class AutoStrikeSelector:
             logger.warning(f"Invalid bias '{bias}' - no strike selection")
             return None
 
+        # Smile fitted from the live chain for this underlying, if any
+        underlying = underlying or getattr(config, "PRIMARY_UNDERLYING", "NIFTY")
+        if smile is None:
+            smile = get_smile_engine().find(underlying, expiry)
+
         # Calculate ATM strike
         atm_strike = self._calculate_atm(spot_price, strike_interval)
 
@@ -115,6 +130,8 @@ class AutoStrikeSelector:
             days_to_expiry=days_to_expiry,
             risk_free_rate=risk_free_rate,
             strike_interval=strike_interval,
+            smile=smile,
+            underlying=underlying,
         )
 
         # Filter by Greeks criteria
@@ -158,23 +175,38 @@ class AutoStrikeSelector:
         days_to_expiry: float,
         risk_free_rate: float,
         strike_interval: int,
+        smile: Optional[VolatilitySmile] = None,
+        underlying: Optional[str] = None,
     ) -> List[StrikeGreeks]:
         """Calculate Greeks for all strikes"""
         candidates = []
         tte = days_to_expiry / 365.0
 
-        for strike in strikes:
-            # Estimate IV based on moneyness
-            iv = self._estimate_iv(spot_price, strike, option_type)
-
-            # Calculate Greeks using Black-Scholes
-            if option_type == "CE":
-                greeks = GreeksCalculator.calculate_call_greeks(spot_price, strike, tte, iv, risk_free_rate)
-            else:
-                greeks = GreeksCalculator.calculate_put_greeks(spot_price, strike, tte, iv, risk_free_rate)
+        # IV from the fitted smile, else estimate from moneyness
+        use_smile = smile is not None and smile.is_fitted()
+        if use_smile:
+            ivs = smile.iv(strikes).tolist()
+        else:
+            ivs = [self._estimate_iv(spot_price, strike, option_type) for strike in strikes]
 
-            # Estimate LTP
-            ltp = self._estimate_ltp(spot_price, strike, option_type)
+        # Calculate Greeks for every strike in one Black-Scholes pass (memoized across scans)
+        batch_args = (spot_price, strikes, tte, ivs, option_type == "CE", risk_free_rate)
+        if getattr(config, "GREEKS_CACHE_ENABLED", True):
+            bucket = (underlying, smile.expiry if smile is not None else None)
+            batch = get_greeks_cache().get_batch(*batch_args, bucket=bucket)
+        else:
+            batch = GreeksCalculator.calculate_batch(*batch_args)
+
+        for strike, iv, row in zip(strikes, ivs, batch):
+            greeks = {
+                "delta": float(row["delta"]),
+                "gamma": float(row["gamma"]),
+                "theta": float(row["theta"]),
+                "vega": float(row["vega"]),
+            }
+
+            # Model price at the smile IV, else estimate LTP
+            ltp = float(row["price"]) if use_smile else self._estimate_ltp(spot_price, strike, option_type)
 
             # Calculate ATM offset
             atm_offset = int((strike - atm_strike) / strike_interval)
@@ -14,6 +14,7 @@ import requests
 import json
 import threading
 import logging
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple, List, Any, Callable
 from pathlib import Path
@@ -26,6 +27,8 @@ load_dotenv(env_path)
 
 from config import config
 from src.utils.logger import StrategyLogger
+from src.integrations.angelone.http_transport import get_http_transport, route_smartconnect
+from src.integrations.angelone.instrument_index import get_instrument_index
 
 logger = StrategyLogger.get_logger(__name__)
 
@@ -54,6 +57,9 @@ class AngelOnePhase2:
     CANCEL_ORDER_ENDPOINT = "/rest/secure/angelbroking/order/v1/cancelOrder"
     ORDER_STATUS_ENDPOINT = "/rest/secure/angelbroking/order/v1/details"
 
+    # getQuote rate window (seconds) for ANGELONE_QUOTE_RATE_LIMIT
+    QUOTE_RATE_WINDOW = 60.0
+
     # Instrument registry (will be populated from broker)
     INSTRUMENT_DB = {
         "NIFTY": {"token": "99926015", "exchange": "NSE", "type": "INDEX"},
@@ -84,8 +90,8 @@ class AngelOnePhase2:
         # SmartAPI client
         self._smartapi_client = None
 
-        # Instrument master cache
-        self._instruments: Optional[Dict] = None
+        # Instrument master (shared InstrumentIndex; download at most once)
+        self._instrument_download_attempted = False
 
         # Subscription state (for REST polling fallback)
         self._subscriptions: List[Dict[str, Any]] = []
@@ -94,6 +100,16 @@ class AngelOnePhase2:
         self._on_tick: Optional[Callable] = None
         self.connected = False
 
+        # Batched REST polling (getQuote accepts many tokens per exchange)
+        self.poll_batched = getattr(config, "ANGELONE_POLL_BATCHED", True)
+        self.poll_interval = getattr(config, "ANGELONE_POLL_INTERVAL", 2.0)
+        self.poll_quote_mode = getattr(config, "ANGELONE_POLL_QUOTE_MODE", "FULL")
+        self.quote_batch_size = getattr(config, "ANGELONE_QUOTE_BATCH_SIZE", 50)
+        self.quote_rate_limit = getattr(config, "ANGELONE_QUOTE_RATE_LIMIT", 500)
+        self._quote_requests: deque = deque()  # request times (poll and gap-fill threads)
+        self._quote_lock = threading.Lock()
+        self._poll_tokens: Dict[str, Tuple[str, str]] = {}
+
         logger.info(f"AngelOnePhase2 initialized (PAPER_TRADING={self.paper_trading})")
 
     # =========================================================================
@@ -147,6 +163,8 @@ class AngelOnePhase2:
 
             # Initialize SmartAPI client
             self._smartapi_client = SmartConnect(api_key=self.api_key)
+            # Route SDK REST calls through the shared keep-alive pool
+            route_smartconnect(self._smartapi_client)
 
             # Login with OTP
             session = self._smartapi_client.generateSession(self.client_code, self.password, totp_code)
@@ -178,7 +196,9 @@ class AngelOnePhase2:
 
             headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
 
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            response = get_http_transport().post(
+                url, json=payload, headers=headers, timeout=10, endpoint="login"
+            )
             response.raise_for_status()
 
             data = response.json()
@@ -375,55 +395,33 @@ class AngelOnePhase2:
         """
         Background polling thread for LTP updates.
         Periodically fetches LTP for subscribed instruments and invokes callback.
+
+        With a live SmartAPI session the instruments are fetched in batched
+        getQuote calls (one per exchange chunk) and the interval adapts to
+        the remaining request budget; otherwise each symbol is polled alone.
         """
         logger.info("Starting AngelOne polling loop...")
-        poll_interval = 2  # seconds between polls
+        poll_interval = self.poll_interval
         consecutive_errors = 0
         max_consecutive_errors = 10
 
         while not self._stop_poll.is_set():
             try:
                 if not self._subscriptions:
-                    time.sleep(poll_interval)
+                    self._stop_poll.wait(poll_interval)
                     continue
 
-                # Fetch LTP for all subscribed symbols
-                for inst in self._subscriptions:
-                    try:
-                        symbol = inst.get("symbol")
-                        if not symbol:
-                            continue
-
-                        ltp_data = self.get_ltp(symbol)
-
-                        if ltp_data and not ltp_data.get("status") == "error" and self._on_tick:
-                            # Invoke callback with tick data
-                            tick = {
-                                "symbol": symbol,
-                                "ltp": ltp_data.get("ltp"),
-                                "bid": ltp_data.get("bid"),
-                                "ask": ltp_data.get("ask"),
-                                "volume": ltp_data.get("volume", 0),
-                                "oi": ltp_data.get("oi", 0),
-                                "timestamp": datetime.now().isoformat(),
-                            }
-                            try:
-                                self._on_tick(tick)
-                            except Exception as cb_err:
-                                logger.error(f"Callback error: {cb_err}")
-
-                        consecutive_errors = 0
-
-                    except Exception as e:
-                        consecutive_errors += 1
-                        logger.warning(f"Poll error for {symbol}: {e} ({consecutive_errors}/{max_consecutive_errors})")
-
-                        if consecutive_errors >= max_consecutive_errors:
-                            logger.error("Max polling errors exceeded, stopping poll loop")
-                            self._stop_poll.set()
-                            return
-
-                time.sleep(poll_interval)
+                if self._can_batch_poll():
+                    batches = self._poll_batched()
+                    consecutive_errors = 0
+                    poll_interval = self._next_poll_interval(batches)
+                else:
+                    consecutive_errors = self._poll_per_symbol(consecutive_errors, max_consecutive_errors)
+                    if self._stop_poll.is_set():
+                        return
+                    poll_interval = self.poll_interval
+
+                self._stop_poll.wait(poll_interval)
 
             except Exception as e:
                 consecutive_errors += 1
@@ -432,10 +430,231 @@ class AngelOnePhase2:
                     logger.error("Poll loop exceeded max errors, stopping")
                     self._stop_poll.set()
                     return
-                time.sleep(poll_interval)
+                self._stop_poll.wait(poll_interval)
 
         logger.info("AngelOne polling loop stopped")
 
+    def _poll_per_symbol(self, consecutive_errors: int, max_consecutive_errors: int) -> int:
+        """Fetch LTP one symbol at a time (paper mode / HTTP fallback)."""
+        for inst in self._subscriptions:
+            symbol = inst.get("symbol")
+            try:
+                if not symbol:
+                    continue
+
+                ltp_data = self.get_ltp(symbol)
+
+                if ltp_data and not ltp_data.get("status") == "error":
+                    self._emit_tick(symbol, ltp_data)
+
+                consecutive_errors = 0
+
+            except Exception as e:
+                consecutive_errors += 1
+                logger.warning(f"Poll error for {symbol}: {e} ({consecutive_errors}/{max_consecutive_errors})")
+
+                if consecutive_errors >= max_consecutive_errors:
+                    logger.error("Max polling errors exceeded, stopping poll loop")
+                    self._stop_poll.set()
+                    break
+
+        return consecutive_errors
+
+    def _emit_tick(self, symbol: str, data: Dict) -> None:
+        """Invoke the tick callback with a normalized tick."""
+        if not self._on_tick:
+            return
+        tick = {
+            "symbol": symbol,
+            "ltp": data.get("ltp"),
+            "bid": data.get("bid"),
+            "ask": data.get("ask"),
+            "volume": data.get("volume", 0),
+            "oi": data.get("oi", 0),
+            "timestamp": datetime.now().isoformat(),
+        }
+        try:
+            self._on_tick(tick)
+        except Exception as cb_err:
+            logger.error(f"Callback error: {cb_err}")
+
+    # -------------------------------------------------------------------------
+    # Batched quote polling
+    # -------------------------------------------------------------------------
+
+    def _can_batch_poll(self) -> bool:
+        return (
+            self.poll_batched
+            and not self.paper_trading
+            and self._smartapi_client is not None
+            and self.is_authenticated()
+        )
+
+    def _poll_batches(self) -> List[Tuple[str, List[str], Dict[str, str]]]:
+        """
+        Group subscriptions into getQuote requests.
+
+        Returns:
+            List of (exchange, tokens, token -> symbol) with at most
+            quote_batch_size tokens per request
+        """
+        by_exchange: Dict[str, Dict[str, str]] = {}
+        for inst in self._subscriptions:
+            symbol = inst.get("symbol")
+            if not symbol:
+                continue
+            resolved = self._poll_tokens.get(symbol)
+            if resolved is None:
+                resolved = self._resolve_poll_token(inst)
+                if resolved is None:
+                    continue
+                self._poll_tokens[symbol] = resolved
+            exchange, token = resolved
+            by_exchange.setdefault(exchange, {})[token] = symbol
+
+        batches = []
+        size = self.quote_batch_size
+        for exchange, token_map in by_exchange.items():
+            tokens = list(token_map)
+            for i in range(0, len(tokens), size):
+                chunk = tokens[i : i + size]
+                batches.append((exchange, chunk, {t: token_map[t] for t in chunk}))
+        return batches
+
+    def _resolve_poll_token(self, inst: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """Resolve (exchange, token) for a subscribed instrument."""
+        symbol = inst["symbol"]
+        token = inst.get("token") or self._symbol_to_token(symbol)
+        if not token:
+            return None
+
+        exchange = inst.get("exchange")
+        if symbol in self.INSTRUMENT_DB:
+            exchange = self.INSTRUMENT_DB[symbol]["exchange"]
+        exchange = (exchange or "NFO").replace("_INDEX", "")
+        return exchange, str(token)
+
+    def _poll_batched(self) -> int:
+        """
+        Fetch all subscriptions with batched getQuote calls and fan out ticks.
+
+        Returns:
+            Number of requests one full cycle needs
+        """
+        batches = self._poll_batches()
+        for exchange, tokens, symbols in batches:
+            if self._stop_poll.is_set():
+                break
+            fetched = self._quote_batch(exchange, tokens)
+            if fetched is None:
+                logger.debug("Quote request budget exhausted, deferring remaining batches")
+                break
+
+            for data in fetched:
+                symbol = symbols.get(str(data.get("symbolToken")))
+                if symbol:
+                    self._emit_tick(symbol, self._quote_to_tick(data))
+
+        return len(batches)
+
+    def fetch_quotes(self, exchange: str, tokens: List[str]) -> Dict[str, Dict]:
+        """
+        Quotes for many tokens of one exchange in batched getQuote calls.
+
+        Shares the polling loop's request budget; chunks that do not fit in
+        the current rate window are skipped.
+
+        Returns:
+            token -> {ltp, bid, ask, volume, oi} for the tokens fetched
+        """
+        quotes: Dict[str, Dict] = {}
+        if self._smartapi_client is None or not tokens:
+            return quotes
+
+        tokens = [str(token) for token in tokens]
+        size = self.quote_batch_size
+        for i in range(0, len(tokens), size):
+            fetched = self._quote_batch(exchange, tokens[i : i + size])
+            if fetched is None:
+                logger.debug(f"Quote request budget exhausted, {len(tokens) - i} tokens not fetched")
+                break
+            for data in fetched:
+                quotes[str(data.get("symbolToken"))] = self._quote_to_tick(data)
+        return quotes
+
+    def _quote_batch(self, exchange: str, tokens: List[str]) -> Optional[List[Dict]]:
+        """
+        One getQuote request under the rate budget.
+
+        Returns:
+            'fetched' entries ([] on error), None if the budget is exhausted
+        """
+        if not self._acquire_quote_budget():
+            return None
+
+        try:
+            quote = self._smartapi_client.getQuote(mode=self.poll_quote_mode, exchangeTokens={exchange: tokens})
+        except Exception as e:
+            logger.warning(f"Batched getQuote failed ({exchange}, {len(tokens)} tokens): {e}")
+            return []
+
+        if not quote or not quote.get("status"):
+            logger.warning(f"Batched getQuote error: {(quote or {}).get('message')}")
+            return []
+
+        return (quote.get("data") or {}).get("fetched") or []
+
+    @staticmethod
+    def _quote_to_tick(data: Dict) -> Dict:
+        """Map a getQuote 'fetched' entry (LTP/OHLC/FULL) to tick fields."""
+        depth = data.get("depth") or {}
+        buy = depth.get("buy") or []
+        sell = depth.get("sell") or []
+        return {
+            "ltp": data.get("ltp"),
+            "bid": buy[0].get("price") if buy else data.get("bid"),
+            "ask": sell[0].get("price") if sell else data.get("ask"),
+            "volume": data.get("tradeVolume", data.get("volume", 0)),
+            "oi": data.get("opnInterest", data.get("oi", 0)),
+        }
+
+    def _prune_quote_requests(self, now: float) -> None:
+        """Drop requests older than the rate window (call under _quote_lock)."""
+        window_start = now - self.QUOTE_RATE_WINDOW
+        while self._quote_requests and self._quote_requests[0] <= window_start:
+            self._quote_requests.popleft()
+
+    def _acquire_quote_budget(self) -> bool:
+        """Record one getQuote request if the rate window allows it."""
+        now = time.time()
+        with self._quote_lock:
+            self._prune_quote_requests(now)
+            if len(self._quote_requests) >= self.quote_rate_limit:
+                return False
+            self._quote_requests.append(now)
+        return True
+
+    def _next_poll_interval(self, batches: int) -> float:
+        """
+        Sleep before the next cycle given the remaining request budget.
+
+        The remaining budget of the rate window is spread evenly over the
+        window, so the interval stays at the configured floor while budget
+        is plentiful and stretches as it runs low. If a full cycle no longer
+        fits, wait until enough requests age out of the window.
+        """
+        now = time.time()
+        with self._quote_lock:
+            self._prune_quote_requests(now)
+            remaining = self.quote_rate_limit - len(self._quote_requests)
+            if batches and remaining < batches:
+                idx = min(batches - remaining, len(self._quote_requests)) - 1
+                interval = self._quote_requests[idx] + self.QUOTE_RATE_WINDOW - now
+            else:
+                interval = self.QUOTE_RATE_WINDOW * batches / max(remaining, 1)
+
+        return min(max(interval, self.poll_interval), self.QUOTE_RATE_WINDOW)
+
     # =========================================================================
     # MARKET DATA
     # =========================================================================
@@ -499,7 +718,7 @@ class AngelOnePhase2:
             url = f"{self.API_BASE}{self.LTP_ENDPOINT}{symbol}"
             headers = {"Authorization": f"Bearer {self._token}"}
 
-            response = requests.get(url, headers=headers, timeout=5)
+            response = get_http_transport().get(url, headers=headers, timeout=5, endpoint="quote")
             response.raise_for_status()
 
             data = response.json()
@@ -525,20 +744,16 @@ class AngelOnePhase2:
     def _symbol_to_token(self, symbol: str) -> Optional[str]:
         """Convert symbol to broker token using instrument master."""
         try:
-            # Load instrument master if not cached
-            if self._instruments is None:
-                if self._smartapi_client:
-                    self._instruments = self._smartapi_client.load_instrument_master()
-
-                # If loading failed, download first
-                if not self._instruments and self._smartapi_client:
-                    logger.info("Downloading instrument master...")
-                    if self._smartapi_client.download_instrument_master("NFO"):
-                        self._instruments = self._smartapi_client.load_instrument_master()
-
-            # Use instrument master if available
-            if self._instruments and self._smartapi_client:
-                token = self._smartapi_client.symbol_to_token(symbol, self._instruments)
+            # Shared memory-mapped instrument index (built once per day)
+            index = get_instrument_index()
+            if index is None and self._smartapi_client and not self._instrument_download_attempted:
+                self._instrument_download_attempted = True
+                logger.info("Downloading instrument master...")
+                if self._smartapi_client.download_instrument_master("NFO"):
+                    index = get_instrument_index(refresh=True)
+
+            if index is not None:
+                token = index.symbol_to_token(symbol)
                 if token:
                     return token
 
@@ -641,7 +856,9 @@ class AngelOnePhase2:
             # Retry logic
             for attempt in range(3):
                 try:
-                    response = requests.post(url, json=order_data, headers=headers, timeout=10)
+                    response = get_http_transport().post(
+                        url, json=order_data, headers=headers, timeout=10, endpoint="place_order"
+                    )
                     response.raise_for_status()
 
                     data = response.json()
@@ -0,0 +1,288 @@
+"""
+Pooled HTTP Transport
+Shared keep-alive ``requests.Session`` for every AngelOne REST call
+
+A single session reuses TCP/TLS connections across login, quote, order and
+instrument-master requests instead of paying a fresh handshake per call.
+Connections are pooled per host, every request gets a default timeout, and
+latency is recorded per endpoint as a fixed-bucket histogram alongside the
+per-host connection reuse counts reported by urllib3.
+
+SmartConnect's ``_request`` calls the module-level ``requests.request`` and
+ignores ``reqsession``, so ``route_smartconnect`` rebinds ``_request`` on an
+SDK client instance to send through the pooled session instead. Response
+handling is the SDK's own: ``error_type`` maps to the SDK exception classes,
+``session_expiry_hook`` runs on a 403 TokenException, and bad payloads raise
+DataException.
+"""
+
+import bisect
+import json
+import logging
+import time
+from threading import Lock
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import config
+
+# SDK exception classes (handles both smartapi and SmartApi package names)
+try:
+    from smartapi import smartExceptions as sdk_exceptions
+except ImportError:
+    try:
+        from SmartApi import smartExceptions as sdk_exceptions  # type: ignore
+    except ImportError:  # pragma: no cover
+        sdk_exceptions = None
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds (ms); the last bucket is open-ended
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class EndpointStats:
+    """Latency histogram for one endpoint"""
+
+    __slots__ = ("count", "errors", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets: List[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, latency_ms: float, error: bool = False):
+        self.count += 1
+        if error:
+            self.errors += 1
+        self.total_ms += latency_ms
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the given percentile"""
+        if not self.count:
+            return 0.0
+        target = self.count * pct / 100.0
+        seen = 0
+        for bound, hits in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += hits
+            if seen >= target:
+                return float(bound)
+        return self.max_ms
+
+    def to_dict(self) -> Dict:
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "histogram": dict(zip(labels, self.buckets)),
+        }
+
+
+class HttpTransport:
+    """
+    Pooled keep-alive HTTP client with per-endpoint latency tracking
+
+    Usage:
+        transport = get_http_transport()
+        resp = transport.get(url, headers=headers, endpoint="quote")
+        transport.get_stats()
+    """
+
+    def __init__(
+        self,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Initialize transport
+
+        Args:
+            pool_connections: Number of host pools kept alive
+            pool_maxsize: Max open connections per host
+            timeout: Default request timeout (seconds) when the caller passes none
+        """
+        self.pool_connections = pool_connections or getattr(config, "HTTP_POOL_CONNECTIONS", 4)
+        self.pool_maxsize = pool_maxsize or getattr(config, "HTTP_POOL_MAXSIZE", 10)
+        self.timeout = timeout or getattr(config, "HTTP_TIMEOUT", 10)
+
+        self.session = requests.Session()
+        self.session.headers["Connection"] = "keep-alive"
+        self._adapter = HTTPAdapter(
+            pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, pool_block=False
+        )
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+        self._stats: Dict[str, EndpointStats] = {}
+        self._stats_lock = Lock()
+
+    def request(self, method: str, url: str, endpoint: Optional[str] = None, **kwargs) -> requests.Response:
+        """
+        Send a request over the pooled session
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            endpoint: Label for latency stats (defaults to the URL path)
+            **kwargs: Passed to requests.Session.request
+
+        Returns:
+            requests.Response (exceptions propagate to the caller)
+        """
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        label = endpoint or urlsplit(url).path or url
+
+        started = time.perf_counter()
+        error = True
+        try:
+            response = self.session.request(method, url, **kwargs)
+            error = response.status_code >= 400
+            return response
+        finally:
+            latency_ms = (time.perf_counter() - started) * 1000
+            with self._stats_lock:
+                stats = self._stats.get(label)
+                if stats is None:
+                    stats = self._stats[label] = EndpointStats()
+                stats.record(latency_ms, error)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def connection_stats(self) -> Dict[str, Dict]:
+        """Per-host connections opened vs requests served (reused = requests - opened)"""
+        hosts = {}
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened = pool.num_connections
+            served = pool.num_requests
+            hosts[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                "requests": served,
+                "connections_opened": opened,
+                "connections_reused": max(0, served - opened),
+            }
+        return hosts
+
+    def get_stats(self) -> Dict:
+        """Get per-endpoint latency histograms and per-host connection reuse"""
+        with self._stats_lock:
+            endpoints = {label: stats.to_dict() for label, stats in self._stats.items()}
+        return {"endpoints": endpoints, "hosts": self.connection_stats()}
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
+
+# Global transport
+_transport: Optional[HttpTransport] = None
+
+
+def get_http_transport() -> HttpTransport:
+    """Get or create the shared HTTP transport"""
+    global _transport
+    if _transport is None:
+        _transport = HttpTransport()
+    return _transport
+
+
+def route_smartconnect(client, transport: Optional[HttpTransport] = None, exceptions=None):
+    """
+    Send a SmartConnect instance's REST calls through the pooled transport
+
+    Rebinds ``client._request`` with the SDK's request building (routes, headers,
+    bearer token, JSON body / params) and response handling, but sending via
+    ``transport.request``.
+
+    Args:
+        client: SmartConnect instance
+        transport: Transport to use (defaults to the shared one)
+        exceptions: SDK ``smartExceptions`` module (defaults to the installed SDK's)
+
+    Returns:
+        The same client (left on the SDK's own path if the SDK exceptions are unavailable)
+    """
+    transport = transport or get_http_transport()
+    ex = exceptions or sdk_exceptions
+    if ex is None:
+        logger.warning("SmartAPI exceptions unavailable; SmartConnect requests not pooled")
+        return client
+
+    def _request(route, method, parameters=None):
+        params = parameters.copy() if parameters else {}
+        uri = client._routes[route].format(**params)
+        url = urljoin(client.root, uri)
+
+        # Custom headers
+        headers = client.requestHeaders()
+        if client.access_token:
+            headers["Authorization"] = f"Bearer {client.access_token}"
+
+        if client.debug:
+            logger.debug(f"Request: {method} {url} {params} {headers}")
+
+        r = transport.request(
+            method,
+            url,
+            endpoint=route,
+            data=json.dumps(params) if method in ("POST", "PUT") else None,
+            params=json.dumps(params) if method in ("GET", "DELETE") else None,
+            headers=headers,
+            verify=not client.disable_ssl,
+            allow_redirects=True,
+            timeout=client.timeout,
+            proxies=client.proxies,
+        )
+
+        if client.debug:
+            logger.debug(f"Response: {r.status_code} {r.content}")
+
+        # Validate the content type (same handling as SmartConnect._request)
+        if "json" in headers["Content-type"]:
+            try:
+                data = json.loads(r.content.decode("utf8"))
+            except ValueError:
+                raise ex.DataException(
+                    f"Couldn't parse the JSON response received from the server: {r.content}"
+                )
+
+            # api error
+            if data.get("error_type"):
+                # Call session hook if its registered and TokenException is raised
+                if client.session_expiry_hook and r.status_code == 403 and data["error_type"] == "TokenException":
+                    client.session_expiry_hook()
+
+                # native errors
+                exp = getattr(ex, data["error_type"], ex.GeneralException)
+                raise exp(data["message"], code=r.status_code)
+
+            return data
+        elif "csv" in headers["Content-type"]:
+            return r.content
+        else:
+            raise ex.DataException(
+                f"Unknown Content-type ({headers['Content-type']}) with response: ({r.content})"
+            )
+
+    client._request = _request
+    return client
@@ -0,0 +1,426 @@
+"""
+Instrument Index
+Compact, memory-mapped index over the AngelOne instrument master
+
+Built once per day from ``data/instruments.csv`` (the filtered scrip master
+written by ``SmartAPIClient.download_instrument_master``) and cached on disk:
+
+    <dir>/instruments.npy    - records sorted by contract key (mmap)
+    <dir>/keys.npy           - contiguous contract keys for binary search (mmap)
+    <dir>/symbol_hash.npy    - sorted trading-symbol hashes (mmap)
+    <dir>/symbol_row.npy     - record row for each hash (mmap)
+    <dir>/strings.bin        - UTF-8 trading symbols, addressed by offset/len
+    <dir>/meta.json          - build date, source mtime, underlying names
+
+Contract key packs (underlying, expiry, CE/PE, strike) into one int64 so
+exact lookups are one ``searchsorted`` and all strikes of an expiry are one
+contiguous slice.
+"""
+
+import csv
+import json
+import os
+import tempfile
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from config import config
+from src.utils.logger import StrategyLogger
+
+logger = StrategyLogger.get_logger(__name__)
+
+INDEX_VERSION = 1
+
+OPT_NONE, OPT_CE, OPT_PE = 0, 1, 2
+OPTION_CODES = {"CE": OPT_CE, "PE": OPT_PE}
+
+EXCHANGES = ["NSE", "NFO", "BSE", "BFO", "MCX", "CDS", "NCO"]
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("token", "<i8"),
+        ("strike", "<i8"),  # paise
+        ("expiry", "<i4"),  # YYYYMMDD, 0 if none
+        ("lot_size", "<i4"),
+        ("symbol_off", "<u4"),
+        ("symbol_len", "<u2"),
+        ("name_id", "<u2"),
+        ("option", "u1"),
+        ("exchange", "u1"),
+    ]
+)
+
+_STRIKE_BITS = 29  # strikes up to ~5.3M rupees in paise
+_EPOCH = date(2000, 1, 1).toordinal()
+
+_EXPIRY_FORMATS = ("%d%b%Y", "%d%b%y", "%Y-%m-%d", "%d-%b-%Y", "%d-%b-%y")
+
+
+def _fnv1a(text: str) -> int:
+    """Stable 64-bit FNV-1a hash (Python's hash() is salted per process)"""
+    h = 0xCBF29CE484222325
+    for byte in text.encode("utf-8"):
+        h = ((h ^ byte) * 0x100000001B3) & 0xFFFFFFFFFFFFFFFF
+    return h
+
+
+def _replace_file(path: Path, write):
+    """Write a file via a temp file in the same directory and os.replace() it into place"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except Exception:
+        os.unlink(tmp)
+        raise
+
+
+@lru_cache(maxsize=256)
+def parse_expiry(expiry: Union[str, date, datetime, None]) -> Optional[date]:
+    """Parse scrip-master / expiry-code formats (26DEC2024, 26DEC24, 2024-12-26)"""
+    if expiry is None or expiry == "":
+        return None
+    if isinstance(expiry, datetime):
+        return expiry.date()
+    if isinstance(expiry, date):
+        return expiry
+    text = str(expiry).strip().upper()
+    for fmt in _EXPIRY_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _contract_key(name_id: int, expiry: Optional[date], option: int, strike_paise: int) -> int:
+    day = expiry.toordinal() - _EPOCH if expiry else 0
+    return (((name_id << 16) | day) << 2 | option) << _STRIKE_BITS | strike_paise
+
+
+class InstrumentIndex:
+    """
+    Read-only structured lookups over the instrument master
+
+    Usage:
+        index = InstrumentIndex.load_or_build("data/instruments.csv", "data/instrument_index")
+        index.option_token("NIFTY", "30DEC2025", 24000, "CE")
+        index.strikes("NIFTY", "30DEC2025")
+        index.nearest_strike("NIFTY", "30DEC2025", 24037.5)
+    """
+
+    def __init__(
+        self,
+        records: np.ndarray,
+        keys: np.ndarray,
+        symbol_hash: np.ndarray,
+        symbol_row: np.ndarray,
+        strings: np.ndarray,
+        names: List[str],
+    ):
+        self.records = records
+        self.keys = keys
+        self._symbol_hash = symbol_hash
+        self._symbol_row = symbol_row
+        self._strings = strings
+        self.names = names
+        self._name_ids = {name: i for i, name in enumerate(names)}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    # ------------------------------------------------------------------
+    # Build / persist
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, csv_path: Union[str, Path]) -> "InstrumentIndex":
+        """Parse the instrument CSV into an in-memory index"""
+        names: List[str] = []
+        name_ids: Dict[str, int] = {}
+        rows = []
+        keys = []
+        hashes = []
+        blob = bytearray()
+
+        with open(csv_path, "r", newline="") as f:
+            for row in csv.DictReader(f):
+                symbol = row.get("symbol") or row.get("tradingsymbol")
+                token = row.get("token") or row.get("symboltoken")
+                if not symbol or not token or not token.isdigit():
+                    continue
+
+                name = (row.get("name") or "").upper()
+                name_id = name_ids.get(name)
+                if name_id is None:
+                    name_id = name_ids[name] = len(names)
+                    names.append(name)
+
+                option = OPTION_CODES.get(symbol[-2:], OPT_NONE)
+                expiry = parse_expiry(row.get("expiry"))
+                try:
+                    strike = max(0, int(round(float(row.get("strike") or 0))))
+                except ValueError:
+                    strike = 0
+                if strike >= 1 << _STRIKE_BITS:
+                    continue
+                try:
+                    lot_size = int(float(row.get("lotsize") or 1))
+                except ValueError:
+                    lot_size = 1
+                exchange = row.get("exch_seg", "NFO")
+
+                raw = symbol.encode("utf-8")
+                keys.append(_contract_key(name_id, expiry, option, strike))
+                rows.append(
+                    (
+                        int(token),
+                        strike,
+                        int(expiry.strftime("%Y%m%d")) if expiry else 0,
+                        lot_size,
+                        len(blob),
+                        len(raw),
+                        name_id,
+                        option,
+                        EXCHANGES.index(exchange) if exchange in EXCHANGES else 255,
+                    )
+                )
+                hashes.append(_fnv1a(symbol))
+                blob += raw
+
+        keys = np.array(keys, dtype=np.int64)
+        order = np.argsort(keys, kind="stable")
+        records = np.array(rows, dtype=RECORD_DTYPE)[order]
+
+        hashes = np.array(hashes, dtype=np.uint64)[order]
+        by_hash = np.argsort(hashes, kind="stable")
+        strings = np.frombuffer(bytes(blob), dtype=np.uint8)
+
+        return cls(
+            records,
+            keys[order],
+            hashes[by_hash],
+            by_hash.astype(np.uint32),
+            strings,
+            names,
+        )
+
+    def save(self, index_dir: Union[str, Path], source_mtime: float = 0.0):
+        """
+        Write index files
+
+        Each file is written to a temp file in ``index_dir`` and swapped in with
+        ``os.replace()``, so processes that already memory-map the old files keep
+        reading them intact. meta.json is replaced last.
+        """
+        index_dir = Path(index_dir)
+        index_dir.mkdir(parents=True, exist_ok=True)
+        _replace_file(index_dir / "instruments.npy", lambda f: np.save(f, self.records))
+        _replace_file(index_dir / "keys.npy", lambda f: np.save(f, self.keys))
+        _replace_file(index_dir / "symbol_hash.npy", lambda f: np.save(f, self._symbol_hash))
+        _replace_file(index_dir / "symbol_row.npy", lambda f: np.save(f, self._symbol_row))
+        _replace_file(index_dir / "strings.bin", lambda f: f.write(self._strings.tobytes()))
+
+        meta = {
+            "version": INDEX_VERSION,
+            "built": date.today().isoformat(),
+            "source_mtime": source_mtime,
+            "count": len(self.records),
+            "names": self.names,
+        }
+        _replace_file(index_dir / "meta.json", lambda f: f.write(json.dumps(meta).encode()))
+
+    @classmethod
+    def load(cls, index_dir: Union[str, Path]) -> "InstrumentIndex":
+        """Memory-map a saved index"""
+        index_dir = Path(index_dir)
+        meta = json.loads((index_dir / "meta.json").read_text())
+        arrays = [
+            np.load(index_dir / f"{name}.npy", mmap_mode="r")
+            for name in ("instruments", "keys", "symbol_hash", "symbol_row")
+        ]
+        strings_path = index_dir / "strings.bin"
+        if strings_path.stat().st_size:
+            strings = np.memmap(strings_path, dtype=np.uint8, mode="r")
+        else:
+            strings = np.empty(0, dtype=np.uint8)
+        return cls(*arrays, strings, meta["names"])
+
+    @classmethod
+    def load_or_build(
+        cls, csv_path: Union[str, Path], index_dir: Union[str, Path]
+    ) -> Optional["InstrumentIndex"]:
+        """
+        Load today's index, rebuilding it if missing, stale or older than the CSV
+
+        Returns:
+            InstrumentIndex or None if neither an index nor the CSV exists
+        """
+        csv_path = Path(csv_path)
+        index_dir = Path(index_dir)
+        source_mtime = csv_path.stat().st_mtime if csv_path.exists() else None
+
+        meta_path = index_dir / "meta.json"
+        if meta_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text())
+                fresh = meta.get("version") == INDEX_VERSION and (
+                    source_mtime is None
+                    or (meta.get("built") == date.today().isoformat() and meta.get("source_mtime") == source_mtime)
+                )
+                if fresh:
+                    return cls.load(index_dir)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Instrument index unreadable, rebuilding: {e}")
+
+        if source_mtime is None:
+            logger.warning(f"Instrument file not found: {csv_path}")
+            return None
+
+        index = cls.build(csv_path)
+        index.save(index_dir, source_mtime)
+        logger.info(f"✓ Instrument index built: {len(index)} instruments -> {index_dir}")
+        return cls.load(index_dir)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _row(self, row: int) -> Dict:
+        rec = self.records[row]
+        expiry = int(rec["expiry"])
+        exchange = int(rec["exchange"])
+        return {
+            "token": str(int(rec["token"])),
+            "symbol": self.symbol_at(row),
+            "exchange": EXCHANGES[exchange] if exchange < len(EXCHANGES) else "",
+            "name": self.names[int(rec["name_id"])],
+            "expiry": datetime.strptime(str(expiry), "%Y%m%d").strftime("%d%b%Y").upper() if expiry else "",
+            "strike": int(rec["strike"]) / 100.0,
+            "option_type": {OPT_CE: "CE", OPT_PE: "PE"}.get(int(rec["option"]), ""),
+            "lot_size": int(rec["lot_size"]),
+        }
+
+    def symbol_at(self, row: int) -> str:
+        off = int(self.records["symbol_off"][row])
+        length = int(self.records["symbol_len"][row])
+        return self._strings[off : off + length].tobytes().decode("utf-8")
+
+    def _find_symbol(self, symbol: str) -> Optional[int]:
+        hashes = self._symbol_hash
+        target = np.uint64(_fnv1a(symbol))
+        i = int(np.searchsorted(hashes, target))
+        while i < len(hashes) and hashes[i] == target:
+            row = int(self._symbol_row[i])
+            if self.symbol_at(row) == symbol:
+                return row
+            i += 1
+        return None
+
+    def symbol_to_token(self, symbol: str) -> Optional[str]:
+        """Exact trading-symbol lookup"""
+        row = self._find_symbol(symbol)
+        return None if row is None else str(int(self.records["token"][row]))
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        """Instrument details for a trading symbol"""
+        row = self._find_symbol(symbol)
+        return None if row is None else self._row(row)
+
+    def _contract_base(self, underlying: str, expiry, option_type: str) -> Optional[int]:
+        """Key of strike 0 for (underlying, expiry, CE/PE)"""
+        name_id = self._name_ids.get(underlying.upper())
+        expiry = parse_expiry(expiry)
+        option = OPTION_CODES.get(option_type.upper())
+        if name_id is None or expiry is None or option is None:
+            return None
+        return _contract_key(name_id, expiry, option, 0)
+
+    def _contract_range(self, underlying: str, expiry, option_type: str):
+        base = self._contract_base(underlying, expiry, option_type)
+        if base is None:
+            return 0, 0
+        hi = base | ((1 << _STRIKE_BITS) - 1)
+        return int(np.searchsorted(self.keys, base)), int(np.searchsorted(self.keys, hi, side="right"))
+
+    def option_row(self, underlying: str, expiry, strike: float, option_type: str) -> Optional[int]:
+        base = self._contract_base(underlying, expiry, option_type)
+        if base is None:
+            return None
+        key = base | int(round(strike * 100))
+        i = int(np.searchsorted(self.keys, key))
+        if i < len(self.keys) and int(self.keys[i]) == key:
+            return i
+        return None
+
+    def option_token(self, underlying: str, expiry, strike: float, option_type: str) -> Optional[str]:
+        """(underlying, expiry, strike, CE/PE) -> token"""
+        row = self.option_row(underlying, expiry, strike, option_type)
+        return None if row is None else str(int(self.records["token"][row]))
+
+    def option(self, underlying: str, expiry, strike: float, option_type: str) -> Optional[Dict]:
+        """(underlying, expiry, strike, CE/PE) -> instrument details"""
+        row = self.option_row(underlying, expiry, strike, option_type)
+        return None if row is None else self._row(row)
+
+    def strikes(self, underlying: str, expiry, option_type: str = "CE") -> np.ndarray:
+        """Sorted strikes (rupees) listed for an expiry"""
+        start, end = self._contract_range(underlying, expiry, option_type)
+        return self.records["strike"][start:end] / 100.0
+
+    def nearest_strike(self, underlying: str, expiry, spot: float, option_type: str = "CE") -> Optional[float]:
+        """Listed strike closest to ``spot`` (binary search, no scan)"""
+        start, end = self._contract_range(underlying, expiry, option_type)
+        if start == end:
+            return None
+        strikes = self.records["strike"][start:end]
+        target = spot * 100
+        i = int(np.searchsorted(strikes, target))
+        if i == len(strikes) or (i > 0 and target - strikes[i - 1] <= strikes[i] - target):
+            i -= 1
+        return int(strikes[i]) / 100.0
+
+    def expiries(self, underlying: str) -> List[date]:
+        """Sorted option expiries listed for an underlying"""
+        name_id = self._name_ids.get(underlying.upper())
+        if name_id is None:
+            return []
+        lo = name_id << (16 + 2 + _STRIKE_BITS)
+        hi = (name_id + 1) << (16 + 2 + _STRIKE_BITS)
+        start = int(np.searchsorted(self.keys, lo))
+        end = int(np.searchsorted(self.keys, hi))
+        block = self.records[start:end]
+        values = np.unique(block["expiry"][(block["option"] != OPT_NONE) & (block["expiry"] > 0)])
+        return [datetime.strptime(str(int(v)), "%Y%m%d").date() for v in values]
+
+
+# Global instrument index
+_index: Optional[InstrumentIndex] = None
+_index_day: Optional[date] = None
+_index_lock = Lock()
+
+
+def get_instrument_index(refresh: bool = False) -> Optional[InstrumentIndex]:
+    """Get the shared instrument index (rebuilt at most once per day; a failed load is kept for the day too)"""
+    global _index, _index_day
+    today = date.today()
+    if not refresh and _index_day == today:
+        return _index
+    with _index_lock:
+        if refresh or _index_day != today:
+            try:
+                _index = InstrumentIndex.load_or_build(
+                    getattr(config, "INSTRUMENT_MASTER_PATH", "data/instruments.csv"),
+                    getattr(config, "INSTRUMENT_INDEX_DIR", "data/instrument_index"),
+                )
+            except Exception as e:
+                logger.error(f"Instrument index load failed: {e}")
+                _index = None
+            _index_day = today
+        return _index
@@ -28,6 +28,7 @@ else:
 
 from config import config
 from src.utils.logger import StrategyLogger
+from src.integrations.angelone.http_transport import get_http_transport, route_smartconnect
 
 logger = StrategyLogger.get_logger(__name__)
 
@@ -88,6 +89,8 @@ class SmartAPIClient:
 
             # Initialize SmartConnect
             self.smart_connect = SmartConnect(api_key=self.api_key)
+            # Route SDK REST calls through the shared keep-alive pool
+            route_smartconnect(self.smart_connect)
 
             # Use low-level call to include TOTP explicitly
             totp_code = self.generate_totp()
@@ -486,14 +489,13 @@ class SmartAPIClient:
         Returns: True if successful
         """
         try:
-            import requests
             from pathlib import Path
 
             # AngelOne instrument master URL
             url = f"https://margincalculator.angelbroking.com/OpenAPI_File/files/OpenAPIScripMaster.json"
 
             logger.info(f"Downloading instrument master for {exchange}...")
-            response = requests.get(url, timeout=30)
+            response = get_http_transport().get(url, timeout=30, endpoint="instrument_master")
 
             if response.status_code == 200:
                 # Parse JSON and filter by exchange
@@ -6,11 +6,15 @@ Optimized for local network resilience with auto-reconnection and retry logic
 
 import json
 import time
-from threading import Thread, Lock, Event
+from collections import deque
+from threading import Thread, Event, Condition
 from datetime import datetime
 from src.utils.network_resilience import get_network_monitor
 from config import config
 from src.utils.logger import StrategyLogger
+from src.integrations.data_feeds.tick_recorder import TickRecorder
+from src.integrations.data_feeds.tick_conflator import TickConsumer
+from src.integrations.data_feeds.snapshot_store import SnapshotStore
 
 try:
     from src.integrations.angelone.angelone_client import AngelOneClient
@@ -37,19 +41,29 @@ class DataFeed:
         self.subscribed_symbols = set()
         self.subscribed_instruments = []  # Store for re-subscription
 
-        # Thread-safe data storage
-        self.data_lock = Lock()
-        self.ltp_data = {}
-        self.quote_data = {}
-        self.depth_data = {}
-        self.tick_data = []
-        self.tick_csv_path = None
-        self._csv_initialized = False
+        # Latest LTP / quote / depth per symbol (immutable snapshots, lock-free reads)
+        self.snapshots = SnapshotStore()
+        self.tick_data = deque(maxlen=getattr(config, "TICK_HISTORY_SIZE", 1000))
 
-        # Callbacks
+        # Binary tick persistence (background writer; feed thread only buffers)
+        self.tick_recorder = None
+        if getattr(config, "TICK_RECORDING_ENABLED", True):
+            self.tick_recorder = TickRecorder(
+                directory=getattr(config, "TICK_RECORDING_DIR", "ticks"),
+                block_size=getattr(config, "TICK_RECORDING_BLOCK_SIZE", 4096),
+            )
+
+        # Callbacks (TickConsumer per callback: own worker thread + bounded mailbox)
         self.on_tick_callbacks = []
         self.on_quote_callbacks = []
         self.on_depth_callbacks = []
+        self.consumer_mode = getattr(config, "TICK_CONSUMER_MODE", "conflate")
+        self.consumer_max_pending = getattr(config, "TICK_CONSUMER_MAX_PENDING", 1000)
+
+        # Tick notification for event-driven consumers (strategy loop)
+        self.tick_condition = Condition()
+        self.tick_versions = {}  # symbol -> monotonically increasing tick count
+        self.tick_received_at = {}  # symbol -> epoch seconds when last tick arrived
 
         # Reconnection state
         self.reconnect_thread = None
@@ -67,36 +81,6 @@ class DataFeed:
 
         logger.info("DataFeed initialized with auto-reconnection + REST API polling fallback")
 
-    def _init_csv(self):
-        try:
-            from pathlib import Path
-            from datetime import datetime
-
-            if not self._csv_initialized:
-                ts = datetime.now().strftime("%Y%m%d")
-                ticks_dir = Path("ticks")
-                ticks_dir.mkdir(exist_ok=True)
-                self.tick_csv_path = ticks_dir / f"ticks_{ts}.csv"
-                if not self.tick_csv_path.exists():
-                    with open(self.tick_csv_path, "w") as f:
-                        f.write("timestamp,symbol,ltp,bid,ask,source\n")
-                self._csv_initialized = True
-        except Exception as e:
-            logger.error(f"Error initializing tick CSV: {e}")
-
-    def _write_tick_to_csv(self, tick):
-        try:
-            if not self._csv_initialized:
-                self._init_csv()
-            if not self.tick_csv_path:
-                return
-            ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            line = f"{ts},{tick.get('symbol')},{tick.get('ltp')},{tick.get('bid')},{tick.get('ask')},{tick.get('source','WEBSOCKET')}\n"
-            with open(self.tick_csv_path, "a") as f:
-                f.write(line)
-        except Exception as e:
-            logger.error(f"Error writing tick to CSV: {e}")
-
     def connect(self, retry_count=0):
         """Establish WebSocket connection using OpenAlgo with retry logic"""
         try:
@@ -105,6 +89,7 @@ class DataFeed:
                 return False
 
             logger.info(f"Connecting to WebSocket (attempt {retry_count + 1}/{self.MAX_RECONNECT_ATTEMPTS})...")
+            self.start_recording()
 
             # Select data source: OpenAlgo or AngelOne (broker)
             data_src = getattr(config, "DATA_SOURCE", "openalgo")
@@ -266,6 +251,8 @@ class DataFeed:
             if hasattr(self, "client") and self.client:
                 self.client.disconnect()
             self.connected = False
+            if self.tick_recorder:
+                self.tick_recorder.flush()
             logger.info("WebSocket disconnected")
         except Exception as e:
             logger.error(f"Error disconnecting WebSocket: {e}")
@@ -286,7 +273,7 @@ class DataFeed:
                     return False
 
             if callback:
-                self.on_tick_callbacks.append(callback)
+                self.register_callback("tick", callback)
 
             # Support both OpenAlgo client (subscribe_ltp) and AngelOne adapter (subscribe)
             if hasattr(self.client, "subscribe_ltp"):
@@ -319,7 +306,7 @@ class DataFeed:
         """Subscribe to quote updates"""
         try:
             if callback:
-                self.on_quote_callbacks.append(callback)
+                self.register_callback("quote", callback)
 
             if hasattr(self.client, "subscribe_quote"):
                 self.client.subscribe_quote(instruments, on_data_received=self._process_tick)
@@ -340,7 +327,7 @@ class DataFeed:
         """Subscribe to market depth updates"""
         try:
             if callback:
-                self.on_depth_callbacks.append(callback)
+                self.register_callback("depth", callback)
 
             if hasattr(self.client, "subscribe_depth"):
                 self.client.subscribe_depth(instruments, on_data_received=self._process_tick)
@@ -445,76 +432,125 @@ class DataFeed:
                 return
 
             # Record data flow for health monitoring
-            self.last_tick_received = time.time()
+            received_at = time.time()
+            self.last_tick_received = received_at
             self.network_monitor.record_websocket_tick()
 
-            with self.data_lock:
-                # Update LTP
-                if "ltp" in tick:
-                    self.ltp_data[symbol] = {"price": tick["ltp"], "timestamp": datetime.now()}
-
-                # Update quote
-                if "bid" in tick or "ask" in tick:
-                    self.quote_data[symbol] = {
-                        "bid": tick.get("bid"),
-                        "ask": tick.get("ask"),
-                        "bid_qty": tick.get("bid_qty"),
-                        "ask_qty": tick.get("ask_qty"),
-                        "timestamp": datetime.now(),
-                    }
-
-                # Update depth
-                if "depth" in tick:
-                    self.depth_data[symbol] = tick["depth"]
-
-                # Store tick
-                self.tick_data.append(tick)
-                if len(self.tick_data) > 1000:  # Keep last 1000 ticks
-                    self.tick_data = self.tick_data[-1000:]
+            # Publish new LTP / quote / depth snapshot and keep recent ticks
+            self.snapshots.update(symbol, tick, received_at)
+            self.tick_data.append(tick)
+
+            # Wake any thread blocked in wait_for_ticks()
+            with self.tick_condition:
+                self.tick_versions[symbol] = self.tick_versions.get(symbol, 0) + 1
+                self.tick_received_at[symbol] = received_at
+                self.tick_condition.notify_all()
 
             # Call registered callbacks
             self._trigger_callbacks(tick)
 
             if "ltp" in tick:
                 logger.debug(f"{tick.get('symbol')}: {tick.get('ltp')} [{tick.get('source', 'WEBSOCKET')}]")
-                # Persist tick to CSV
-                self._write_tick_to_csv(tick)
+                # Persist tick (buffer append; disk I/O happens on the recorder thread)
+                if self.tick_recorder:
+                    self.tick_recorder.record(tick, received_at)
 
         except Exception as e:
             logger.error(f"Error processing tick: {e}")
 
     def _trigger_callbacks(self, tick):
-        """Trigger registered callbacks"""
+        """Hand tick to registered consumers (mailbox write only; never runs callbacks here)"""
         try:
-            for callback in self.on_tick_callbacks:
-                callback(tick)
+            for consumer in self.on_tick_callbacks:
+                consumer.offer(tick)
 
             if "bid" in tick or "ask" in tick:
-                for callback in self.on_quote_callbacks:
-                    callback(tick)
+                for consumer in self.on_quote_callbacks:
+                    consumer.offer(tick)
 
             if "depth" in tick:
-                for callback in self.on_depth_callbacks:
-                    callback(tick)
+                for consumer in self.on_depth_callbacks:
+                    consumer.offer(tick)
 
         except Exception as e:
             logger.error(f"Error triggering callbacks: {e}")
 
-    def register_callback(self, callback_type, callback_func):
-        """Register callback function for data updates"""
-        if callback_type == "tick":
-            self.on_tick_callbacks.append(callback_func)
-        elif callback_type == "quote":
-            self.on_quote_callbacks.append(callback_func)
-        elif callback_type == "depth":
-            self.on_depth_callbacks.append(callback_func)
-        else:
+    def register_callback(self, callback_type, callback_func, mode=None, max_pending=None):
+        """Register callback function for data updates
+
+        Args:
+            callback_type: 'tick', 'quote' or 'depth'
+            callback_func: Called with the tick dict on the consumer's own thread
+            mode: 'conflate' (latest tick per symbol wins), 'fifo' (bounded queue)
+                or 'inline' (run on the feed thread); defaults to TICK_CONSUMER_MODE
+            max_pending: Mailbox bound (symbols for conflate, ticks for fifo)
+
+        Returns:
+            TickConsumer handling the callback (None for an unknown type)
+        """
+        registry = {
+            "tick": self.on_tick_callbacks,
+            "quote": self.on_quote_callbacks,
+            "depth": self.on_depth_callbacks,
+        }.get(callback_type)
+        if registry is None:
             logger.warning(f"Unknown callback type: {callback_type}")
+            return None
+
+        consumer = TickConsumer(
+            callback_func,
+            mode=mode or self.consumer_mode,
+            max_pending=max_pending or self.consumer_max_pending,
+        )
+        registry.append(consumer)
+        return consumer
+
+    def get_consumer_stats(self):
+        """Get delivered / overwritten / dropped counters for every consumer"""
+        return [
+            consumer.get_stats()
+            for consumer in self.on_tick_callbacks + self.on_quote_callbacks + self.on_depth_callbacks
+        ]
+
+    def stop_consumers(self):
+        """Stop all consumer worker threads"""
+        for consumer in self.on_tick_callbacks + self.on_quote_callbacks + self.on_depth_callbacks:
+            consumer.stop()
+
+    def wait_for_ticks(self, symbols, seen_versions, timeout=None):
+        """Block until any of ``symbols`` receives a tick not yet seen by the caller
+
+        Args:
+            symbols: Iterable of symbols to watch
+            seen_versions: Caller-owned dict {symbol: version}; updated in place
+                with the versions of the symbols that changed
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            Set of symbols that ticked since the caller last looked (empty on timeout)
+        """
+        symbols = tuple(symbols)
+
+        def _changed():
+            return {
+                s for s in symbols if self.tick_versions.get(s, 0) != seen_versions.get(s, 0)
+            }
+
+        with self.tick_condition:
+            changed = self.tick_condition.wait_for(_changed, timeout=timeout)
+            for s in changed:
+                seen_versions[s] = self.tick_versions.get(s, 0)
+        return changed
+
+    def get_tick_received_at(self, symbol):
+        """Get epoch seconds at which the last tick for symbol was received"""
+        with self.tick_condition:
+            return self.tick_received_at.get(symbol)
 
     def get_ltp(self, symbol):
         """Get last traded price for symbol"""
-        with self.data_lock:
-            return self.ltp_data.get(symbol, {}).get("price")
+        snapshot = self.snapshots.get(symbol)
+        return snapshot.ltp if snapshot else None
 
     def get_ltp_with_timestamp(self, symbol):
         """Get LTP with timestamp for freshness checking
@@ -522,21 +558,42 @@ class DataFeed:
         Returns:
             {'price': float, 'timestamp': datetime} or None
         """
-        with self.data_lock:
-            ltp_data = self.ltp_data.get(symbol)
-            if not ltp_data:
-                return None
-            return {"price": ltp_data.get("price"), "timestamp": ltp_data.get("timestamp")}
+        snapshot = self.snapshots.get(symbol)
+        if not snapshot or snapshot.ltp_time is None:
+            return None
+        return {"price": snapshot.ltp, "timestamp": snapshot.ltp_time}
 
     def get_quote(self, symbol):
         """Get quote data for symbol"""
-        with self.data_lock:
-            return self.quote_data.get(symbol)
+        snapshot = self.snapshots.get(symbol)
+        if not snapshot or snapshot.quote_time is None:
+            return None
+        return {
+            "bid": snapshot.bid,
+            "ask": snapshot.ask,
+            "bid_qty": snapshot.bid_qty,
+            "ask_qty": snapshot.ask_qty,
+            "timestamp": snapshot.quote_time,
+        }
 
     def get_depth(self, symbol):
         """Get market depth for symbol"""
-        with self.data_lock:
-            return self.depth_data.get(symbol)
+        snapshot = self.snapshots.get(symbol)
+        return snapshot.depth if snapshot else None
+
+    def get_snapshot(self, symbol):
+        """Get the immutable SymbolSnapshot (LTP, quote, depth, version) for symbol"""
+        return self.snapshots.get(symbol)
+
+    def start_recording(self):
+        """Start the tick recorder (any transport: WebSocket, REST polling or offline adapter)"""
+        if self.tick_recorder:
+            self.tick_recorder.start()
+
+    def stop_recording(self):
+        """Flush buffered ticks to disk and stop the tick recorder"""
+        if self.tick_recorder:
+            self.tick_recorder.close()
 
     def is_connected(self):
         """Check if WebSocket is connected"""
@@ -592,6 +649,7 @@ class DataFeed:
 
         logger.warning("⚠️ WebSocket not receiving data! Starting REST API polling fallback...")
         self.use_rest_polling = True
+        self.start_recording()
 
         # Store symbols for polling
         self.polling_symbols = instruments
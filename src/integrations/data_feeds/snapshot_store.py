@@ -0,0 +1,86 @@
+"""
+Snapshot Store
+Single-writer / many-reader latest-value store for market data
+
+Each symbol maps to an immutable, versioned SymbolSnapshot. The ingestion
+thread builds a new snapshot and swaps the dict entry (a single reference
+assignment, atomic under the GIL); readers just fetch the current object
+and never take a lock or observe a half-updated record.
+"""
+
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, NamedTuple, Optional
+
+
+class SymbolSnapshot(NamedTuple):
+    """Immutable latest market state for one symbol"""
+
+    symbol: str
+    version: int = 0
+    ltp: Optional[float] = None
+    ltp_time: Optional[datetime] = None
+    bid: Optional[float] = None
+    ask: Optional[float] = None
+    bid_qty: Optional[float] = None
+    ask_qty: Optional[float] = None
+    quote_time: Optional[datetime] = None
+    depth: Any = None
+    received_at: float = 0.0
+
+
+class SnapshotStore:
+    """
+    Latest LTP / quote / depth per symbol
+
+    Writers serialize on a private lock (WebSocket and REST polling threads
+    may both publish); readers are lock-free.
+    """
+
+    def __init__(self):
+        self._snapshots: Dict[str, SymbolSnapshot] = {}
+        self._write_lock = Lock()
+        self.version = 0  # bumped on every update
+
+    def update(self, symbol: str, tick: Dict, received_at: float) -> SymbolSnapshot:
+        """Merge a tick into the symbol's snapshot and publish it"""
+        with self._write_lock:
+            prev = self._snapshots.get(symbol)
+            if prev is None:
+                prev = SymbolSnapshot(symbol)
+            now = datetime.fromtimestamp(received_at)
+
+            has_ltp = "ltp" in tick
+            has_quote = "bid" in tick or "ask" in tick
+            snapshot = SymbolSnapshot(
+                symbol,
+                prev.version + 1,
+                tick["ltp"] if has_ltp else prev.ltp,
+                now if has_ltp else prev.ltp_time,
+                tick.get("bid") if has_quote else prev.bid,
+                tick.get("ask") if has_quote else prev.ask,
+                tick.get("bid_qty") if has_quote else prev.bid_qty,
+                tick.get("ask_qty") if has_quote else prev.ask_qty,
+                now if has_quote else prev.quote_time,
+                tick["depth"] if "depth" in tick else prev.depth,
+                received_at,
+            )
+            self._snapshots[symbol] = snapshot
+            self.version += 1
+        return snapshot
+
+    def get(self, symbol: str) -> Optional[SymbolSnapshot]:
+        """Current snapshot for symbol (lock-free)"""
+        return self._snapshots.get(symbol)
+
+    def all(self) -> Dict[str, SymbolSnapshot]:
+        """Point-in-time copy of every snapshot (lock-free)"""
+        return self._snapshots.copy()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def clear(self):
+        with self._write_lock:
+            self._snapshots = {}
+            self.version += 1
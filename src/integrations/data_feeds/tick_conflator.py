@@ -0,0 +1,174 @@
+"""
+Tick Conflator
+Decouples feed ingestion from tick consumers
+
+Each registered callback becomes a TickConsumer with its own worker thread
+and a bounded mailbox. The feed thread only drops the tick into the mailbox
+and returns; it never runs or waits for strategy code.
+
+Mailbox modes:
+    conflate - one slot per symbol, the latest tick overwrites the pending one
+               (consumers always see the freshest price, never a backlog)
+    fifo     - bounded queue of every tick; the oldest is dropped when full
+    inline   - legacy behaviour, callback runs on the feed thread
+"""
+
+import logging
+import time
+from collections import OrderedDict, deque
+from threading import Condition, Thread
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MODE_CONFLATE = "conflate"
+MODE_FIFO = "fifo"
+MODE_INLINE = "inline"
+MODES = (MODE_CONFLATE, MODE_FIFO, MODE_INLINE)
+
+
+class TickConsumer:
+    """
+    Bounded mailbox + worker thread for one tick callback
+
+    Usage:
+        consumer = TickConsumer(strategy.on_tick, mode="conflate")
+        consumer.offer(tick)       # feed thread: O(1), never blocks on the callback
+        consumer.stop()
+    """
+
+    def __init__(self, callback: Callable, mode: str = MODE_CONFLATE, max_pending: int = 1000, name: str = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown consumer mode '{mode}', expected one of {MODES}")
+
+        self.callback = callback
+        self.mode = mode
+        self.max_pending = max(1, max_pending)
+        self.name = name or getattr(callback, "__name__", "consumer")
+
+        self._cond = Condition()
+        self._slots: "OrderedDict[str, Dict]" = OrderedDict()  # conflate: symbol -> latest tick
+        self._queue: deque = deque()  # fifo
+        self._thread: Optional[Thread] = None
+        self.running = False
+
+        # Stats
+        self.offered = 0
+        self.delivered = 0
+        self.overwritten = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_callback_time = 0.0
+
+        if mode != MODE_INLINE:
+            self.start()
+
+    def start(self):
+        """Start worker thread"""
+        if self.running or self.mode == MODE_INLINE:
+            return
+        self.running = True
+        self._thread = Thread(target=self._worker_loop, daemon=True, name=f"TickConsumer-{self.name}")
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Stop worker thread (pending ticks are discarded)"""
+        if not self.running:
+            return
+        with self._cond:
+            self.running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    # ------------------------------------------------------------------
+    # Feed thread
+    # ------------------------------------------------------------------
+
+    def offer(self, tick: Dict) -> bool:
+        """
+        Hand a tick to the consumer (called on the feed thread)
+
+        Returns:
+            False if the tick was dropped because the mailbox is full
+        """
+        if self.mode == MODE_INLINE:
+            self.offered += 1
+            self._deliver(tick)
+            return True
+
+        with self._cond:
+            self.offered += 1
+            if self.mode == MODE_CONFLATE:
+                symbol = tick.get("symbol")
+                if symbol in self._slots:
+                    self._slots[symbol] = tick
+                    self.overwritten += 1
+                    return True
+                if len(self._slots) >= self.max_pending:
+                    self.dropped += 1
+                    return False
+                self._slots[symbol] = tick
+            else:
+                if len(self._queue) >= self.max_pending:
+                    self._queue.popleft()
+                    self.dropped += 1
+                self._queue.append(tick)
+            self._cond.notify()
+        return True
+
+    # ------------------------------------------------------------------
+    # Worker thread
+    # ------------------------------------------------------------------
+
+    def _take_pending(self):
+        """Swap out everything pending (lock held)"""
+        if self.mode == MODE_CONFLATE:
+            pending = list(self._slots.values())
+            self._slots.clear()
+        else:
+            pending = list(self._queue)
+            self._queue.clear()
+        return pending
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: not self.running or self._slots or self._queue)
+                if not self.running:
+                    return
+                pending = self._take_pending()
+
+            for tick in pending:
+                self._deliver(tick)
+
+    def _deliver(self, tick: Dict):
+        started = time.perf_counter()
+        try:
+            self.callback(tick)
+            self.delivered += 1
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Tick consumer '{self.name}' callback error: {e}")
+        elapsed = time.perf_counter() - started
+        if elapsed > self.max_callback_time:
+            self.max_callback_time = elapsed
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._slots) + len(self._queue)
+
+    def get_stats(self) -> Dict:
+        """Get consumer statistics"""
+        return {
+            "name": self.name,
+            "mode": self.mode,
+            "offered": self.offered,
+            "delivered": self.delivered,
+            "overwritten": self.overwritten,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "pending": self.pending,
+            "max_callback_ms": self.max_callback_time * 1000,
+        }
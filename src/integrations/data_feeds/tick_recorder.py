@@ -0,0 +1,374 @@
+"""
+Tick Recorder
+Buffered, rotating binary tick persistence for the live data feed
+
+The feed thread only writes one fixed-width record into a preallocated
+NumPy block; a background writer thread appends full blocks to disk.
+
+File layout (little-endian, 8-byte aligned):
+    header : b"AXTK" | u16 version | u16 record size
+    blocks : 4-byte tag | u32 count | payload (padded to 8 bytes)
+        b"SYMS" - symbol dictionary entries (u16 length + UTF-8 name), ids
+                  are assigned sequentially from 0 within each file
+        b"RECS" - ``count`` records of TICK_DTYPE
+"""
+
+import logging
+import math
+import struct
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from queue import Empty, Queue
+from threading import Lock, Thread
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FILE_MAGIC = b"AXTK"
+FILE_VERSION = 1
+FILE_SUFFIX = ".tkb"
+
+TAG_SYMBOLS = b"SYMS"
+TAG_RECORDS = b"RECS"
+
+_FILE_HEADER = struct.Struct("<4sHH")
+_BLOCK_HEADER = struct.Struct("<4sI")
+_SYMBOL_LEN = struct.Struct("<H")
+
+TICK_DTYPE = np.dtype(
+    {
+        "names": ["ts", "symbol_id", "source", "ltp", "bid", "ask", "volume", "oi"],
+        "formats": ["<f8", "<u4", "u1", "<f8", "<f8", "<f8", "<i8", "<i8"],
+        "offsets": [0, 8, 12, 16, 24, 32, 40, 48],
+        "itemsize": 56,
+    }
+)
+
+SOURCE_CODES = {"WEBSOCKET": 0, "REST_POLLING": 1}
+SOURCE_NAMES = {0: "WEBSOCKET", 1: "REST_POLLING", 255: "OTHER"}
+
+_NAN = math.nan
+
+
+def _pad8(size: int) -> int:
+    return (-size) % 8
+
+
+class TickRecorder:
+    """
+    Records ticks to compact binary session files on a background thread
+
+    Usage:
+        recorder = TickRecorder("ticks")
+        recorder.start()
+        recorder.record(tick, time.time())   # feed thread: buffer write only
+        recorder.close()                     # flush and stop on shutdown
+    """
+
+    def __init__(
+        self,
+        directory: str = "ticks",
+        block_size: int = 4096,
+        buffer_count: int = 4,
+        flush_interval: float = 5.0,
+    ):
+        self.directory = Path(directory)
+        self.block_size = block_size
+        self.flush_interval = flush_interval
+
+        # Symbol dictionary (append-only; ids are indexes into _symbol_names)
+        self._symbol_ids: Dict[str, int] = {}
+        self._symbol_names: List[str] = []
+
+        # Buffer pool: feed thread fills _active, writer drains _full
+        self._lock = Lock()
+        self._free = deque(np.empty(block_size, dtype=TICK_DTYPE) for _ in range(buffer_count - 1))
+        self._active: Optional[np.ndarray] = np.empty(block_size, dtype=TICK_DTYPE)
+        self._count = 0
+        self._full: Queue = Queue()
+
+        # End of the local day being buffered (epoch seconds; feed thread)
+        self._day_end = -math.inf
+
+        # Writer state (touched only by writer thread)
+        self._file = None
+        self._file_day: Optional[str] = None
+        self._file_symbols = 0
+
+        self._thread: Optional[Thread] = None
+        self.running = False
+
+        # Stats
+        self.recorded = 0
+        self.dropped = 0
+        self.blocks_written = 0
+        self.current_path: Optional[Path] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start background writer thread"""
+        if self.running:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.running = True
+        self._thread = Thread(target=self._writer_loop, daemon=True, name="TickRecorder")
+        self._thread.start()
+        logger.info(f"TickRecorder started: {self.directory} (block={self.block_size} ticks)")
+
+    def flush(self):
+        """Hand the partially filled buffer to the writer"""
+        with self._lock:
+            self._seal_active_locked()
+
+    def rotate(self):
+        """Close the current file after pending blocks; next block starts a new session file"""
+        self.flush()
+        self._full.put("rotate")
+
+    def close(self, timeout: float = 5.0):
+        """Flush pending ticks and stop the writer thread"""
+        if not self.running:
+            return
+        self.flush()
+        self._full.put(None)
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self.running = False
+        logger.info(
+            f"TickRecorder closed: {self.recorded} ticks, {self.blocks_written} blocks, {self.dropped} dropped"
+        )
+
+    # ------------------------------------------------------------------
+    # Feed thread
+    # ------------------------------------------------------------------
+
+    def record(self, tick: Dict, ts: Optional[float] = None) -> bool:
+        """Append tick to the active buffer (called on the feed thread)"""
+        if ts is None:
+            ts = time.time()
+        if ts >= self._day_end:
+            self._roll_day(ts)
+
+        symbol = tick.get("symbol")
+        sid = self._symbol_ids.get(symbol)
+        if sid is None:
+            sid = self._register_symbol(symbol)
+
+        ltp = tick.get("ltp")
+        bid = tick.get("bid")
+        ask = tick.get("ask")
+        volume = tick.get("volume")
+        oi = tick.get("oi")
+        row = (
+            ts,
+            sid,
+            SOURCE_CODES.get(tick.get("source", "WEBSOCKET"), 255),
+            _NAN if ltp is None else ltp,
+            _NAN if bid is None else bid,
+            _NAN if ask is None else ask,
+            -1 if volume is None else volume,
+            -1 if oi is None else oi,
+        )
+
+        with self._lock:
+            buf = self._active
+            if buf is None:
+                self.dropped += 1
+                return False
+            buf[self._count] = row
+            self._count += 1
+            self.recorded += 1
+            if self._count == self.block_size:
+                self._seal_active_locked()
+        return True
+
+    def _roll_day(self, ts: float):
+        """Advance the day to ts; on a date change seal the buffer and start a new file"""
+        midnight = datetime.fromtimestamp(ts).replace(hour=0, minute=0, second=0, microsecond=0)
+        first = self._day_end == -math.inf
+        self._day_end = (midnight + timedelta(days=1)).timestamp()
+        if not first:
+            with self._lock:
+                self._seal_active_locked()
+                self._full.put("rotate")
+
+    def _register_symbol(self, symbol: str) -> int:
+        with self._lock:
+            sid = self._symbol_ids.get(symbol)
+            if sid is None:
+                sid = len(self._symbol_names)
+                self._symbol_names.append(symbol)
+                self._symbol_ids[symbol] = sid
+            return sid
+
+    def _seal_active_locked(self):
+        """Queue active buffer for writing and install a free one (lock held)"""
+        if self._active is None or self._count == 0:
+            return
+        self._full.put((self._active, self._count))
+        self._active = self._free.popleft() if self._free else None
+        self._count = 0
+
+    def _release_buffer(self, buf: np.ndarray):
+        with self._lock:
+            if self._active is None:
+                self._active = buf
+                self._count = 0
+            else:
+                self._free.append(buf)
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _writer_loop(self):
+        while True:
+            try:
+                item = self._full.get(timeout=self.flush_interval)
+            except Empty:
+                self.flush()
+                continue
+
+            if item is None:
+                break
+            if item == "rotate":
+                self._close_file()
+                continue
+
+            buf, count = item
+            try:
+                self._write_block(buf, count)
+            except Exception as e:
+                logger.error(f"TickRecorder write failed: {e}")
+            finally:
+                self._release_buffer(buf)
+
+        # Drain anything sealed after the stop sentinel was queued
+        while not self._full.empty():
+            item = self._full.get_nowait()
+            if isinstance(item, tuple):
+                self._write_block(*item)
+                self._release_buffer(item[0])
+        self._close_file()
+
+    def _write_block(self, buf: np.ndarray, count: int):
+        day = datetime.fromtimestamp(float(buf[0]["ts"])).strftime("%Y%m%d")
+        if self._file is not None and day != self._file_day:
+            self._close_file()
+        if self._file is None:
+            self._open_file(day)
+
+        names = self._symbol_names[:]
+        if len(names) > self._file_symbols:
+            payload = b"".join(
+                _SYMBOL_LEN.pack(len(raw)) + raw
+                for raw in (name.encode("utf-8") for name in names[self._file_symbols :])
+            )
+            self._file.write(_BLOCK_HEADER.pack(TAG_SYMBOLS, len(names) - self._file_symbols))
+            self._file.write(payload + b"\0" * _pad8(len(payload)))
+            self._file_symbols = len(names)
+
+        self._file.write(_BLOCK_HEADER.pack(TAG_RECORDS, count))
+        self._file.write(buf[:count].tobytes())
+        self._file.flush()
+        self.blocks_written += 1
+
+    def _open_file(self, day: str):
+        session = datetime.now().strftime("%H%M%S")
+        path = self.directory / f"ticks_{day}_{session}{FILE_SUFFIX}"
+        self._file = open(path, "wb")
+        self._file.write(_FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, TICK_DTYPE.itemsize))
+        self._file_day = day
+        self._file_symbols = 0
+        self.current_path = path
+        logger.info(f"TickRecorder writing session file {path}")
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._file_day = None
+
+    def get_stats(self) -> Dict:
+        """Get recorder statistics"""
+        return {
+            "recorded": self.recorded,
+            "dropped": self.dropped,
+            "blocks_written": self.blocks_written,
+            "symbols": len(self._symbol_names),
+            "pending_blocks": self._full.qsize(),
+            "current_file": str(self.current_path) if self.current_path else None,
+        }
+
+
+def read_tick_file(path) -> Tuple[np.ndarray, List[str]]:
+    """
+    Load a binary tick file
+
+    Returns:
+        (records, symbols): structured array of TICK_DTYPE and the symbol
+        dictionary indexed by ``records["symbol_id"]``
+    """
+    raw = np.fromfile(path, dtype=np.uint8)
+    magic, version, itemsize = _FILE_HEADER.unpack_from(raw, 0)
+    if magic != FILE_MAGIC or itemsize != TICK_DTYPE.itemsize:
+        raise ValueError(f"Not a tick file (version {version}): {path}")
+
+    symbols: List[str] = []
+    chunks = []
+    offset = _FILE_HEADER.size
+    end = len(raw)
+    while offset + _BLOCK_HEADER.size <= end:
+        tag, count = _BLOCK_HEADER.unpack_from(raw, offset)
+        offset += _BLOCK_HEADER.size
+        if tag == TAG_RECORDS:
+            size = count * itemsize
+            if offset + size > end:  # truncated tail (crash mid-write)
+                count = (end - offset) // itemsize
+                size = count * itemsize
+            chunks.append(np.frombuffer(raw, dtype=TICK_DTYPE, count=count, offset=offset))
+            offset += size
+        elif tag == TAG_SYMBOLS:
+            start = offset
+            for _ in range(count):
+                (length,) = _SYMBOL_LEN.unpack_from(raw, offset)
+                offset += _SYMBOL_LEN.size
+                symbols.append(raw[offset : offset + length].tobytes().decode("utf-8"))
+                offset += length
+            offset += _pad8(offset - start)
+        else:
+            raise ValueError(f"Corrupt tick file block {tag!r} at offset {offset}: {path}")
+
+    records = np.concatenate(chunks) if chunks else np.empty(0, dtype=TICK_DTYPE)
+    return records, symbols
+
+
+def tick_file_to_dataframe(path):
+    """Load a binary tick file as a timestamp-indexed DataFrame"""
+    import pandas as pd
+
+    records, symbols = read_tick_file(path)
+    df = pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(records["ts"], unit="s", utc=True)
+            .tz_convert(datetime.now().astimezone().tzinfo)
+            .tz_localize(None),
+            "symbol": pd.Categorical.from_codes(records["symbol_id"].astype(np.int64), categories=symbols)
+            if len(symbols)
+            else pd.Categorical([]),
+            "ltp": records["ltp"],
+            "bid": records["bid"],
+            "ask": records["ask"],
+            "volume": records["volume"],
+            "oi": records["oi"],
+            "source": pd.Series(records["source"]).map(SOURCE_NAMES).values,
+        }
+    )
+    return df.set_index("timestamp").sort_index()
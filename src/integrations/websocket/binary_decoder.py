@@ -0,0 +1,121 @@
+"""
+Binary Frame Decoder for SmartAPI (AngelOne) SmartStream
+
+Packet layouts (little-endian, prices in paise):
+- LTP        (51 bytes):  mode, exchange, token[25], sequence, exchange_ts, ltp
+- QUOTE      (123 bytes): LTP + last qty, avg price, volume, total buy/sell qty, OHLC
+- SNAP_QUOTE (379 bytes): QUOTE + last trade ts, OI, OI change %, 5-level depth,
+                          circuit limits, 52-week high/low
+
+Each layout is a precompiled ``struct.Struct`` so one ``unpack_from`` call
+decodes a whole packet in place (bytes, bytearray or memoryview; no slicing).
+"""
+
+import struct
+from typing import Dict, List, Optional
+
+# Subscription mode byte (matches SubscriptionMode values)
+MODE_LTP = 1
+MODE_QUOTE = 2
+MODE_SNAP_QUOTE = 3
+
+PRICE_DIVISOR = 100.0
+DEPTH_LEVELS = 10  # 5 buy + 5 sell
+
+_HEADER_FMT = "<BB25sqqq"
+_QUOTE_FMT = "qqqddqqqq"
+_SNAP_FMT = "qqq" + "hqqh" * DEPTH_LEVELS + "qqqq"
+
+LTP_PACKET = struct.Struct(_HEADER_FMT)
+QUOTE_PACKET = struct.Struct(_HEADER_FMT + _QUOTE_FMT)
+SNAP_QUOTE_PACKET = struct.Struct(_HEADER_FMT + _QUOTE_FMT + _SNAP_FMT)
+
+_SNAP_TAIL_KEYS = ("upper_circuit_limit", "lower_circuit_limit", "52_week_high_price", "52_week_low_price")
+_QUOTE_END = 6 + 9  # header + quote fields
+_DEPTH_START = _QUOTE_END + 3
+_DEPTH_END = _DEPTH_START + 4 * DEPTH_LEVELS
+
+
+def _depth(values) -> Dict[str, List[Dict]]:
+    buy, sell = [], []
+    for i in range(0, 4 * DEPTH_LEVELS, 4):
+        flag, quantity, price, orders = values[i : i + 4]
+        level = {"flag": flag, "quantity": quantity, "price": price, "no of orders": orders}
+        (buy if flag == 0 else sell).append(level)
+    return {"best_5_buy_data": buy, "best_5_sell_data": sell}
+
+
+def _decode_ltp(values) -> Dict:
+    mode, exchange_type, raw_token, sequence, exchange_ts, ltp = values[:6]
+    return {
+        "type": "tick",
+        "subscription_mode": mode,
+        "exchange_type": exchange_type,
+        "token": raw_token.split(b"\x00", 1)[0].decode("ascii"),
+        "sequence_number": sequence,
+        "exchange_timestamp": exchange_ts,
+        "last_traded_price": ltp,
+        "ltp": ltp / PRICE_DIVISOR,
+    }
+
+
+def _decode_quote(values) -> Dict:
+    (mode, exchange_type, raw_token, sequence, exchange_ts, ltp,
+     ltq, atp, volume, total_buy, total_sell, open_, high, low, close) = values[:_QUOTE_END]
+    return {
+        "type": "tick",
+        "subscription_mode": mode,
+        "exchange_type": exchange_type,
+        "token": raw_token.split(b"\x00", 1)[0].decode("ascii"),
+        "sequence_number": sequence,
+        "exchange_timestamp": exchange_ts,
+        "last_traded_price": ltp,
+        "ltp": ltp / PRICE_DIVISOR,
+        "last_traded_quantity": ltq,
+        "average_traded_price": atp,
+        "volume_trade_for_the_day": volume,
+        "volume": volume,
+        "total_buy_quantity": total_buy,
+        "total_sell_quantity": total_sell,
+        "open_price_of_the_day": open_,
+        "high_price_of_the_day": high,
+        "low_price_of_the_day": low,
+        "closed_price": close,
+        "high": high / PRICE_DIVISOR,
+        "low": low / PRICE_DIVISOR,
+        "close": close / PRICE_DIVISOR,
+    }
+
+
+def _decode_snap_quote(values) -> Dict:
+    tick = _decode_quote(values)
+    tick["last_traded_timestamp"] = values[_QUOTE_END]
+    tick["open_interest"] = tick["oi"] = values[_QUOTE_END + 1]
+    tick["open_interest_change_percentage"] = values[_QUOTE_END + 2]
+    tick.update(_depth(values[_DEPTH_START:_DEPTH_END]))
+    tick.update(zip(_SNAP_TAIL_KEYS, values[_DEPTH_END:]))
+    return tick
+
+
+def decode_packet(frame) -> Optional[Dict]:
+    """
+    Decode one SmartStream packet
+
+    Args:
+        frame: bytes / bytearray / memoryview of a single packet
+
+    Returns:
+        Tick dict with SmartAPI field names (raw paise integers) plus
+        convenience keys ``type``, ``ltp``, ``high``/``low``/``close``
+        (rupees), ``volume`` and ``oi``; None if the frame is too short
+    """
+    size = len(frame)
+    if size < LTP_PACKET.size:
+        return None
+
+    mode = frame[0]
+    if mode == MODE_SNAP_QUOTE and size >= SNAP_QUOTE_PACKET.size:
+        return _decode_snap_quote(SNAP_QUOTE_PACKET.unpack_from(frame))
+    if mode >= MODE_QUOTE and size >= QUOTE_PACKET.size:
+        return _decode_quote(QUOTE_PACKET.unpack_from(frame))
+    return _decode_ltp(LTP_PACKET.unpack_from(frame))
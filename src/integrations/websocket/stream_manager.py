@@ -11,15 +11,29 @@ Manages multiple data streams:
 import time
 from typing import Dict, List, Callable, Optional, Any
 from datetime import datetime
-from collections import deque, defaultdict
+from collections import defaultdict
 import threading
 
+import numpy as np
+
 from src.utils.logger import StrategyLogger
+from src.integrations.angelone.instrument_index import get_instrument_index
 from .websocket_client import WebSocketClient, SubscriptionMode
+from .tick_ring import TickRingBuffer
 
 logger = StrategyLogger.get_logger(__name__)
 
 
+def _best_price(depth) -> Optional[float]:
+    """Top-of-book price from a best-5 depth list"""
+    if depth:
+        try:
+            return depth[0]["price"]
+        except (LookupError, TypeError):
+            return None
+    return None
+
+
 class StreamManager:
     """
     Manages real-time data streams
@@ -42,9 +56,8 @@ class StreamManager:
         self.ws_client = websocket_client
         self.buffer_size = buffer_size
 
-        # Data buffers
-        self.tick_buffers: Dict[str, deque] = defaultdict(lambda: deque(maxlen=buffer_size))
-        self.latest_ticks: Dict[str, Dict] = {}
+        # Data buffers: fixed-size columnar ring per token
+        self.tick_buffers: Dict[str, TickRingBuffer] = {}
 
         # Callbacks
         self.tick_callbacks: List[Callable] = []
@@ -97,9 +110,30 @@ class StreamManager:
         self.subscribe_instruments(instruments, mode)
         logger.info("Subscribed to NIFTY & BANKNIFTY")
 
+    def option_instruments(self, underlying: str, expiry: str, strikes: List[int]) -> List[Dict[str, Any]]:
+        """
+        CE and PE instruments for a set of strikes
+
+        Returns:
+            List of dicts with token, exchange, symbol, strike and option_type
+        """
+        instruments = []
+        for strike in strikes:
+            for option_type in ("CE", "PE"):
+                instruments.append(
+                    {
+                        "token": self._get_option_token(underlying, expiry, strike, option_type),
+                        "exchange": "NFO",
+                        "symbol": f"{underlying} {expiry} {strike} {option_type}",
+                        "strike": strike,
+                        "option_type": option_type,
+                    }
+                )
+        return instruments
+
     def subscribe_option_chain(
         self, underlying: str, expiry: str, strikes: List[int], mode: SubscriptionMode = SubscriptionMode.QUOTE
-    ):
+    ) -> List[Dict[str, Any]]:
         """
         Subscribe to complete option chain
 
@@ -108,34 +142,32 @@ class StreamManager:
             expiry: Expiry date (DDMMMYY format)
             strikes: List of strike prices
             mode: Subscription mode
+
+        Returns:
+            The subscribed instruments (see option_instruments)
         """
         try:
-            instruments = []
-
-            for strike in strikes:
-                # Add CE
-                instruments.append(
-                    {
-                        "token": self._get_option_token(underlying, expiry, strike, "CE"),
-                        "exchange": "NFO",
-                        "symbol": f"{underlying} {expiry} {strike} CE",
-                    }
-                )
-
-                # Add PE
-                instruments.append(
-                    {
-                        "token": self._get_option_token(underlying, expiry, strike, "PE"),
-                        "exchange": "NFO",
-                        "symbol": f"{underlying} {expiry} {strike} PE",
-                    }
-                )
-
+            instruments = self.option_instruments(underlying, expiry, strikes)
             self.subscribe_instruments(instruments, mode)
             logger.info(f"Subscribed to {len(strikes)} strikes ({len(instruments)} options)")
+            return instruments
 
         except Exception as e:
             logger.error(f"Subscribe option chain error: {e}")
+            return []
+
+    def unsubscribe_option_chain(
+        self, underlying: str, expiry: str, strikes: List[int], mode: SubscriptionMode = SubscriptionMode.QUOTE
+    ):
+        """Unsubscribe the CE and PE of some strikes"""
+        try:
+            tokens = [inst["token"] for inst in self.option_instruments(underlying, expiry, strikes)]
+            if tokens:
+                self.ws_client.unsubscribe(tokens=tokens, mode=mode, exchange="NFO")
+            logger.info(f"Unsubscribed from {len(strikes)} strikes ({len(tokens)} options)")
+
+        except Exception as e:
+            logger.error(f"Unsubscribe option chain error: {e}")
 
     def on_tick(self, callback: Callable):
         """Register callback for price ticks"""
@@ -164,31 +196,39 @@ class StreamManager:
             if not token:
                 return
 
-            # Parse tick data
-            tick = {
-                "token": token,
-                "timestamp": datetime.now(),
-                "ltp": tick_data.get("last_traded_price"),
-                "volume": tick_data.get("volume_trade_for_the_day"),
-                "oi": tick_data.get("open_interest"),
-                "bid": tick_data.get("best_5_buy_data"),
-                "ask": tick_data.get("best_5_sell_data"),
-                "change": tick_data.get("change"),
-                "change_percent": tick_data.get("percentage_change"),
-            }
-
-            # Update buffers
+            now = time.time()
+            ltp = tick_data.get("last_traded_price")
+            volume = tick_data.get("volume_trade_for_the_day")
+            oi = tick_data.get("open_interest")
+            bid = tick_data.get("best_5_buy_data")
+            ask = tick_data.get("best_5_sell_data")
+
+            # Update buffers (no per-tick allocation)
             with self.lock:
-                self.tick_buffers[token].append(tick)
-                self.latest_ticks[token] = tick
+                ring = self.tick_buffers.get(token)
+                if ring is None:
+                    ring = self.tick_buffers[token] = TickRingBuffer(self.buffer_size)
+                ring.append(now, ltp, volume, oi, _best_price(bid), _best_price(ask))
                 self.tick_count += 1
 
-            # Trigger callbacks
-            for callback in self.tick_callbacks:
-                try:
-                    callback(tick)
-                except Exception as e:
-                    logger.error(f"Tick callback error: {e}")
+            # Build the tick dict only when someone consumes it
+            if self.tick_callbacks:
+                tick = {
+                    "token": token,
+                    "timestamp": datetime.fromtimestamp(now),
+                    "ltp": ltp,
+                    "volume": volume,
+                    "oi": oi,
+                    "bid": bid,
+                    "ask": ask,
+                    "change": tick_data.get("change"),
+                    "change_percent": tick_data.get("percentage_change"),
+                }
+                for callback in self.tick_callbacks:
+                    try:
+                        callback(tick)
+                    except Exception as e:
+                        logger.error(f"Tick callback error: {e}")
 
             # Check if Greeks update is needed
             if "delta" in tick_data or "gamma" in tick_data:
@@ -219,14 +259,23 @@ class StreamManager:
     def get_latest_price(self, token: str) -> Optional[float]:
         """Get latest price for token"""
         with self.lock:
-            tick = self.latest_ticks.get(token)
-            return tick["ltp"] if tick else None
+            ring = self.tick_buffers.get(token)
+            return ring.latest("ltp") if ring is not None else None
 
-    def get_price_history(self, token: str, count: int = 100) -> List[Dict]:
-        """Get recent price history"""
+    def get_price_history(self, token: str, count: int = 100) -> Dict[str, np.ndarray]:
+        """
+        Get recent tick history as column arrays, oldest first
+
+        Returns:
+            Dict of timestamp (epoch seconds), ltp, volume, oi, bid, ask
+            arrays. These are views into the ring buffer (no copy); call
+            ``.copy()`` on any column that must outlive later ticks.
+        """
         with self.lock:
-            buffer = self.tick_buffers.get(token, deque())
-            return list(buffer)[-count:]
+            ring = self.tick_buffers.get(token)
+            if ring is None:
+                return {}
+            return ring.view(count)
 
     def get_statistics(self) -> Dict:
         """Get streaming statistics"""
@@ -235,7 +284,8 @@ class StreamManager:
         return {
             "total_ticks": self.tick_count,
             "ticks_per_second": self.tick_count / uptime if uptime > 0 else 0,
-            "active_instruments": len(self.latest_ticks),
+            "active_instruments": len(self.tick_buffers),
+            "buffer_bytes": sum(ring.nbytes for ring in self.tick_buffers.values()),
             "uptime_seconds": uptime,
             "connected": self.ws_client.is_connected,
             "subscriptions": self.ws_client.get_subscription_count(),
@@ -254,6 +304,13 @@ class StreamManager:
         Returns: Token string
         """
         try:
+            # Structured lookup in the shared instrument index
+            index = get_instrument_index()
+            if index is not None:
+                token = index.option_token(underlying, expiry, strike, option_type)
+                if token:
+                    return token
+
             # Build symbol name (e.g., NIFTY23JAN2624000CE)
             symbol = f"{underlying}{expiry}{strike}{option_type}"
 
@@ -0,0 +1,88 @@
+"""
+Columnar Tick Ring Buffer
+
+Fixed-size, per-instrument tick history stored as NumPy columns
+(timestamp, ltp, volume, oi, bid, ask).
+
+Every column is allocated at twice the capacity and each tick is written
+to slot ``i`` and ``i + capacity``, so the most recent ``n`` ticks are
+always one contiguous slice. Appends are O(1) with no allocation and
+history reads return views instead of copies.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+COLUMNS = ("timestamp", "ltp", "volume", "oi", "bid", "ask")
+
+
+class TickRingBuffer:
+    """
+    Preallocated ring of recent ticks for one instrument
+
+    Usage:
+        ring = TickRingBuffer(1000)
+        ring.append(ts, ltp, volume, oi, bid, ask)
+        history = ring.view(100)      # dict of column views, oldest first
+    """
+
+    __slots__ = ("capacity", "size", "_pos", "_data") + COLUMNS
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.size = 0
+        self._pos = 0  # next write slot in [0, capacity)
+
+        # One block, one row per column; NaN marks missing values
+        self._data = np.full((len(COLUMNS), 2 * capacity), np.nan)
+        for row, name in enumerate(COLUMNS):
+            setattr(self, name, self._data[row])
+
+    def append(self, timestamp: float, ltp: float, volume: float, oi: float, bid: float, ask: float):
+        """Write one tick (overwrites the oldest once full)"""
+        data = self._data
+        pos = self._pos
+        mirror = pos + self.capacity
+        data[:, pos] = data[:, mirror] = (timestamp, ltp, volume, oi, bid, ask)
+
+        pos += 1
+        self._pos = 0 if pos == self.capacity else pos
+        if self.size < self.capacity:
+            self.size += 1
+
+    def _window(self, count: Optional[int]) -> slice:
+        n = self.size if count is None else max(0, min(count, self.size))
+        end = self._pos + self.capacity
+        return slice(end - n, end)
+
+    def view(self, count: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Latest ``count`` ticks (all if None) as column views, oldest first
+
+        Views alias the ring and change as new ticks arrive; ``copy()``
+        them if they must outlive the next append.
+        """
+        window = self._window(count)
+        return {name: getattr(self, name)[window] for name in COLUMNS}
+
+    def column(self, name: str, count: Optional[int] = None) -> np.ndarray:
+        """Latest ``count`` values of one column as a view"""
+        return getattr(self, name)[self._window(count)]
+
+    def latest(self, name: str = "ltp") -> Optional[float]:
+        """Most recent value of a column (None if empty or missing)"""
+        if not self.size:
+            return None
+        value = float(getattr(self, name)[self._pos + self.capacity - 1])
+        return None if np.isnan(value) else value
+
+    def clear(self):
+        """Drop all ticks (keeps the allocation)"""
+        self.size = 0
+        self._pos = 0
+        self._data.fill(np.nan)
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
@@ -20,6 +20,7 @@ import logging
 from collections import defaultdict
 
 from src.utils.logger import StrategyLogger
+from .binary_decoder import decode_packet
 
 logger = StrategyLogger.get_logger(__name__)
 
@@ -323,89 +324,18 @@ class WebSocketClient:
         """
         Parse binary tick data from SmartAPI WebSocket.
 
-        SmartAPI sends binary format with:
-        - Token (4 bytes)
-        - LTP (8 bytes)
-        - Volume (8 bytes)
-        - Greeks data (for options)
+        Decoded with precompiled LTP / QUOTE / SNAP_QUOTE layouts
+        (see binary_decoder); undecodable frames are passed through raw.
         """
         try:
-            if len(message) < 20:
+            tick = decode_packet(message)
+            if tick is None:
                 logger.debug(f"Binary data too short: {len(message)} bytes")
                 return {"type": "tick", "raw": message}
+            return tick
 
-            import struct
-
-            # Parse according to SmartAPI documentation
-            offset = 0
-
-            # Token (4 bytes, big-endian)
-            token = struct.unpack(">I", message[offset : offset + 4])[0]
-            offset += 4
-
-            # LTP (8 bytes, double)
-            ltp = struct.unpack(">d", message[offset : offset + 8])[0]
-            offset += 8
-
-            # High (8 bytes, double)
-            high = struct.unpack(">d", message[offset : offset + 8])[0]
-            offset += 8
-
-            # Low (8 bytes, double)
-            low = struct.unpack(">d", message[offset : offset + 8])[0]
-            offset += 8
-
-            # Close (8 bytes, double)
-            close = struct.unpack(">d", message[offset : offset + 8])[0]
-            offset += 8
-
-            # Volume (8 bytes, long)
-            volume = struct.unpack(">Q", message[offset : offset + 8])[0]
-            offset += 8
-
-            # IV (8 bytes, double) - for options
-            iv = 0.0
-            if len(message) >= offset + 8:
-                iv = struct.unpack(">d", message[offset : offset + 8])[0]
-                offset += 8
-
-            # Greeks data if available
-            delta, gamma, theta, vega = 0, 0, 0, 0
-            if len(message) >= offset + 32:
-                try:
-                    delta = struct.unpack(">d", message[offset : offset + 8])[0]
-                    offset += 8
-                    gamma = struct.unpack(">d", message[offset : offset + 8])[0]
-                    offset += 8
-                    theta = struct.unpack(">d", message[offset : offset + 8])[0]
-                    offset += 8
-                    vega = struct.unpack(">d", message[offset : offset + 8])[0]
-                except:
-                    pass
-
-            result = {
-                "type": "tick",
-                "token": token,
-                "ltp": ltp,
-                "high": high,
-                "low": low,
-                "close": close,
-                "volume": volume,
-                "iv": iv,
-                "delta": delta,
-                "gamma": gamma,
-                "theta": theta,
-                "vega": vega,
-            }
-
-            logger.debug(f"Parsed binary: token={token}, ltp={ltp}, vol={volume}")
-            return result
-
-        except struct.error as e:
-            logger.error(f"Binary parsing error: {e}")
-            return {"type": "tick", "raw": message}
         except Exception as e:
-            logger.error(f"Unexpected binary parsing error: {e}")
+            logger.error(f"Binary parsing error: {e}")
             return {"type": "tick", "raw": message}
 
     def _get_exchange_code(self, exchange: str) -> int:
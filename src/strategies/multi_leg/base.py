@@ -8,16 +8,23 @@ Provides foundation for:
 - Spreads (Bull/Bear/Calendar/Ratio)
 """
 
+import itertools
+import re
 from dataclasses import dataclass
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from enum import Enum
 from abc import ABC, abstractmethod
 
+from src.core.portfolio_greeks import get_portfolio_greeks_aggregator
+from src.engines.portfolio.scenario_engine import ScenarioResult, get_scenario_engine
 from src.utils.logger import StrategyLogger
 
 logger = StrategyLogger.get_logger(__name__)
 
+_strategy_ids = itertools.count(1)
+_EXPIRY_CODE = re.compile(r"^\d{2}[A-Z]{3}\d{2}$")  # 30DEC25
+
 
 class OptionType(Enum):
     """Option types"""
@@ -68,6 +75,7 @@ class OptionLeg:
         current_price: Current market price
         token: Instrument token
         expiry: Expiry date
+        symbol: Trading symbol (key of published live Greeks)
     """
 
     strike: int
@@ -78,6 +86,7 @@ class OptionLeg:
     current_price: float = 0.0
     token: str = ""
     expiry: str = ""
+    symbol: str = ""
 
     # Greeks
     delta: float = 0.0
@@ -183,7 +192,9 @@ class MultiLegStrategy(ABC):
         self.max_profit_seen = 0.0
         self.max_loss_seen = 0.0
 
-        # Greeks aggregation
+        # Greeks aggregation (legs sit in the shared book while active)
+        self.strategy_id = f"{self.name}#{next(_strategy_ids)}"
+        self.portfolio_greeks = get_portfolio_greeks_aggregator()
         self.net_delta = 0.0
         self.net_gamma = 0.0
         self.net_theta = 0.0
@@ -265,6 +276,7 @@ class MultiLegStrategy(ABC):
             # Mark as active
             self.is_active = True
             self.entry_time = datetime.now()
+            self._register_legs()
 
             logger.info(f"✅ Entered {self.name} with {len(self.legs)} legs")
             for leg in self.legs:
@@ -297,6 +309,7 @@ class MultiLegStrategy(ABC):
             # Mark as inactive
             self.is_active = False
             self.exit_time = datetime.now()
+            self.portfolio_greeks.remove_strategy(self.strategy_id)
 
             duration = (self.exit_time - self.entry_time).total_seconds() / 60
 
@@ -331,21 +344,76 @@ class MultiLegStrategy(ABC):
         Update Greeks for all legs
 
         Args:
-            greeks_data: {token: {delta, gamma, theta, vega, iv}}
+            greeks_data: {symbol: {delta, gamma, theta, vega, iv}} (token keys also accepted)
         """
-        for leg in self.legs:
-            if leg.token in greeks_data:
-                greeks = greeks_data[leg.token]
+        for index, leg in enumerate(self.legs):
+            greeks = greeks_data.get(self._leg_symbol(leg)) or greeks_data.get(leg.token)
+            if greeks:
                 leg.delta = greeks.get("delta", 0.0)
                 leg.gamma = greeks.get("gamma", 0.0)
                 leg.theta = greeks.get("theta", 0.0)
                 leg.vega = greeks.get("vega", 0.0)
                 leg.iv = greeks.get("iv", 0.0)
+                if self.is_active:
+                    self.portfolio_greeks.update_position(self._leg_key(index), greeks=leg)
+
+        self._update_greeks()
+
+    def set_leg_quantity(self, index: int, quantity: int):
+        """
+        Resize one leg
 
+        Args:
+            index: Leg position in self.legs
+            quantity: New (unsigned) quantity
+        """
+        leg = self.legs[index]
+        leg.quantity = quantity
+        if self.is_active:
+            self.portfolio_greeks.update_quantity(self._leg_key(index), self._signed_quantity(leg))
+        self._update_greeks()
+
+    def _leg_key(self, index: int) -> str:
+        return f"{self.strategy_id}:{index}"
+
+    def _leg_symbol(self, leg: OptionLeg) -> str:
+        """Trading symbol GreeksDataManager publishes the leg's Greeks under (NIFTY30DEC2523000CE)"""
+        if leg.symbol:
+            return leg.symbol
+        expiry = (leg.expiry or self.expiry or "").upper()
+        if not _EXPIRY_CODE.match(expiry):
+            expiry = ""
+        strike = int(leg.strike) if float(leg.strike).is_integer() else leg.strike
+        return f"{self.underlying}{expiry}{strike}{leg.option_type.value}"
+
+    @staticmethod
+    def _signed_quantity(leg: OptionLeg) -> int:
+        return leg.quantity if leg.direction == LegDirection.BUY else -leg.quantity
+
+    def _register_legs(self):
+        """Put every leg into the shared portfolio book"""
+        self.portfolio_greeks.remove_strategy(self.strategy_id)
+        for index, leg in enumerate(self.legs):
+            self.portfolio_greeks.upsert_position(
+                self._leg_key(index),
+                self._leg_symbol(leg),
+                self.underlying,
+                self._signed_quantity(leg),
+                strategy=self.strategy_id,
+                greeks=leg,
+            )
         self._update_greeks()
 
     def _update_greeks(self):
-        """Aggregate Greeks across all legs"""
+        """Net Greeks: the book's totals for this strategy while active, else summed over the legs"""
+        if self.is_active:
+            totals = self.portfolio_greeks.get_totals(strategy=self.strategy_id)
+            self.net_delta = totals["net_delta"]
+            self.net_gamma = totals["net_gamma"]
+            self.net_theta = totals["net_theta"]
+            self.net_vega = totals["net_vega"]
+            return
+
         self.net_delta = 0.0
         self.net_gamma = 0.0
         self.net_theta = 0.0
@@ -364,19 +432,38 @@ class MultiLegStrategy(ABC):
         return sum(leg.get_pnl() for leg in self.legs)
 
     def get_max_risk(self) -> float:
-        """Calculate maximum risk (theoretical)"""
-        # To be overridden by specific strategies
-        return self.max_loss
+        """Maximum loss at expiry from the legs' payoff (max_loss before legs exist)"""
+        if not self.legs:
+            return self.max_loss
+        return get_scenario_engine().expiry_profile(self.legs)["max_loss"]
 
     def get_max_reward(self) -> float:
-        """Calculate maximum reward (theoretical)"""
-        # To be overridden by specific strategies
-        return self.max_profit
+        """Maximum profit at expiry from the legs' payoff (max_profit before legs exist)"""
+        if not self.legs:
+            return self.max_profit
+        return get_scenario_engine().expiry_profile(self.legs)["max_profit"]
 
     def get_breakeven_points(self) -> List[float]:
-        """Calculate breakeven points"""
-        # To be overridden by specific strategies
-        return []
+        """Numerical breakevens of the payoff at expiry"""
+        if not self.legs:
+            return []
+        return get_scenario_engine().expiry_profile(self.legs)["breakevens"]
+
+    def analyze_scenarios(self, spot: float, time_to_expiry: float, iv=None, **grid) -> ScenarioResult:
+        """
+        P&L surface of the legs over spot × IV shift × days forward
+
+        Args:
+            spot: Current spot
+            time_to_expiry: Years to expiry (scalar or per leg)
+            iv: Optional IV override (decimal); defaults to each leg's IV
+            **grid: spots / iv_shifts / days_forward axes (see ScenarioEngine.evaluate)
+        """
+        return get_scenario_engine().evaluate(self.legs, spot, time_to_expiry, iv, **grid)
+
+    def get_shock_risk(self, spot: float, time_to_expiry: float, iv=None) -> Dict:
+        """Instant P&L under the configured spot / IV shocks (worst_loss, worst_shock, by_shock)"""
+        return get_scenario_engine().shock_losses(self.legs, spot, time_to_expiry, iv)
 
     def get_summary(self) -> Dict:
         """Get strategy summary"""
@@ -418,10 +505,16 @@ class MultiLegStrategy(ABC):
             for leg in self.legs
         ]
 
-    def check_adjustment_needed(self) -> Tuple[bool, str]:
+    def check_adjustment_needed(
+        self, spot: Optional[float] = None, time_to_expiry: Optional[float] = None
+    ) -> Tuple[bool, str]:
         """
         Check if position needs adjustment
 
+        Args:
+            spot: Current spot; with time_to_expiry enables the shock-loss check
+            time_to_expiry: Years to expiry
+
         Returns:
             (needs_adjustment, reason)
         """
@@ -441,6 +534,12 @@ class MultiLegStrategy(ABC):
         if current_pnl >= self.max_profit:
             return True, f"Target profit reached: ₹{current_pnl:.2f}"
 
+        # Check loss under configured spot / IV shocks
+        if spot is not None and time_to_expiry is not None and self.legs:
+            shock = self.get_shock_risk(spot, time_to_expiry)
+            if -shock["worst_loss"] > self.max_loss:
+                return True, f"Shock {shock['worst_shock']} loss ₹{-shock['worst_loss']:.2f} exceeds max loss"
+
         return False, "No adjustment needed"
 
     def adjust(self, adjustment_type: str, **kwargs) -> bool:
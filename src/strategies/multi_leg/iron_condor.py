@@ -301,7 +301,22 @@ class IronCondorStrategy(MultiLegStrategy):
         - roll: Roll untested side for additional credit
         - close_side: Close one side if price moved
         - widen: Widen the spreads
+        - auto: Roll the side opposite the worst spot / IV shock
+          (needs spot and time_to_expiry kwargs)
         """
+        if adjustment_type == "auto":
+            spot, time_to_expiry = kwargs.get("spot"), kwargs.get("time_to_expiry")
+            if spot is None or time_to_expiry is None:
+                logger.warning("Auto adjustment needs spot and time_to_expiry")
+                return False
+            shock = self.get_shock_risk(spot, time_to_expiry)
+            if -shock["worst_loss"] <= self.max_loss:
+                return False
+            # Down shock tests the puts: roll the untested call side down (and vice versa)
+            side = "roll_call_side" if shock["worst_shock"][0] < 0 else "roll_put_side"
+            logger.info(f"Worst shock {shock['worst_shock']} loses ₹{-shock['worst_loss']:.2f} → {side}")
+            return self.adjust(side)
+
         if adjustment_type == "roll_put_side":
             # Roll put spread up for credit
             logger.info("Rolling put side up...")
@@ -478,11 +478,17 @@ class RatioSpread(MultiLegStrategy):
         return False, "Hold"
 
     def get_max_risk(self) -> float:
+        if self.legs:
+            return super().get_max_risk()
         return float("inf")  # Unlimited upside risk
 
     def get_max_reward(self) -> float:
+        if self.legs:
+            return super().get_max_reward()
         return (self.short_strike - self.long_strike) * self.quantity
 
     def get_breakeven_points(self) -> List[float]:
-        # Complex calculation for ratio spreads
+        # Numerical payoff once legs exist; rough placeholder before setup
+        if self.legs:
+            return super().get_breakeven_points()
         return [self.long_strike, self.short_strike + 50]
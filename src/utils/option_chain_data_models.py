@@ -5,11 +5,14 @@ Clean, typed data structures for option chain information.
 No business logic - just data containers.
 """
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from typing import Dict, Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
+import numpy as np
+
 
 class OptionType(Enum):
     """Option type enumeration"""
@@ -91,63 +94,395 @@ class StrikePair:
         return (self.ce and self.ce.is_liquid) and (self.pe and self.pe.is_liquid)
 
 
-@dataclass
+# Side rows in the (2, n) chain arrays
+CE_ROW, PE_ROW = 0, 1
+SIDE_TYPES = (OptionType.CE, OptionType.PE)
+
+FLOAT_COLUMNS = ("ltp", "bid", "ask", "oi_prev", "timestamps")  # NaN = missing
+INT_COLUMNS = ("volume", "oi")
+CHAIN_COLUMNS = FLOAT_COLUMNS + INT_COLUMNS + ("token", "present")
+
+
+def side_row(option_type) -> int:
+    """Row of an OptionType / "CE" / "PE" in the chain arrays"""
+    value = getattr(option_type, "value", option_type)
+    return PE_ROW if str(value).upper() == "PE" else CE_ROW
+
+
+def _epoch(timestamp: Optional[datetime]) -> float:
+    """Naive datetimes are UTC (the chain uses datetime.utcnow)"""
+    if timestamp is None:
+        return np.nan
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def _from_epoch(value: float) -> Optional[datetime]:
+    if np.isnan(value):
+        return None
+    return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None)
+
+
+def _strike_key(strike) -> float:
+    return round(float(strike), 2)
+
+
+@dataclass(frozen=True)
+class ChainSide:
+    """Zero-copy CE or PE row of a snapshot's chain arrays"""
+
+    option_type: OptionType
+    strikes: np.ndarray
+    ltp: np.ndarray
+    bid: np.ndarray
+    ask: np.ndarray
+    volume: np.ndarray
+    oi: np.ndarray
+    oi_prev: np.ndarray
+    timestamps: np.ndarray  # epoch seconds (UTC)
+    token: np.ndarray
+    present: np.ndarray
+
+    @property
+    def liquid(self) -> np.ndarray:
+        """StrikeData.is_liquid for every strike"""
+        return self.present & (self.volume > 0) & (self.oi > 0)
+
+
+class StrikePairsView(Mapping):
+    """
+    Read-only {strike: StrikePair} view over a columnar snapshot
+
+    Compatibility for code written against the dict of StrikeData objects;
+    pairs are built on access, the snapshot holds only arrays.
+    """
+
+    def __init__(self, snapshot: "OptionChainSnapshot"):
+        self._snapshot = snapshot
+
+    def __getitem__(self, strike) -> StrikePair:
+        i = self._snapshot.index_of(strike)
+        if i is None:
+            raise KeyError(strike)
+        return self._snapshot.pair_at(i)
+
+    def __contains__(self, strike) -> bool:
+        return self._snapshot.index_of(strike) is not None
+
+    def __iter__(self):
+        return iter(self._snapshot.strike_prices.tolist())
+
+    def __len__(self) -> int:
+        return len(self._snapshot.strike_prices)
+
+
 class OptionChainSnapshot:
-    """Complete snapshot of option chain"""
+    """
+    Complete snapshot of option chain (columnar)
+
+    Strikes are a sorted array; every per-option field (ltp, bid, ask, volume,
+    oi, oi_prev, token, exchange timestamp) is a (2, n) array with row CE_ROW /
+    PE_ROW, and ``present`` marks which sides exist. Lookups by strike or ATM
+    offset are O(1); chain aggregates are array operations.
+
+    ``strikes`` is a {strike: StrikePair} compatibility view; assigning a dict
+    of StrikePair to it reloads the arrays.
+    """
+
+    def __init__(
+        self,
+        underlying: str,
+        expiry: str,
+        strikes: Optional[Dict[float, StrikePair]] = None,
+        atm_strike: Optional[float] = None,
+        timestamp: Optional[datetime] = None,
+        fetch_latency_ms: float = 0.0,
+        is_partial: bool = False,
+        data_quality_score: float = 0.0,
+        exchange: str = "NFO",
+        version: int = 0,
+    ):
+        # Universe definition
+        self.underlying = underlying  # e.g., "NIFTY"
+        self.expiry = expiry  # e.g., "08JAN26"
+        self.atm_strike = atm_strike
+        self.exchange = exchange
+
+        # Metadata
+        self.timestamp = timestamp or datetime.utcnow()
+        self.fetch_latency_ms = fetch_latency_ms  # Time to fetch from broker
+
+        # Health
+        self.is_partial = is_partial  # Some strikes missing
+        self.data_quality_score = data_quality_score  # 0-100
+        self.version = version  # Publish sequence (streaming chains)
+
+        self._set_columns(np.zeros(0), {})
+        if strikes:
+            self.strikes = strikes
+
+    # -------- Construction --------
+
+    @classmethod
+    def from_arrays(
+        cls,
+        underlying: str,
+        expiry: str,
+        strikes,
+        ltp,
+        bid=None,
+        ask=None,
+        volume=None,
+        oi=None,
+        oi_prev=None,
+        token=None,
+        present=None,
+        timestamps=None,
+        **meta,
+    ) -> "OptionChainSnapshot":
+        """
+        Build from per-side arrays shaped (2, n) (row CE_ROW / PE_ROW)
+
+        Strikes need not be sorted. ``present`` defaults to rows with a
+        non-NaN LTP; missing float values are NaN.
+
+        Raises:
+            ValueError: Duplicate strikes, or negative LTP / OI / volume
+        """
+        snapshot = cls(underlying, expiry, **meta)
+        strikes = np.asarray(strikes, dtype=float)
+        n = len(strikes)
+        ltp = np.asarray(ltp, dtype=float).reshape(2, n)
+        columns = {
+            "ltp": ltp,
+            "bid": bid,
+            "ask": ask,
+            "oi_prev": oi_prev,
+            "timestamps": timestamps,
+            "volume": volume,
+            "oi": oi,
+            "token": token,
+            "present": ~np.isnan(ltp) if present is None else present,
+        }
+        for name, values in columns.items():
+            columns[name] = snapshot._column(name, n, values)
+        snapshot._set_columns(strikes, columns)
+        return snapshot
+
+    @staticmethod
+    def _column(name: str, n: int, values=None) -> np.ndarray:
+        """(2, n) array for a chain column, defaulted where values is None"""
+        if name in FLOAT_COLUMNS:
+            dtype, fill = float, np.nan
+        elif name in INT_COLUMNS:
+            dtype, fill = np.int64, 0
+        elif name == "present":
+            dtype, fill = bool, False
+        else:
+            dtype, fill = object, None
+        if values is None:
+            return np.full((2, n), fill, dtype=dtype)
+        return np.array(values, dtype=dtype).reshape(2, n)
+
+    def _set_columns(self, strikes: np.ndarray, columns: Dict[str, np.ndarray]):
+        """Install columns sorted by strike and rebuild the strike index"""
+        n = len(strikes)
+        order = np.argsort(strikes, kind="stable")
+        self.strike_prices = np.ascontiguousarray(strikes[order])
+        for name in CHAIN_COLUMNS:
+            values = columns.get(name)
+            values = self._column(name, n) if values is None else values
+            setattr(self, name, np.ascontiguousarray(values[:, order]))
+
+        self._index = {_strike_key(k): i for i, k in enumerate(self.strike_prices.tolist())}
+        if len(self._index) != n:
+            raise ValueError("Duplicate strikes in option chain snapshot")
+        self._validate()
+        self.strike_interval = self._detect_interval(self.strike_prices)
+
+    def _validate(self):
+        """Vectorized StrikeData checks over every present option"""
+        present = self.present
+        if (self.ltp[present] < 0).any():
+            raise ValueError(f"LTP cannot be negative: {self.ltp[present].min()}")
+        if (self.oi < 0).any() or (self.volume < 0).any():
+            raise ValueError(f"OI/Volume cannot be negative: OI={self.oi.min()}, Vol={self.volume.min()}")
+
+    @staticmethod
+    def _detect_interval(strikes: np.ndarray) -> Optional[float]:
+        """Most common gap between listed strikes"""
+        if len(strikes) < 2:
+            return None
+        gaps, counts = np.unique(np.round(np.diff(strikes), 2), return_counts=True)
+        return float(gaps[counts.argmax()])
 
-    # Universe definition
-    underlying: str  # e.g., "NIFTY"
-    expiry: str  # e.g., "08JAN26"
+    @property
+    def strikes(self) -> StrikePairsView:
+        """{strike: StrikePair} compatibility view"""
+        return StrikePairsView(self)
+
+    @strikes.setter
+    def strikes(self, pairs: Dict[float, StrikePair]):
+        strikes = np.array([float(k) for k in pairs], dtype=float)
+        n = len(strikes)
+        columns = {name: self._column(name, n) for name in CHAIN_COLUMNS}
+        for i, pair in enumerate(pairs.values()):
+            for row, data in ((CE_ROW, pair.ce), (PE_ROW, pair.pe)):
+                if data is None:
+                    continue
+                columns["present"][row, i] = True
+                columns["ltp"][row, i] = data.ltp
+                columns["bid"][row, i] = np.nan if data.bid is None else data.bid
+                columns["ask"][row, i] = np.nan if data.ask is None else data.ask
+                columns["oi_prev"][row, i] = np.nan if data.oi_prev is None else data.oi_prev
+                columns["timestamps"][row, i] = _epoch(data.timestamp)
+                columns["volume"][row, i] = data.volume
+                columns["oi"][row, i] = data.oi
+                columns["token"][row, i] = data.token
+        self._set_columns(strikes, columns)
+
+    # -------- Lookups --------
+
+    def index_of(self, strike) -> Optional[int]:
+        """Array index of a strike (O(1)), None if not listed"""
+        if strike is None:
+            return None
+        return self._index.get(_strike_key(strike))
 
-    # Data
-    strikes: Dict[float, StrikePair] = field(default_factory=dict)
-    atm_strike: Optional[float] = None
+    @property
+    def atm_index(self) -> Optional[int]:
+        return self.index_of(self.atm_strike)
+
+    def side(self, option_type) -> ChainSide:
+        """Zero-copy CE / PE view of the chain arrays"""
+        row = side_row(option_type)
+        return ChainSide(
+            SIDE_TYPES[row],
+            self.strike_prices,
+            *(getattr(self, name)[row] for name in ("ltp", "bid", "ask", "volume", "oi", "oi_prev")),
+            self.timestamps[row],
+            self.token[row],
+            self.present[row],
+        )
 
-    # Metadata
-    timestamp: datetime = field(default_factory=datetime.utcnow)
-    fetch_latency_ms: float = 0.0  # Time to fetch from broker
+    @property
+    def ce(self) -> ChainSide:
+        return self.side(OptionType.CE)
 
-    # Health
-    is_partial: bool = False  # Some strikes missing
-    data_quality_score: float = 0.0  # 0-100
+    @property
+    def pe(self) -> ChainSide:
+        return self.side(OptionType.PE)
+
+    def window(self, width: int, center: Optional[float] = None) -> "OptionChainSnapshot":
+        """
+        Zero-copy snapshot of the strikes within ± width positions of center
+        (default ATM); its arrays are slices of this snapshot's arrays
+        """
+        center = self.atm_strike if center is None else center
+        i = self.index_of(center)
+        if i is None:
+            i = int(np.searchsorted(self.strike_prices, center or 0.0))
+        window = slice(max(i - width, 0), i + width + 1)
+
+        view = OptionChainSnapshot.__new__(OptionChainSnapshot)
+        view.__dict__.update(self.__dict__)
+        view.strike_prices = self.strike_prices[window]
+        for name in CHAIN_COLUMNS:
+            setattr(view, name, getattr(self, name)[:, window])
+        view._index = {_strike_key(k): j for j, k in enumerate(view.strike_prices.tolist())}
+        return view
+
+    def copy(self) -> "OptionChainSnapshot":
+        """Snapshot owning copies of the arrays (e.g. to publish a live, in-place updated chain)"""
+        snapshot = OptionChainSnapshot.__new__(OptionChainSnapshot)
+        snapshot.__dict__.update(self.__dict__)
+        snapshot.strike_prices = self.strike_prices.copy()
+        for name in CHAIN_COLUMNS:
+            setattr(snapshot, name, getattr(self, name).copy())
+        snapshot._index = dict(self._index)
+        return snapshot
+
+    def strike_data(self, row: int, i: int) -> Optional[StrikeData]:
+        """StrikeData object for one side of one strike (compatibility)"""
+        if not self.present[row, i]:
+            return None
+
+        def optional(value: float) -> Optional[float]:
+            return None if np.isnan(value) else float(value)
+
+        oi_prev = optional(self.oi_prev[row, i])
+        return StrikeData(
+            strike=float(self.strike_prices[i]),
+            option_type=SIDE_TYPES[row],
+            ltp=float(self.ltp[row, i]),
+            bid=optional(self.bid[row, i]),
+            ask=optional(self.ask[row, i]),
+            volume=int(self.volume[row, i]),
+            oi=int(self.oi[row, i]),
+            oi_prev=None if oi_prev is None else int(oi_prev),
+            timestamp=_from_epoch(self.timestamps[row, i]),
+            token=self.token[row, i],
+            exchange=self.exchange,
+        )
+
+    def pair_at(self, i: int) -> StrikePair:
+        """StrikePair for the strike at array index i (compatibility)"""
+        return StrikePair(float(self.strike_prices[i]), self.strike_data(CE_ROW, i), self.strike_data(PE_ROW, i))
+
+    # -------- Aggregates --------
 
     @property
     def strike_count(self) -> int:
         """Total strikes in snapshot"""
-        return len(self.strikes)
+        return len(self.strike_prices)
+
+    @property
+    def complete_mask(self) -> np.ndarray:
+        """Strikes with both CE & PE present"""
+        return self.present.all(axis=0)
+
+    @property
+    def liquid_mask(self) -> np.ndarray:
+        """Strikes where both sides have volume and OI"""
+        return (self.present & (self.volume > 0) & (self.oi > 0)).all(axis=0)
 
     @property
     def complete_pairs(self) -> int:
         """Count of complete CE/PE pairs"""
-        return sum(1 for pair in self.strikes.values() if pair.is_complete)
+        return int(self.complete_mask.sum())
 
     @property
     def liquid_pairs(self) -> int:
         """Count of liquid CE/PE pairs"""
-        return sum(1 for pair in self.strikes.values() if pair.both_liquid)
+        return int(self.liquid_mask.sum())
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the numeric chain arrays"""
+        return self.strike_prices.nbytes + sum(
+            getattr(self, name).nbytes for name in CHAIN_COLUMNS if name != "token"
+        )
 
     def get_atm_ce(self) -> Optional[StrikeData]:
         """Get ATM call option"""
-        if self.atm_strike and self.atm_strike in self.strikes:
-            return self.strikes[self.atm_strike].ce
-        return None
+        i = self.atm_index
+        return self.strike_data(CE_ROW, i) if i is not None else None
 
     def get_atm_pe(self) -> Optional[StrikeData]:
         """Get ATM put option"""
-        if self.atm_strike and self.atm_strike in self.strikes:
-            return self.strikes[self.atm_strike].pe
-        return None
+        i = self.atm_index
+        return self.strike_data(PE_ROW, i) if i is not None else None
 
     def get_strike(self, offset: int) -> Optional[StrikePair]:
         """Get strike at offset from ATM (e.g., -1 = 1 strike lower)"""
         if not self.atm_strike:
             return None
 
-        # Assume strikes are spaced by standard interval (typically 100 for NIFTY)
-        strike_interval = 100  # TODO: auto-detect
-        target_strike = self.atm_strike + (offset * strike_interval)
-
-        return self.strikes.get(target_strike)
+        # Spacing detected from the listed strikes (50 for NIFTY weeklies, 100 for BANKNIFTY)
+        interval = self.strike_interval or 0.0
+        i = self.index_of(self.atm_strike + offset * interval)
+        return self.pair_at(i) if i is not None else None
 
     def get_chain_summary(self) -> Dict:
         """Summary of chain health"""
@@ -155,56 +490,108 @@ class OptionChainSnapshot:
             "underlying": self.underlying,
             "expiry": self.expiry,
             "atm_strike": self.atm_strike,
+            "strike_interval": self.strike_interval,
             "total_strikes": self.strike_count,
             "complete_pairs": self.complete_pairs,
             "liquid_pairs": self.liquid_pairs,
             "is_partial": self.is_partial,
             "data_quality": self.data_quality_score,
             "fetch_latency_ms": self.fetch_latency_ms,
+            "version": self.version,
             "timestamp": self.timestamp.isoformat(),
         }
 
 
+# Momentum hint thresholds (per side, per snapshot)
+OI_HINT_THRESHOLD = 100
+VOLUME_SPIKE_THRESHOLD = 1000
+
+
+def _empty_changes(dtype) -> np.ndarray:
+    return np.zeros((2, 0), dtype=dtype)
+
+
 @dataclass
 class OptionChainDelta:
-    """Changes from previous snapshot"""
+    """
+    Changes from previous snapshot
+
+    Diffs are (2, m) arrays (row CE_ROW / PE_ROW) over ``strikes``, the
+    strikes listed in both snapshots; ``compared`` marks sides present in
+    both. The "20000.0-CE" keyed dicts are built from them on access.
+    """
 
     timestamp: datetime
 
-    # Strikes that changed
-    oi_changes: Dict[str, int] = field(default_factory=dict)  # "20000-CE": +500
-    volume_changes: Dict[str, int] = field(default_factory=dict)
-    ltp_changes: Dict[str, float] = field(default_factory=dict)
+    # Aligned diffs over strikes common to both snapshots
+    strikes: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    compared: np.ndarray = field(default_factory=lambda: _empty_changes(bool))
+    oi_change: np.ndarray = field(default_factory=lambda: _empty_changes(np.int64))
+    volume_change: np.ndarray = field(default_factory=lambda: _empty_changes(np.int64))
+    ltp_change: np.ndarray = field(default_factory=lambda: _empty_changes(float))
+    stale_mask: np.ndarray = field(default_factory=lambda: _empty_changes(bool))  # no OI / volume / LTP change
 
     # Health
     new_strikes_added: List[float] = field(default_factory=list)
     strikes_removed: List[float] = field(default_factory=list)
     stale_strikes: List[float] = field(default_factory=list)
 
+    def _keyed(self, mask: np.ndarray, values: np.ndarray) -> Dict[str, float]:
+        rows, cols = np.nonzero(mask)
+        return {
+            f"{self.strikes[i]}-{SIDE_TYPES[row].value}": value
+            for row, i, value in zip(rows.tolist(), cols.tolist(), values[rows, cols].tolist())
+        }
+
+    @property
+    def oi_changes(self) -> Dict[str, int]:
+        """{"20000.0-CE": +500} for every side whose OI changed"""
+        return self._keyed(self.oi_change != 0, self.oi_change)
+
+    @property
+    def volume_changes(self) -> Dict[str, int]:
+        return self._keyed(self.volume_change != 0, self.volume_change)
+
+    @property
+    def ltp_changes(self) -> Dict[str, float]:
+        return self._keyed(self.ltp_change != 0, self.ltp_change)
+
+    @property
+    def change_counts(self) -> Dict[str, int]:
+        """Number of sides with OI / volume / LTP changes"""
+        return {
+            "oi": int(np.count_nonzero(self.oi_change)),
+            "volume": int(np.count_nonzero(self.volume_change)),
+            "ltp": int(np.count_nonzero(self.ltp_change)),
+        }
+
     @property
     def has_changes(self) -> bool:
         """Any changes detected"""
         return bool(
-            self.oi_changes or self.volume_changes or self.ltp_changes or self.new_strikes_added or self.strikes_removed
+            self.oi_change.any()
+            or self.volume_change.any()
+            or self.ltp_change.any()
+            or self.new_strikes_added
+            or self.strikes_removed
         )
 
+    @property
+    def momentum_masks(self) -> Dict[str, np.ndarray]:
+        """(2, m) masks of OI build-up / unwinding and volume spikes"""
+        return {
+            "oi_increasing": self.oi_change > OI_HINT_THRESHOLD,
+            "oi_decreasing": self.oi_change < -OI_HINT_THRESHOLD,
+            "volume_spike": self.volume_change > VOLUME_SPIKE_THRESHOLD,
+        }
+
     @property
     def momentum_hints(self) -> Dict[str, str]:
         """Raw momentum signals (not tradable, just hints)"""
         hints = {}
-
-        # OI increases suggest buyers/sellers entering
-        for key, change in self.oi_changes.items():
-            if change > 100:
-                hints[f"{key}_oi_increasing"] = True
-            elif change < -100:
-                hints[f"{key}_oi_decreasing"] = True
-
-        # Volume spikes
-        for key, change in self.volume_changes.items():
-            if change > 1000:
-                hints[f"{key}_volume_spike"] = True
-
+        for name, mask in self.momentum_masks.items():
+            for key in self._keyed(mask, mask):
+                hints[f"{key}_{name}"] = True
         return hints
 
 
@@ -26,6 +26,8 @@ from src.utils.option_chain_data_models import (
 )
 from src.utils.option_chain_filters import NoiseFilter, DataValidator, StaleDataDetector, BrokerHiccupDetector
 from src.utils.option_chain_snapshot import SnapshotEngine, SnapshotCache, SnapshotValidator
+from src.utils.option_chain_history import ChainHistoryStore
+from src.utils.option_chain_stream import StreamingOptionChain
 
 logger = logging.getLogger(__name__)
 
@@ -63,7 +65,11 @@ class OptionChainDataEngine:
         self.stale_detector = StaleDataDetector(self.config.get("stale_threshold_sec", 60))
         self.hiccup_detector = BrokerHiccupDetector(self.config.get("error_threshold", 3))
         self.snapshot_engine = SnapshotEngine()
-        self.snapshot_cache = SnapshotCache()
+        self.snapshot_cache = SnapshotCache(self.config.get("cache_max_entries", 32))
+        self.history_store = ChainHistoryStore(
+            max_bytes=int(self.config.get("history_max_mb", 256) * 1024 * 1024),
+            keyframe_every=self.config.get("history_keyframe_every", 300),
+        )
         self.snapshot_validator = SnapshotValidator()
 
         # Health tracking
@@ -76,6 +82,8 @@ class OptionChainDataEngine:
         self._stop_event = threading.Event()
         self._fetch_thread: Optional[threading.Thread] = None
         self._subscribers: List[Callable] = []
+        self._ingest_lock = threading.Lock()  # tick thread (stream publish) vs fetch / gap-fill thread
+        self.stream: Optional[StreamingOptionChain] = None  # Streaming mode
 
         # Callbacks
         self.on_snapshot = None  # Called on new snapshot
@@ -148,56 +156,73 @@ class OptionChainDataEngine:
                 self.error_count += 1
                 return None
 
-            # Step 2: Filter noise
-            filtered_snapshot, drops = self.noise_filter.filter_snapshot(raw_snapshot, self.snapshot_engine.previous)
-
-            # Step 3: Normalize & validate
-            is_valid, reason = self.validator.check_strike_alignment(filtered_snapshot)
-            if not is_valid:
-                self.logger.warning(f"Validation failed: {reason}")
+            return self._ingest(raw_snapshot, fetch_start)
 
-            # Step 4: Compute quality score
-            quality_score = self.validator.compute_quality_score(filtered_snapshot)
-            filtered_snapshot.data_quality_score = quality_score
+        except Exception as e:
+            self.logger.error(f"Fetch failed: {e}", exc_info=True)
+            self.error_count += 1
+            self.hiccup_detector.record_error()
+            return None
 
-            # Step 5: Validate consistency
-            if not self.snapshot_validator.validate_snapshot_consistency(filtered_snapshot):
-                self.logger.warning("Snapshot consistency check failed")
-                self.error_count += 1
-                return None
+    def _ingest(self, raw_snapshot: OptionChainSnapshot, fetch_start: float) -> Optional[OptionChainSnapshot]:
+        """Filter, validate, store and publish a raw snapshot (REST fetch or stream)"""
+        with self._ingest_lock:
+            return self._ingest_locked(raw_snapshot, fetch_start)
+
+    def _ingest_locked(self, raw_snapshot: OptionChainSnapshot, fetch_start: float) -> Optional[OptionChainSnapshot]:
+        # Step 2: Filter noise (one vectorized pass; rejected sides are masked in place)
+        filter_result = self.noise_filter.filter_chain(raw_snapshot, self.snapshot_engine.previous)
+        filtered_snapshot = filter_result.apply(raw_snapshot)
+        if filter_result.dropped:
+            self.logger.info(f"Dropped {len(filter_result.dropped)} strikes: {filter_result.dropped[:5]}")
+
+        # Step 3: Normalize & validate
+        is_valid, reason = self.validator.check_strike_alignment(filtered_snapshot)
+        if not is_valid:
+            self.logger.warning(f"Validation failed: {reason}")
+
+        # Step 4: Quality score (computed in the filter pass)
+        quality_score = filter_result.quality_score
+        filtered_snapshot.data_quality_score = quality_score
+
+        # Step 5: Validate consistency
+        if not self.snapshot_validator.validate_snapshot_consistency(filtered_snapshot):
+            self.logger.warning("Snapshot consistency check failed")
+            self.error_count += 1
+            return None
 
-            # Record latency
-            fetch_latency = (time.time() - fetch_start) * 1000  # ms
-            filtered_snapshot.fetch_latency_ms = fetch_latency
-            self.latencies.append(fetch_latency)
-            if len(self.latencies) > 100:
-                self.latencies.pop(0)
+        # Record latency
+        fetch_latency = (time.time() - fetch_start) * 1000  # ms
+        filtered_snapshot.fetch_latency_ms = fetch_latency
+        self.latencies.append(fetch_latency)
+        if len(self.latencies) > 100:
+            self.latencies.pop(0)
 
-            # Step 6: Update snapshot engine (calculate delta)
-            delta = self.snapshot_engine.update_snapshot(filtered_snapshot)
+        # Step 6: Update snapshot engine (calculate delta)
+        delta = self.snapshot_engine.update_snapshot(filtered_snapshot)
 
-            # Step 7: Cache
-            self.snapshot_cache.store(self.universe.underlying, self.universe.expiry.expiry_code, filtered_snapshot)
+        # Step 7: Cache
+        self.snapshot_cache.store(filtered_snapshot.underlying, filtered_snapshot.expiry, filtered_snapshot)
+        try:
+            self.history_store.append(filtered_snapshot)
+        except ValueError as e:
+            self.logger.warning(f"Snapshot not recorded in history: {e}")
 
-            # Step 8: Update health
-            self.hiccup_detector.record_success()
-            self.fetch_count += 1
-            self._update_health(quality_score)
+        # Step 8: Update health
+        self.hiccup_detector.record_success()
+        self.fetch_count += 1
+        self._update_health(quality_score)
 
-            # Step 9: Notify subscribers
-            if self.on_snapshot:
-                self.on_snapshot(filtered_snapshot)
+        # Step 9: Notify subscribers
+        if self.on_snapshot:
+            self.on_snapshot(filtered_snapshot)
 
-            if self.on_delta and delta.has_changes:
-                self.on_delta(delta)
+        if self.on_delta and delta.has_changes:
+            self.on_delta(delta)
 
-            return filtered_snapshot
+        self._notify_subscribers(filtered_snapshot)
 
-        except Exception as e:
-            self.logger.error(f"Fetch failed: {e}", exc_info=True)
-            self.error_count += 1
-            self.hiccup_detector.record_error()
-            return None
+        return filtered_snapshot
 
     def _fetch_from_broker(self) -> Optional[OptionChainSnapshot]:
         """
@@ -206,6 +231,7 @@ class OptionChainDataEngine:
         try:
             # Get SmartAPI client
             from src.integrations.angelone.angelone_adapter import get_angelone_adapter
+            from src.integrations.angelone.instrument_index import get_instrument_index
 
             broker = get_angelone_adapter()
 
@@ -226,31 +252,40 @@ class OptionChainDataEngine:
 
             spot_price = float(spot_data.get("ltp", 0))
 
-            # Search for option symbols
-            search_pattern = f"{self.universe.underlying}{self.universe.expiry.expiry_code}"
-            search_results = broker._smartapi_client.search_scrip("NFO", search_pattern)
-
-            if not search_results:
-                self.logger.warning(f"No options found for {search_pattern}")
-                return None
-
-            # Extract unique strikes
-            strikes_set = set()
-            for scrip in search_results:
-                symbol = scrip.get("tradingsymbol", "")
-                # Extract strike from symbol (e.g., NIFTY23JAN24000CE -> 24000)
-                try:
-                    # CE and PE symbols end with CE/PE
-                    strike_str = symbol[:-2] if symbol.endswith(("CE", "PE")) else symbol
-                    # Extract only digits from end
-                    for i in range(len(strike_str) - 1, -1, -1):
-                        if not strike_str[i].isdigit():
-                            strike_str = strike_str[i + 1 :]
-                            break
-                    if strike_str:
-                        strikes_set.add(int(strike_str))
-                except (ValueError, IndexError):
-                    continue
+            # Listed strikes from the instrument index (no network search)
+            index = get_instrument_index()
+            listed = (
+                index.strikes(self.universe.underlying, self.universe.expiry.expiry_date)
+                if index is not None
+                else []
+            )
+            strikes_set = {int(strike) for strike in listed}
+
+            if not strikes_set:
+                # Search for option symbols
+                search_pattern = f"{self.universe.underlying}{self.universe.expiry.expiry_code}"
+                search_results = broker._smartapi_client.search_scrip("NFO", search_pattern)
+
+                if not search_results:
+                    self.logger.warning(f"No options found for {search_pattern}")
+                    return None
+
+                # Extract unique strikes
+                for scrip in search_results:
+                    symbol = scrip.get("tradingsymbol", "")
+                    # Extract strike from symbol (e.g., NIFTY23JAN24000CE -> 24000)
+                    try:
+                        # CE and PE symbols end with CE/PE
+                        strike_str = symbol[:-2] if symbol.endswith(("CE", "PE")) else symbol
+                        # Extract only digits from end
+                        for i in range(len(strike_str) - 1, -1, -1):
+                            if not strike_str[i].isdigit():
+                                strike_str = strike_str[i + 1 :]
+                                break
+                        if strike_str:
+                            strikes_set.add(int(strike_str))
+                    except (ValueError, IndexError):
+                        continue
 
             strikes = sorted(list(strikes_set))
             self.logger.info(
@@ -311,6 +346,125 @@ class OptionChainDataEngine:
         """Get previous snapshot (for delta calc)"""
         return self.snapshot_engine.previous
 
+    def get_snapshot_at(self, timestamp, underlying: str = None, expiry: str = None) -> Optional[OptionChainSnapshot]:
+        """Chain as of a past time (defaults to the current universe) from the history store"""
+        if underlying is None or expiry is None:
+            if self.universe is None:
+                return None
+            underlying = underlying or self.universe.underlying
+            expiry = expiry or self.universe.expiry.expiry_code
+        return self.history_store.snapshot_at(underlying, expiry, timestamp)
+
+    # =========================================================================
+    # STREAMING CHAIN
+    # =========================================================================
+
+    def start_streaming(
+        self,
+        stream_manager,
+        strikes: Optional[List[float]] = None,
+        spot: Optional[float] = None,
+        width: Optional[int] = None,
+        gap_fill_interval_sec: Optional[float] = None,
+    ) -> Optional[StreamingOptionChain]:
+        """
+        Maintain the chain from websocket ticks instead of interval re-fetches.
+
+        ATM ± width CE/PE tokens are subscribed and rolled with spot; snapshots
+        go through the usual filter / validate / publish path. REST is only
+        used (on the background thread) for cells without recent ticks.
+
+        Args:
+            stream_manager: StreamManager delivering ticks
+            strikes: Listed strikes (default: instrument index for the universe expiry)
+            spot: Initial spot (default: universe ATM reference)
+            width: Strikes each side of ATM (default: universe strikes_range)
+            gap_fill_interval_sec: Seconds between REST gap-fill passes
+        """
+
+        if not self.universe:
+            self.logger.warning("Universe not defined")
+            return None
+
+        if strikes is None:
+            from src.integrations.angelone.instrument_index import get_instrument_index
+
+            index = get_instrument_index()
+            if index is not None:
+                strikes = index.strikes(self.universe.underlying, self.universe.expiry.expiry_date).tolist()
+        if not strikes:
+            self.logger.warning("No listed strikes for streaming chain")
+            return None
+
+        self.stop_streaming()
+        underlying = self.universe.underlying
+        self.stream = StreamingOptionChain(
+            stream_manager,
+            underlying,
+            self.universe.expiry.expiry_code,
+            strikes,
+            width=width or self.universe.strikes_range,
+            spot_token=self._get_token_for_underlying(underlying),
+            on_publish=self._on_stream_snapshot,
+            gap_filler=self._rest_quotes,
+            publish_interval=self.config.get("stream_publish_interval_sec", 0.25),
+            max_age=self.config.get("stale_threshold_sec", 60),
+        )
+        stream_manager.on_tick(self.stream.on_tick)
+        self.stream.update_spot(spot or self.universe.atm_reference)
+
+        interval = gap_fill_interval_sec or self.config.get("gap_fill_interval_sec", 5)
+        self._stop_event.clear()
+        self._fetch_thread = threading.Thread(
+            target=self._gap_fill_loop, args=(interval,), daemon=True, name="OptionChainGapFill"
+        )
+        self._fetch_thread.start()
+        self.logger.info(f"Started streaming chain: {underlying} {self.universe.expiry.expiry_code}")
+        return self.stream
+
+    def stop_streaming(self):
+        """Stop the streaming chain and its gap-fill thread"""
+        if self.stream is None:
+            return
+        self.stop_continuous_fetch()
+        self.stream.stop()
+        self.stream = None
+
+    def _on_stream_snapshot(self, snapshot: OptionChainSnapshot):
+        """Published stream window → filter / validate / store / notify"""
+        self._ingest(snapshot, time.time())
+
+    def _gap_fill_loop(self, interval_sec: float):
+        """Background REST gap filling for the streaming chain"""
+
+        while not self._stop_event.is_set():
+            try:
+                stream = self.stream
+                if stream is not None:
+                    stream.fill_gaps()
+            except Exception as e:
+                self.logger.error(f"Gap fill error: {e}", exc_info=True)
+
+            self._stop_event.wait(interval_sec)
+
+    def _rest_quotes(self, instruments: List[Dict]) -> Dict[str, Dict]:
+        """
+        Quotes over REST for instruments the stream has no recent tick for
+
+        One batched getQuote per chunk of tokens under the adapter's shared
+        quote budget; LTP, best bid / ask, volume and OI are all filled.
+        """
+        fetch_quotes = getattr(self.adapter, "fetch_quotes", None)
+        if fetch_quotes is None or not instruments:
+            return {}
+
+        quotes = fetch_quotes("NFO", [inst["token"] for inst in instruments])
+        return {
+            token: {name: value for name, value in quote.items() if value is not None}
+            for token, quote in quotes.items()
+            if quote.get("ltp") is not None
+        }
+
     # =========================================================================
     # BACKGROUND FETCH
     # =========================================================================
@@ -392,7 +546,6 @@ class OptionChainDataEngine:
             fetch_success_rate=success_rate,
             avg_fetch_latency_ms=sum(self.latencies) / len(self.latencies) if self.latencies else 0,
             last_fetch_time=datetime.utcnow(),
-            is_trading_ready=status == DataHealthStatus.HEALTHY and success_rate >= 95,
         )
 
     def get_health(self) -> DataHealthReport:
@@ -419,7 +572,9 @@ class OptionChainDataEngine:
             "avg_latency_ms": self.health_report.avg_fetch_latency_ms,
             "current_snapshot": self.snapshot_engine.get_chain_summary(),
             "cache_size": self.snapshot_cache.get_cache_size(),
+            "history_bytes": self.history_store.nbytes,
             "hiccup_errors": self.hiccup_detector.consecutive_errors,
+            "stream": self.stream.get_stats() if self.stream else None,
         }
 
     def get_detailed_status(self) -> Dict:
@@ -430,8 +585,8 @@ class OptionChainDataEngine:
 
         return {
             "universe": asdict(self.universe) if self.universe else None,
-            "current_snapshot": asdict(current) if current else None,
-            "previous_snapshot": asdict(previous) if previous else None,
+            "current_snapshot": current.get_chain_summary() if current else None,
+            "previous_snapshot": previous.get_chain_summary() if previous else None,
             "health": asdict(self.health_report),
             "metrics": self.get_metrics(),
             "cache": self.snapshot_cache.list_cached(),
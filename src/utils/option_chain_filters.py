@@ -2,15 +2,94 @@
 Phase 2: Noise Reduction Filters & Data Validators
 
 Garbage in → Garbage out prevention.
+
+NoiseFilter.filter_chain runs every check over the chain arrays in one
+vectorized pass (zero-volume, frozen-LTP, LTP / OI spike and stale masks plus
+the quality score); ChainFilterResult.apply drops rejected sides in place by
+clearing their ``present`` bits, so downstream engines never copy the chain.
 """
 
 import logging
-from typing import Optional, List, Tuple
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime, timedelta
+
+import numpy as np
+
 from src.utils.option_chain_data_models import StrikeData, OptionChainSnapshot, OptionType
 
 logger = logging.getLogger(__name__)
 
+# Drop reasons in check order (the first failing check is reported)
+DROP_REASONS = ("zero_volume", "frozen_ltp", "ltp_spike", "oi_spike")
+
+
+def quality_score(strike_count: int, complete_pairs: int, liquid_pairs: int, age_sec: float) -> float:
+    """
+    Data quality score (0-100)
+    Factors:
+    - Completeness (40%)
+    - Liquidity (40%)
+    - Freshness (20%)
+    """
+    completeness_score = (complete_pairs / strike_count) * 100 if strike_count > 0 else 0
+    liquidity_score = (liquid_pairs / complete_pairs) * 100 if complete_pairs > 0 else 0
+    freshness_score = max(0, 100 - (age_sec * 10))  # Loses 10 points per second
+
+    quality = (completeness_score * 0.4) + (liquidity_score * 0.4) + (freshness_score * 0.2)
+    return min(100, max(0, quality))  # Clamp 0-100
+
+
+def _snapshot_age(snapshot: OptionChainSnapshot) -> float:
+    return (datetime.utcnow() - snapshot.timestamp).total_seconds()
+
+
+def _previous_columns(prev_snapshot: Optional[OptionChainSnapshot], strikes: np.ndarray):
+    """Previous (ltp, volume, oi, timestamps, present) on the current strike grid"""
+    n = len(strikes)
+    if prev_snapshot is None or not prev_snapshot.strike_count:
+        empty = np.full((2, n), np.nan)
+        return empty, empty, empty, empty, np.zeros((2, n), dtype=bool)
+    prev_strikes = prev_snapshot.strike_prices
+    columns = (prev_snapshot.ltp, prev_snapshot.volume, prev_snapshot.oi, prev_snapshot.timestamps)
+    if np.array_equal(prev_strikes, strikes):
+        return (*columns, prev_snapshot.present)
+
+    pos = np.searchsorted(prev_strikes, strikes).clip(max=len(prev_strikes) - 1)
+    found = prev_strikes[pos] == strikes
+    return (*(column[:, pos] for column in columns), prev_snapshot.present[:, pos] & found)
+
+
+@dataclass
+class ChainFilterResult:
+    """Masks from one fused filter pass, shaped (2, n) like the chain arrays"""
+
+    valid: np.ndarray  # present and passing every check
+    zero_volume: np.ndarray
+    frozen_ltp: np.ndarray
+    ltp_spike: np.ndarray
+    oi_spike: np.ndarray
+    stale: np.ndarray  # reported only; stale sides are not dropped
+    keep: np.ndarray  # (n,) strikes with at least one usable side
+    quality_score: float
+    dropped: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def drop_counts(self) -> Dict[str, int]:
+        return {name: int(getattr(self, name).sum()) for name in DROP_REASONS}
+
+    def stale_strikes(self, strikes: np.ndarray) -> List[float]:
+        return strikes[self.stale.any(axis=0)].tolist()
+
+    def apply(self, snapshot: OptionChainSnapshot) -> OptionChainSnapshot:
+        """Drop rejected sides in place (present &= valid); no chain data is copied"""
+        np.logical_and(snapshot.present, self.valid, out=snapshot.present)
+        if self.dropped:
+            snapshot.is_partial = True
+        return snapshot
+
 
 class NoiseFilter:
     """Filters out suspicious/noisy data"""
@@ -23,6 +102,7 @@ class NoiseFilter:
         self.max_ltp_jump_percent = self.config.get("max_ltp_jump_percent", 10.0)
         self.max_oi_jump_percent = self.config.get("max_oi_jump_percent", 20.0)
         self.stale_data_threshold_sec = self.config.get("stale_data_threshold_sec", 60)
+        self.stale_threshold_sec = self.config.get("stale_threshold_sec", 60)
 
         self.logger = logging.getLogger(f"{__name__}.NoiseFilter")
 
@@ -102,51 +182,95 @@ class NoiseFilter:
 
         return True, None
 
-    def filter_snapshot(
-        self, snapshot: OptionChainSnapshot, prev_snapshot: Optional[OptionChainSnapshot] = None
-    ) -> Tuple[OptionChainSnapshot, List[str]]:
-        """Filter entire snapshot, return filtered snapshot and drop reasons"""
-
-        dropped_strikes = []
-        filtered_pairs = {}
-
-        for strike_price, pair in snapshot.strikes.items():
-            ce_valid = True
-            pe_valid = True
-            ce_reason = None
-            pe_reason = None
-
-            # Validate CE
-            if pair.ce:
-                prev_ce = None
-                if prev_snapshot and strike_price in prev_snapshot.strikes:
-                    prev_ce = prev_snapshot.strikes[strike_price].ce
-
-                ce_valid, ce_reason = self.validate_strike(pair.ce, prev_ce)
+    def filter_chain(
+        self, snapshot: OptionChainSnapshot, prev_snapshot: Optional[OptionChainSnapshot] = None, now: float = None
+    ) -> ChainFilterResult:
+        """
+        Every validate_strike check plus stale cells and the quality score, in one pass
 
-            # Validate PE
-            if pair.pe:
-                prev_pe = None
-                if prev_snapshot and strike_price in prev_snapshot.strikes:
-                    prev_pe = prev_snapshot.strikes[strike_price].pe
+        Args:
+            snapshot: Chain to check (not modified; see ChainFilterResult.apply)
+            prev_snapshot: Previous chain, aligned by strike
+            now: Epoch seconds for staleness (default: current time)
 
-                pe_valid, pe_reason = self.validate_strike(pair.pe, prev_pe)
+        Returns:
+            ChainFilterResult (quality score as DataValidator computes it after filtering)
+        """
+        started = time.perf_counter()
+        now = time.time() if now is None else now
+        strikes = snapshot.strike_prices
+        present, ltp, volume, oi = snapshot.present, snapshot.ltp, snapshot.volume, snapshot.oi
+        prev_ltp, prev_volume, prev_oi, prev_ts, prev_present = _previous_columns(prev_snapshot, strikes)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            zero_volume = present & (volume == 0) if self.min_volume > 0 else np.zeros_like(present)
+            frozen_ltp = (
+                present
+                & prev_present
+                & (ltp == prev_ltp)
+                & (volume == prev_volume)
+                & (snapshot.timestamps - prev_ts > self.stale_data_threshold_sec)
+            )
+            ltp_jump = np.abs((ltp - prev_ltp) / prev_ltp) * 100
+            ltp_spike = present & prev_present & (prev_ltp > 0) & (ltp_jump > self.max_ltp_jump_percent)
+            oi_prev = snapshot.oi_prev
+            oi_jump = np.abs((oi - oi_prev) / oi_prev) * 100
+            oi_spike = (
+                present & prev_present & (prev_oi > 0) & (oi_prev > 0) & (oi_jump > self.max_oi_jump_percent)
+            )
+            stale = present & (now - snapshot.timestamps > self.stale_threshold_sec)
+
+        valid = present & ~(zero_volume | frozen_ltp | ltp_spike | oi_spike)
+        keep = (~present | valid).any(axis=0)
+
+        # Quality as compute_quality_score sees the filtered chain (dropped strikes excluded)
+        complete = valid.all(axis=0)
+        liquid = complete & ((volume > 0) & (oi > 0)).all(axis=0)
+        score = quality_score(int(keep.sum()), int(complete.sum()), int(liquid.sum()), _snapshot_age(snapshot))
+
+        dropped = []
+        if not keep.all():
+            masks = np.stack([zero_volume, frozen_ltp, ltp_spike, oi_spike])  # (check, side, strike)
+            first = masks.argmax(axis=0)  # first failing check per side
+            for i in np.flatnonzero(~keep):
+                reason = DROP_REASONS[first[0, i]]  # CE reason first, as before
+                dropped.append(f"{strikes[i]}({reason})")
+
+        result = ChainFilterResult(
+            valid=valid,
+            zero_volume=zero_volume,
+            frozen_ltp=frozen_ltp,
+            ltp_spike=ltp_spike,
+            oi_spike=oi_spike,
+            stale=stale,
+            keep=keep,
+            quality_score=score,
+            dropped=dropped,
+            elapsed_ms=(time.perf_counter() - started) * 1000,
+        )
+        rejected = {name: count for name, count in result.drop_counts.items() if count}
+        if rejected.get("ltp_spike") or rejected.get("oi_spike"):
+            self.logger.warning(f"Rejected options (spikes detected): {rejected}")
+        elif rejected:
+            self.logger.debug(f"Rejected options: {rejected}")
+        return result
 
-            # Keep pair if at least one side is valid
-            if ce_valid or pe_valid:
-                pair.ce = pair.ce if ce_valid else None
-                pair.pe = pair.pe if pe_valid else None
-                filtered_pairs[strike_price] = pair
-            else:
-                dropped_strikes.append(f"{strike_price}({ce_reason or pe_reason})")
+    def filter_snapshot(
+        self, snapshot: OptionChainSnapshot, prev_snapshot: Optional[OptionChainSnapshot] = None
+    ) -> Tuple[OptionChainSnapshot, List[str]]:
+        """
+        Filter entire snapshot in place, return it and drop reasons
 
-        snapshot.strikes = filtered_pairs
+        Rejected sides are cleared from ``present``; strikes with no usable
+        side stay in the grid with both sides absent.
+        """
+        result = self.filter_chain(snapshot, prev_snapshot)
+        result.apply(snapshot)
 
-        if dropped_strikes:
-            snapshot.is_partial = True
-            logger.info(f"Dropped {len(dropped_strikes)} strikes: {dropped_strikes[:5]}")
+        if result.dropped:
+            logger.info(f"Dropped {len(result.dropped)} strikes: {result.dropped[:5]}")
 
-        return snapshot, dropped_strikes
+        return snapshot, result.dropped
 
 
 class DataValidator:
@@ -209,27 +333,9 @@ class DataValidator:
         - Liquidity (40%)
         - Freshness (20%)
         """
-
-        # Completeness score
-        if snapshot.strike_count > 0:
-            completeness_score = (snapshot.complete_pairs / snapshot.strike_count) * 100
-        else:
-            completeness_score = 0
-
-        # Liquidity score
-        if snapshot.complete_pairs > 0:
-            liquidity_score = (snapshot.liquid_pairs / snapshot.complete_pairs) * 100
-        else:
-            liquidity_score = 0
-
-        # Freshness score (0-100, 100 if < 5 seconds old)
-        age_sec = (datetime.utcnow() - snapshot.timestamp).total_seconds()
-        freshness_score = max(0, 100 - (age_sec * 10))  # Loses 10 points per second
-
-        # Weighted score
-        quality = (completeness_score * 0.4) + (liquidity_score * 0.4) + (freshness_score * 0.2)
-
-        return min(100, max(0, quality))  # Clamp 0-100
+        return quality_score(
+            snapshot.strike_count, snapshot.complete_pairs, snapshot.liquid_pairs, _snapshot_age(snapshot)
+        )
 
 
 class StaleDataDetector:
@@ -244,20 +350,15 @@ class StaleDataDetector:
         age_sec = (datetime.utcnow() - snapshot.timestamp).total_seconds()
         return age_sec > self.stale_threshold_sec
 
+    def stale_mask(self, snapshot: OptionChainSnapshot, now: float = None) -> np.ndarray:
+        """(2, n) options whose last tick is older than the threshold"""
+        now = time.time() if now is None else now
+        with np.errstate(invalid="ignore"):
+            return snapshot.present & (now - snapshot.timestamps > self.stale_threshold_sec)
+
     def find_stale_strikes(self, snapshot: OptionChainSnapshot) -> List[float]:
         """Find strikes with old LTP data"""
-        stale = []
-        now = datetime.utcnow()
-
-        for strike_price, pair in snapshot.strikes.items():
-            for strike in [pair.ce, pair.pe]:
-                if strike and strike.timestamp:
-                    age = (now - strike.timestamp).total_seconds()
-                    if age > self.stale_threshold_sec:
-                        stale.append(strike_price)
-                        break
-
-        return stale
+        return snapshot.strike_prices[self.stale_mask(snapshot).any(axis=0)].tolist()
 
     def partial_chain_detector(self, snapshot: OptionChainSnapshot) -> bool:
         """Detect if chain is partial/incomplete"""
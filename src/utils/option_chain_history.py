@@ -0,0 +1,431 @@
+"""
+Phase 2: Option Chain History (Delta-Encoded)
+
+Hours of chain history per (underlying, expiry) in compact arrays.
+
+Each appended snapshot becomes a frame. Every keyframe_every frames (or when
+the strike grid changes) the full chain is stored as a keyframe; other frames
+store only the cells that changed, per column, as (cell index, value) pairs
+in growable typed buffers:
+
+    • ltp / bid / ask      int32 paise (prices are kept to the paisa)
+    • volume / oi          int32 increments (a keyframe is forced on overflow)
+    • oi_prev / present    new values
+    • tick timestamps      int32 milliseconds from the keyframe time
+
+snapshot_at(t) starts from the keyframe at or before t and applies every
+frame up to t in one vectorized pass per column. ChainHistoryStore caps the
+total bytes, evicting least recently used (underlying, expiry) histories and
+then the oldest keyframe segments.
+"""
+
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from threading import RLock
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.utils.option_chain_data_models import OptionChainSnapshot
+
+logger = logging.getLogger(__name__)
+
+NAN_CODE = np.iinfo(np.int32).min  # encoded NaN for price / timestamp columns
+PRICE_COLUMNS = ("ltp", "bid", "ask")
+ADDITIVE_COLUMNS = ("volume", "oi")
+ENCODED_DTYPES = {
+    "ltp": np.int32,
+    "bid": np.int32,
+    "ask": np.int32,
+    "volume": np.int64,
+    "oi": np.int64,
+    "oi_prev": np.int64,
+    "timestamps": np.int32,
+    "present": np.bool_,
+}
+DELTA_DTYPES = dict(ENCODED_DTYPES, volume=np.int32, oi=np.int32)
+ENCODED_COLUMNS = tuple(ENCODED_DTYPES)
+MAX_CELLS = np.iinfo(np.uint16).max + 1  # cell indices are stored as uint16
+TOKEN_BYTES = 64  # rough per-token cost of the object array in keyframes
+
+
+def _epoch(timestamp: Union[datetime, float]) -> float:
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.timestamp()
+    return float(timestamp)
+
+
+def _encode(snapshot: OptionChainSnapshot, base_time: float) -> Dict[str, np.ndarray]:
+    """Chain columns in their stored integer form"""
+    encoded = {}
+    for name in PRICE_COLUMNS:
+        values = getattr(snapshot, name)
+        encoded[name] = np.where(np.isnan(values), NAN_CODE, np.rint(values * 100)).astype(np.int32)
+    encoded["volume"] = snapshot.volume.astype(np.int64)
+    encoded["oi"] = snapshot.oi.astype(np.int64)
+    encoded["oi_prev"] = np.where(np.isnan(snapshot.oi_prev), -1, snapshot.oi_prev).astype(np.int64)
+    offsets = np.rint((snapshot.timestamps - base_time) * 1000)
+    encoded["timestamps"] = np.where(np.isnan(offsets), NAN_CODE, offsets).astype(np.int32)
+    encoded["present"] = snapshot.present.copy()
+    return encoded
+
+
+def _decode(encoded: Dict[str, np.ndarray], base_time: float) -> Dict[str, np.ndarray]:
+    columns = {}
+    for name in PRICE_COLUMNS:
+        values = encoded[name]
+        columns[name] = np.where(values == NAN_CODE, np.nan, values / 100.0)
+    columns["volume"] = encoded["volume"].copy()
+    columns["oi"] = encoded["oi"].copy()
+    columns["oi_prev"] = np.where(encoded["oi_prev"] < 0, np.nan, encoded["oi_prev"]).astype(float)
+    offsets = encoded["timestamps"]
+    columns["timestamps"] = np.where(offsets == NAN_CODE, np.nan, base_time + offsets / 1000.0)
+    columns["present"] = encoded["present"].copy()
+    return columns
+
+
+class _Buffer:
+    """Append-only typed array with amortized growth"""
+
+    def __init__(self, dtype, capacity: int = 256):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self.data.dtype).ravel()
+        end = self.size + len(values)
+        if end > len(self.data):
+            grown = np.empty(max(end, 2 * len(self.data)), dtype=self.data.dtype)
+            grown[: self.size] = self.data[: self.size]
+            self.data = grown
+        self.data[self.size : end] = values
+        self.size = end
+
+    def append(self, value):
+        self.extend([value])
+
+    def view(self) -> np.ndarray:
+        return self.data[: self.size]
+
+    def drop_front(self, count: int):
+        """Drop the first count values (shrinks capacity to fit)"""
+        self.data = self.data[count : self.size].copy()
+        self.size = len(self.data)
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+
+class _Keyframe:
+    """Full chain at one frame"""
+
+    def __init__(self, frame: int, snapshot: OptionChainSnapshot, base_time: float):
+        self.frame = frame
+        self.base_time = base_time
+        self.strikes = snapshot.strike_prices.copy()
+        self.tokens = snapshot.token.copy()
+        self.exchange = snapshot.exchange
+        self.encoded = _encode(snapshot, base_time)
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.strikes.nbytes
+            + sum(values.nbytes for values in self.encoded.values())
+            + self.tokens.size * TOKEN_BYTES
+        )
+
+
+class ChainHistory:
+    """
+    Delta-encoded snapshot history for one underlying / expiry
+
+    Usage:
+        history = ChainHistory("NIFTY", "30DEC25")
+        history.append(snapshot)                   # every published snapshot
+        history.snapshot_at(datetime(2025, 12, 30, 10, 15))
+    """
+
+    def __init__(self, underlying: str, expiry: str, keyframe_every: int = 300):
+        self.underlying = underlying
+        self.expiry = expiry
+        self.keyframe_every = keyframe_every
+        self._lock = RLock()
+
+        # Frame metadata
+        self._times = _Buffer(np.float64)
+        self._versions = _Buffer(np.int64)
+        self._atm = _Buffer(np.float64)
+        self._quality = _Buffer(np.float32)
+        self._latency = _Buffer(np.float32)
+        self._partial = _Buffer(np.bool_)
+
+        # Changed cells: per column, start offset per frame plus (cell, value) pairs
+        self._offsets = {name: _Buffer(np.int64) for name in ENCODED_COLUMNS}
+        self._cells = {name: _Buffer(np.uint16) for name in ENCODED_COLUMNS}
+        self._values = {name: _Buffer(DELTA_DTYPES[name]) for name in ENCODED_COLUMNS}
+
+        self._keyframes: List[_Keyframe] = []
+        self._last: Optional[Dict[str, np.ndarray]] = None  # encoded state of the newest frame
+        self._last_strikes: Optional[np.ndarray] = None
+        self._last_tokens: Optional[np.ndarray] = None
+
+        # Stats
+        self.trimmed_frames = 0
+
+    @property
+    def frame_count(self) -> int:
+        return self._times.size
+
+    # -------- Append --------
+
+    def append(self, snapshot: OptionChainSnapshot) -> int:
+        """
+        Record a snapshot (timestamps must not go backwards)
+
+        Returns:
+            Frame index
+        """
+        with self._lock:
+            frame = self.frame_count
+            timestamp = _epoch(snapshot.timestamp)
+            if frame and timestamp < self._times.view()[-1]:
+                raise ValueError(f"Snapshot at {snapshot.timestamp} is older than the last recorded frame")
+            if snapshot.ltp.size > MAX_CELLS:
+                raise ValueError(f"Chain of {snapshot.ltp.size} cells exceeds the {MAX_CELLS} history limit")
+
+            keyframe = self._needs_keyframe(snapshot, frame)
+            if not keyframe:
+                deltas = self._deltas(snapshot)
+                keyframe = deltas is None
+            if keyframe:
+                self._keyframes.append(_Keyframe(frame, snapshot, timestamp))
+                deltas = {}
+                self._last = self._keyframes[-1].encoded
+                self._last_strikes = snapshot.strike_prices.copy()
+                self._last_tokens = snapshot.token.copy()
+
+            for name in ENCODED_COLUMNS:
+                self._offsets[name].append(self._cells[name].size)
+                if name in deltas:
+                    cells, values = deltas[name]
+                    self._cells[name].extend(cells)
+                    self._values[name].extend(values)
+
+            self._times.append(timestamp)
+            self._versions.append(getattr(snapshot, "version", 0))
+            self._atm.append(np.nan if snapshot.atm_strike is None else snapshot.atm_strike)
+            self._quality.append(snapshot.data_quality_score)
+            self._latency.append(snapshot.fetch_latency_ms)
+            self._partial.append(snapshot.is_partial)
+            return frame
+
+    def _needs_keyframe(self, snapshot: OptionChainSnapshot, frame: int) -> bool:
+        if self._last is None or frame - self._keyframes[-1].frame >= self.keyframe_every:
+            return True
+        strikes = snapshot.strike_prices
+        if strikes.shape != self._last_strikes.shape or (strikes != self._last_strikes).any():
+            return True
+        return bool((snapshot.token != self._last_tokens).any())
+
+    def _deltas(self, snapshot: OptionChainSnapshot) -> Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+        """Changed cells per column vs the last frame (None: increments overflow, keyframe instead)"""
+        encoded = _encode(snapshot, self._keyframes[-1].base_time)
+        if (encoded["timestamps"] == NAN_CODE).sum() != np.isnan(snapshot.timestamps).sum():
+            return None  # tick times out of int32 millisecond range of the keyframe
+        deltas = {}
+        for name in ENCODED_COLUMNS:
+            new, old = encoded[name].ravel(), self._last[name].ravel()
+            cells = np.flatnonzero(new != old)
+            if name in ADDITIVE_COLUMNS:
+                values = new[cells] - old[cells]
+                limits = np.iinfo(np.int32)
+                if len(values) and (values.min() < limits.min or values.max() > limits.max):
+                    return None
+            else:
+                values = new[cells]
+            deltas[name] = (cells, values)
+        self._last = encoded
+        return deltas
+
+    # -------- Reconstruct --------
+
+    def times(self) -> np.ndarray:
+        """Frame timestamps (epoch seconds, UTC)"""
+        with self._lock:
+            return self._times.view().copy()
+
+    def snapshot_at(self, timestamp: Union[datetime, float]) -> Optional[OptionChainSnapshot]:
+        """Chain as of a time (the last frame at or before it); None before the first frame"""
+        with self._lock:
+            frame = int(np.searchsorted(self._times.view(), _epoch(timestamp), side="right")) - 1
+            if frame < 0:
+                return None
+            return self._reconstruct(frame)
+
+    def snapshot_frame(self, frame: int) -> OptionChainSnapshot:
+        with self._lock:
+            return self._reconstruct(frame)
+
+    def _reconstruct(self, frame: int) -> OptionChainSnapshot:
+        frames = np.array([k.frame for k in self._keyframes])
+        keyframe = self._keyframes[int(np.searchsorted(frames, frame, side="right")) - 1]
+
+        state = {name: values.copy() for name, values in keyframe.encoded.items()}
+        if frame > keyframe.frame:
+            for name in ENCODED_COLUMNS:
+                offsets = self._offsets[name].view()
+                start = offsets[keyframe.frame + 1]
+                end = offsets[frame + 1] if frame + 1 < len(offsets) else self._cells[name].size
+                if end == start:
+                    continue
+                cells = self._cells[name].view()[start:end]
+                values = self._values[name].view()[start:end]
+                flat = state[name].reshape(-1)
+                if name in ADDITIVE_COLUMNS:
+                    np.add.at(flat, cells, values)
+                else:
+                    # Last write wins per cell
+                    last_cells, first = np.unique(cells[::-1], return_index=True)
+                    flat[last_cells] = values[::-1][first]
+
+        columns = _decode(state, keyframe.base_time)
+        atm = self._atm.view()[frame]
+        return OptionChainSnapshot.from_arrays(
+            self.underlying,
+            self.expiry,
+            keyframe.strikes,
+            token=keyframe.tokens,
+            atm_strike=None if np.isnan(atm) else float(atm),
+            timestamp=datetime.fromtimestamp(self._times.view()[frame], timezone.utc).replace(tzinfo=None),
+            fetch_latency_ms=float(self._latency.view()[frame]),
+            is_partial=bool(self._partial.view()[frame]),
+            data_quality_score=float(self._quality.view()[frame]),
+            exchange=keyframe.exchange,
+            version=int(self._versions.view()[frame]),
+            **columns,
+        )
+
+    # -------- Memory --------
+
+    @property
+    def nbytes(self) -> int:
+        buffers = [self._times, self._versions, self._atm, self._quality, self._latency, self._partial]
+        for name in ENCODED_COLUMNS:
+            buffers += [self._offsets[name], self._cells[name], self._values[name]]
+        return sum(buffer.nbytes for buffer in buffers) + sum(k.nbytes for k in self._keyframes)
+
+    def trim_oldest(self) -> int:
+        """
+        Drop the oldest keyframe segment (frames before the second keyframe)
+
+        Returns:
+            Frames dropped (0 if only one keyframe is left)
+        """
+        with self._lock:
+            if len(self._keyframes) < 2:
+                return 0
+            cut = self._keyframes[1].frame
+            for buffer in (self._times, self._versions, self._atm, self._quality, self._latency, self._partial):
+                buffer.drop_front(cut)
+            for name in ENCODED_COLUMNS:
+                start = int(self._offsets[name].view()[cut])
+                self._offsets[name].drop_front(cut)
+                self._offsets[name].data -= start
+                self._cells[name].drop_front(start)
+                self._values[name].drop_front(start)
+            self._keyframes.pop(0)
+            for keyframe in self._keyframes:
+                keyframe.frame -= cut
+            self.trimmed_frames += cut
+            return cut
+
+    def get_stats(self) -> Dict:
+        times = self._times.view()
+        return {
+            "underlying": self.underlying,
+            "expiry": self.expiry,
+            "frames": self.frame_count,
+            "keyframes": len(self._keyframes),
+            "bytes": self.nbytes,
+            "first": float(times[0]) if len(times) else None,
+            "last": float(times[-1]) if len(times) else None,
+            "trimmed_frames": self.trimmed_frames,
+        }
+
+
+class ChainHistoryStore:
+    """
+    Memory-capped histories keyed by (underlying, expiry), LRU evicted
+
+    Usage:
+        store = ChainHistoryStore(max_bytes=256 * 1024 * 1024)
+        store.append(snapshot)
+        store.snapshot_at("NIFTY", "30DEC25", timestamp)
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, keyframe_every: int = 300):
+        self.max_bytes = max_bytes
+        self.keyframe_every = keyframe_every
+        self._histories: "OrderedDict[Tuple[str, str], ChainHistory]" = OrderedDict()
+        self._lock = RLock()
+        self.evicted = 0
+
+        self.logger = logging.getLogger(f"{__name__}.ChainHistoryStore")
+
+    def append(self, snapshot: OptionChainSnapshot) -> int:
+        """Record a snapshot under its underlying / expiry; enforces the memory cap"""
+        key = (snapshot.underlying, snapshot.expiry)
+        with self._lock:
+            history = self._histories.get(key)
+            if history is None:
+                history = self._histories[key] = ChainHistory(*key, keyframe_every=self.keyframe_every)
+            self._histories.move_to_end(key)
+            frame = history.append(snapshot)
+            self._enforce_cap(key)
+            return frame
+
+    def _enforce_cap(self, keep: Tuple[str, str]):
+        total = self.nbytes
+        # Least recently used histories go first, then the oldest segments of the active one
+        while total > self.max_bytes and len(self._histories) > 1:
+            key, history = next(iter(self._histories.items()))
+            if key == keep:
+                break
+            del self._histories[key]
+            self.evicted += 1
+            total -= history.nbytes
+            self.logger.info(f"Evicted chain history {key[0]} {key[1]} ({history.frame_count} frames)")
+        history = self._histories[keep]
+        while total > self.max_bytes and history.trim_oldest():
+            total = self.nbytes
+
+    def get(self, underlying: str, expiry: str) -> Optional[ChainHistory]:
+        with self._lock:
+            history = self._histories.get((underlying, expiry))
+            if history is not None:
+                self._histories.move_to_end((underlying, expiry))
+            return history
+
+    def snapshot_at(self, underlying: str, expiry: str, timestamp: Union[datetime, float]) -> Optional[OptionChainSnapshot]:
+        """Reconstruct a chain as of a time"""
+        history = self.get(underlying, expiry)
+        return history.snapshot_at(timestamp) if history is not None else None
+
+    @property
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(history.nbytes for history in self._histories.values())
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "evicted": self.evicted,
+                "histories": {f"{u}:{e}": h.get_stats() for (u, e), h in self._histories.items()},
+            }
@@ -7,7 +7,9 @@ Maintains current and previous snapshots for delta calculations.
 import logging
 from typing import Optional, Dict
 from datetime import datetime
-from collections import deque
+from collections import OrderedDict, deque
+
+import numpy as np
 
 from src.utils.option_chain_data_models import OptionChainSnapshot, OptionChainDelta, StrikeData, OptionType
 
@@ -21,14 +23,15 @@ class SnapshotEngine:
     Maintains:
     - Current snapshot (fresh data)
     - Previous snapshot (for delta calc)
-    - Historical snapshots (for metrics)
+    - (timestamp, fetch latency) of recent snapshots (for metrics);
+      full chain history lives in ChainHistoryStore
     """
 
     def __init__(self, max_history: int = 100):
         self.current: Optional[OptionChainSnapshot] = None
         self.previous: Optional[OptionChainSnapshot] = None
 
-        # Historical snapshots (for metrics/debugging)
+        # (timestamp, fetch_latency_ms) of recent snapshots (for metrics/debugging)
         self.history = deque(maxlen=max_history)
 
         self.logger = logging.getLogger(f"{__name__}.SnapshotEngine")
@@ -44,22 +47,21 @@ class SnapshotEngine:
         # Shift snapshots
         self.previous = self.current
         self.current = new_snapshot
-        self.history.append(new_snapshot)
+        self.history.append((new_snapshot.timestamp, new_snapshot.fetch_latency_ms))
 
         # Calculate delta
         delta = self._calculate_delta(new_snapshot, self.previous)
 
         if delta.has_changes:
-            self.logger.debug(
-                f"Snapshot delta: {len(delta.oi_changes)} OI changes, " f"{len(delta.volume_changes)} volume changes"
-            )
+            counts = delta.change_counts
+            self.logger.debug(f"Snapshot delta: {counts['oi']} OI changes, {counts['volume']} volume changes")
 
         return delta
 
     def _calculate_delta(
         self, current: OptionChainSnapshot, previous: Optional[OptionChainSnapshot]
     ) -> OptionChainDelta:
-        """Calculate changes between snapshots"""
+        """Calculate changes between snapshots as array diffs over the common strikes"""
 
         delta = OptionChainDelta(timestamp=datetime.utcnow())
 
@@ -67,90 +69,30 @@ class SnapshotEngine:
             # First snapshot, no delta
             return delta
 
-        # Compare strikes
-        current_strikes = set(current.strikes.keys())
-        previous_strikes = set(previous.strikes.keys())
-
-        # New strikes
-        delta.new_strikes_added = list(current_strikes - previous_strikes)
-
-        # Removed strikes
-        delta.strikes_removed = list(previous_strikes - current_strikes)
-
-        # Changed strikes
-        for strike in current_strikes & previous_strikes:
-            current_pair = current.strikes[strike]
-            previous_pair = previous.strikes[strike]
-
-            # CE changes
-            if current_pair.ce and previous_pair.ce:
-                self._check_strike_changes(current_pair.ce, previous_pair.ce, f"{strike}-CE", delta)
-
-            # PE changes
-            if current_pair.pe and previous_pair.pe:
-                self._check_strike_changes(current_pair.pe, previous_pair.pe, f"{strike}-PE", delta)
-
-        # Detect stale strikes
-        delta.stale_strikes = self._find_stale_strikes(current, previous)
-
-        return delta
-
-    def _check_strike_changes(
-        self, current: StrikeData, previous: StrikeData, strike_key: str, delta: OptionChainDelta
-    ):
-        """Check single strike for changes"""
-
-        # OI change
-        if current.oi != previous.oi:
-            change = current.oi - previous.oi
-            delta.oi_changes[strike_key] = change
-
-        # Volume change
-        if current.volume != previous.volume:
-            change = current.volume - previous.volume
-            delta.volume_changes[strike_key] = change
-
-        # LTP change
-        if current.ltp != previous.ltp:
-            change = current.ltp - previous.ltp
-            delta.ltp_changes[strike_key] = change
-
-    def _find_stale_strikes(self, current: OptionChainSnapshot, previous: Optional[OptionChainSnapshot]) -> list:
-        """Find strikes that haven't changed"""
-
-        stale = []
-
-        if not previous:
-            return stale
-
-        for strike in current.strikes.keys():
-            if strike not in previous.strikes:
-                continue
-
-            curr_pair = current.strikes[strike]
-            prev_pair = previous.strikes[strike]
-
-            # Check if any side is truly stale (no OI/Vol change)
-            ce_stale = (
-                curr_pair.ce
-                and prev_pair.ce
-                and curr_pair.ce.oi == prev_pair.ce.oi
-                and curr_pair.ce.volume == prev_pair.ce.volume
-                and curr_pair.ce.ltp == prev_pair.ce.ltp
+        # Align strike grids (same grid: no reindexing)
+        current_strikes, previous_strikes = current.strike_prices, previous.strike_prices
+        if current_strikes.shape == previous_strikes.shape and (current_strikes == previous_strikes).all():
+            strikes, ci, pi = current_strikes, slice(None), slice(None)
+        else:
+            strikes, ci, pi = np.intersect1d(
+                current_strikes, previous_strikes, assume_unique=True, return_indices=True
             )
+            delta.new_strikes_added = np.setdiff1d(current_strikes, previous_strikes, assume_unique=True).tolist()
+            delta.strikes_removed = np.setdiff1d(previous_strikes, current_strikes, assume_unique=True).tolist()
 
-            pe_stale = (
-                curr_pair.pe
-                and prev_pair.pe
-                and curr_pair.pe.oi == prev_pair.pe.oi
-                and curr_pair.pe.volume == prev_pair.pe.volume
-                and curr_pair.pe.ltp == prev_pair.pe.ltp
-            )
+        # Changed sides (only where both snapshots have the option)
+        compared = current.present[:, ci] & previous.present[:, pi]
+        delta.strikes = strikes
+        delta.compared = compared
+        delta.oi_change = np.where(compared, current.oi[:, ci] - previous.oi[:, pi], 0)
+        delta.volume_change = np.where(compared, current.volume[:, ci] - previous.volume[:, pi], 0)
+        delta.ltp_change = np.where(compared, current.ltp[:, ci] - previous.ltp[:, pi], 0.0)
 
-            if ce_stale or pe_stale:
-                stale.append(strike)
+        # Stale: a side with no OI / volume / LTP change
+        delta.stale_mask = compared & (delta.oi_change == 0) & (delta.volume_change == 0) & (delta.ltp_change == 0)
+        delta.stale_strikes = strikes[delta.stale_mask.any(axis=0)].tolist()
 
-        return stale
+        return delta
 
     def get_atm_ce(self) -> Optional[StrikeData]:
         """Get current ATM call"""
@@ -183,23 +125,25 @@ class SnapshotEngine:
 
         return {
             "snapshots_captured": len(self.history),
-            "first_snapshot": self.history[0].timestamp.isoformat() if self.history else None,
-            "latest_snapshot": self.history[-1].timestamp.isoformat() if self.history else None,
+            "first_snapshot": self.history[0][0].isoformat() if self.history else None,
+            "latest_snapshot": self.history[-1][0].isoformat() if self.history else None,
             "avg_fetch_latency_ms": (
-                sum(s.fetch_latency_ms for s in self.history) / len(self.history) if self.history else 0
+                sum(latency for _, latency in self.history) / len(self.history) if self.history else 0
             ),
         }
 
 
 class SnapshotCache:
     """
-    In-memory cache of snapshots.
-    Thread-safe storage of option chain data.
+    In-memory cache of latest snapshots.
+    Holds at most max_entries (underlying, expiry) pairs, least recently used evicted.
     """
 
-    def __init__(self):
+    def __init__(self, max_entries: int = 32):
         self.cache: Dict[str, Dict[str, OptionChainSnapshot]] = {}
         # Structure: cache[underlying][expiry] = OptionChainSnapshot
+        self.max_entries = max_entries
+        self._order: "OrderedDict[tuple, None]" = OrderedDict()  # LRU order of (underlying, expiry)
 
         self.logger = logging.getLogger(f"{__name__}.SnapshotCache")
 
@@ -209,11 +153,25 @@ class SnapshotCache:
             self.cache[underlying] = {}
 
         self.cache[underlying][expiry] = snapshot
+        self._order[(underlying, expiry)] = None
+        self._order.move_to_end((underlying, expiry))
         self.logger.debug(f"Cached snapshot: {underlying} {expiry}")
 
+        while len(self._order) > self.max_entries:
+            (old_underlying, old_expiry), _ = self._order.popitem(last=False)
+            self._drop(old_underlying, old_expiry)
+            self.logger.debug(f"Evicted cached snapshot: {old_underlying} {old_expiry}")
+
+    def _drop(self, underlying: str, expiry: str):
+        expiries = self.cache.get(underlying, {})
+        expiries.pop(expiry, None)
+        if not expiries:
+            self.cache.pop(underlying, None)
+
     def retrieve(self, underlying: str, expiry: str) -> Optional[OptionChainSnapshot]:
         """Retrieve snapshot from cache"""
         if underlying in self.cache and expiry in self.cache[underlying]:
+            self._order.move_to_end((underlying, expiry))
             return self.cache[underlying][expiry]
         return None
 
@@ -240,14 +198,18 @@ class SnapshotCache:
         """Clear cache (selective or full)"""
         if underlying is None:
             self.cache.clear()
+            self._order.clear()
             self.logger.info("Cleared entire cache")
         elif expiry is None:
             if underlying in self.cache:
+                for cached_expiry in self.cache[underlying]:
+                    self._order.pop((underlying, cached_expiry), None)
                 del self.cache[underlying]
                 self.logger.info(f"Cleared cache for {underlying}")
         else:
             if underlying in self.cache and expiry in self.cache[underlying]:
-                del self.cache[underlying][expiry]
+                self._order.pop((underlying, expiry), None)
+                self._drop(underlying, expiry)
                 self.logger.info(f"Cleared cache for {underlying} {expiry}")
 
     def get_cache_size(self) -> int:
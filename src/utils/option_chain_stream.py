@@ -0,0 +1,361 @@
+"""
+Phase 2: Streaming Option Chain
+
+Option chain maintained in place from websocket ticks.
+
+    • ATM ± N CE/PE tokens subscribed through StreamManager.subscribe_option_chain
+    • Each tick writes its strike cell in the columnar chain arrays (no objects)
+    • Versioned snapshots (copies of the ATM window) published at most every
+      publish_interval seconds to the on_publish callback
+    • When spot crosses into another strike, only the strikes entering and
+      leaving the window are subscribed / unsubscribed (outside the chain
+      lock); strikes whose subscribe failed are retried by fill_gaps
+    • REST (gap_filler) is only used for window cells with no tick yet or
+      none within max_age seconds
+"""
+
+import logging
+import time
+from datetime import datetime
+from threading import RLock
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.integrations.websocket.binary_decoder import PRICE_DIVISOR
+from src.utils.option_chain_data_models import OptionChainSnapshot, side_row
+
+logger = logging.getLogger(__name__)
+
+
+def _top_price(depth) -> Optional[float]:
+    """Best price from a best-5 depth list (or a plain number)"""
+    if isinstance(depth, (list, tuple)):
+        try:
+            return depth[0]["price"] if depth else None
+        except (LookupError, TypeError):
+            return None
+    return depth
+
+
+def _strike_arg(strike: float):
+    """Strikes as the int the instrument lookups expect, when integral"""
+    return int(strike) if float(strike).is_integer() else float(strike)
+
+
+class StreamingOptionChain:
+    """
+    Live option chain for one underlying / expiry
+
+    Usage:
+        chain = StreamingOptionChain(stream_manager, "NIFTY", "30DEC25", listed_strikes, width=15,
+                                     on_publish=engine.ingest)
+        stream_manager.on_tick(chain.on_tick)
+        chain.update_spot(23012.5)        # subscribes ATM ± 15, rolls on strike crossings
+        chain.fill_gaps()                 # background loop: REST for cells with no ticks
+    """
+
+    def __init__(
+        self,
+        stream_manager,
+        underlying: str,
+        expiry: str,
+        strikes,
+        width: int = 10,
+        spot_token: Optional[str] = None,
+        on_publish: Optional[Callable[[OptionChainSnapshot], None]] = None,
+        gap_filler: Optional[Callable[[List[Dict]], Dict[str, Dict]]] = None,
+        publish_interval: float = 0.25,
+        max_age: float = 60.0,
+        price_divisor: float = PRICE_DIVISOR,
+    ):
+        """
+        Initialize streaming chain
+
+        Args:
+            stream_manager: StreamManager used for (un)subscriptions
+            underlying: Underlying symbol
+            expiry: Expiry code (e.g. 30DEC25)
+            strikes: Listed strikes for the expiry
+            width: Strikes kept subscribed on each side of ATM
+            spot_token: Token of the underlying; its ticks drive update_spot
+            on_publish: Called with each published snapshot
+            gap_filler: REST quotes for instruments: {token: {ltp, volume, oi}} in rupees
+            publish_interval: Minimum seconds between published snapshots
+            max_age: Seconds without a tick after which a cell is a gap
+            price_divisor: Tick prices arrive in paise from the binary feed
+        """
+        self.stream_manager = stream_manager
+        self.underlying = underlying
+        self.expiry = expiry
+        self.width = width
+        self.spot_token = spot_token
+        self.on_publish = on_publish
+        self.gap_filler = gap_filler
+        self.publish_interval = publish_interval
+        self.max_age = max_age
+        self.price_divisor = price_divisor
+
+        # Working chain over every listed strike; cells are written in place
+        strikes = np.unique(np.asarray(strikes, dtype=float))
+        self.chain = OptionChainSnapshot.from_arrays(underlying, expiry, strikes, np.full((2, len(strikes)), np.nan))
+        self._cells: Dict[str, Tuple[int, int]] = {}  # token -> (row, strike index)
+        self._instruments: Dict[str, Dict] = {}  # token -> subscribed instrument
+        self._window: Tuple[int, int] = (0, 0)  # subscribed strike index range [lo, hi)
+        self._pending: Set[int] = set()  # window strike indices not subscribed yet
+        self._subscribing: Set[int] = set()  # strike indices with a subscribe in flight
+        self._lock = RLock()
+
+        self.spot: Optional[float] = None
+        self.version = 0
+        self._dirty = False
+        self._last_publish = 0.0
+        self.active = True
+
+        # Stats
+        self.ticks = 0
+        self.rolls = 0
+        self.subscribed_total = 0
+        self.unsubscribed_total = 0
+        self.gap_fills = 0
+
+    # -------- Subscription window --------
+
+    def update_spot(self, spot: float) -> bool:
+        """
+        Track the underlying; roll the window when the ATM strike changes
+
+        Returns:
+            True if the subscription window moved
+        """
+        strikes = self.chain.strike_prices
+        if not len(strikes) or not spot or spot <= 0:
+            return False
+        self.spot = spot
+
+        i = int(np.searchsorted(strikes, spot))
+        if i == len(strikes) or (i > 0 and spot - strikes[i - 1] <= strikes[i] - spot):
+            i -= 1
+        lo, hi = max(i - self.width, 0), min(i + self.width + 1, len(strikes))
+
+        with self._lock:
+            atm = float(strikes[i])
+            if atm == self.chain.atm_strike and (lo, hi) == self._window:
+                return False
+            self.chain.atm_strike = atm
+            leaving = self._roll(lo, hi)
+            self._dirty = True
+
+        self._sync_subscriptions(leaving)
+        return True
+
+    def _roll(self, lo: int, hi: int) -> List:
+        """Move the window to [lo, hi) (call under _lock); returns strikes to unsubscribe"""
+        old_lo, old_hi = self._window
+        old = set(range(old_lo, old_hi))
+        new = set(range(lo, hi))
+        leaving = sorted(old - new)
+        entering = sorted(new - old)
+
+        if leaving:
+            for token in [t for t, (_, i) in self._cells.items() if i in old - new]:
+                del self._cells[token]
+                self._instruments.pop(token, None)
+            self.chain.present[:, leaving] = False  # no longer maintained
+            self._pending.difference_update(leaving)
+            self.unsubscribed_total += len(leaving)
+        self._pending.update(entering)
+
+        self._window = (lo, hi)
+        self.rolls += 1
+        logger.info(
+            f"{self.underlying} {self.expiry} chain window ATM {self.chain.atm_strike}: "
+            f"+{len(entering)} / -{len(leaving)} strikes"
+        )
+        return [_strike_arg(self.chain.strike_prices[i]) for i in leaving]
+
+    def _sync_subscriptions(self, leaving: List = ()) -> int:
+        """
+        Subscription I/O outside the lock: unsubscribe leaving strikes, subscribe
+        pending ones; strikes that get no instruments back stay pending
+
+        Returns:
+            Strikes still pending
+        """
+        if leaving:
+            self.stream_manager.unsubscribe_option_chain(self.underlying, self.expiry, leaving)
+
+        with self._lock:
+            entering = sorted(self._pending - self._subscribing)
+            self._subscribing.update(entering)
+            strikes = [_strike_arg(self.chain.strike_prices[i]) for i in entering]
+        if not entering:
+            return len(self._pending)
+
+        try:
+            instruments = self.stream_manager.subscribe_option_chain(self.underlying, self.expiry, strikes) or []
+        except Exception as e:
+            logger.warning(f"{self.underlying} {self.expiry} subscribe failed: {e}")
+            instruments = []
+
+        outside = set()
+        with self._lock:
+            self._subscribing.difference_update(entering)
+            lo, hi = self._window
+            subscribed = set()
+            for inst in instruments:
+                i = self.chain.index_of(inst["strike"])
+                if i is None:
+                    continue
+                if not self.active or not lo <= i < hi:
+                    outside.add(_strike_arg(self.chain.strike_prices[i]))  # left the window meanwhile
+                    continue
+                self._cells[inst["token"]] = (side_row(inst["option_type"]), i)
+                self._instruments[inst["token"]] = inst
+                subscribed.add(i)
+            self._pending.difference_update(subscribed)
+            self.subscribed_total += len(subscribed)
+            pending = len(self._pending)
+
+        if outside:
+            self.stream_manager.unsubscribe_option_chain(self.underlying, self.expiry, sorted(outside))
+        if pending:
+            logger.warning(f"{self.underlying} {self.expiry}: {pending} window strikes not subscribed, will retry")
+        return pending
+
+    # -------- Ticks --------
+
+    def on_tick(self, tick: Dict):
+        """StreamManager tick callback: write the tick into its strike cell"""
+        if not self.active:
+            return
+        token = tick.get("token")
+        if token is not None and token == self.spot_token:
+            ltp = tick.get("ltp")
+            if ltp is not None:
+                self.update_spot(ltp / self.price_divisor)
+            self._maybe_publish()
+            return
+
+        with self._lock:
+            cell = self._cells.get(token)
+            if cell is None:
+                return
+            self._write(cell, tick, self.price_divisor)
+            self.ticks += 1
+        self._maybe_publish()
+
+    def _write(self, cell: Tuple[int, int], quote: Dict, divisor: float):
+        """Update one CE/PE cell in place (fields missing from the quote are kept)"""
+        chain = self.chain
+        row, i = cell
+        ltp = quote.get("ltp")
+        if ltp is not None:
+            chain.ltp[row, i] = ltp / divisor
+        for name, value in (("bid", _top_price(quote.get("bid"))), ("ask", _top_price(quote.get("ask")))):
+            if value is not None:
+                getattr(chain, name)[row, i] = value / divisor
+        volume = quote.get("volume")
+        if volume is not None:
+            chain.volume[row, i] = volume
+        oi = quote.get("oi")
+        if oi is not None:
+            if chain.present[row, i] and oi != chain.oi[row, i]:
+                chain.oi_prev[row, i] = chain.oi[row, i]
+            chain.oi[row, i] = oi
+        chain.timestamps[row, i] = time.time()
+        chain.present[row, i] = not np.isnan(chain.ltp[row, i])
+        self._dirty = True
+
+    # -------- Gap filling --------
+
+    def gaps(self) -> List[Dict]:
+        """Subscribed instruments with no tick yet, or none within max_age"""
+        now = time.time()
+        with self._lock:
+            chain = self.chain
+            return [
+                self._instruments[token]
+                for token, (row, i) in self._cells.items()
+                if not chain.present[row, i] or now - chain.timestamps[row, i] > self.max_age
+            ]
+
+    def fill_gaps(self) -> int:
+        """
+        Retry failed subscriptions, then quote gap cells over REST (off the tick
+        thread); returns cells filled
+        """
+        if self._pending and self.active:
+            self._sync_subscriptions()
+        if self.gap_filler is None:
+            return 0
+        missing = self.gaps()
+        if not missing:
+            return 0
+
+        quotes = self.gap_filler(missing) or {}
+        filled = 0
+        with self._lock:
+            for token, quote in quotes.items():
+                cell = self._cells.get(token)
+                if cell is not None and quote:
+                    self._write(cell, quote, 1.0)
+                    filled += 1
+        self.gap_fills += filled
+        if filled:
+            self.publish()
+        return filled
+
+    # -------- Publishing --------
+
+    def _maybe_publish(self):
+        if self._dirty and time.time() - self._last_publish >= self.publish_interval:
+            self.publish()
+
+    def publish(self) -> Optional[OptionChainSnapshot]:
+        """Publish a versioned copy of the ATM window (if anything changed)"""
+        with self._lock:
+            if not self._dirty or self.chain.atm_strike is None:
+                return None
+            snapshot = self.chain.window(self.width).copy()
+            self.version += 1
+            snapshot.version = self.version
+            snapshot.timestamp = datetime.utcnow()
+            snapshot.is_partial = not snapshot.present.all()
+            self._dirty = False
+            self._last_publish = time.time()
+
+        if self.on_publish:
+            try:
+                self.on_publish(snapshot)
+            except Exception as e:
+                logger.error(f"Chain publish callback error: {e}")
+        return snapshot
+
+    def stop(self):
+        """Unsubscribe the whole window"""
+        with self._lock:
+            self.active = False
+            lo, hi = self._window
+            strikes = [_strike_arg(s) for s in self.chain.strike_prices[lo:hi]]
+            self._cells.clear()
+            self._instruments.clear()
+            self._pending.clear()
+            self._window = (0, 0)
+        if strikes:
+            self.stream_manager.unsubscribe_option_chain(self.underlying, self.expiry, strikes)
+
+    def get_stats(self) -> Dict:
+        lo, hi = self._window
+        return {
+            "version": self.version,
+            "atm_strike": self.chain.atm_strike,
+            "window_strikes": hi - lo,
+            "subscribed_tokens": len(self._cells),
+            "pending_strikes": len(self._pending),
+            "ticks": self.ticks,
+            "rolls": self.rolls,
+            "subscribed_total": self.subscribed_total,
+            "unsubscribed_total": self.unsubscribed_total,
+            "gap_fills": self.gap_fills,
+        }
@@ -0,0 +1,86 @@
+"""
+Tests for Greeks Cache
+Covers quantized keys, LRU eviction, hit/miss counters and per-bucket regime invalidation
+"""
+
+import numpy as np
+import pytest
+
+from src.engines.greeks.greeks_cache import GreeksCache
+from src.engines.greeks.greeks_calculator import GreeksCalculator
+
+SPOT = 23000.0
+STRIKES = np.arange(22500.0, 23501.0, 50.0)
+TTE = 5 / 365.0
+
+
+class TestGreeksCache:
+    """Test memoized Black-Scholes Greeks"""
+
+    def test_matches_calculator(self):
+        """Test cached values equal the calculator on snapped inputs"""
+        cache = GreeksCache(spot_tick=0.5, iv_tick=0.0005)
+        cached = cache.get_batch(SPOT + 0.1, STRIKES, TTE, 0.1502, "CE")
+        snapped_tte = cache.tte_tick * round(TTE / cache.tte_tick)
+        direct = GreeksCalculator.calculate_batch(SPOT, STRIKES, snapped_tte, 0.15, "CE")
+
+        for name in ("delta", "gamma", "theta", "vega", "price"):
+            np.testing.assert_allclose(cached[name], direct[name], rtol=1e-9)
+
+    def test_repeated_scan_hits(self):
+        """Test rescanning a chain (exact or within ticks) is served from cache"""
+        cache = GreeksCache()
+        first = cache.get_batch(SPOT, STRIKES, TTE, 0.15, "PE")
+        again = cache.get_batch(SPOT, STRIKES, TTE, 0.15, "PE")
+        nudged = cache.get_batch(SPOT + 0.1, STRIKES, TTE, 0.15001, "PE")
+
+        stats = cache.get_stats()
+        assert stats["misses"] == len(STRIKES)
+        assert stats["hits"] == 2 * len(STRIKES)
+        np.testing.assert_array_equal(first, again)
+        np.testing.assert_array_equal(first, nudged)
+
+    def test_lru_eviction(self):
+        """Test the least recently used entries are evicted first"""
+        cache = GreeksCache(max_size=3)
+        # Distinct raw spots in one tick bucket so each call keys per option
+        spots = iter(SPOT + np.arange(10) * 0.01)
+        for strike in (22900.0, 23000.0, 23100.0):
+            cache.get(next(spots), strike, TTE, 0.15, "CE")
+        cache.get(next(spots), 22900.0, TTE, 0.15, "CE")  # refresh oldest
+        cache.get(next(spots), 23200.0, TTE, 0.15, "CE")  # evicts 23000
+
+        assert len(cache) == 3
+        assert cache.get_stats()["evictions"] == 1
+        misses = cache.misses
+        cache.get(next(spots), 22900.0, TTE, 0.15, "CE")
+        assert cache.misses == misses
+        cache.get(next(spots), 23000.0, TTE, 0.15, "CE")
+        assert cache.misses == misses + 1
+
+    @pytest.mark.parametrize("spot, iv", [(SPOT * 1.02, 0.15), (SPOT, 0.20)])
+    def test_invalidates_on_large_move(self, spot, iv):
+        """Test a spot or IV move past the threshold clears the cache"""
+        cache = GreeksCache(spot_move_pct=1.0, iv_move=0.03)
+        cache.get_batch(SPOT, STRIKES, TTE, 0.15, "CE")
+        cache.get_batch(spot, STRIKES, TTE, iv, "CE")
+
+        stats = cache.get_stats()
+        assert stats["invalidations"] == 1
+        assert stats["size"] == len(STRIKES)
+
+    def test_invalidation_scoped_to_bucket(self):
+        """Test a move in one (underlying, expiry) keeps the other bucket's entries and reference"""
+        cache = GreeksCache(spot_move_pct=1.0, iv_move=0.03)
+        weekly, monthly = ("NIFTY", "30DEC25"), ("NIFTY", "27JAN26")
+        cache.get_batch(SPOT, STRIKES, TTE, 0.15, "CE", bucket=weekly)
+        cache.get_batch(SPOT, STRIKES, 4 * TTE, 0.12, "CE", bucket=monthly)
+
+        cache.get_batch(SPOT, STRIKES, TTE, 0.20, "CE", bucket=weekly)  # weekly IV jump
+        assert cache.get_stats()["invalidations"] == 1
+        assert len(cache) == 2 * len(STRIKES)
+
+        hits = cache.hits
+        cache.get_batch(SPOT + 0.1, STRIKES, 4 * TTE, 0.12, "CE", bucket=monthly)
+        assert cache.hits == hits + len(STRIKES)
+        assert cache.get_stats()["invalidations"] == 1
@@ -0,0 +1,189 @@
+"""
+Tests for Greeks Calculator
+Covers the vectorized Black-Scholes batch API against the scalar path
+and the vectorized implied-volatility solver
+"""
+
+import numpy as np
+import pytest
+
+from src.engines.greeks.greeks_calculator import (
+    GREEKS_DTYPE,
+    IV_PRICE_TOLERANCE,
+    MAX_IV,
+    MIN_IV,
+    GreeksCalculationEngine,
+    GreeksCalculator,
+    IvEstimator,
+)
+from src.engines.greeks.greeks_models import OptionType
+
+SPOT = 23000.0
+STRIKES = np.arange(22000.0, 24001.0, 50.0)
+
+
+class TestGreeksBatch:
+    """Test vectorized whole-chain Greeks"""
+
+    @pytest.mark.parametrize("option_type", ["CE", "PE"])
+    def test_batch_matches_scalar(self, option_type):
+        """Test batch Greeks agree with calculate_call/put_greeks"""
+        tte, iv = 5 / 365.0, 0.14
+        batch = GreeksCalculator.calculate_batch(SPOT, STRIKES, tte, iv, option_type)
+        scalar = (
+            GreeksCalculator.calculate_call_greeks
+            if option_type == "CE"
+            else GreeksCalculator.calculate_put_greeks
+        )
+
+        assert batch.dtype == GREEKS_DTYPE
+        for strike, row in zip(STRIKES, batch):
+            expected = scalar(SPOT, strike, tte, iv)
+            for name, value in expected.items():
+                assert row[name] == pytest.approx(value, rel=1e-5, abs=1e-6)
+
+    def test_put_call_parity(self):
+        """Test batch prices satisfy C - P = S - K e^(-rT)"""
+        tte, rate = 30 / 365.0, 0.06
+        calls = GreeksCalculator.calculate_batch(SPOT, STRIKES, tte, 0.2, "CE", rate)
+        puts = GreeksCalculator.calculate_batch(SPOT, STRIKES, tte, 0.2, "PE", rate)
+
+        parity = SPOT - STRIKES * np.exp(-rate * tte)
+        np.testing.assert_allclose(calls["price"] - puts["price"], parity, atol=1e-6)
+
+    def test_mixed_rows_and_expiry(self):
+        """Test per-row types, vols and expiries broadcast, expired rows are intrinsic"""
+        batch = GreeksCalculator.calculate_batch(
+            SPOT,
+            [22500.0, 23500.0, 22500.0],
+            [0.0, 0.0, 7 / 365.0],
+            [0.15, 0.15, 0.15],
+            [OptionType.CALL, OptionType.PUT, OptionType.PUT],
+        )
+
+        assert batch["delta"][:2].tolist() == [1.0, -1.0]
+        assert batch["price"][:2].tolist() == [500.0, 500.0]
+        assert batch["gamma"][:2].tolist() == [0.0, 0.0]
+        assert -1.0 < batch["delta"][2] < 0.0
+
+
+class TestIvSolver:
+    """Test vectorized implied-volatility solver"""
+
+    @staticmethod
+    def _chain(tte=5 / 365.0):
+        types = np.where(STRIKES >= SPOT, "CE", "PE")
+        true_iv = 0.12 + 5e-8 * (STRIKES - SPOT) ** 2  # smile
+        prices = GreeksCalculator.calculate_batch(SPOT, STRIKES, tte, true_iv, types)["price"]
+        return types, true_iv, prices
+
+    def test_recovers_market_iv(self):
+        """Test solved IVs reprice every option within tolerance"""
+        types, true_iv, prices = self._chain()
+        solution = IvEstimator.solve_batch(prices, SPOT, STRIKES, 5 / 365.0, types)
+
+        assert solution.converged.all()
+        np.testing.assert_allclose(solution.iv, true_iv, atol=1e-4)
+        repriced = GreeksCalculator.calculate_batch(SPOT, STRIKES, 5 / 365.0, solution.iv, types)["price"]
+        assert np.abs(repriced - prices).max() <= IV_PRICE_TOLERANCE
+
+    def test_warm_start_reduces_iterations(self):
+        """Test seeding with the previous snapshot's IV converges faster"""
+        types, true_iv, prices = self._chain()
+        cold = IvEstimator.solve_batch(prices, SPOT, STRIKES, 5 / 365.0, types)
+        warm = IvEstimator.solve_batch(prices, SPOT, STRIKES, 5 / 365.0, types, initial_iv=true_iv * 1.01)
+
+        assert warm.converged.all()
+        assert warm.iterations.sum() < cold.iterations.sum()
+
+    def test_unsolvable_rows(self):
+        """Test zero prices get the default IV and arbitrage prices hit the bounds unconverged"""
+        solution = IvEstimator.solve_batch(
+            [0.0, 5000.0, 0.001, 900.0, 400.0],
+            SPOT,
+            [SPOT, SPOT, SPOT + 3000, SPOT - 1000, SPOT + 500],
+            5 / 365.0,
+            ["CE", "CE", "CE", "CE", "PE"],
+        )
+
+        assert solution.converged.tolist() == [False, False, True, False, False]
+        assert solution.iterations[[0, 1, 3, 4]].tolist() == [0, 0, 0, 0]
+        assert solution.iv[1] == MAX_IV
+        assert MIN_IV <= solution.iv[2] < 0.3
+        assert solution.iv[3] == solution.iv[4] == MIN_IV  # below intrinsic
+
+    def test_scalar_estimate_reprices(self):
+        """Test estimate_from_price returns the IV that reprices the LTP"""
+        ltp = GreeksCalculator.calculate_batch(SPOT, 23100.0, 7 / 365.0, 0.18, "CE")["price"]
+        iv = IvEstimator.estimate_from_price(float(ltp), SPOT, 23100.0, 7 / 365.0, OptionType.CALL)
+
+        assert iv == pytest.approx(0.18, abs=1e-5)
+
+
+class TestGreeksCalculationEngineBatch:
+    """Test chain-level GreeksCalculationEngine API"""
+
+    def test_broker_greeks_take_priority(self):
+        """Test broker rows keep broker Greeks and model rows are batch priced"""
+        engine = GreeksCalculationEngine()
+        strikes = [22900.0, 23000.0, 23100.0]
+        types = [OptionType.CALL, OptionType.CALL, OptionType.PUT]
+        broker = {(23000.0, OptionType.CALL): {"delta": 0.5, "gamma": 0.001, "theta": -5.0, "vega": 10.0}}
+
+        results = engine.calculate_greeks_batch(
+            strikes, types, SPOT, 5.0, [150.0, 90.0, 110.0], broker_greeks=broker, broker_ivs={}
+        )
+
+        statuses = [status for _, status in results]
+        assert statuses[1] == "broker_greeks"
+        assert statuses[0].startswith("calculated_bs") and statuses[2].startswith("calculated_bs")
+        assert results[1][0].delta == 0.5
+        assert results[2][0].delta < 0
+        assert engine.get_metrics()["total_calculated"] == 3
+
+    def test_iv_warm_start_across_snapshots(self):
+        """Test the second snapshot reuses solved IVs and reports iterations"""
+        engine = GreeksCalculationEngine()
+        strikes = list(STRIKES[15:25])
+        types = [OptionType.CALL] * len(strikes)
+        ltps = GreeksCalculator.calculate_batch(SPOT, strikes, 5 / 365.0, 0.15, "CE")["price"].tolist()
+
+        engine.calculate_greeks_batch(strikes, types, SPOT, 5.0, ltps)
+        first = engine.get_metrics()["avg_iv_iterations"]
+        results = engine.calculate_greeks_batch(strikes, types, SPOT, 5.0, ltps)
+        metrics = engine.get_metrics()
+
+        assert metrics["iv_solves"] == 2 * len(strikes)
+        assert metrics["iv_unconverged"] == 0
+        assert metrics["avg_iv_iterations"] < first
+        assert all(snap.implied_volatility == pytest.approx(0.15, abs=1e-4) for snap, _ in results)
+
+    def test_iv_warm_start_keyed_by_expiry_and_pruned(self, monkeypatch):
+        """Test warm starts stay within one underlying / expiry and expired buckets are dropped"""
+        import src.engines.greeks.greeks_calculator as greeks_calculator
+
+        engine = GreeksCalculationEngine()
+        strikes = list(STRIKES[15:25])
+        types = [OptionType.CALL] * len(strikes)
+        weekly = GreeksCalculator.calculate_batch(SPOT, strikes, 5 / 365.0, 0.15, "CE")["price"].tolist()
+        monthly = GreeksCalculator.calculate_batch(SPOT, strikes, 30 / 365.0, 0.20, "CE")["price"].tolist()
+        now = 1_700_000_000.0
+        monkeypatch.setattr(greeks_calculator.time, "time", lambda: now)
+
+        engine.calculate_greeks_batch(strikes, types, SPOT, 5.0, weekly, underlying="NIFTY", expiry="30DEC25")
+        engine.calculate_greeks_batch(strikes, types, SPOT, 30.0, monthly, underlying="NIFTY", expiry="27JAN26")
+
+        assert engine.last_iv[("NIFTY", "30DEC25")][(strikes[0], OptionType.CALL)] == pytest.approx(0.15, abs=1e-4)
+        assert engine.last_iv[("NIFTY", "27JAN26")][(strikes[0], OptionType.CALL)] == pytest.approx(0.20, abs=1e-4)
+
+        now += 6 * 86400
+        engine.calculate_greeks_batch(strikes, types, SPOT, 24.0, monthly, underlying="NIFTY", expiry="27JAN26")
+        assert set(engine.last_iv) == {("NIFTY", "27JAN26")}
+
+    def test_below_intrinsic_not_used_as_warm_start(self):
+        """Test an unsolvable price is counted unconverged and not kept for the next snapshot"""
+        engine = GreeksCalculationEngine()
+        engine.calculate_greeks_batch([22000.0], [OptionType.CALL], SPOT, 5.0, [900.0], underlying="NIFTY")
+
+        assert engine.get_metrics()["iv_unconverged"] == 1
+        assert engine.last_iv[("NIFTY", None)] == {}
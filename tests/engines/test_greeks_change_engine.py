@@ -0,0 +1,52 @@
+"""
+Tests for Greeks Change Engine
+Covers incremental momentum against the full-chain analyzer
+"""
+
+from src.engines.greeks.greeks_change_engine import GreeksChangeTracker, MomentumAnalyzer
+from src.engines.greeks.greeks_models import GreeksSnapshot, OptionType
+
+STRIKES = [22900.0, 22950.0, 23000.0, 23050.0, 23100.0]
+
+
+def _snapshot(strike, delta, gamma=0.002):
+    return GreeksSnapshot(
+        strike=strike, option_type=OptionType.CALL, delta=delta, gamma=gamma, theta=-5.0, vega=8.0
+    )
+
+
+class TestIncrementalMomentum:
+    """Test MomentumAnalyzer.update_momentum"""
+
+    def test_matches_full_analysis(self):
+        """Test incremental counts equal analyze_momentum over the moved strikes"""
+        tracker = GreeksChangeTracker()
+        analyzer = MomentumAnalyzer()
+        for strike in STRIKES:
+            tracker.update(strike, _snapshot(strike, 0.5))
+        analyzer.update_momentum(tracker.get_all_current(), STRIKES)
+
+        moved = {22950.0: 0.55, 23000.0: 0.56, 23100.0: 0.45}
+        for strike, delta in moved.items():
+            tracker.update(strike, _snapshot(strike, delta, gamma=0.004))
+        greeks = tracker.get_all_current()
+
+        incremental = analyzer.update_momentum(greeks, moved)
+        full = MomentumAnalyzer().analyze_momentum({s: greeks[s] for s in moved}, 23000.0)
+
+        assert incremental["direction"] == full["direction"] == "BULLISH"
+        assert incremental["signals"] == full["signals"]
+        assert incremental["strength"] == 2 / len(STRIKES)
+
+    def test_settled_strikes_fall_back_to_neutral(self):
+        """Test strikes that stop moving no longer count"""
+        tracker = GreeksChangeTracker()
+        analyzer = MomentumAnalyzer()
+        for strike in STRIKES:
+            tracker.update(strike, _snapshot(strike, 0.5))
+        tracker.update(23000.0, _snapshot(23000.0, 0.4))
+
+        greeks = tracker.get_all_current()
+
+        assert analyzer.update_momentum(greeks, [23000.0])["direction"] == "BEARISH"
+        assert analyzer.update_momentum(greeks, [])["direction"] == "NEUTRAL"
@@ -0,0 +1,219 @@
+"""
+Tests for Greeks Data Manager
+Covers the concurrent refresh cycle, atomic publish, shared rate budget,
+cycle duration metrics and hybrid local / broker Greeks, drift shared with GreeksEngine
+"""
+
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.engines.greeks import greeks_data_manager
+from src.engines.greeks.greeks_calculator import GreeksCalculator
+from src.engines.greeks.greeks_data_manager import GreeksDataManager, parse_option_symbol
+from src.engines.greeks.greeks_engine import GreeksEngine
+from src.engines.greeks.greeks_health import GreeksHealthMonitor, get_greeks_health_monitor
+from src.engines.greeks.greeks_models import GreeksSnapshot as ChainGreeks
+from src.engines.greeks.greeks_models import OptionType
+
+SYMBOLS = [f"NIFTY25JAN{strike}CE" for strike in range(23000, 23400, 50)]
+EXPIRY = (date.today() + timedelta(days=7)).strftime("%d%b%y").upper()
+OPTION = f"NIFTY23100CE{EXPIRY}"
+
+
+class FakeOptionsHelper:
+    """Greeks API stand-in with a fixed per-call latency"""
+
+    def __init__(self, manager=None, latency=0.05):
+        self.manager = manager
+        self.latency = latency
+        self.call_times = []
+        self.published_mid_cycle = False
+        self.data = {"delta": 0.5, "iv": 14.0, "ltp": 100.0}
+        self._lock = threading.Lock()
+
+    def get_option_greeks(self, symbol, exchange="NFO", underlying_symbol=None, underlying_exchange=None):
+        with self._lock:
+            self.call_times.append(time.monotonic())
+        if self.manager is not None and self.manager.current_greeks:
+            self.published_mid_cycle = True
+        time.sleep(self.latency)
+        if symbol.endswith("FAIL"):
+            return {"status": "error"}
+        return {"status": "success", "data": dict(self.data)}
+
+
+class FakeFeed:
+    """Streaming feed stand-in"""
+
+    def __init__(self, prices, age=0.0):
+        self.prices = prices
+        self.age = age
+        self.subscribed = []
+
+    def get_ltp_with_timestamp(self, symbol):
+        if symbol not in self.prices:
+            return None
+        return {"price": self.prices[symbol], "timestamp": datetime.now() - timedelta(seconds=self.age)}
+
+    def subscribe_ltp(self, instruments):
+        self.subscribed.extend(i["symbol"] for i in instruments)
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(greeks_data_manager, "OptionsHelper", FakeOptionsHelper)
+    manager = GreeksDataManager(health_monitor=GreeksHealthMonitor())
+    manager.refresh_workers = 4
+    manager.api_rate_limit = 100
+    yield manager
+    manager.stop_background_refresh()
+
+
+class TestGreeksRefreshCycle:
+    """Test concurrent background refresh"""
+
+    def test_cycle_runs_concurrently(self, manager):
+        """Test a cycle over N symbols takes well under N sequential calls"""
+        manager.options_helper = FakeOptionsHelper(manager, latency=0.05)
+
+        snapshots = manager.refresh_cycle(SYMBOLS)
+
+        assert set(snapshots) == set(SYMBOLS)
+        assert manager.get_stats()["last_cycle_ms"] < 0.05 * len(SYMBOLS) * 1000 * 0.75
+
+    def test_snapshots_published_together(self, manager):
+        """Test no snapshot is visible until the whole cycle has been fetched"""
+        helper = manager.options_helper = FakeOptionsHelper(manager, latency=0.01)
+
+        manager.refresh_cycle(SYMBOLS + ["NIFTY25JAN23500FAIL"])
+
+        assert not helper.published_mid_cycle
+        assert set(manager.current_greeks) == set(SYMBOLS)
+
+        manager.min_call_interval = 0
+        manager.refresh_cycle(SYMBOLS)
+        current, prev = manager.get_rolling_greeks(SYMBOLS[0])
+        assert prev is not None and current.timestamp > prev.timestamp
+
+    def test_shared_rate_budget(self, manager):
+        """Test workers never exceed the rate limit inside one window"""
+        helper = manager.options_helper = FakeOptionsHelper(latency=0.0)
+        manager.api_rate_limit = 3
+        manager.API_RATE_WINDOW = 0.2
+
+        manager.refresh_cycle(SYMBOLS)
+
+        times = sorted(helper.call_times)
+        assert len(times) == len(SYMBOLS)
+        for i in range(len(times) - 3):
+            assert times[i + 3] - times[i] >= 0.2 * 0.9
+        assert manager.get_stats()["api_calls_total"] == len(SYMBOLS)
+
+    def test_recently_fetched_symbols_skipped(self, manager):
+        """Test symbols inside min_call_interval are not refetched"""
+        helper = manager.options_helper = FakeOptionsHelper(latency=0.0)
+        manager.min_call_interval = 60
+
+        manager.refresh_cycle(SYMBOLS)
+        manager.refresh_cycle(SYMBOLS)
+
+        stats = manager.get_stats()
+        assert len(helper.call_times) == len(SYMBOLS)
+        assert stats["refresh_cycles"] == 2
+        assert stats["max_cycle_ms"] >= stats["avg_cycle_ms"] > 0
+
+
+class TestHybridGreeks:
+    """Test local Greeks from streamed prices with broker recalibration"""
+
+    @staticmethod
+    def _feed(manager, age=0.0):
+        _, strike, option_type, expiry = parse_option_symbol(OPTION)
+        tte = (expiry - datetime.now()).total_seconds() / (365.0 * 24 * 3600)
+        ltp = float(GreeksCalculator.calculate_batch(23000.0, strike, tte, 0.15, option_type)["price"])
+        feed = FakeFeed({OPTION: ltp, "NIFTY": 23000.0}, age=age)
+        manager.attach_price_feed(feed)
+        manager.greeks_source = "hybrid"
+        manager.recalibrate_interval = 60
+        return feed
+
+    def test_local_between_broker_checks(self, manager):
+        """Test the broker is hit once to calibrate, then Greeks come from ticks"""
+        self._feed(manager)
+        local = manager._compute_local_greeks(OPTION, underlying_symbol="NIFTY")
+        helper = manager.options_helper
+        helper.data = {"delta": local.delta, "iv": 15.5, "ltp": local.ltp}
+
+        first = manager.get_greeks(OPTION, underlying_symbol="NIFTY", force_refresh=True)
+        second = manager.get_greeks(OPTION, underlying_symbol="NIFTY", force_refresh=True)
+
+        assert len(helper.call_times) == 1
+        assert first.iv == 15.5
+        assert second.iv == pytest.approx(15.5, abs=0.01)  # re-anchored to the broker IV
+        assert manager.get_stats()["broker_recalibrations"] == 1
+        assert not manager.health_monitor.is_drifting(OPTION)
+
+    def test_drift_raises_health_flag(self, manager):
+        """Test broker / local disagreement flags the symbol and reverts it to the broker"""
+        self._feed(manager)
+        manager.options_helper.data = {"delta": 0.9, "iv": 15.0, "ltp": 50.0}
+        manager.min_call_interval = 0
+
+        manager.get_greeks(OPTION, underlying_symbol="NIFTY")
+        chain = {23100.0: ChainGreeks(23100.0, OptionType.CALL, 0.4, 0.001, -5.0, 8.0, implied_volatility=0.15)}
+        report = manager.health_monitor.check_health(chain, "NIFTY")
+
+        assert manager.get_stats()["drifting_symbols"] == [OPTION]
+        assert manager.health_monitor.get_health_summary()["drift_alerts"] == 1
+        assert report.model_drift_count == 1
+        manager.get_greeks(OPTION, underlying_symbol="NIFTY", force_refresh=True)
+        assert len(manager.options_helper.call_times) == 2
+
+    def test_stale_ticks_fall_back_to_broker(self, manager):
+        """Test old ticks are not used for local Greeks"""
+        self._feed(manager, age=30.0)
+
+        assert manager._compute_local_greeks(OPTION, underlying_symbol="NIFTY") is None
+        manager.last_api_call[OPTION] = time.time()
+        manager.get_greeks(OPTION, underlying_symbol="NIFTY", force_refresh=True)
+        assert len(manager.options_helper.call_times) == 1
+
+    def test_unstreamed_symbol_subscribed(self, manager):
+        """Test a symbol without ticks is subscribed for later local use"""
+        feed = self._feed(manager)
+        other = f"NIFTY23200PE{EXPIRY}"
+
+        assert manager._compute_local_greeks(other, underlying_symbol="NIFTY") is None
+        assert feed.subscribed == [other]
+
+    def test_drift_reaches_engine_health(self, manager):
+        """Test drift flagged by the manager degrades the engine sharing its monitor, for that underlying only"""
+        self._feed(manager)
+        manager.options_helper.data = {"delta": 0.9, "iv": 15.0, "ltp": 50.0}
+        engine = GreeksEngine(health_monitor=manager.health_monitor)
+        engine.set_universe("NIFTY", 23000.0, days_to_expiry=5.0)
+
+        manager.get_greeks(OPTION, underlying_symbol="NIFTY")
+        engine.update_from_option_chain(
+            {23000.0 + 50 * i: {"type": "CE", "ltp": 200.0 - 20 * i, "oi": 1000} for i in range(9)}
+        )
+
+        assert manager.health_monitor.health_history[-1].model_drift_count == 1
+        assert manager.health_monitor.check_health({}, "BANKNIFTY").model_drift_count == 0
+        assert GreeksEngine().health_monitor is get_greeks_health_monitor() is GreeksDataManager().health_monitor
+
+    def test_spot_from_symbol_underlying(self, manager):
+        """Test local Greeks price off the option's own underlying, not the primary one"""
+        symbol = f"BANKNIFTY51000PE{EXPIRY}"
+        _, strike, option_type, expiry = parse_option_symbol(symbol)
+        tte = (expiry - datetime.now()).total_seconds() / (365.0 * 24 * 3600)
+        ltp = float(GreeksCalculator.calculate_batch(51200.0, strike, tte, 0.14, option_type)["price"])
+        manager.attach_price_feed(FakeFeed({symbol: ltp, "BANKNIFTY": 51200.0, "NIFTY": 23000.0}))
+
+        local = manager._compute_local_greeks(symbol)
+
+        assert local is not None
+        assert local.iv == pytest.approx(14.0, abs=0.05)
@@ -0,0 +1,78 @@
+"""
+Tests for Greeks Engine
+Covers incremental chain updates: only strikes whose inputs moved are recomputed,
+and carried-over strikes report no Greek velocity
+"""
+
+import pytest
+
+from src.engines.greeks.greeks_engine import GreeksEngine
+from src.engines.greeks.greeks_oi_sync import ACCELERATION, THETA_TRAP
+from src.utils.option_chain_data_models import OptionType, StrikeData
+
+STRIKES = [22800.0 + 50 * i for i in range(9)]
+
+
+def _chain(ltps):
+    return {
+        strike: {"type": "CE", "ltp": ltp, "bid": ltp - 0.5, "ask": ltp + 0.5, "oi": 1000 + i, "volume": 50}
+        for i, (strike, ltp) in enumerate(zip(STRIKES, ltps))
+    }
+
+
+class TestIncrementalUpdate:
+    """Test GreeksEngine.update_from_option_chain"""
+
+    def test_recomputes_only_moved_strikes(self):
+        """Test a second chain with two moved LTPs recomputes two strikes and skips the rest"""
+        engine = GreeksEngine()
+        engine.set_universe("NIFTY", 23000.0, days_to_expiry=5.0)
+        ltps = [330.0, 290.0, 250.0, 215.0, 180.0, 150.0, 125.0, 100.0, 80.0]
+
+        engine.update_from_option_chain(_chain(ltps))
+        assert engine.last_strikes_recomputed == len(STRIKES) and engine.last_strikes_skipped == 0
+        first = dict(engine.current_greeks)
+
+        ltps[3] += 4.0
+        ltps[6] -= 3.0
+        engine.update_from_option_chain(_chain(ltps))
+
+        assert engine.last_strikes_recomputed == 2 and engine.last_strikes_skipped == len(STRIKES) - 2
+        assert engine.strikes_recomputed == len(STRIKES) + 2
+        assert engine.current_greeks[STRIKES[0]] is first[STRIKES[0]]
+        assert engine.current_greeks[STRIKES[3]] is not first[STRIKES[3]]
+        assert engine.current_greeks[STRIKES[3]].last_price == pytest.approx(219.0)
+        assert set(engine.current_greeks) == set(STRIKES)
+
+        oi = engine.current_oi_data[STRIKES[4]]
+        assert isinstance(oi, StrikeData) and oi.option_type == OptionType.CE
+        assert oi.oi == 1004 and oi.ltp == pytest.approx(180.0)
+
+    def test_unchanged_cycle_clears_danger_flags(self):
+        """Test a cycle with no moved inputs raises no theta trap / acceleration flags"""
+        engine = GreeksEngine()
+        engine.set_universe("NIFTY", 23000.0, days_to_expiry=5.0)
+        ltps = [330.0, 290.0, 250.0, 215.0, 180.0, 150.0, 125.0, 100.0, 80.0]
+        engine.update_from_option_chain(_chain(ltps))
+
+        # Expiry closes in and OI builds: every strike recomputes with a theta spike
+        engine.set_universe("NIFTY", 23000.0, days_to_expiry=1.0)
+        chain = _chain(ltps)
+        for data in chain.values():
+            data["oi"] += 500
+
+        def sync():
+            return engine.oi_sync_validator.validate_chain_sync(
+                engine.current_greeks, engine.previous_greeks, engine.current_oi_data, engine.previous_oi_data
+            )
+
+        engine.update_from_option_chain(chain)
+        assert sync()["theta_danger_count"] == len(STRIKES)
+
+        engine.update_from_option_chain(chain)
+        result = sync()
+
+        assert engine.last_strikes_recomputed == 0
+        assert result["theta_danger_count"] == 0
+        assert not (result["details"]["flags"] & (ACCELERATION | THETA_TRAP)).any()
+        assert all(g.theta_spike == 0 and g.gamma_expansion == 0 for g in engine.current_greeks.values())
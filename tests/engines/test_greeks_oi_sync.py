@@ -0,0 +1,122 @@
+"""
+Tests for Greeks + OI Sync Validator
+Covers the vectorized chain check against the per-strike rules,
+price / IV divergence flags and the chain recommendation
+"""
+
+import numpy as np
+import pytest
+
+from src.engines.greeks.greeks_models import GreeksSnapshot, OptionType
+from src.engines.greeks.greeks_oi_sync import (
+    AVOID,
+    FAKE_MOVE,
+    IV_DIVERGENCE,
+    NO_HISTORY,
+    PRICE_OI_DIVERGENCE,
+    RECOMMENDATIONS,
+    SMART_MONEY,
+    THETA_TRAP,
+    GreeksOiSyncValidator,
+)
+from src.utils.option_chain_data_models import StrikeData
+
+
+def _random_chain(rng, strikes):
+    """Strike-keyed current / previous Greeks and OI with every direction mix"""
+    current_greeks, previous_greeks, current_oi, previous_oi = {}, {}, {}, {}
+    for strike in strikes:
+        delta = rng.uniform(0.1, 0.9)
+        gamma = rng.uniform(0.003, 0.01)
+        theta = rng.uniform(-3.0, -0.5)
+        oi = int(rng.integers(1000, 100000))
+        previous_greeks[strike] = GreeksSnapshot(strike, OptionType.CALL, delta, gamma, theta, 5.0)
+        previous_oi[strike] = StrikeData(strike, OptionType.CALL, ltp=100.0, oi=oi)
+        current_greeks[strike] = GreeksSnapshot(
+            strike,
+            OptionType.CALL,
+            delta * rng.choice([0.9, 1.0, 1.1]),
+            gamma + rng.choice([-0.002, 0.0, 0.002]),
+            theta + rng.choice([-0.2, 0.0]),
+            5.0,
+            gamma_previous=gamma,
+            theta_previous=theta,
+        )
+        current_oi[strike] = StrikeData(strike, OptionType.CALL, ltp=100.0, oi=int(oi * rng.choice([0.9, 1.0, 1.1])))
+    return current_greeks, previous_greeks, current_oi, previous_oi
+
+
+class TestChainSync:
+    """Test vectorized chain validation"""
+
+    def test_matches_per_strike_rules(self):
+        """Test every row reproduces validate_strike_sync and the old aggregate"""
+        rng = np.random.default_rng(3)
+        strikes = [22250.0 + 50 * i for i in range(31)]
+        chain = _random_chain(rng, strikes)
+        current_greeks, previous_greeks, current_oi, previous_oi = chain
+        del previous_oi[strikes[0]]  # no history for the first strike
+
+        validator = GreeksOiSyncValidator()
+        summary = validator.validate_chain_sync(current_greeks, previous_greeks, current_oi, previous_oi)
+        details = summary["details"]
+
+        reference = GreeksOiSyncValidator()
+        expected = [
+            reference.validate_strike_sync(
+                current_greeks[s], previous_greeks.get(s), current_oi[s], previous_oi.get(s)
+            )
+            for s in strikes
+        ]
+        for row, result in zip(details, expected):
+            assert RECOMMENDATIONS[row["recommendation"]] == result.recommendation
+            assert row["quality"] == pytest.approx(result.quality_score)
+            assert bool(row["flags"] & FAKE_MOVE) == result.fake_move_detected
+            assert bool(row["flags"] & SMART_MONEY) == result.smart_money_signal
+            assert bool(row["flags"] & THETA_TRAP) == result.theta_exit_signal
+        assert details[0]["flags"] & NO_HISTORY
+
+        assert summary["overall_alignment"] == pytest.approx(np.mean([r.quality_score for r in expected]))
+        assert summary["fake_move_count"] == sum(r.fake_move_detected for r in expected)
+        assert validator.get_metrics() == reference.get_metrics()
+
+    def test_divergence_flags(self):
+        """Test LTP ↑ with OI ↓ and IV moving against LTP are flagged per side"""
+        current = {
+            "strike": [23000.0, 23000.0, 23050.0],
+            "is_call": [True, False, True],
+            "delta": [0.5, -0.5, 0.4],
+            "gamma": [0.002, 0.002, 0.002],
+            "iv": [14.0, 14.0, 15.0],
+            "oi": [900.0, 1000.0, np.nan],
+            "ltp": [110.0, 95.0, 80.0],
+        }
+        previous = {
+            "delta": [0.5, -0.5, 0.4],
+            "gamma": [0.002, 0.002, 0.002],
+            "iv": [14.0, 13.0, 15.0],
+            "oi": [1000.0, 1000.0, 1000.0],
+            "ltp": [100.0, 100.0, 80.0],
+        }
+        summary = GreeksOiSyncValidator().validate_chain_arrays(current, previous)
+        details = summary["details"]
+
+        assert len(details) == 2  # no current OI: skipped
+        assert details[0]["flags"] & PRICE_OI_DIVERGENCE and not details[0]["flags"] & IV_DIVERGENCE
+        assert not details[1]["is_call"] and details[1]["flags"] & IV_DIVERGENCE
+        assert summary["price_oi_divergence_count"] == 1
+
+    def test_chain_recommendation(self):
+        """Test a chain of fake moves across two expiries is avoided"""
+        n = 124  # ATM ± 15 strikes, CE and PE, two expiries
+        current = {"delta": np.full(n, 0.55), "gamma": np.full(n, 0.002), "iv": np.full(n, 14.0)}
+        current.update(oi=np.full(n, 800.0), ltp=np.full(n, 120.0))
+        previous = {"delta": np.full(n, 0.5), "gamma": np.full(n, 0.002), "iv": np.full(n, 14.0)}
+        previous.update(oi=np.full(n, 1000.0), ltp=np.full(n, 100.0))
+
+        summary = GreeksOiSyncValidator().validate_chain_arrays(current, previous)
+
+        assert summary["recommendation"] == "AVOID"
+        assert summary["fake_move_count"] == n
+        assert (summary["details"]["recommendation"] == AVOID).all()
+        assert summary["overall_alignment"] == pytest.approx(0.1)
@@ -0,0 +1,84 @@
+"""
+Tests for Scenario Grid Engine
+Covers the vectorized spot × IV × time P&L grid, numerical breakevens,
+expiry payoff bounds and worst-case shock losses
+"""
+
+import numpy as np
+import pytest
+
+from src.engines.greeks.greeks_calculator import GreeksCalculator
+from src.engines.portfolio.scenario_engine import ScenarioEngine
+from src.strategies.multi_leg.iron_condor import IronCondorStrategy
+from src.strategies.multi_leg.spreads import RatioSpread
+
+SPOT = 23000.0
+TTE = 5 / 365.0
+
+
+@pytest.fixture
+def condor():
+    strategy = IronCondorStrategy(quantity=75, max_loss=2000, max_profit=5000)
+    strategy.legs = strategy.setup(SPOT)
+    for leg in strategy.legs:
+        leg.iv = 14.0
+        leg.current_price = leg.entry_price
+    return strategy
+
+
+class TestScenarioGrid:
+    """Test P&L surface evaluation"""
+
+    def test_grid_matches_leg_pricing(self, condor):
+        """Test a grid node equals the legs priced one by one, and the grid is fast"""
+        engine = ScenarioEngine(spot_steps=100, iv_steps=20, time_steps=5)
+        result = engine.evaluate(condor.legs, SPOT, TTE)
+
+        assert result.pnl.shape == (100, 20, 5)
+        assert result.elapsed_ms < 250
+
+        s, v, t = 37, 4, 2
+        spot, iv_shift, days = result.spots[s], result.iv_shifts[v], result.days_forward[t]
+        expected = 0.0
+        for leg in condor.legs:
+            price = GreeksCalculator.calculate_batch(
+                spot, leg.strike, TTE - days / 365.0, 0.14 + iv_shift / 100.0, leg.option_type
+            )["price"]
+            sign = -1 if leg.direction.value == "SELL" else 1
+            expected += sign * leg.quantity * (float(price) - leg.entry_price)
+        assert result.pnl[s, v, t] == pytest.approx(expected, rel=1e-9)
+
+    def test_expiry_slice_breakevens(self, condor):
+        """Test breakevens on the expiry slice match the condor's closed form"""
+        result = ScenarioEngine().evaluate(condor.legs, SPOT, TTE, spots=np.arange(22000.0, 24001.0, 10.0))
+
+        np.testing.assert_allclose(result.breakevens(), condor.get_breakeven_points(), atol=1e-6)
+        assert result.worst_case()["pnl"] == pytest.approx(-(100 * 75 - condor.net_credit))
+
+
+class TestScenarioRisk:
+    """Test payoff bounds and shock losses"""
+
+    def test_expiry_profile_bounds(self, condor):
+        """Test bounded condor wings and an unbounded short-call ratio wing"""
+        profile = ScenarioEngine().expiry_profile(condor.legs)
+        assert profile["max_profit"] == pytest.approx(condor.net_credit)
+        assert profile["max_loss"] == pytest.approx(100 * 75 - condor.net_credit)
+
+        ratio = RatioSpread("NIFTY", "30DEC25")
+        ratio.legs = ratio.setup(SPOT, long_premium=130.0, short_premium=60.0)
+        assert ratio.get_max_risk() == float("inf")
+        assert ratio.get_max_reward() == pytest.approx(90.0)
+        assert ratio.get_breakeven_points() == pytest.approx([23010.0, 23190.0])
+
+    def test_shock_losses_drive_adjustment(self, condor):
+        """Test the worst configured shock flags the condor and picks the side to roll"""
+        shock = ScenarioEngine(shocks=[(-4.0, 8.0), (1.0, -2.0)]).shock_losses(condor.legs, SPOT, TTE)
+
+        assert shock["worst_shock"] == (-4.0, 8.0)
+        assert shock["worst_loss"] == pytest.approx(min(p for _, _, p in shock["by_shock"]))
+        assert shock["worst_loss"] < -condor.max_loss
+
+        needed, reason = condor.check_adjustment_needed(spot=SPOT, time_to_expiry=TTE)
+        assert needed and "Shock" in reason
+        assert condor.adjust("auto", spot=SPOT, time_to_expiry=TTE)
@@ -0,0 +1,103 @@
+"""
+Tests for Volatility Smile
+Covers the log-moneyness fit, incremental refits, wings, smile-priced Greeks
+and strike selection picking up the registered smile
+"""
+
+import numpy as np
+import pytest
+
+from src.engines.greeks.greeks_calculator import GreeksCalculator
+from src.engines.greeks import volatility_smile
+from src.engines.greeks.volatility_smile import SmileEngine, VolatilitySmile
+from src.engines.strike_selection.auto_selector import AutoStrikeSelector
+
+SPOT = 23000.0
+TTE = 7 / 365.0
+STRIKES = np.arange(22500.0, 23501.0, 50.0)
+
+
+def _true_iv(strikes):
+    k = np.log(np.asarray(strikes) / SPOT)
+    return 0.13 - 0.05 * k + 0.9 * k**2
+
+
+def _fitted_smile(smile=None):
+    smile = smile or VolatilitySmile("NIFTY", "TEST")
+    types = np.where(STRIKES >= SPOT, "CE", "PE")
+    prices = GreeksCalculator.calculate_batch(SPOT, STRIKES, TTE, _true_iv(STRIKES), types)["price"]
+    assert smile.update_from_prices(prices, SPOT, STRIKES, TTE, types) == len(STRIKES)
+    return smile
+
+
+class TestVolatilitySmile:
+    """Test per-expiry smile fit"""
+
+    def test_interpolates_unseen_strikes(self):
+        """Test IV between observed strikes matches the true smile"""
+        smile = _fitted_smile()
+        unseen = np.array([22725.0, 23025.0, 23275.0])
+
+        np.testing.assert_allclose(smile.iv(unseen), _true_iv(unseen), atol=1e-4)
+        assert smile.get_stats()["rmse"] < 1e-4
+
+    def test_fit_cached_until_new_quote(self):
+        """Test queries reuse the fit and a new quote refits incrementally"""
+        smile = _fitted_smile()
+        smile.iv(23000.0)
+        smile.iv(23100.0)
+        assert smile.refits == 1
+
+        before = float(smile.iv(23000.0))
+        smile.update([23000.0], [0.20], [50.0])
+        assert float(smile.iv(23000.0)) > before
+        assert smile.refits == 2
+        assert smile.get_stats()["points"] == len(STRIKES)
+        assert smile.fit_age is not None and smile.fit_age < 5
+
+    def test_sparse_quotes_and_wings(self):
+        """Test one quote gives a flat smile and the wings continue linearly"""
+        smile = VolatilitySmile("NIFTY", "TEST")
+        assert smile.update([23000.0], [0.15]) == 0  # no spot yet
+        smile.update([23000.0], [0.15], spot=SPOT, time_to_expiry=TTE)
+
+        assert smile.iv([21000.0, 25000.0]).tolist() == pytest.approx([0.15, 0.15])
+
+        wing_strikes = SPOT * np.exp([0.1, 0.2, 0.3])  # equally spaced in log-moneyness
+        wing = _fitted_smile().iv(wing_strikes)
+        assert wing[2] - wing[1] == pytest.approx(wing[1] - wing[0], abs=1e-9)
+
+    def test_greeks_without_quotes_for_strike(self):
+        """Test smile Greeks price an unobserved strike at the smile IV"""
+        smile = _fitted_smile()
+        greeks = smile.greeks([23225.0], "CE")
+        direct = GreeksCalculator.calculate_batch(SPOT, 23225.0, TTE, _true_iv(23225.0), "CE")
+
+        assert greeks["delta"][0] == pytest.approx(float(direct["delta"]), abs=1e-3)
+        assert VolatilitySmile("NIFTY", "EMPTY").greeks([23000.0], "CE") is None
+
+    def test_engine_finds_latest_smile(self):
+        """Test the registry returns the fitted smile for an underlying"""
+        engine = SmileEngine()
+        assert engine.find("NIFTY") is None
+        smile = engine.get_smile("NIFTY", "30DEC25")
+        smile.update([23000.0], [0.15], spot=SPOT, time_to_expiry=TTE)
+
+        assert engine.find("NIFTY") is smile
+        assert engine.find("NIFTY", "30DEC25") is smile
+        assert "NIFTY:30DEC25" in engine.get_stats()
+
+    def test_selector_uses_registered_smile(self, monkeypatch):
+        """Test select_optimal_strike prices off the underlying's smile without being handed one"""
+        engine = SmileEngine()
+        monkeypatch.setattr(volatility_smile, "_engine", engine)
+        smile = _fitted_smile(engine.get_smile("NIFTY", "30DEC25"))
+        selector = AutoStrikeSelector(atm_range=3)
+
+        best = selector.select_optimal_strike(SPOT, "BULLISH", days_to_expiry=7.0, underlying="NIFTY")
+        direct = GreeksCalculator.calculate_batch(SPOT, best.strike, TTE, float(smile.iv(best.strike)), "CE", 0.065)
+
+        assert best.iv == pytest.approx(float(smile.iv(best.strike)))
+        assert best.ltp == pytest.approx(float(direct["price"]), rel=1e-3)
+        fallback = selector.select_optimal_strike(SPOT, "BULLISH", days_to_expiry=7.0, underlying="BANKNIFTY")
+        assert fallback.iv == selector._estimate_iv(SPOT, fallback.strike, "CE")
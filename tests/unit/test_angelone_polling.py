@@ -0,0 +1,92 @@
+"""
+Unit tests for AngelOne batched REST polling
+Tests: exchange grouping, batch size limit, tick fan-out, adaptive interval,
+fetch_quotes sharing the request budget
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.integrations.angelone.angelone_client import AngelOnePhase2
+
+
+def _client(batch_size=2, rate_limit=500):
+    client = AngelOnePhase2()
+    client.paper_trading = False
+    client.quote_batch_size = batch_size
+    client.quote_rate_limit = rate_limit
+    client.poll_interval = 2.0
+    client._smartapi_client = MagicMock()
+    client._smartapi_client.getQuote.side_effect = lambda mode, exchangeTokens: {
+        "status": True,
+        "data": {
+            "fetched": [
+                {"symbolToken": token, "ltp": 100.0 + int(token), "tradeVolume": 10, "opnInterest": 5,
+                 "depth": {"buy": [{"price": 99.0}], "sell": [{"price": 101.0}]}}
+                for tokens in exchangeTokens.values()
+                for token in tokens
+            ],
+            "unfetched": [],
+        },
+    }
+    return client
+
+
+@pytest.mark.unit
+class TestBatchedPolling:
+    """Test batched getQuote polling"""
+
+    def test_groups_by_exchange_and_fans_out(self):
+        """Test one request per exchange chunk and one tick per symbol"""
+        client = _client(batch_size=2)
+        ticks = []
+        client._on_tick = ticks.append
+        client._subscriptions = [
+            {"symbol": "OPT1", "exchange": "NFO", "token": "1"},
+            {"symbol": "OPT2", "exchange": "NFO", "token": "2"},
+            {"symbol": "OPT3", "exchange": "NFO", "token": "3"},
+            {"symbol": "IDX", "exchange": "NSE_INDEX", "token": "4"},
+        ]
+
+        batches = client._poll_batched()
+
+        calls = [c.kwargs["exchangeTokens"] for c in client._smartapi_client.getQuote.call_args_list]
+        assert batches == 3
+        assert calls == [{"NFO": ["1", "2"]}, {"NFO": ["3"]}, {"NSE": ["4"]}]
+        assert [t["symbol"] for t in ticks] == ["OPT1", "OPT2", "OPT3", "IDX"]
+        assert ticks[0]["ltp"] == 101.0
+        assert (ticks[0]["bid"], ticks[0]["ask"], ticks[0]["oi"]) == (99.0, 101.0, 5)
+
+    def test_budget_limits_requests(self):
+        """Test requests stop once the rate window budget is used"""
+        client = _client(batch_size=1, rate_limit=2)
+        client._subscriptions = [{"symbol": f"S{i}", "exchange": "NFO", "token": str(i)} for i in range(4)]
+
+        client._poll_batched()
+
+        assert client._smartapi_client.getQuote.call_count == 2
+
+    def test_interval_adapts_to_remaining_budget(self):
+        """Test interval stays at the floor with budget and stretches when low"""
+        client = _client(rate_limit=100)
+        assert client._next_poll_interval(1) == 2.0
+
+        now = time.time()
+        client._quote_requests.extend([now - 30] * 95)
+        assert client._next_poll_interval(1) == pytest.approx(12.0)
+        # Cycle no longer fits: wait for the oldest requests to age out
+        assert client._next_poll_interval(10) == pytest.approx(30.0, abs=0.5)
+
+    def test_fetch_quotes_shares_budget(self):
+        """Test fetch_quotes chunks tokens and stops with the poll loop's budget"""
+        client = _client(batch_size=2, rate_limit=3)
+        client._subscriptions = [{"symbol": "S1", "exchange": "NFO", "token": "1"}]
+        client._poll_batched()
+
+        quotes = client.fetch_quotes("NFO", [2, 3, 4, 5, 6, 7])
+
+        assert client._smartapi_client.getQuote.call_count == 3
+        assert sorted(quotes) == ["2", "3", "4", "5"]
+        assert quotes["2"] == {"ltp": 102.0, "bid": 99.0, "ask": 101.0, "volume": 10, "oi": 5}
@@ -0,0 +1,93 @@
+"""
+Unit tests for DataFeed tick notification
+Tests: wait_for_ticks timeout, wake-up on a watched symbol, no wake-up on other
+symbols, time-based exits checked without fresh ticks
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core import trade_manager
+from src.core.trade_manager import TradeManager
+from src.integrations.data_feeds.data_feed import DataFeed
+
+
+@pytest.fixture
+def feed():
+    feed = DataFeed()
+    feed.tick_recorder = None
+    return feed
+
+
+def _tick_later(feed, symbol, delay, count=1):
+    def run():
+        for _ in range(count):
+            time.sleep(delay)
+            feed._process_tick({"symbol": symbol, "ltp": 22000.0})
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+@pytest.mark.unit
+class TestWaitForTicks:
+    """Test DataFeed.wait_for_ticks"""
+
+    def test_times_out_without_ticks(self, feed):
+        """Test an idle feed returns an empty set after the timeout"""
+        start = time.perf_counter()
+        changed = feed.wait_for_ticks(["NIFTY"], {}, timeout=0.1)
+
+        assert changed == set()
+        assert time.perf_counter() - start >= 0.09
+
+    def test_wakes_on_watched_symbol(self, feed):
+        """Test a tick on a watched symbol wakes the waiter well before the timeout"""
+        seen = {}
+        ticker = _tick_later(feed, "NIFTY", 0.05)
+
+        start = time.perf_counter()
+        changed = feed.wait_for_ticks(["NIFTY", "NIFTY30DEC2524000CE"], seen, timeout=5.0)
+        ticker.join()
+
+        assert changed == {"NIFTY"}
+        assert time.perf_counter() - start < 2.0
+        assert seen == {"NIFTY": 1}
+        assert feed.wait_for_ticks(["NIFTY"], seen, timeout=0) == set()
+
+    def test_ignores_other_symbols(self, feed):
+        """Test ticks on unwatched symbols do not wake the waiter"""
+        ticker = _tick_later(feed, "BANKNIFTY", 0.02, count=5)
+
+        start = time.perf_counter()
+        changed = feed.wait_for_ticks(["NIFTY"], {}, timeout=0.3)
+        ticker.join()
+
+        assert changed == set()
+        assert time.perf_counter() - start >= 0.29
+        assert feed.tick_versions["BANKNIFTY"] == 5
+
+
+@pytest.mark.unit
+class TestTimeExitWithoutTicks:
+    """Test TradeManager.check_time_exit (run by the strategy loop on wait timeout)"""
+
+    def test_max_time_exit_at_last_price(self, monkeypatch):
+        """Test a trade past the expiry max time exits with no new market data"""
+        monkeypatch.setattr(trade_manager, "OrderManager", lambda **kwargs: None)  # multi-leg orders not used here
+        manager = TradeManager()
+        trade = manager.enter_trade(
+            "NIFTY", "30DEC25", "CE", 24000, 100.0, 75, 0.5, 0.002, -5.0, 0.15, 93.0, 107.0
+        )
+        rules = {"max_time_in_trade": 300}
+
+        assert manager.check_time_exit(trade, rules) is None
+        assert manager.check_time_exit(trade, None) is None
+
+        trade.entry_time = datetime.now() - timedelta(seconds=301)
+        assert manager.check_time_exit(trade, rules) == "expiry_time_forced_exit_loss"
+        assert trade.time_in_trade_sec >= 301
@@ -0,0 +1,43 @@
+"""
+Unit tests for DifferentialProcessor
+Tests: exact change detection, per-field epsilon, drift accumulation
+"""
+
+import pytest
+
+from src.core.latency_optimizer import DifferentialProcessor
+
+
+@pytest.mark.unit
+class TestDifferentialProcessor:
+    """Test changed-field extraction between snapshots"""
+
+    def test_exact_changes(self):
+        """Test new strikes are reported in full and only moved fields after"""
+        processor = DifferentialProcessor()
+        first = processor.get_changes({23000: {"ltp": 100.0, "oi": 10}})
+        second = processor.get_changes({23000: {"ltp": 100.0, "oi": 12}, 23050: {"ltp": 80.0}})
+
+        assert first == {23000: {"ltp": 100.0, "oi": 10}}
+        assert second == {23000: {"oi": 12}, 23050: {"ltp": 80.0}}
+
+    def test_epsilon_ignores_small_moves(self):
+        """Test fields with a tolerance only change past epsilon"""
+        processor = DifferentialProcessor(tolerances={"ltp": 0.05})
+        processor.get_changes({23000: {"ltp": 100.0, "type": "CE"}})
+
+        assert processor.get_changes({23000: {"ltp": 100.04, "type": "CE"}}) == {}
+        flipped = processor.get_changes({23000: {"ltp": 100.04, "type": "PE"}})
+        assert flipped == {23000: {"type": "PE"}}
+
+    def test_sub_epsilon_drift_accumulates(self):
+        """Test repeated small moves are measured from the last reported value"""
+        processor = DifferentialProcessor(tolerances={"ltp": 0.05})
+        processor.get_changes({23000: {"ltp": 100.0}})
+
+        assert processor.get_changes({23000: {"ltp": 100.03}}) == {}
+        assert processor.get_changes({23000: {"ltp": 100.06}}) == {23000: {"ltp": 100.06}}
+        assert processor.get_changes({23000: {"ltp": 100.09}}) == {}
+
+        processor.reset()
+        assert processor.get_changes({23000: {"ltp": 100.09}}) == {23000: {"ltp": 100.09}}
@@ -0,0 +1,218 @@
+"""
+Unit tests for Pooled HTTP Transport
+Tests: connection reuse, default timeout, per-endpoint latency histograms,
+SmartConnect requests routed through the pooled session, SDK error handling
+(expired session hook, error_type exceptions, bad payloads)
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from src.integrations.angelone.http_transport import HttpTransport, route_smartconnect
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        status = 404 if self.path.startswith("/missing") else 200
+        body = b'{"status": true}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        sent = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        status = 200
+        if self.path.endswith("/expired"):
+            status = 403
+            body = json.dumps({"status": False, "message": "Invalid Token", "errorcode": "AG8001",
+                               "error_type": "TokenException"}).encode()
+        elif self.path.endswith("/unknown"):
+            status = 500
+            body = json.dumps({"status": False, "message": "Something failed", "error_type": "OddException"}).encode()
+        elif self.path.endswith("/garbage"):
+            body = b"<html>gateway error</html>"
+        else:
+            body = json.dumps({"status": True, "data": {"path": self.path, "sent": sent,
+                                                       "auth": self.headers.get("Authorization")}}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _SmartAPIException(Exception):
+    def __init__(self, message, code=500):
+        super().__init__(message)
+        self.code = code
+
+
+class _TokenException(_SmartAPIException):
+    pass
+
+
+class _DataException(_SmartAPIException):
+    pass
+
+
+class _GeneralException(_SmartAPIException):
+    pass
+
+
+# Stand-in for the SDK's smartExceptions module
+FAKE_EXCEPTIONS = SimpleNamespace(
+    TokenException=_TokenException, DataException=_DataException, GeneralException=_GeneralException
+)
+
+
+class FakeSmartConnect:
+    """Request-building surface of SmartConnect; its own _request uses requests.request"""
+
+    def __init__(self, root):
+        self.root = root
+        self._routes = {
+            "api.ltp.data": "/rest/secure/angelbroking/order/v1/getLtpData",
+            "api.expired": "/rest/secure/expired",
+            "api.unknown": "/rest/secure/unknown",
+            "api.garbage": "/rest/secure/garbage",
+        }
+        self.access_token = "JWT"
+        self.timeout = 5
+        self.proxies = {}
+        self.disable_ssl = False
+        self.debug = False
+        self.session_expiry_hook = None
+
+    def requestHeaders(self):
+        return {"Content-type": "application/json", "Accept": "application/json"}
+
+    def _request(self, route, method, parameters=None):
+        return requests.request(method, self.root + self._routes[route], data=json.dumps(parameters))
+
+    def ltpData(self, exchange, tradingsymbol, symboltoken):
+        params = {"exchange": exchange, "tradingsymbol": tradingsymbol, "symboltoken": symboltoken}
+        return self._request("api.ltp.data", "POST", params)
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.unit
+class TestHttpTransport:
+    """Test pooled keep-alive transport"""
+
+    def test_connection_reused(self, server_url):
+        """Test sequential requests share one pooled connection"""
+        transport = HttpTransport(pool_maxsize=2, timeout=5)
+        for _ in range(5):
+            assert transport.get(f"{server_url}/quote", endpoint="quote").json() == {"status": True}
+
+        hosts = transport.get_stats()["hosts"]
+        assert len(hosts) == 1
+        host = next(iter(hosts.values()))
+        assert host["requests"] == 5
+        assert host["connections_opened"] == 1
+        assert host["connections_reused"] == 4
+        transport.close()
+
+    def test_endpoint_histogram(self, server_url):
+        """Test latency and errors are recorded per endpoint"""
+        transport = HttpTransport(timeout=5)
+        transport.get(f"{server_url}/quote", endpoint="quote")
+        transport.get(f"{server_url}/quote", endpoint="quote")
+        transport.get(f"{server_url}/missing/1")
+
+        endpoints = transport.get_stats()["endpoints"]
+        assert endpoints["quote"]["count"] == 2
+        assert endpoints["quote"]["errors"] == 0
+        assert sum(endpoints["quote"]["histogram"].values()) == 2
+        assert endpoints["/missing/1"]["errors"] == 1
+        transport.close()
+
+    def test_default_timeout_applied(self, monkeypatch):
+        """Test the transport timeout is used when the caller passes none"""
+        transport = HttpTransport(timeout=3)
+        seen = {}
+
+        def fake_request(method, url, **kwargs):
+            seen.update(kwargs)
+            raise ConnectionError("offline")
+
+        monkeypatch.setattr(transport.session, "request", fake_request)
+        with pytest.raises(ConnectionError):
+            transport.post("https://api.example.test/login", json={}, endpoint="login")
+
+        assert seen["timeout"] == 3
+        assert transport.get_stats()["endpoints"]["login"]["errors"] == 1
+
+    def test_smartconnect_uses_pooled_session(self, server_url, monkeypatch):
+        """Test SDK calls go through the transport session, not requests.request"""
+        def unpooled(*args, **kwargs):
+            raise AssertionError("requests.request called directly")
+
+        monkeypatch.setattr(requests, "request", unpooled)
+        transport = HttpTransport(timeout=5)
+        client = route_smartconnect(FakeSmartConnect(server_url), transport, FAKE_EXCEPTIONS)
+
+        for _ in range(3):
+            resp = client.ltpData("NFO", "NIFTY30DEC2523000CE", "43650")
+
+        assert resp["data"]["path"] == "/rest/secure/angelbroking/order/v1/getLtpData"
+        assert resp["data"]["sent"]["symboltoken"] == "43650"
+        assert resp["data"]["auth"] == "Bearer JWT"
+        stats = transport.get_stats()
+        assert stats["endpoints"]["api.ltp.data"]["count"] == 3
+        assert next(iter(stats["hosts"].values()))["connections_reused"] == 2
+        transport.close()
+
+    def test_smartconnect_expired_session(self, server_url):
+        """Test a 403 TokenException calls the session expiry hook and raises the SDK exception"""
+        transport = HttpTransport(timeout=5)
+        client = route_smartconnect(FakeSmartConnect(server_url), transport, FAKE_EXCEPTIONS)
+        expired = []
+        client.session_expiry_hook = lambda: expired.append(True)
+
+        with pytest.raises(_TokenException) as exc_info:
+            client._request("api.expired", "POST", {})
+
+        assert expired == [True]
+        assert exc_info.value.code == 403
+        assert str(exc_info.value) == "Invalid Token"
+        assert transport.get_stats()["endpoints"]["api.expired"]["errors"] == 1
+        transport.close()
+
+    def test_smartconnect_error_types(self, server_url):
+        """Test unknown error types raise GeneralException and bad JSON raises DataException"""
+        transport = HttpTransport(timeout=5)
+        client = route_smartconnect(FakeSmartConnect(server_url), transport, FAKE_EXCEPTIONS)
+        expired = []
+        client.session_expiry_hook = lambda: expired.append(True)
+
+        with pytest.raises(_GeneralException) as exc_info:
+            client._request("api.unknown", "POST", {})
+        assert exc_info.value.code == 500
+
+        with pytest.raises(_DataException):
+            client._request("api.garbage", "POST", {})
+
+        assert expired == []
+        transport.close()
@@ -0,0 +1,150 @@
+"""
+Unit tests for the memory-mapped Instrument Index
+Tests: build/load round-trip, structured option lookups, nearest strike, daily rebuild,
+shared index caches failed loads and builds once under concurrent callers
+"""
+
+import csv
+import threading
+import time
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.integrations.angelone import instrument_index
+from src.integrations.angelone.instrument_index import InstrumentIndex, get_instrument_index
+
+FIELDS = ["token", "symbol", "name", "expiry", "strike", "lotsize", "instrumenttype", "exch_seg", "tick_size"]
+
+
+def _write_master(path):
+    rows = []
+    token = 40000
+    for expiry, code in (("30DEC2025", "30DEC25"), ("06JAN2026", "06JAN26")):
+        for strike in (23900, 24000, 24050, 24100):
+            for opt in ("CE", "PE"):
+                token += 1
+                rows.append([token, f"NIFTY{code}{strike}{opt}", "NIFTY", expiry, f"{strike * 100}.000000", 75,
+                             "OPTIDX", "NFO", "5.000000"])
+    rows.append([35001, "NIFTY30DEC25FUT", "NIFTY", "30DEC2025", "-1.000000", 75, "FUTIDX", "NFO", "10.000000"])
+    rows.append([45001, "BANKNIFTY30DEC2551000CE", "BANKNIFTY", "30DEC2025", "5100000.000000", 35, "OPTIDX", "NFO",
+                 "5.000000"])
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def index(tmp_path):
+    master = tmp_path / "instruments.csv"
+    _write_master(master)
+    return InstrumentIndex.load_or_build(master, tmp_path / "index")
+
+
+@pytest.mark.unit
+class TestInstrumentIndex:
+    """Test instrument index lookups"""
+
+    def test_loads_memory_mapped(self, index):
+        """Test the loaded index is backed by mmap arrays"""
+        assert len(index) == 18
+        assert isinstance(index.records, np.memmap)
+
+    def test_option_and_symbol_lookup(self, index):
+        """Test (underlying, expiry, strike, type) and symbol lookups agree"""
+        token = index.option_token("NIFTY", "30DEC25", 24000, "PE")
+        assert token == index.symbol_to_token("NIFTY30DEC2524000PE")
+        assert index.option_token("nifty", date(2025, 12, 30), 24000.0, "pe") == token
+        assert index.option_token("NIFTY", "30DEC25", 24025, "PE") is None
+        assert index.symbol_to_token("UNKNOWN") is None
+
+        info = index.get("BANKNIFTY30DEC2551000CE")
+        assert info["token"] == "45001"
+        assert info["strike"] == 51000.0
+        assert info["option_type"] == "CE"
+        assert info["expiry"] == "30DEC2025"
+
+    def test_strikes_nearest_and_expiries(self, index):
+        """Test strike listing, nearest strike and expiry listing"""
+        assert index.strikes("NIFTY", "06JAN2026").tolist() == [23900.0, 24000.0, 24050.0, 24100.0]
+        assert index.nearest_strike("NIFTY", "30DEC2025", 24030) == 24050.0
+        assert index.nearest_strike("NIFTY", "30DEC2025", 24020) == 24000.0
+        assert index.nearest_strike("NIFTY", "30DEC2025", 30000) == 24100.0
+        assert index.nearest_strike("FINNIFTY", "30DEC2025", 24000) is None
+        assert index.expiries("NIFTY") == [date(2025, 12, 30), date(2026, 1, 6)]
+
+    def test_rebuilds_when_master_changes(self, tmp_path, index):
+        """Test a newer instrument CSV triggers a rebuild"""
+        master = tmp_path / "instruments.csv"
+        with open(master, "a", newline="") as f:
+            csv.writer(f).writerow([49999, "NIFTY30DEC2524150CE", "NIFTY", "30DEC2025", "2415000.000000", 75,
+                                    "OPTIDX", "NFO", "5.000000"])
+
+        rebuilt = InstrumentIndex.load_or_build(master, tmp_path / "index")
+        assert len(rebuilt) == 19
+        assert rebuilt.option_token("NIFTY", "30DEC25", 24150, "CE") == "49999"
+
+    def test_rebuild_leaves_mapped_index_intact(self, tmp_path, index):
+        """Test a rebuild swaps in new files instead of overwriting ones already mapped"""
+        token = index.option_token("NIFTY", "30DEC25", 24000, "PE")
+        master = tmp_path / "instruments.csv"
+        with open(master, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            writer.writerow([49999, "NIFTY30DEC2524150CE", "NIFTY", "30DEC2025", "2415000.000000", 75,
+                             "OPTIDX", "NFO", "5.000000"])
+
+        rebuilt = InstrumentIndex.load_or_build(master, tmp_path / "index")
+
+        assert len(rebuilt) == 1
+        assert len(index) == 18
+        assert index.option_token("NIFTY", "30DEC25", 24000, "PE") == token
+        assert index.symbol_to_token("NIFTY30DEC2524000PE") == token
+        assert not list((tmp_path / "index").glob("*.tmp"))
+
+
+@pytest.mark.unit
+class TestSharedInstrumentIndex:
+    """Test the shared get_instrument_index() global"""
+
+    @pytest.fixture
+    def loads(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(instrument_index, "_index", None)
+        monkeypatch.setattr(instrument_index, "_index_day", None)
+        return calls
+
+    def test_failed_load_cached_for_the_day(self, loads, monkeypatch):
+        """Test a missing master is tried once, not on every lookup"""
+
+        def missing(csv_path, index_dir):
+            loads.append(csv_path)
+            return None
+
+        monkeypatch.setattr(InstrumentIndex, "load_or_build", staticmethod(missing))
+        assert all(get_instrument_index() is None for _ in range(5))
+        assert len(loads) == 1
+
+        get_instrument_index(refresh=True)
+        assert len(loads) == 2
+
+    def test_concurrent_callers_build_once(self, loads, monkeypatch, index):
+        """Test threads racing past the day check share one build"""
+
+        def slow(csv_path, index_dir):
+            loads.append(csv_path)
+            time.sleep(0.05)
+            return index
+
+        monkeypatch.setattr(InstrumentIndex, "load_or_build", staticmethod(slow))
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(get_instrument_index())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(loads) == 1
+        assert results == [index] * 8
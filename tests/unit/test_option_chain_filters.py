@@ -0,0 +1,100 @@
+"""
+Unit tests for the fused option chain filter pass
+Tests: masks against the per-strike validate_strike rules, quality score against
+DataValidator on the old filtered chain, in-place apply, stale mask
+"""
+
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.utils.option_chain_data_models import CE_ROW, PE_ROW, OptionChainSnapshot, StrikePair
+from src.utils.option_chain_filters import DataValidator, NoiseFilter, StaleDataDetector
+
+
+def _chains(seed=5, n=40):
+    """Previous / current chains on shifted grids with spikes, frozen and zero-volume options"""
+    rng = np.random.default_rng(seed)
+    now = time.time()
+    prev_strikes = 22500.0 + 50 * np.arange(n)
+    strikes = prev_strikes + 100  # two strikes new, two gone
+    prev_ltp = rng.uniform(5, 300, (2, n)).round(2)
+    prev_volume = rng.integers(0, 5000, (2, n))
+    prev_oi = rng.integers(0, 50000, (2, n))
+    prev = OptionChainSnapshot.from_arrays(
+        "NIFTY", "30DEC25", prev_strikes, prev_ltp, volume=prev_volume, oi=prev_oi,
+        timestamps=np.full((2, n), now - 120), timestamp=datetime.utcnow(),
+    )
+
+    # Current values for the overlapping strikes, then random disturbances
+    ltp = np.full((2, n), 100.0)
+    ltp[:, :-2] = prev_ltp[:, 2:] * rng.choice([1.0, 1.02, 1.3], (2, n - 2))
+    volume = np.full((2, n), 100)
+    volume[:, :-2] = prev_volume[:, 2:] + rng.choice([0, 10], (2, n - 2))
+    volume[CE_ROW, 5] = 0
+    oi = rng.integers(0, 50000, (2, n))
+    oi_prev = np.where(rng.random((2, n)) < 0.7, (oi * rng.choice([0.5, 0.95, 1.0], (2, n))).round(), np.nan)
+    ltp[rng.random((2, n)) < 0.1] = np.nan
+    timestamps = np.where(rng.random((2, n)) < 0.5, now, now - 90)
+    current = OptionChainSnapshot.from_arrays(
+        "NIFTY", "30DEC25", strikes, ltp, volume=volume, oi=oi, oi_prev=oi_prev,
+        timestamps=timestamps, timestamp=datetime.utcnow(),
+    )
+    return prev, current, now
+
+
+@pytest.mark.unit
+class TestFusedChainFilter:
+    """Test NoiseFilter.filter_chain"""
+
+    def test_matches_per_strike_rules(self):
+        """Test every side matches validate_strike and the score the old filtered chain got"""
+        prev, current, now = _chains()
+        noise_filter = NoiseFilter({"min_volume": 1})
+        result = noise_filter.filter_chain(current, prev, now=now)
+
+        filtered, dropped = {}, []
+        for i, strike in enumerate(current.strike_prices):
+            pair = current.pair_at(i)
+            prev_pair = prev.strikes[strike] if strike in prev.strikes else None
+            checks = {}
+            for row, side, prev_side in ((CE_ROW, pair.ce, "ce"), (PE_ROW, pair.pe, "pe")):
+                if side is None:
+                    assert not result.valid[row, i]
+                    continue
+                valid, reason = noise_filter.validate_strike(side, getattr(prev_pair, prev_side, None))
+                assert result.valid[row, i] == valid
+                checks[row] = (valid, reason)
+            ce_valid, ce_reason = checks.get(CE_ROW, (True, None))
+            pe_valid, pe_reason = checks.get(PE_ROW, (True, None))
+            assert result.keep[i] == (ce_valid or pe_valid)
+            if ce_valid or pe_valid:
+                filtered[strike] = StrikePair(strike, pair.ce if ce_valid else None, pair.pe if pe_valid else None)
+            else:
+                dropped.append(f"{strike}({ce_reason or pe_reason})")
+
+        assert result.dropped == dropped
+        assert all(result.drop_counts.values())
+        reference = OptionChainSnapshot("NIFTY", "30DEC25", strikes=filtered, timestamp=current.timestamp)
+        expected = DataValidator().compute_quality_score(reference)
+        assert result.quality_score == pytest.approx(expected, abs=0.1)  # freshness ticks between calls
+
+    def test_apply_in_place_and_stale(self):
+        """Test apply only clears present bits and stale sides match StaleDataDetector"""
+        prev, current, now = _chains()
+        noise_filter = NoiseFilter({"stale_threshold_sec": 60})
+        result = noise_filter.filter_chain(current, prev, now=now)
+        ltp, present = current.ltp, current.present.copy()
+
+        filtered, drops = noise_filter.filter_snapshot(current, prev)
+
+        assert filtered is current and filtered.ltp is ltp
+        assert (filtered.present == (present & result.valid)).all()
+        assert filtered.is_partial == bool(drops)
+        detector = StaleDataDetector(60)
+        assert (result.stale == (present & (now - current.timestamps > 60))).all()
+        assert detector.find_stale_strikes(current) == current.strike_prices[
+            (current.present & (now - current.timestamps > 60)).any(axis=0)
+        ].tolist()
@@ -0,0 +1,121 @@
+"""
+Unit tests for the delta-encoded option chain history
+Tests: reconstruction at any time across keyframes and strike grid changes,
+compactness vs full snapshots, LRU eviction and segment trimming, bounded SnapshotCache
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.utils.option_chain_data_models import OptionChainSnapshot
+from src.utils.option_chain_history import ChainHistory, ChainHistoryStore
+from src.utils.option_chain_snapshot import SnapshotCache
+
+START = datetime(2025, 12, 30, 9, 15)
+
+
+def _session(frames, n=60, seed=7, underlying="NIFTY", expiry="30DEC25"):
+    """One snapshot per second: ticking LTPs, growing volume / OI, a few cells quiet"""
+    rng = np.random.default_rng(seed)
+    strikes = 22500.0 + 50 * np.arange(n)
+    ltp = rng.uniform(5, 500, (2, n)).round(2)
+    volume = rng.integers(0, 10000, (2, n))
+    oi = rng.integers(1000, 100000, (2, n))
+    ticked = np.full((2, n), START.timestamp())
+    snapshots = []
+    for k in range(frames):
+        moving = rng.random((2, n)) < 0.3
+        ltp = np.where(moving, np.maximum(ltp + rng.choice([-0.05, 0.05, 0.5], (2, n)), 0.05), ltp).round(2)
+        volume = volume + moving * rng.integers(0, 500, (2, n))
+        oi = np.maximum(oi + (rng.random((2, n)) < 0.05) * rng.integers(-300, 300, (2, n)), 0)
+        stamp = START + timedelta(seconds=k)
+        ticked = np.where(moving, stamp.timestamp(), ticked)
+        snapshots.append(
+            OptionChainSnapshot.from_arrays(
+                underlying, expiry, strikes, ltp, bid=ltp - 0.05, ask=ltp + 0.05, volume=volume, oi=oi,
+                timestamps=ticked, token=np.full((2, n), "T"),
+                atm_strike=float(strikes[n // 2]), timestamp=stamp, version=k,
+            )
+        )
+    return snapshots
+
+
+def _assert_same(rebuilt, original):
+    assert rebuilt.strike_prices.tolist() == original.strike_prices.tolist()
+    for name in ("ltp", "bid", "ask", "oi_prev"):
+        np.testing.assert_allclose(getattr(rebuilt, name), getattr(original, name), atol=0.005)
+    assert (rebuilt.volume == original.volume).all() and (rebuilt.oi == original.oi).all()
+    assert (rebuilt.present == original.present).all()
+    assert rebuilt.version == original.version and rebuilt.timestamp == original.timestamp
+
+
+@pytest.mark.unit
+class TestChainHistory:
+    """Test delta-encoded history"""
+
+    def test_reconstructs_any_frame(self):
+        """Test snapshots rebuild across keyframes, quiet frames and a strike grid change"""
+        snapshots = _session(250)
+        snapshots[120] = snapshots[120].window(10).copy()  # grid change forces a keyframe
+        history = ChainHistory("NIFTY", "30DEC25", keyframe_every=50)
+        for snapshot in snapshots:
+            history.append(snapshot)
+
+        for k in (0, 1, 49, 50, 77, 119, 120, 121, 249):
+            _assert_same(history.snapshot_at(snapshots[k].timestamp), snapshots[k])
+        between = history.snapshot_at(snapshots[10].timestamp + timedelta(milliseconds=500))
+        assert between.version == 10
+        assert history.snapshot_at(START - timedelta(seconds=1)) is None
+
+        with pytest.raises(ValueError):
+            history.append(snapshots[0])  # older than the last frame
+
+    def test_compact_vs_full_snapshots(self):
+        """Test an hour-scale session takes a fraction of the full snapshots' memory"""
+        snapshots = _session(600)
+        history = ChainHistory("NIFTY", "30DEC25")
+        for snapshot in snapshots:
+            history.append(snapshot)
+
+        full = sum(s.nbytes for s in snapshots)
+        assert history.nbytes < full / 3
+        _assert_same(history.snapshot_frame(599), snapshots[599])
+
+
+@pytest.mark.unit
+class TestChainHistoryStore:
+    """Test the memory-capped store"""
+
+    def test_lru_eviction_and_trimming(self):
+        """Test least recently used keys are evicted, then the oldest segments trimmed"""
+        weekly = _session(100, expiry="30DEC25")
+        monthly = _session(100, expiry="27JAN26", seed=8)
+        store = ChainHistoryStore(max_bytes=10**9, keyframe_every=20)
+        for snapshot in weekly:
+            store.append(snapshot)
+        for snapshot in monthly:
+            store.append(snapshot)
+
+        store.max_bytes = store.get("NIFTY", "27JAN26").nbytes * 0.6
+        store.append(_session(101, expiry="27JAN26", seed=8)[-1])
+
+        assert store.get("NIFTY", "30DEC25") is None and store.evicted == 1
+        history = store.get("NIFTY", "27JAN26")
+        assert history.trimmed_frames > 0 and store.nbytes <= store.max_bytes
+        assert store.snapshot_at("NIFTY", "27JAN26", monthly[0].timestamp) is None
+        _assert_same(store.snapshot_at("NIFTY", "27JAN26", monthly[99].timestamp), monthly[99])
+
+    def test_snapshot_cache_bound(self):
+        """Test SnapshotCache keeps the most recently used expiries"""
+        cache = SnapshotCache(max_entries=2)
+        snapshot = _session(1)[0]
+        cache.store("NIFTY", "30DEC25", snapshot)
+        cache.store("NIFTY", "27JAN26", snapshot)
+        cache.retrieve("NIFTY", "30DEC25")
+        cache.store("BANKNIFTY", "30DEC25", snapshot)
+
+        assert cache.get_cache_size() == 2
+        assert cache.retrieve("NIFTY", "27JAN26") is None
+        assert cache.list_cached() == {"NIFTY": ["30DEC25"], "BANKNIFTY": ["30DEC25"]}
@@ -0,0 +1,87 @@
+"""
+Unit tests for the columnar OptionChainSnapshot
+Tests: array layout, O(1) strike / offset lookups with the detected interval,
+vectorized aggregates, zero-copy views, StrikeData compatibility
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.utils.option_chain_data_models import (
+    CE_ROW,
+    PE_ROW,
+    OptionChainSnapshot,
+    OptionType,
+    StrikeData,
+    StrikePair,
+)
+
+
+def _chain(strikes=(23100.0, 22900.0, 23000.0, 23050.0, 22950.0)):
+    n = len(strikes)
+    ltp = np.array([[100.0 + i for i in range(n)], [90.0 + i for i in range(n)]])
+    ltp[PE_ROW, 3] = np.nan  # 23050 PE missing
+    volume = np.full((2, n), 500)
+    volume[CE_ROW, 0] = 0  # 23100 CE illiquid
+    return OptionChainSnapshot.from_arrays(
+        "NIFTY", "30DEC25", strikes, ltp, volume=volume, oi=np.full((2, n), 1000), atm_strike=23000.0
+    )
+
+
+@pytest.mark.unit
+class TestOptionChainSnapshot:
+    """Test columnar chain snapshots"""
+
+    def test_sorted_columns_and_lookups(self):
+        """Test strikes sort with their columns and offsets use the real interval"""
+        snapshot = _chain()
+
+        assert snapshot.strike_prices.tolist() == [22900.0, 22950.0, 23000.0, 23050.0, 23100.0]
+        assert snapshot.ltp[CE_ROW].tolist() == [101.0, 104.0, 102.0, 103.0, 100.0]
+        assert snapshot.strike_interval == 50.0
+        assert snapshot.get_strike(1).strike == 23050.0
+        assert snapshot.get_strike(-2).ce.ltp == 101.0
+        assert snapshot.get_strike(3) is None
+        assert snapshot.get_atm_pe().ltp == 92.0
+
+    def test_vectorized_aggregates(self):
+        """Test pair counts come from the present / liquidity masks"""
+        snapshot = _chain()
+
+        assert snapshot.complete_pairs == 4
+        assert snapshot.liquid_pairs == 3
+        assert snapshot.ce.liquid.sum() == 4
+        assert snapshot.get_chain_summary()["strike_interval"] == 50.0
+
+        with pytest.raises(ValueError):
+            OptionChainSnapshot.from_arrays("NIFTY", "30DEC25", [23000.0], [[-1.0], [5.0]])
+
+    def test_zero_copy_views(self):
+        """Test side and window views share memory with the snapshot"""
+        snapshot = _chain()
+        window = snapshot.window(1)
+
+        assert window.strike_prices.tolist() == [22950.0, 23000.0, 23050.0]
+        assert np.shares_memory(window.ltp, snapshot.ltp)
+        assert np.shares_memory(snapshot.pe.oi, snapshot.oi)
+        assert window.get_atm_ce().ltp == 102.0
+
+    def test_strike_data_round_trip(self):
+        """Test the {strike: StrikePair} view matches the objects loaded into it"""
+        stamp = datetime(2025, 12, 30, 9, 30)
+        ce = StrikeData(
+            23000.0, OptionType.CE, ltp=120.5, bid=120.0, ask=121.0, volume=10, oi=500, oi_prev=450,
+            timestamp=stamp, token="4711",
+        )
+        pe = StrikeData(23000.0, OptionType.PE, ltp=80.0, volume=5, oi=300)
+        wing = StrikeData(23050.0, OptionType.PE, ltp=95.0)
+        pairs = {23000.0: StrikePair(23000.0, ce, pe), 23050.0: StrikePair(23050.0, None, wing)}
+        snapshot = OptionChainSnapshot("NIFTY", "30DEC25", strikes=pairs)
+
+        assert snapshot.strikes[23000.0].ce == ce
+        assert snapshot.strikes[23000.0].pe.bid is None
+        assert snapshot.strikes[23050.0].ce is None
+        assert 23050.0 in snapshot.strikes and 23100.0 not in snapshot.strikes
+        assert list(snapshot.strikes) == [23000.0, 23050.0]
@@ -0,0 +1,192 @@
+"""
+Unit tests for StreamingOptionChain
+Tests: in-place tick updates, versioned publishing, ATM window rolling
+with minimal subscription churn, subscribe retries outside the chain lock,
+batched REST gap filling through the engine
+"""
+
+import threading
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.integrations.angelone.angelone_client import AngelOnePhase2
+from src.integrations.websocket.stream_manager import StreamManager
+from src.utils.option_chain_engine import OptionChainDataEngine
+from src.utils.option_chain_data_models import CE_ROW, PE_ROW, OptionChainSnapshot
+from src.utils.option_chain_stream import StreamingOptionChain
+
+STRIKES = 22500.0 + 50.0 * np.arange(21)  # 22500 … 23500
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr("src.integrations.websocket.stream_manager.get_instrument_index", lambda: None)
+    return StreamManager(MagicMock(), buffer_size=8)
+
+
+def _token(strike, option_type):
+    return f"TOKEN_NIFTY30DEC25{int(strike)}{option_type}"
+
+
+@pytest.mark.unit
+class TestStreamingOptionChain:
+    """Test the tick-maintained chain"""
+
+    def test_ticks_update_cells_and_publish_versions(self, manager):
+        """Test ticks routed through StreamManager land in their cells and publish copies"""
+        published = []
+        chain = StreamingOptionChain(
+            manager, "NIFTY", "30DEC25", STRIKES, width=2, spot_token="99926000",
+            on_publish=published.append, publish_interval=0.0,
+        )
+        manager.on_tick(chain.on_tick)
+        manager.process_tick({"token": "99926000", "last_traded_price": 2301000})  # spot 23010
+
+        assert chain.chain.atm_strike == 23000.0
+        assert published[-1].strike_prices.tolist() == [22900.0, 22950.0, 23000.0, 23050.0, 23100.0]
+        assert not published[-1].present.any()
+
+        manager.process_tick(
+            {"token": _token(23000, "CE"), "last_traded_price": 12050, "volume_trade_for_the_day": 900,
+             "open_interest": 5000, "best_5_buy_data": [{"price": 12000}], "best_5_sell_data": [{"price": 12100}]}
+        )
+        manager.process_tick({"token": _token(23050, "PE"), "last_traded_price": 14000, "open_interest": 700})
+        latest = published[-1]
+
+        assert latest.version == len(published) == 3
+        assert latest.get_atm_ce().ltp == 120.5
+        assert (latest.get_atm_ce().bid, latest.get_atm_ce().ask) == (120.0, 121.0)
+        assert latest.strikes[23050.0].pe.oi == 700
+        assert published[1].strikes[23050.0].pe is None  # earlier versions are not mutated
+        assert latest.is_partial
+
+    def test_roll_subscribes_only_the_difference(self, manager):
+        """Test a strike crossing unsubscribes / subscribes one strike on each end"""
+        chain = StreamingOptionChain(manager, "NIFTY", "30DEC25", STRIKES, width=3)
+        chain.update_spot(23010.0)
+        manager.ws_client.subscribe.reset_mock()
+
+        assert not chain.update_spot(23020.0)  # same ATM
+        assert chain.update_spot(23040.0)  # ATM 23000 → 23050
+
+        unsubscribed = manager.ws_client.unsubscribe.call_args.kwargs["tokens"]
+        subscribed = manager.ws_client.subscribe.call_args.kwargs["tokens"]
+        assert unsubscribed == [_token(22850, "CE"), _token(22850, "PE")]
+        assert subscribed == [_token(23200, "CE"), _token(23200, "PE")]
+        assert chain.get_stats()["subscribed_tokens"] == 14
+
+        chain.update_spot(23490.0)  # window clamps at the last listed strike
+        assert chain.chain.window(3).strike_prices[-1] == 23500.0
+
+    def test_rest_fills_only_gaps(self, manager):
+        """Test REST is asked only for cells the stream has not ticked"""
+        asked = []
+
+        def rest(instruments):
+            asked.extend(inst["token"] for inst in instruments)
+            return {inst["token"]: {"ltp": 50.0, "oi": 10} for inst in instruments}
+
+        chain = StreamingOptionChain(manager, "NIFTY", "30DEC25", STRIKES, width=1, gap_filler=rest)
+        manager.on_tick(chain.on_tick)
+        chain.update_spot(23000.0)
+        manager.process_tick({"token": _token(23000, "CE"), "last_traded_price": 10000})
+
+        assert chain.fill_gaps() == 5
+        assert _token(23000, "CE") not in asked and len(asked) == 5
+        i = chain.chain.index_of(23000.0)
+        assert chain.chain.ltp[CE_ROW, i] == 100.0 and chain.chain.ltp[PE_ROW, i] == 50.0
+        assert chain.fill_gaps() == 0
+
+    def test_failed_subscribe_retried_outside_lock(self, manager):
+        """Test subscribe I/O runs without the chain lock and failed strikes are retried by fill_gaps"""
+        chain = StreamingOptionChain(manager, "NIFTY", "30DEC25", STRIKES, width=1)
+        subscribe = manager.subscribe_option_chain
+        calls = []
+
+        def try_lock():
+            acquired = chain._lock.acquire(timeout=0.5)
+            calls.append(acquired)
+            if acquired:
+                chain._lock.release()
+
+        def flaky(underlying, expiry, strikes):
+            locked = threading.Thread(target=try_lock)
+            locked.start()
+            locked.join()
+            if len(calls) == 1:
+                raise ConnectionError("socket closed")
+            return subscribe(underlying, expiry, strikes)
+
+        manager.subscribe_option_chain = flaky
+        assert chain.update_spot(23000.0)
+        assert chain.get_stats()["pending_strikes"] == 3 and chain.get_stats()["subscribed_tokens"] == 0
+
+        chain.fill_gaps()
+
+        assert calls == [True, True]
+        assert chain.get_stats()["pending_strikes"] == 0 and chain.get_stats()["subscribed_tokens"] == 6
+
+
+@pytest.mark.unit
+class TestEngineGapFill:
+    """Test OptionChainDataEngine streaming gap fill"""
+
+    def test_gap_fill_batched_under_quote_budget(self, manager):
+        """Test gap cells are filled by one budgeted getQuote with every field, not per-symbol LTP calls"""
+        adapter = AngelOnePhase2()
+        adapter._smartapi_client = MagicMock()
+        adapter._smartapi_client.getQuote.side_effect = lambda mode, exchangeTokens: {
+            "status": True,
+            "data": {"fetched": [
+                {"symbolToken": token, "ltp": 80.0, "tradeVolume": 1200, "opnInterest": 4000,
+                 "depth": {"buy": [{"price": 79.5}], "sell": [{"price": 80.5}]}}
+                for token in exchangeTokens["NFO"]
+            ]},
+        }
+        engine = OptionChainDataEngine(adapter, {"stream_publish_interval_sec": 0.0})
+        engine.set_universe("NIFTY", datetime(2025, 12, 30), 23000.0, strikes_range=1)
+
+        engine.start_streaming(manager, strikes=STRIKES.tolist(), spot=23000.0, gap_fill_interval_sec=60)
+        deadline = time.time() + 2
+        while engine.get_current_snapshot() is None and time.time() < deadline:
+            time.sleep(0.01)
+        engine.stop_streaming()
+
+        snapshot = engine.get_current_snapshot()
+        assert adapter._smartapi_client.getQuote.call_count == 1
+        assert len(adapter._quote_requests) == 1
+        assert len(adapter._smartapi_client.getQuote.call_args.kwargs["exchangeTokens"]["NFO"]) == 6
+        atm = snapshot.get_atm_pe()
+        assert (atm.ltp, atm.bid, atm.ask, atm.volume, atm.oi) == (80.0, 79.5, 80.5, 1200, 4000)
+        adapter._smartapi_client.get_ltp_data.assert_not_called()
+
+    def test_ingest_serialized(self):
+        """Test stream publishes and gap-fill passes never run the ingest pipeline concurrently"""
+        engine = OptionChainDataEngine(MagicMock())
+        filter_chain = engine.noise_filter.filter_chain
+        active, overlaps = [], []
+
+        def slow_filter(snapshot, previous):
+            active.append(1)
+            overlaps.append(len(active) > 1)
+            time.sleep(0.02)
+            active.pop()
+            return filter_chain(snapshot, previous)
+
+        engine.noise_filter.filter_chain = slow_filter
+        snapshots = [
+            OptionChainSnapshot.from_arrays("NIFTY", "30DEC25", STRIKES[:5], np.full((2, 5), 100.0 + k), version=k)
+            for k in range(6)
+        ]
+        threads = [threading.Thread(target=engine._ingest, args=(s, time.time())) for s in snapshots]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(overlaps) == 6 and not any(overlaps)
+        assert engine.fetch_count == 6
@@ -0,0 +1,169 @@
+"""
+Unit tests for Order Gateway
+Tests: concurrent leg submission, grouped acks, partial-failure policies, leg skew metric
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.core.order_gateway import OrderGateway
+from src.core.performance_monitor import LatencyMetrics
+
+
+class FakeOrderManager:
+    """Records option and symbol orders; option legs listed in ``reject`` fail"""
+
+    def __init__(self, delay=0.0, reject=()):
+        self.delay = delay
+        self.reject = set(reject)
+        self.placed = []
+        self.orders = []
+        self.acks = {}
+        self.cancelled = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def place_option_order(self, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.placed.append(kwargs)
+            orderid = f"OID{len(self.placed)}"
+            strike = 23000 + len(self.placed) * 50  # spot drifts between resolutions
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        if (kwargs["option_type"], kwargs["action"]) in self.reject:
+            return None
+        symbol = f"{kwargs['underlying']}{kwargs['expiry_date']}{strike}{kwargs['option_type']}"
+        self.acks[orderid] = {"status": "success", "orderid": orderid, "symbol": symbol, "exchange": "NFO"}
+        return self.acks[orderid]
+
+    def place_order(self, **kwargs):
+        with self._lock:
+            self.orders.append(kwargs)
+            return {"status": "success", "orderid": f"SOID{len(self.orders)}"}
+
+    def cancel_order(self, order_id):
+        self.cancelled.append(order_id)
+        return True
+
+
+STRADDLE = [
+    {"offset": "ATM", "option_type": "CE", "action": "BUY", "quantity": 75},
+    {"offset": "ATM", "option_type": "PE", "action": "BUY", "quantity": 75},
+]
+
+
+@pytest.mark.unit
+class TestOrderGateway:
+    """Test concurrent basket submission"""
+
+    def test_legs_submitted_concurrently(self):
+        """Test all legs are in flight together"""
+        om = FakeOrderManager(delay=0.1)
+        gateway = OrderGateway(om, max_workers=4, partial_failure_policy="none")
+
+        started = time.perf_counter()
+        resp = gateway.place_option_legs("ANGEL-X", "NIFTY", STRADDLE, "30JAN25")
+        elapsed = time.perf_counter() - started
+
+        assert resp["status"] == "success"
+        assert [r["status"] for r in resp["results"]] == ["success", "success"]
+        assert om.max_in_flight == 2
+        assert elapsed < 0.18
+        gateway.shutdown()
+
+    def test_more_legs_than_workers(self):
+        """Test legs beyond the pool queue without stalling, also with baskets sharing the pool"""
+        om = FakeOrderManager(delay=0.05)
+        gateway = OrderGateway(om, max_workers=2, partial_failure_policy="none")
+        iron_fly = STRADDLE + [
+            {"offset": "OTM4", "option_type": "CE", "action": "SELL", "quantity": 75},
+            {"offset": "OTM4", "option_type": "PE", "action": "SELL", "quantity": 75},
+        ]
+
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(target=gateway.place_option_legs, args=("ANGEL-X", "NIFTY", iron_fly, "30JAN25"))
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        assert len(om.placed) == 8
+        assert om.max_in_flight == 2
+        assert elapsed < 0.5  # 4 rounds of 0.05s; a stalled start would add a second per leg
+        gateway.shutdown()
+
+    def test_leg_skew_recorded(self):
+        """Test ack skew reaches the latency metrics"""
+        metrics = LatencyMetrics()
+        gateway = OrderGateway(FakeOrderManager(), latency_metrics=metrics)
+
+        resp = gateway.place_option_legs("ANGEL-X", "NIFTY", STRADDLE, "30JAN25")
+
+        assert resp["leg_skew_ms"] >= 0
+        assert len(metrics.leg_skew_times) == 1
+        assert "leg_skew" in metrics.get_stats()
+        gateway.shutdown()
+
+    def test_order_manager_passes_latency_metrics(self, monkeypatch):
+        """Test the OrderManager gateway records skew into the caller's metrics"""
+        from src.core import order_manager
+        from src.core.order_manager import OrderManager
+
+        monkeypatch.setattr(order_manager, "RiskManager", object)  # risk checks not used here
+        metrics = LatencyMetrics()
+        manager = OrderManager(latency_metrics=metrics)
+
+        assert manager.gateway.latency_metrics is metrics
+        manager.gateway.shutdown()
+
+    def test_partial_failure_flattens_filled_legs(self):
+        """Test acknowledged legs are offset when another leg fails"""
+        om = FakeOrderManager(reject={("PE", "BUY")})
+        gateway = OrderGateway(om, partial_failure_policy="flatten")
+
+        resp = gateway.place_option_legs("ANGEL-X", "NIFTY", STRADDLE, "30JAN25")
+
+        assert resp["status"] == "error"
+        assert resp["partial_failure_policy"] == "flatten"
+        assert len(om.placed) == 2  # offsets are not resolved again
+        filled = [r for r in resp["results"] if r["status"] == "success"][0]
+        unwind = om.orders[0]
+        assert unwind["symbol"] == om.acks[filled["orderid"]]["symbol"]
+        assert (unwind["exchange"], unwind["action"].value, unwind["quantity"]) == ("NFO", "SELL", 75)
+        assert unwind["order_type"].value == "MARKET"
+        assert gateway.get_stats()["partial_failures"] == 1
+        gateway.shutdown()
+
+    def test_partial_failure_cancels_filled_legs(self):
+        """Test acknowledged legs are cancelled under the cancel policy"""
+        om = FakeOrderManager(reject={("CE", "BUY")})
+        gateway = OrderGateway(om, partial_failure_policy="cancel")
+
+        resp = gateway.place_option_legs("ANGEL-X", "NIFTY", STRADDLE, "30JAN25")
+
+        assert resp["status"] == "error"
+        assert len(om.placed) == 2
+        assert om.cancelled == [resp["orderid"]]
+        gateway.shutdown()
+
+    def test_total_failure_applies_no_policy(self):
+        """Test nothing is unwound when no leg was acknowledged"""
+        om = FakeOrderManager(reject={("CE", "BUY"), ("PE", "BUY")})
+        gateway = OrderGateway(om, partial_failure_policy="flatten")
+
+        resp = gateway.place_option_legs("ANGEL-X", "NIFTY", STRADDLE, "30JAN25")
+
+        assert resp["status"] == "error"
+        assert resp["partial_failure_policy"] is None
+        assert len(om.placed) == 2
+        gateway.shutdown()
@@ -0,0 +1,123 @@
+"""
+Unit tests for PortfolioGreeksAggregator
+Tests: incremental totals vs full recompute, per-underlying / per-strategy views,
+version stamps, live Greeks by symbol, risk manager reads
+"""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from src.core import portfolio_greeks
+from src.core.portfolio_greeks import PortfolioGreeksAggregator
+
+
+def _full_sum(book, positions):
+    """Reference totals recomputed from scratch"""
+    totals = {"net_delta": 0.0, "net_gamma": 0.0, "net_theta": 0.0, "net_vega": 0.0, "gross_delta": 0.0}
+    for key in positions:
+        p = book.get_position(key)
+        totals["net_delta"] += p.delta * p.quantity
+        totals["net_gamma"] += p.gamma * p.quantity
+        totals["net_theta"] += p.theta * p.quantity
+        totals["net_vega"] += p.vega * p.quantity
+        totals["gross_delta"] += abs(p.delta * p.quantity)
+    return totals
+
+
+@pytest.mark.unit
+class TestPortfolioGreeksAggregator:
+    """Test incrementally maintained book Greeks"""
+
+    def test_incremental_matches_full_sum(self):
+        """Test random tick / resize sequences leave totals equal to a full recompute"""
+        rng = random.Random(7)
+        book = PortfolioGreeksAggregator()
+        keys = [f"T{i}" for i in range(20)]
+        for i, key in enumerate(keys):
+            book.upsert_position(key, f"NIFTY{23000 + 50 * (i % 5)}CE", "NIFTY", rng.choice([-75, 75, 150]))
+
+        for _ in range(500):
+            if rng.random() < 0.7:
+                greeks = {"delta": rng.uniform(-1, 1), "gamma": rng.uniform(0, 0.01), "vega": rng.uniform(0, 15)}
+                book.update_greeks(f"NIFTY{23000 + 50 * rng.randrange(5)}CE", greeks)
+            else:
+                book.update_quantity(rng.choice(keys), rng.choice([-150, -75, 75, 300]))
+
+        totals = book.get_totals()
+        for name, value in _full_sum(book, keys).items():
+            assert totals[name] == pytest.approx(value, abs=1e-9)
+        assert totals["positions"] == len(keys)
+
+    def test_views_by_underlying_and_strategy(self):
+        """Test one position counts in the book, its underlying and its strategy"""
+        book = PortfolioGreeksAggregator()
+        book.upsert_position("A", "NIFTY23000CE", "NIFTY", 75, strategy="straddle", greeks={"delta": 0.5})
+        book.upsert_position("B", "NIFTY23000PE", "NIFTY", 75, strategy="straddle", greeks={"delta": -0.45})
+        book.upsert_position("C", "BANKNIFTY48000CE", "BANKNIFTY", -30, greeks={"delta": 0.4, "theta": -12.0})
+
+        assert book.get_totals(strategy="straddle")["net_delta"] == pytest.approx(3.75)
+        assert book.get_totals(underlying="BANKNIFTY")["net_theta"] == pytest.approx(360.0)
+        assert book.get_totals()["gross_delta"] == pytest.approx(37.5 + 33.75 + 12.0)
+
+        book.remove_strategy("straddle")
+        snapshot = book.snapshot()
+        assert set(snapshot["underlyings"]) == {"BANKNIFTY"}
+        assert snapshot["portfolio"]["net_delta"] == pytest.approx(-12.0)
+
+    def test_live_greeks_and_versions(self):
+        """Test snapshots apply by symbol and every change bumps the version"""
+        book = PortfolioGreeksAggregator()
+        book.upsert_position("A", "NIFTY23000CE", "NIFTY", 75)
+        book.upsert_position("B", "NIFTY23000CE", "NIFTY", -25, strategy="hedge")
+        version = book.version
+
+        class Snapshot:
+            delta, gamma, theta, vega = 0.6, 0.002, -8.0, 11.0
+
+        assert book.apply_greeks({"NIFTY23000CE": Snapshot(), "NIFTY23100CE": Snapshot()}) == 2
+        assert book.version == version + 1
+        assert book.get_totals()["net_vega"] == pytest.approx(11.0 * 50)
+        assert book.update_greeks("UNHELD", {"delta": 1.0}) == 0
+        assert book.version == version + 1
+
+        book.remove_position("A")
+        assert book.get_totals()["net_delta"] == pytest.approx(-15.0)
+        assert book.get_stats()["symbols"] == 1
+
+    def test_risk_manager_reads_shared_book(self, monkeypatch):
+        """Test RiskManager limits and hedge triggers use the aggregator totals"""
+        from src.core import risk_manager
+
+        # Limits RiskManager reads, independent of the local config file
+        limits = SimpleNamespace(
+            MAX_DAILY_LOSS=5000, MAX_DAILY_PROFIT=10000, MAX_TRADES_PER_DAY=5, MAX_POSITION_SIZE=100
+        )
+        monkeypatch.setattr(risk_manager, "config", limits)
+        book = PortfolioGreeksAggregator()
+        monkeypatch.setattr(portfolio_greeks, "_aggregator", book)
+        risk = risk_manager.RiskManager()
+        book.upsert_position("A", "NIFTY23000CE", "NIFTY", 150, greeks={"delta": 0.6})
+
+        greeks = risk.get_portfolio_greeks()
+        assert greeks["net_delta"] == pytest.approx(90.0)
+        assert greeks["version"] == book.version
+        assert greeks["needs_hedge"]
+
+    def test_multi_leg_legs_keyed_by_published_symbol(self, monkeypatch):
+        """Test Greeks published by trading symbol reach an active strategy's legs"""
+        from src.strategies.multi_leg import base
+        from src.strategies.multi_leg.straddle import StraddleStrategy
+
+        book = PortfolioGreeksAggregator()
+        monkeypatch.setattr(base, "get_portfolio_greeks_aggregator", lambda: book)
+        straddle = StraddleStrategy("NIFTY", "30DEC25", quantity=75)
+        assert straddle.enter(23010.0)
+
+        book.apply_greeks({"NIFTY30DEC2523000CE": {"delta": 0.52}, "NIFTY30DEC2523000PE": {"delta": -0.47}})
+
+        assert book.get_totals(strategy=straddle.strategy_id)["net_delta"] == pytest.approx(0.05 * 75)
+        straddle.update_greeks({"NIFTY30DEC2523000CE": {"delta": 0.6, "gamma": 0.002}})
+        assert straddle.legs[0].delta == 0.6
+        assert straddle.net_delta == pytest.approx((0.6 - 0.47) * 75)
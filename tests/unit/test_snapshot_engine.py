@@ -0,0 +1,63 @@
+"""
+Unit tests for SnapshotEngine deltas
+Tests: aligned array diffs, new / removed strikes, stale masks, momentum hints
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.utils.option_chain_data_models import CE_ROW, PE_ROW, OptionChainSnapshot
+from src.utils.option_chain_snapshot import SnapshotEngine
+
+
+def _chain(strikes, ltp, oi, volume):
+    return OptionChainSnapshot.from_arrays("NIFTY", "30DEC25", strikes, ltp, oi=oi, volume=volume)
+
+
+@pytest.mark.unit
+class TestSnapshotDelta:
+    """Test vectorized snapshot diffs"""
+
+    def test_diffs_over_shifted_grid(self):
+        """Test diffs align on common strikes and list added / removed ones"""
+        engine = SnapshotEngine()
+        engine.update_snapshot(
+            _chain([22950.0, 23000.0, 23050.0], np.full((2, 3), 100.0), np.full((2, 3), 1000), np.full((2, 3), 50))
+        )
+        ltp = np.full((2, 3), 100.0)
+        ltp[CE_ROW, 0] = 104.5
+        ltp[PE_ROW, 1] = np.nan  # 23050 PE not quoted: not compared
+        oi = np.full((2, 3), 1000)
+        oi[PE_ROW, 0] = 1300
+        volume = np.full((2, 3), 50)
+        volume[CE_ROW, 0] = 2050
+        delta = engine.update_snapshot(_chain([23000.0, 23050.0, 23100.0], ltp, oi, volume))
+
+        assert delta.strikes.tolist() == [23000.0, 23050.0]
+        assert delta.new_strikes_added == [23100.0]
+        assert delta.strikes_removed == [22950.0]
+        assert delta.oi_changes == {"23000.0-PE": 300}
+        assert delta.ltp_changes == {"23000.0-CE": pytest.approx(4.5)}
+        assert not delta.compared[PE_ROW, 1]
+        assert delta.stale_strikes == [23050.0]
+        assert delta.momentum_hints == {"23000.0-PE_oi_increasing": True, "23000.0-CE_volume_spike": True}
+        assert delta.has_changes
+
+    def test_streaming_sized_diff_is_fast(self):
+        """Test a 60-strike two-sided diff on the same grid stays in microseconds"""
+        rng = np.random.default_rng(1)
+        strikes = 21500.0 + 50.0 * np.arange(60)
+        previous = _chain(strikes, rng.uniform(1, 500, (2, 60)), rng.integers(0, 10**6, (2, 60)), np.zeros((2, 60)))
+        current = _chain(strikes, previous.ltp + rng.choice([0.0, 0.05], (2, 60)), previous.oi, previous.volume)
+        engine = SnapshotEngine()
+
+        started = time.perf_counter()
+        for _ in range(200):
+            delta = engine._calculate_delta(current, previous)
+        per_diff_us = (time.perf_counter() - started) / 200 * 1e6
+
+        assert per_diff_us < 500
+        assert delta.change_counts["ltp"] == np.count_nonzero(current.ltp != previous.ltp)
+        assert len(delta.stale_strikes) == np.count_nonzero((current.ltp == previous.ltp).any(axis=0))
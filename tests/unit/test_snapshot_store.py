@@ -0,0 +1,45 @@
+"""
+Unit tests for Snapshot Store
+Tests: field merging, immutability of published snapshots, versioning
+"""
+
+import time
+
+import pytest
+
+from src.integrations.data_feeds.snapshot_store import SnapshotStore
+
+
+@pytest.mark.unit
+class TestSnapshotStore:
+    """Test latest-value snapshots"""
+
+    def test_merges_partial_ticks(self):
+        """Test LTP-only and quote-only ticks keep the other fields"""
+        store = SnapshotStore()
+        now = time.time()
+        store.update("NIFTY", {"symbol": "NIFTY", "ltp": 22000.0}, now)
+        store.update("NIFTY", {"symbol": "NIFTY", "bid": 21999.0, "ask": 22001.0}, now + 1)
+
+        snap = store.get("NIFTY")
+        assert snap.ltp == 22000.0
+        assert (snap.bid, snap.ask) == (21999.0, 22001.0)
+        assert snap.version == 2
+        assert snap.ltp_time < snap.quote_time
+        assert store.get("BANKNIFTY") is None
+
+    def test_published_snapshots_never_change(self):
+        """Test readers holding a snapshot never see later writes"""
+        store = SnapshotStore()
+        store.update("NIFTY", {"ltp": 1.0}, time.time())
+        held = store.get("NIFTY")
+        view = store.all()
+
+        store.update("NIFTY", {"ltp": 2.0}, time.time())
+
+        assert held.ltp == 1.0
+        assert view["NIFTY"].ltp == 1.0
+        assert store.get("NIFTY").ltp == 2.0
+        assert store.version == 2
+        with pytest.raises(AttributeError):
+            held.ltp = 3.0
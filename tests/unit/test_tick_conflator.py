@@ -0,0 +1,100 @@
+"""
+Unit tests for Tick Conflator
+Tests: latest-value-wins slots, bounded FIFO, non-blocking feed thread, error isolation
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.integrations.data_feeds.tick_conflator import TickConsumer
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+@pytest.mark.unit
+class TestTickConsumer:
+    """Test tick consumer mailboxes"""
+
+    def test_conflate_keeps_latest_per_symbol(self):
+        """Test a blocked consumer only sees the newest tick per symbol"""
+        gate = threading.Event()
+        received = []
+
+        def slow(tick):
+            gate.wait(2)
+            received.append((tick["symbol"], tick["ltp"]))
+
+        consumer = TickConsumer(slow, mode="conflate")
+        consumer.offer({"symbol": "NIFTY", "ltp": 1})  # picked up, callback now blocked
+        assert _wait_until(lambda: consumer.pending == 0)
+
+        started = time.perf_counter()
+        for i in range(2, 102):
+            consumer.offer({"symbol": "NIFTY", "ltp": i})
+            consumer.offer({"symbol": "BANKNIFTY", "ltp": i})
+        assert time.perf_counter() - started < 0.5  # feed thread never waited on the callback
+
+        gate.set()
+        assert _wait_until(lambda: consumer.delivered == 3)
+        consumer.stop()
+
+        assert received == [("NIFTY", 1), ("NIFTY", 101), ("BANKNIFTY", 101)]
+        assert consumer.overwritten == 198
+        assert consumer.dropped == 0
+
+    def test_fifo_bounded_drops_oldest(self):
+        """Test FIFO mode keeps order and drops the oldest ticks when full"""
+        gate = threading.Event()
+        received = []
+
+        def slow(tick):
+            gate.wait(2)
+            received.append(tick["ltp"])
+
+        consumer = TickConsumer(slow, mode="fifo", max_pending=3)
+        consumer.offer({"symbol": "NIFTY", "ltp": 0})
+        assert _wait_until(lambda: consumer.pending == 0)
+        for i in range(1, 6):
+            consumer.offer({"symbol": "NIFTY", "ltp": i})
+
+        gate.set()
+        assert _wait_until(lambda: consumer.delivered == 4)
+        consumer.stop()
+
+        assert received == [0, 3, 4, 5]
+        assert consumer.dropped == 2
+
+    def test_callback_errors_are_counted(self):
+        """Test a failing callback does not kill the worker"""
+        def boom(tick):
+            raise RuntimeError("bad consumer")
+
+        consumer = TickConsumer(boom, mode="conflate")
+        consumer.offer({"symbol": "NIFTY", "ltp": 1})
+        assert _wait_until(lambda: consumer.errors == 1)
+        consumer.offer({"symbol": "NIFTY", "ltp": 2})
+        assert _wait_until(lambda: consumer.errors == 2)
+        consumer.stop()
+
+    def test_conflate_drops_new_symbols_when_full(self):
+        """Test the per-symbol slot table is bounded"""
+        gate = threading.Event()
+        consumer = TickConsumer(lambda tick: gate.wait(2), mode="conflate", max_pending=2)
+        consumer.offer({"symbol": "A", "ltp": 1})
+        assert _wait_until(lambda: consumer.pending == 0)
+
+        assert consumer.offer({"symbol": "B", "ltp": 1})
+        assert consumer.offer({"symbol": "C", "ltp": 1})
+        assert not consumer.offer({"symbol": "D", "ltp": 1})
+        assert consumer.dropped == 1
+        gate.set()
+        consumer.stop()
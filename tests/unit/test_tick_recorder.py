@@ -0,0 +1,110 @@
+"""
+Unit tests for binary Tick Recorder
+Tests: block buffering, symbol dictionary, flush on close, reader round-trip,
+date rotation, recorder started by the feed on any transport
+"""
+
+import math
+import time
+from datetime import datetime
+
+import pytest
+
+from src.integrations.data_feeds.tick_recorder import (
+    FILE_SUFFIX,
+    TickRecorder,
+    read_tick_file,
+    tick_file_to_dataframe,
+)
+
+
+@pytest.mark.unit
+class TestTickRecorder:
+    """Test tick recording and reading"""
+
+    def _record(self, tmp_path, ticks, block_size=4):
+        recorder = TickRecorder(str(tmp_path), block_size=block_size, flush_interval=0.05)
+        recorder.start()
+        now = time.time()
+        for i, tick in enumerate(ticks):
+            recorder.record(tick, now + i)
+        recorder.close()
+        return recorder
+
+    def test_round_trip_with_partial_block(self, tmp_path):
+        """Test full and partial blocks are both written on close"""
+        ticks = [{"symbol": "NIFTY", "ltp": 22000.0 + i, "bid": 21999.0, "ask": 22001.0} for i in range(10)]
+        recorder = self._record(tmp_path, ticks, block_size=4)
+
+        files = list(tmp_path.glob(f"ticks_*{FILE_SUFFIX}"))
+        assert len(files) == 1
+        records, symbols = read_tick_file(files[0])
+
+        assert symbols == ["NIFTY"]
+        assert len(records) == 10
+        assert records["ltp"].tolist() == [22000.0 + i for i in range(10)]
+        assert recorder.blocks_written == 3
+        assert recorder.dropped == 0
+
+    def test_symbol_dictionary_and_missing_fields(self, tmp_path):
+        """Test symbols are interned and missing fields become NaN / -1"""
+        ticks = [
+            {"symbol": "NIFTY", "ltp": 22000.0},
+            {"symbol": "NIFTY24JAN22000CE", "ltp": 120.5, "volume": 50, "source": "REST_POLLING"},
+            {"symbol": "NIFTY", "ltp": 22001.0},
+        ]
+        self._record(tmp_path, ticks)
+
+        path = next(tmp_path.glob(f"ticks_*{FILE_SUFFIX}"))
+        records, symbols = read_tick_file(path)
+
+        assert symbols == ["NIFTY", "NIFTY24JAN22000CE"]
+        assert records["symbol_id"].tolist() == [0, 1, 0]
+        assert math.isnan(records["bid"][0])
+        assert records["volume"].tolist() == [-1, 50, -1]
+
+        df = tick_file_to_dataframe(path)
+        assert list(df["symbol"]) == ["NIFTY", "NIFTY24JAN22000CE", "NIFTY"]
+        assert list(df["source"]) == ["WEBSOCKET", "REST_POLLING", "WEBSOCKET"]
+
+    def test_drops_instead_of_blocking_when_buffers_exhausted(self, tmp_path):
+        """Test feed thread never blocks when the writer has not drained buffers"""
+        recorder = TickRecorder(str(tmp_path), block_size=2, buffer_count=2)
+        # Writer not started: only two buffers exist
+        results = [recorder.record({"symbol": "NIFTY", "ltp": 1.0}) for _ in range(6)]
+
+        assert results.count(True) == 4
+        assert recorder.dropped == 2
+
+    def test_rotates_on_date_change_within_block(self, tmp_path):
+        """Test a tick from the next day seals the buffer and opens a new day file"""
+        evening = datetime(2025, 12, 29, 23, 59, 58).timestamp()
+        morning = datetime(2025, 12, 30, 0, 0, 1).timestamp()
+        recorder = TickRecorder(str(tmp_path), block_size=100, flush_interval=0.05)
+        recorder.start()
+        for i in range(3):
+            recorder.record({"symbol": "NIFTY", "ltp": 1.0 + i}, evening + i * 0.1)
+        for i in range(2):
+            recorder.record({"symbol": "NIFTY", "ltp": 9.0 + i}, morning + i * 0.1)
+        recorder.close()
+
+        first = next(tmp_path.glob(f"ticks_20251229_*{FILE_SUFFIX}"))
+        second = next(tmp_path.glob(f"ticks_20251230_*{FILE_SUFFIX}"))
+        assert read_tick_file(first)[0]["ltp"].tolist() == [1.0, 2.0, 3.0]
+        assert read_tick_file(second)[0]["ltp"].tolist() == [9.0, 10.0]
+
+    def test_feed_starts_recorder_for_rest_polling(self, tmp_path, monkeypatch):
+        """Test the recorder runs when the feed falls back to REST polling without a WebSocket"""
+        from src.integrations.data_feeds.data_feed import DataFeed
+
+        feed = DataFeed()
+        feed.tick_recorder = TickRecorder(str(tmp_path), flush_interval=0.05)
+        monkeypatch.setattr(feed, "_polling_loop", lambda: None)
+
+        feed.start_rest_polling(["NIFTY"])
+        feed._process_tick({"symbol": "NIFTY", "ltp": 22000.0, "source": "REST_POLLING"})
+        feed.stop_recording()
+
+        records, symbols = read_tick_file(next(tmp_path.glob(f"ticks_*{FILE_SUFFIX}")))
+        assert not feed.connected
+        assert symbols == ["NIFTY"] and records["ltp"].tolist() == [22000.0]
@@ -0,0 +1,67 @@
+import numpy as np
+from unittest.mock import MagicMock
+
+from src.integrations.websocket.stream_manager import StreamManager
+from src.integrations.websocket.tick_ring import TickRingBuffer
+
+
+class TestTickRingBuffer:
+
+    def test_wraps_and_keeps_latest_window_contiguous(self):
+        ring = TickRingBuffer(capacity=4)
+        for i in range(6):
+            ring.append(float(i), 100.0 + i, i, None, 99.0, 101.0)
+
+        assert ring.size == 4
+        history = ring.view()
+        assert history["ltp"].tolist() == [102.0, 103.0, 104.0, 105.0]
+        assert history["timestamp"].tolist() == [2.0, 3.0, 4.0, 5.0]
+        assert np.isnan(history["oi"]).all()
+        assert ring.column("ltp", 2).tolist() == [104.0, 105.0]
+        assert ring.latest("ltp") == 105.0
+        assert ring.latest("oi") is None
+
+    def test_views_are_zero_copy(self):
+        ring = TickRingBuffer(capacity=8)
+        ring.append(1.0, 100.0, 1, 1, 99.0, 101.0)
+        view = ring.column("ltp")
+        assert np.shares_memory(view, ring.ltp)
+        assert ring.view(100)["ltp"].tolist() == [100.0]
+
+
+class TestStreamManager:
+
+    def test_process_tick_buffers_columns(self):
+        manager = StreamManager(MagicMock(), buffer_size=3)
+        received = []
+        manager.on_tick(received.append)
+
+        for i in range(5):
+            manager.process_tick(
+                {
+                    "token": "99926000",
+                    "last_traded_price": 2200000 + i,
+                    "volume_trade_for_the_day": 10 + i,
+                    "best_5_buy_data": [{"price": 2199900}],
+                    "best_5_sell_data": [],
+                }
+            )
+
+        history = manager.get_price_history("99926000", count=2)
+        assert history["ltp"].tolist() == [2200003.0, 2200004.0]
+        assert history["bid"].tolist() == [2199900.0, 2199900.0]
+        assert np.isnan(history["ask"]).all()
+        assert manager.get_latest_price("99926000") == 2200004.0
+        assert manager.get_price_history("unknown") == {}
+        assert len(received) == 5
+        assert received[-1]["ltp"] == 2200004
+
+    def test_memory_fixed_per_token(self):
+        manager = StreamManager(MagicMock(), buffer_size=100)
+        for token in range(200):
+            for i in range(250):
+                manager.process_tick({"token": str(token), "last_traded_price": i})
+
+        assert len(manager.tick_buffers) == 200
+        assert all(ring.size == 100 for ring in manager.tick_buffers.values())
+        assert manager.get_statistics()["buffer_bytes"] == 200 * TickRingBuffer(100).nbytes